@@ -0,0 +1,250 @@
+# backend/core/archive_analytics.py
+"""
+CR-Check — analysis_results 아카이브 분석용 평탄화·집계 (배치 전용)
+
+citation_audit / phase1_forensic / detected_patterns JSONB를 분석 1건당 여러 행의
+평면 테이블로 펼친다. 열 지향 파일(Parquet/Arrow) 기록은
+backend/scripts/export_analysis_archive.py가 담당하고, 이 모듈은 dict 행만 다룬다.
+
+테이블 (모든 행에 analysis_id):
+  analyses          — 분석 1건 1행 (모델·모드·fallback·인용 요약·건수)
+  detections        — 탐지 1건 1행 (validated: detected_patterns / hallucinated: 포렌식 코드)
+  citations         — 〔〕 인용 1건 1행 (report·matched·near-miss)
+  vector_candidates — 벡터 후보 1건 1행 (rank·similarity·starred·validated)
+
+집계 (build_aggregations):
+  hallucination_by_model — Phase 1 모델별 환각 코드 비율
+  fallback_by_mode       — Phase 1 모델·출력 모드별 파싱 fallback 비율 (+ Phase 2 재시도)
+  pattern_conversion     — 패턴별 벡터 후보 → validated 전환율
+  citation_by_model      — Phase 2 모델별 인용 매칭률·near-miss
+
+iter_analysis_rows()는 id keyset 페이지네이션 (OFFSET 없음) — 배치 스크립트 공용.
+순수 모듈: DB/Anthropic import 금지 (HTTP 클라이언트는 호출자가 주입).
+"""
+
+from collections import defaultdict
+from typing import Any, Iterator
+
+ARCHIVE_SELECT = (
+    "id,article_id,created_at,phase1_model,phase2_model,duration_seconds,"
+    "detected_patterns,citation_audit,phase1_forensic"
+)
+
+TABLES = ("analyses", "detections", "citations", "vector_candidates")
+
+
+def iter_analysis_rows(
+    client: Any,
+    sb_url: str,
+    select: str,
+    since_id: int = 0,
+    page_size: int = 200,
+) -> Iterator[dict]:
+    """analysis_results를 id 오름차순으로 page_size씩 (keyset: id=gt.<마지막 id>)."""
+    last_id = since_id
+    while True:
+        r = client.get(
+            f"{sb_url}/rest/v1/analysis_results",
+            params={
+                "select": select,
+                "id": f"gt.{last_id}",
+                "order": "id.asc",
+                "limit": str(page_size),
+            },
+            timeout=60,
+        )
+        r.raise_for_status()
+        rows = r.json()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1]["id"]
+        if len(rows) < page_size:
+            return
+
+
+def _rate(num: int, den: int) -> float | None:
+    return round(num / den, 4) if den else None
+
+
+# ── 평탄화 ──────────────────────────────────────────────────────
+
+def flatten_analysis(row: dict) -> dict[str, list[dict]]:
+    """analysis_results 1행 → 테이블별 행 목록. 비어 있는 JSONB는 0행."""
+    aid = row["id"]
+    forensic = row.get("phase1_forensic") or {}
+    audit = row.get("citation_audit") or {}
+    summary = audit.get("summary") or {}
+    structured = forensic.get("structured_output") or {}
+    phase1 = structured.get("phase1") or {}
+    phase2 = structured.get("phase2") or {}
+
+    validated = list(forensic.get("validated_codes") or [])
+    validated_set = set(validated)
+    hallucinated = list(forensic.get("hallucinated_codes") or [])
+    starred = set(forensic.get("starred_codes") or [])
+    candidates = forensic.get("vector_candidates") or []
+    phase1_model = forensic.get("phase1_model") or row.get("phase1_model")
+
+    detections = [
+        {
+            "analysis_id": aid,
+            "pattern_code": d.get("pattern_code"),
+            "status": "validated",
+            "severity": d.get("severity"),
+            "phase1_model": phase1_model,
+        }
+        for d in row.get("detected_patterns") or []
+    ]
+    detections += [
+        {
+            "analysis_id": aid,
+            "pattern_code": code,
+            "status": "hallucinated",
+            "severity": None,
+            "phase1_model": phase1_model,
+        }
+        for code in hallucinated
+    ]
+
+    citations = []
+    for report, ra in (audit.get("reports") or {}).items():
+        near = {nm.get("label"): nm for nm in ra.get("near_misses") or []}
+        for label, matched in (
+            [(x, True) for x in ra.get("matched") or []]
+            + [(x, False) for x in ra.get("unmatched") or []]
+        ):
+            nm = near.get(label) or {}
+            citations.append({
+                "analysis_id": aid,
+                "report": report,
+                "label": label,
+                "matched": matched,
+                "near_miss_kind": nm.get("kind"),
+                "suggestion": nm.get("suggestion"),
+                "phase2_model": row.get("phase2_model"),
+            })
+
+    vector_candidates = [
+        {
+            "analysis_id": aid,
+            "rank": rank,
+            "pattern_code": vc.get("code"),
+            "similarity": vc.get("similarity"),
+            "starred": vc.get("code") in starred,
+            "validated": vc.get("code") in validated_set,
+        }
+        for rank, vc in enumerate(candidates, start=1)
+    ]
+
+    analysis = {
+        "analysis_id": aid,
+        "article_id": row.get("article_id"),
+        "created_at": row.get("created_at"),
+        "phase1_model": phase1_model,
+        "phase2_model": row.get("phase2_model"),
+        "duration_seconds": row.get("duration_seconds"),
+        "article_context": forensic.get("article_context"),
+        "has_forensic": bool(forensic),
+        "fallback_used": forensic.get("fallback_used"),
+        "phase1_mode": phase1.get("mode"),
+        "phase2_mode": phase2.get("mode"),
+        "phase2_attempts": phase2.get("attempts"),
+        "phase2_parse_fallbacks": phase2.get("parse_fallbacks"),
+        "candidate_count": len(candidates),
+        "validated_count": len(validated),
+        "hallucinated_count": len(hallucinated),
+        "citation_status": audit.get("status"),
+        "citation_used_total": summary.get("used_total"),
+        "citation_matched_total": summary.get("matched_total"),
+        "citation_unmatched_total": summary.get("unmatched_total"),
+        "citation_near_miss_total": summary.get("near_miss_total"),
+        "citation_match_rate": summary.get("match_rate"),
+    }
+    return {
+        "analyses": [analysis],
+        "detections": detections,
+        "citations": citations,
+        "vector_candidates": vector_candidates,
+    }
+
+
+# ── 집계 ────────────────────────────────────────────────────────
+
+class ArchiveAggregator:
+    """flatten_analysis 결과를 순서대로 받아 사전 집계를 누적한다 (1회 통과)."""
+
+    def __init__(self) -> None:
+        self.analyses = 0
+        self._halluc: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])  # 분석, 탐지, 환각
+        self._fallback: dict[tuple, list[int]] = defaultdict(lambda: [0, 0, 0, 0])
+        self._pattern: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])  # 후보, 후보∧validated, validated
+        self._citation: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0, 0])
+
+    def add(self, tables: dict[str, list[dict]]) -> None:
+        for a in tables["analyses"]:
+            self.analyses += 1
+            if not a["has_forensic"]:
+                continue
+            model = a["phase1_model"] or "unknown"
+            h = self._halluc[model]
+            h[0] += 1
+            h[1] += a["validated_count"] + a["hallucinated_count"]
+            h[2] += a["hallucinated_count"]
+
+            f = self._fallback[(model, a["phase1_mode"] or "text")]
+            f[0] += 1
+            f[1] += bool(a["fallback_used"])
+            f[2] += max((a["phase2_attempts"] or 1) - 1, 0)
+            f[3] += a["phase2_parse_fallbacks"] or 0
+
+            if a["citation_status"] == "ok":
+                c = self._citation[a["phase2_model"] or "unknown"]
+                c[0] += a["citation_used_total"] or 0
+                c[1] += a["citation_matched_total"] or 0
+                c[2] += a["citation_near_miss_total"] or 0
+                c[3] += 1
+
+        for vc in tables["vector_candidates"]:
+            p = self._pattern[vc["pattern_code"]]
+            p[0] += 1
+            p[1] += vc["validated"]
+        for d in tables["detections"]:
+            if d["status"] == "validated":
+                self._pattern[d["pattern_code"]][2] += 1
+
+    def result(self) -> dict[str, Any]:
+        return {
+            "analyses": self.analyses,
+            "hallucination_by_model": [
+                {"phase1_model": m, "analyses": n, "detections": det,
+                 "hallucinated": hal, "rate": _rate(hal, det)}
+                for m, (n, det, hal) in sorted(self._halluc.items())
+            ],
+            "fallback_by_mode": [
+                {"phase1_model": m, "phase1_mode": mode, "analyses": n,
+                 "fallbacks": fb, "rate": _rate(fb, n),
+                 "phase2_retries": retries, "phase2_parse_fallbacks": pf}
+                for (m, mode), (n, fb, retries, pf) in sorted(self._fallback.items())
+            ],
+            "pattern_conversion": [
+                {"pattern_code": code, "candidates": cand, "candidate_validated": conv,
+                 "validated": val, "conversion_rate": _rate(conv, cand)}
+                for code, (cand, conv, val) in sorted(
+                    self._pattern.items(), key=lambda kv: (-kv[1][0], kv[0] or ""),
+                )
+            ],
+            "citation_by_model": [
+                {"phase2_model": m, "analyses": n, "used": used, "matched": matched,
+                 "match_rate": _rate(matched, used), "near_misses": near}
+                for m, (used, matched, near, n) in sorted(self._citation.items())
+            ],
+        }
+
+
+def build_aggregations(rows: list[dict]) -> dict[str, Any]:
+    """analysis_results 행 목록 → 사전 집계 (테스트·소량 분석용 편의 함수)."""
+    agg = ArchiveAggregator()
+    for row in rows:
+        agg.add(flatten_analysis(row))
+    return agg.result()
@@ -9,11 +9,17 @@ CR-Check — 기사 청킹 모듈
 1. 전처리 — 노이즈 제거 (캡션, 바이라인, 저작권 고지 등)
 2. 의미 기반 병합 — 한 문장 줄바꿈 관행 대응, 300~500자 블록
 3. 엣지케이스 — 단문/장문/리스트형
+
+CHUNK_MODE=tokens이면 글자 수 대신 임베딩 모델 토큰 예산으로 청킹한다 (섹션 4).
 """
 
+import os
 import re
+import logging
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Chunk:
@@ -79,26 +85,98 @@ _PORTAL_META_PATTERNS = [
 ]
 
 
+# 분류명 → 패턴 목록. 순서 = 노이즈 제거 우선순위.
+_NOISE_PATTERN_GROUPS = (
+    ('caption', _CAPTION_PATTERNS),
+    ('byline', _BYLINE_PATTERNS),
+    ('copyright', _COPYRIGHT_PATTERNS),
+    ('misc', _MISC_NOISE_PATTERNS),
+    ('portal', _PORTAL_META_PATTERNS),
+)
+
+_NOISE_FLAGS = re.MULTILINE | re.IGNORECASE
+
+# 패턴명 → 매칭에 반드시 들어가는 리터럴 (하나라도 있어야 매칭 가능).
+# 현재 텍스트에 리터럴이 하나도 없으면 그 패턴의 sub는 결과를 바꿀 수 없으므로 건너뛴다.
+# IGNORECASE 대소문자 변형이 있는 리터럴은 변형까지 적는다 (ⓒ/Ⓒ).
+# 항목이 없는 패턴(copyright_3 등 영문 대소문자 변형이 많은 것)은 항상 적용한다.
+_NOISE_LITERALS: dict[str, tuple[str, ...]] = {
+    'caption_0': ('기자',),
+    'caption_1': ('○',),
+    'caption_2': ('[사진',),
+    'caption_3': ('(사진',),
+    'caption_4': ('사진',),
+    'caption_5': ('【',),
+    'byline_0': ('기자',),
+    'byline_1': ('특파원',),
+    'byline_2': ('기자',),
+    'byline_3': ('@',),
+    'byline_4': ('기자',),
+    'copyright_0': ('ⓒ', 'Ⓒ'),
+    'copyright_1': ('©',),
+    'copyright_2': ('무단',),
+    'misc_0': ('▶',),
+    'misc_1': ('▶',),
+    'misc_2': ('[관련기사]',),
+    'misc_3': ('☞',),
+    'misc_4': ('※',),
+    'misc_5': ('<',),
+    'misc_6': ('입력',),
+    'misc_7': ('-', '='),
+    'portal_0': ('기사제보',),
+    'portal_1': ('네이버에서',),
+    'portal_2': ('좋아요',),
+    'portal_3': ('언론사',),
+    'portal_4': ('기사원문',),
+    'portal_5': ('공유',),
+}
+
+
+def _named_noise_patterns() -> list[tuple[str, str]]:
+    """(`{분류}_{인덱스}`, 패턴) 목록을 우선순위 순서로 반환. 예: byline_0."""
+    return [
+        (f'{group}_{i}', p)
+        for group, patterns in _NOISE_PATTERN_GROUPS
+        for i, p in enumerate(patterns)
+    ]
+
+
 def _compile_noise_patterns() -> list[re.Pattern]:
-    """모든 노이즈 패턴을 컴파일."""
-    all_patterns = (
-        _CAPTION_PATTERNS
-        + _BYLINE_PATTERNS
-        + _COPYRIGHT_PATTERNS
-        + _MISC_NOISE_PATTERNS
-        + _PORTAL_META_PATTERNS
-    )
-    return [re.compile(p, re.MULTILINE | re.IGNORECASE) for p in all_patterns]
+    """모든 노이즈 패턴을 개별 컴파일 (우선순위 순서)."""
+    return [re.compile(p, _NOISE_FLAGS) for _, p in _named_noise_patterns()]
 
 
+_NOISE_NAMES = [name for name, _ in _named_noise_patterns()]
 _COMPILED_NOISE = _compile_noise_patterns()
+_GATED_NOISE = [
+    (name, pattern, _NOISE_LITERALS.get(name))
+    for name, pattern in zip(_NOISE_NAMES, _COMPILED_NOISE)
+]
 
 
-def preprocess(text: str) -> str:
-    """기사 원문에서 노이즈를 제거한다."""
-    for pattern in _COMPILED_NOISE:
-        text = pattern.sub('', text)
+def _may_match(literals: tuple[str, ...] | None, text: str) -> bool:
+    """리터럴 사전 검사 — False면 그 패턴은 text에서 매칭될 수 없다."""
+    return literals is None or any(lit in text for lit in literals)
+
 
+def find_noise(text: str) -> list[tuple[str, str]]:
+    """preprocess()가 제거할 노이즈를 (패턴명, 매칭 텍스트) 목록으로 반환 (진단용).
+
+    preprocess()와 같은 순서로 패턴을 하나씩 적용하며, 앞 패턴이 지운 뒤의
+    텍스트에서 생긴 매칭도 그 패턴 이름(`caption_2`, `byline_0` 등)으로 기록한다.
+    """
+    hits: list[tuple[str, str]] = []
+    for name, pattern, literals in _GATED_NOISE:
+        if not _may_match(literals, text):
+            continue
+        found = [m.group() for m in pattern.finditer(text) if m.group()]
+        if found:
+            hits.extend((name, g) for g in found)
+            text = pattern.sub('', text)
+    return hits
+
+
+def _normalize_whitespace(text: str) -> str:
     # 연속 공백 줄 정리 (3개 이상 연속 줄바꿈 → 2개)
     text = re.sub(r'\n{3,}', '\n\n', text)
     # 각 줄의 앞뒤 공백 제거
@@ -108,6 +186,84 @@ def preprocess(text: str) -> str:
     return text.strip()
 
 
+# 전처리는 전부 "삭제"로만 이뤄진다 — 정제 텍스트는 원문의 부분 수열이다.
+# _normalize_whitespace()의 세 단계를 같은 순서의 삭제 정규식으로 옮긴 것.
+_WHITESPACE_DELETIONS = (
+    re.compile(r'(?<=\n\n)\n+'),                       # 3개 이상 연속 줄바꿈 → 2개
+    re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE),  # 각 줄의 앞뒤 공백
+    re.compile(r'\A\s+|\s+\Z'),                        # 전체 앞뒤 공백
+)
+
+
+def _delete_matches(
+    text: str, offsets: list[int], pattern: re.Pattern,
+) -> tuple[str, list[int]]:
+    """pattern 매칭 구간을 삭제하고, 남은 문자의 원문 인덱스 목록도 함께 줄인다."""
+    parts: list[str] = []
+    kept: list[int] = []
+    pos = 0
+    for m in pattern.finditer(text):
+        if m.start() == m.end():
+            continue
+        parts.append(text[pos:m.start()])
+        kept.extend(offsets[pos:m.start()])
+        pos = m.end()
+    if pos == 0:
+        return text, offsets
+    parts.append(text[pos:])
+    kept.extend(offsets[pos:])
+    return ''.join(parts), kept
+
+
+def preprocess_with_offsets(text: str) -> tuple[str, list[int]]:
+    """preprocess()와 같은 정제 텍스트 + 오프셋 맵을 반환한다.
+
+    Returns:
+        (cleaned, offsets) — offsets[i]는 cleaned[i]의 원문 인덱스.
+        len(offsets) == len(cleaned)이고 단조 증가한다.
+    """
+    offsets = list(range(len(text)))
+    for _, pattern, literals in _GATED_NOISE:
+        if _may_match(literals, text):
+            text, offsets = _delete_matches(text, offsets, pattern)
+    for pattern in _WHITESPACE_DELETIONS:
+        text, offsets = _delete_matches(text, offsets, pattern)
+    return text, offsets
+
+
+def _preprocess_sequential(text: str) -> str:
+    """[레퍼런스] 리터럴 사전 검사 없이 패턴 29개를 전부 순차 sub하는 기존 전처리.
+
+    preprocess()와의 출력 동등성 테스트(test_chunker_preprocess)와
+    scripts/benchmark_preprocess.py 전용. 파이프라인에서는 사용하지 않는다.
+    """
+    for pattern in _COMPILED_NOISE:
+        text = pattern.sub('', text)
+    return _normalize_whitespace(text)
+
+
+def preprocess(text: str) -> str:
+    """기사 원문에서 노이즈를 제거한다.
+
+    패턴 29개를 우선순위 순서대로 sub한다 (결과는 _preprocess_sequential과 동일).
+    패턴마다 현재 텍스트에 필수 리터럴(_NOISE_LITERALS)이 없으면 정규식 스캔을
+    건너뛴다 — 리터럴 검사는 문자열 탐색이라 정규식 스캔보다 훨씬 싸고,
+    대부분의 기사에서 실제로 도는 패턴은 몇 개뿐이다.
+
+    패턴을 교대 하나로 묶는 단일 패스는 쓰지 않는다. 교대는 가장 왼쪽 매칭이
+    이기므로 우선순위가 뒤인 패턴이 앞 패턴의 매칭을 먼저 가져가고(예: 특파원
+    줄이 다음 기자 줄을 삼킴), 앞 패턴이 지운 뒤에야 생기는 매칭도 재현하지 못해
+    순차 적용과 결과가 달라진다.
+
+    원문 위치가 필요하면 preprocess_with_offsets()를 쓴다 (오프셋 추적 비용이
+    있어 텍스트만 필요한 경로는 이 함수를 쓴다).
+    """
+    for _, pattern, literals in _GATED_NOISE:
+        if _may_match(literals, text):
+            text = pattern.sub('', text)
+    return _normalize_whitespace(text)
+
+
 # ── 2. 의미 기반 병합 청킹 ──────────────────────────────────────
 
 MIN_CHUNK_SIZE = 100   # 이보다 짧은 단락은 병합
@@ -115,6 +271,8 @@ TARGET_MIN = 300       # 목표 최소 청크 크기
 TARGET_MAX = 500       # 목표 최대 청크 크기
 SHORT_ARTICLE = 500    # 이보다 짧으면 단일 청크
 
+CHUNK_MODE = os.environ.get("CHUNK_MODE", "chars")
+
 
 def _split_into_paragraphs(text: str) -> list[str]:
     """텍스트를 의미 단락으로 분리.
@@ -190,54 +348,66 @@ def _split_large_chunk(text: str, max_size: int = TARGET_MAX) -> list[str]:
     return chunks
 
 
-def _build_chunks_with_positions(texts: list[str], original: str) -> list[Chunk]:
-    """청크 텍스트 리스트에서 원본 내 위치를 찾아 Chunk 객체를 생성."""
+def _build_chunks_with_positions(
+    texts: list[str], cleaned: str, offsets: list[int],
+) -> list[Chunk]:
+    """청크 텍스트 리스트에 원문 기준 정확한 위치를 부여해 Chunk 객체를 생성.
+
+    단락 분리·병합·문장 분할은 공백에서만 자르고 공백만 바꾸므로, 청크를 이어
+    붙인 비공백 토큰 열은 cleaned의 토큰 열과 같다. 청크마다 토큰 수만큼
+    cleaned 토큰을 소비해 cleaned 구간을 얻고, offsets로 원문 구간으로 옮긴다.
+    start_idx/end_idx는 청크 첫 글자 ~ 마지막 글자 다음의 원문 인덱스. O(n).
+    """
+    tokens = [m.span() for m in re.finditer(r'\S+', cleaned)]
     chunks = []
-    search_start = 0
+    cursor = 0
 
     for text in texts:
-        # 전처리로 공백이 변경되었을 수 있으므로, 핵심 단어로 근사 매칭
-        # 가장 단순한 방법: 첫 20자로 위치 추정
-        snippet = text[:20].strip()
-        # 원본에서 공백/줄바꿈 무시하고 매칭 시도
-        idx = original.find(snippet, search_start)
-        if idx == -1:
-            # fallback: 이전 청크 끝에서 시작
-            idx = search_start
-
-        start = idx
-        end = min(start + len(text), len(original))
-        chunks.append(Chunk(text=text, start_idx=start, end_idx=end))
-        search_start = end
+        count = len(text.split())
+        if count == 0 or cursor + count > len(tokens):
+            # 불변식이 깨진 경우(도달 불가) — 직전 청크 끝 위치로 둔다
+            pos = chunks[-1].end_idx if chunks else 0
+            chunks.append(Chunk(text=text, start_idx=pos, end_idx=pos))
+            continue
+        start = tokens[cursor][0]
+        end = tokens[cursor + count - 1][1]
+        cursor += count
+        chunks.append(Chunk(
+            text=text, start_idx=offsets[start], end_idx=offsets[end - 1] + 1,
+        ))
 
     return chunks
 
 
 # ── 3. 메인 함수 ────────────────────────────────────────────────
 
-def chunk_article(article_text: str) -> list[Chunk]:
+def chunk_article(article_text: str, mode: str | None = None) -> list[Chunk]:
     """기사 원문을 의미 기반 청크로 분할.
 
     Args:
         article_text: 기사 원문 텍스트 (스크래핑 결과)
+        mode: "chars"(300~500자, 기본) | "tokens"(chunk_article_by_tokens).
+              None이면 환경변수 CHUNK_MODE를 따른다.
 
     Returns:
-        청크 리스트 (각 청크는 text, start_idx, end_idx 포함)
+        청크 리스트 (각 청크는 text, start_idx, end_idx 포함).
+        start_idx/end_idx는 article_text 기준 위치 — 노이즈 제거 후에도 정확하다.
     """
+    if (mode or CHUNK_MODE) == "tokens":
+        return chunk_article_by_tokens(article_text)
+
     if not article_text or not article_text.strip():
         return []
 
-    original = article_text
-
-    # 1. 전처리
-    cleaned = preprocess(article_text)
+    # 1. 전처리 (offsets[i] = cleaned[i]의 원문 인덱스)
+    cleaned, offsets = preprocess_with_offsets(article_text)
 
     if not cleaned:
         return []
 
     # 2. 극단적 단문 → 단일 청크
     if len(cleaned) <= SHORT_ARTICLE:
-        return [Chunk(text=cleaned, start_idx=0, end_idx=len(original))]
+        return [Chunk(text=cleaned, start_idx=offsets[0], end_idx=offsets[-1] + 1)]
 
     # 3. 단락 분리 (빈 줄 기준, 단일 줄바꿈은 병합)
     paragraphs = _split_into_paragraphs(cleaned)
@@ -272,6 +442,165 @@ def chunk_article(article_text: str) -> list[Chunk]:
         final_texts = merged
 
     # 7. 위치 정보 부여
-    chunks = _build_chunks_with_positions(final_texts, original)
+    chunks = _build_chunks_with_positions(final_texts, cleaned, offsets)
+
+    return chunks
+
+
+# ── 4. 토큰 기반 청킹 (CHUNK_MODE=tokens) ────────────────────────
+#
+# 글자 수 기준(300~500자)은 한국어가 임베딩 모델에서 몇 토큰이 되는지와 무관해
+# 청크가 잘게 쪼개지고, 청크마다 임베딩 입력·벡터 RPC가 하나씩 생긴다.
+# 이 모드는 text-embedding-3-small 토크나이저(cl100k_base)로 토큰 예산을 잡고,
+# 문장 경계에서만 자르며, 직전 청크 끝 문장을 overlap 예산만큼 이어 붙인다.
+
+TOKEN_ENCODING = "cl100k_base"  # text-embedding-3-small 토크나이저
+TOKEN_MAX = int(os.environ.get("CHUNK_MAX_TOKENS", "700"))
+TOKEN_OVERLAP = int(os.environ.get("CHUNK_OVERLAP_TOKENS", "80"))
+
+# 한국어 문장 종결: 다./요./까?/죠. 등 + 뒤따르는 닫는 따옴표·괄호, 또는 ?/!.
+# "3.5%", "U.S." 같은 마침표에서는 자르지 않는다.
+_SENTENCE_END = re.compile(
+    r'(?:[다요까죠][.?!]|[?!])["”’」』)\]]*(?=\s|$)'
+)
+_BLANK_LINE = re.compile(r'\n\s*\n')
+
+_tokenizer = None
+_tokenizer_loaded = False
+
+
+def _get_tokenizer():
+    """tiktoken 인코더를 1회 로드. 미설치·로드 실패 시 None (추정치 사용).
+
+    cl100k_base BPE 파일은 최초 1회 내려받아 캐시한다. 오프라인 배포는
+    TIKTOKEN_CACHE_DIR에 미리 넣어 둔다.
+    """
+    global _tokenizer, _tokenizer_loaded
+    if not _tokenizer_loaded:
+        _tokenizer_loaded = True
+        try:
+            import tiktoken
+            _tokenizer = tiktoken.get_encoding(TOKEN_ENCODING)
+        except Exception as e:
+            logger.warning(f"tiktoken 로드 실패 — 토큰 수를 추정치로 대체: {e}")
+    return _tokenizer
 
+
+def count_tokens(text: str) -> int:
+    """임베딩 모델 기준 토큰 수. tiktoken이 없으면 보수적 추정치.
+
+    추정: 비ASCII(한글 등) 1자 = 1토큰, ASCII 4자 = 1토큰.
+    """
+    enc = _get_tokenizer()
+    if enc is not None:
+        return len(enc.encode(text))
+    ascii_count = sum(1 for ch in text if ch.isascii())
+    return (len(text) - ascii_count) + (ascii_count + 3) // 4
+
+
+def _split_sentence_spans(cleaned: str) -> list[tuple[int, int]]:
+    """cleaned를 문장 구간 (start, end) 목록으로 분리. 빈 줄도 문장 경계.
+
+    각 구간은 앞뒤 공백이 없는 cleaned 슬라이스다.
+    """
+    spans: list[tuple[int, int]] = []
+
+    def _add(start: int, end: int) -> None:
+        segment = cleaned[start:end]
+        stripped = segment.strip()
+        if stripped:
+            lead = len(segment) - len(segment.lstrip())
+            spans.append((start + lead, start + lead + len(stripped)))
+
+    block_start = 0
+    for block in [*_BLANK_LINE.finditer(cleaned), None]:
+        block_end = block.start() if block else len(cleaned)
+        pos = block_start
+        for m in _SENTENCE_END.finditer(cleaned, block_start, block_end):
+            _add(pos, m.end())
+            pos = m.end()
+        _add(pos, block_end)
+        if block:
+            block_start = block.end()
+    return spans
+
+
+def _split_oversized_span(
+    cleaned: str, start: int, end: int, max_tokens: int,
+) -> list[tuple[int, int]]:
+    """예산을 넘는 한 문장을 어절(공백) 경계에서 max_tokens 이하로 분할."""
+    pieces: list[tuple[int, int]] = []
+    piece_start = start
+    piece_end = start
+    used = 0
+    for m in re.finditer(r'\S+', cleaned[start:end]):
+        w_start, w_end = start + m.start(), start + m.end()
+        cost = count_tokens(' ' + m.group())
+        if used and used + cost > max_tokens:
+            pieces.append((piece_start, piece_end))
+            piece_start, used = w_start, 0
+        piece_end = w_end
+        used += cost
+    pieces.append((piece_start, piece_end))
+    return pieces
+
+
+def chunk_article_by_tokens(
+    article_text: str,
+    max_tokens: int = TOKEN_MAX,
+    overlap_tokens: int = TOKEN_OVERLAP,
+) -> list[Chunk]:
+    """기사 원문을 토큰 예산 기반 청크로 분할 (CHUNK_MODE=tokens).
+
+    - 문장(한국어 종결부호·빈 줄) 단위로 max_tokens까지 탐욕적으로 채운다.
+    - 새 청크는 직전 청크의 끝 문장들을 overlap_tokens 이내로 이어 받는다.
+    - 한 문장이 max_tokens를 넘으면 어절 경계에서 자른다.
+    - start_idx/end_idx는 chunk_article()과 같이 원문 기준 정확한 위치.
+      overlap 구간만큼 인접 청크 위치가 겹친다.
+    """
+    if not article_text or not article_text.strip():
+        return []
+
+    cleaned, offsets = preprocess_with_offsets(article_text)
+    if not cleaned:
+        return []
+
+    units: list[tuple[int, int, int]] = []  # (start, end, tokens) — cleaned 기준
+    for start, end in _split_sentence_spans(cleaned):
+        tokens = count_tokens(cleaned[start:end])
+        if tokens > max_tokens:
+            for p_start, p_end in _split_oversized_span(cleaned, start, end, max_tokens):
+                units.append((p_start, p_end, count_tokens(cleaned[p_start:p_end])))
+        else:
+            units.append((start, end, tokens))
+
+    groups: list[list[tuple[int, int, int]]] = []
+    current: list[tuple[int, int, int]] = []
+    used = 0
+    for unit in units:
+        if current and used + unit[2] > max_tokens:
+            groups.append(current)
+            # overlap: 직전 청크 끝 문장을 예산 안에서 이어 받되, 청크 전체는 제외
+            carried: list[tuple[int, int, int]] = []
+            carried_tokens = 0
+            for prev in reversed(current[1:]):
+                if carried_tokens + prev[2] > overlap_tokens:
+                    break
+                carried.insert(0, prev)
+                carried_tokens += prev[2]
+            if carried_tokens + unit[2] > max_tokens:
+                carried, carried_tokens = [], 0
+            current, used = carried, carried_tokens
+        current.append(unit)
+        used += unit[2]
+    if current:
+        groups.append(current)
+
+    chunks = []
+    for group in groups:
+        start, end = group[0][0], group[-1][1]
+        text = ' '.join(cleaned[start:end].split())
+        chunks.append(Chunk(
+            text=text, start_idx=offsets[start], end_idx=offsets[end - 1] + 1,
+        ))
     return chunks
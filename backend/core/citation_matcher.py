@@ -0,0 +1,305 @@
+# backend/core/citation_matcher.py
+"""
+CR-Check — 인용 감사 매처 (Aho–Corasick + near-miss 편집 거리)
+
+규범 집합(allowed citations)마다 정식 인용명과 그 변형을 Aho–Corasick 오토마톤으로
+한 번 컴파일해 재사용한다 (compile_matcher — 같은 규범 집합이면 캐시 적중).
+
+- scan()이 3종 리포트를 이어 붙여 오토마톤을 1회 통과시키며, 같은 패스에서
+  리포트별 〔〕 라벨(used)과 bare_mentions를 함께 돌려준다. verify_citations는
+  이 결과로 used/matched/unmatched를 계산한다 (별도 정규식 감사 패스 없음).
+- 매칭 판정은 verify_citations의 normalized exact match 계약 그대로다.
+  이 모듈은 관측 전용 진단만 더한다:
+  · near_misses — 비매칭 라벨에 가장 가까운 정식 인용명
+      variant  : 알려진 변형과 일치 (원문자→N항, 조만 축약, 공백 제거)
+      edit     : 편집 거리 ≤ CITATION_NEAR_MISS_MAX_DISTANCE
+      contains : 라벨 안에 정식 인용명이 통째로 들어 있음 (예: "… 제3조 1항 및 2항")
+      편집 거리 계산이 (정식 인용명 수 × 라벨 길이²)라 비매칭 라벨에만, 그리고
+      verify_report_citations(near_misses=True)일 때만 돈다 (배치 재감사 기본 on).
+  · bare_mentions — 〔〕 없이 본문에 쓰인 정식 인용명
+- backend/scripts/audit_citations_archive.py가 같은 매처로 아카이브 전체를 재감사한다.
+
+순수 모듈: DB/Anthropic import 금지.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional
+
+from .verify_citations import _BRACKET_PATTERN, normalize_citation_label
+
+NEAR_MISS_MAX_DISTANCE = int(os.environ.get("CITATION_NEAR_MISS_MAX_DISTANCE", "3"))
+
+# 원문자 → "N항" (scripts/generate_ethics_to_pattern_map.py와 같은 규칙)
+# DB article_number는 "제3조 ①", 리포트는 "제3조 1항"으로 쓰는 경우가 많다.
+_CIRCLED_TO_HANG = {c: f"{i}항" for i, c in enumerate("①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳", start=1)}
+_CIRCLED_RE = re.compile("|".join(_CIRCLED_TO_HANG))
+_ARTICLE_ONLY_RE = re.compile(r"\s*(?:[①-⑳]|\d+\s*항).*$")
+_WS = re.compile(r"\s+")
+_FULLWIDTH_DIGITS = str.maketrans("０１２３４５６７８９", "0123456789")
+
+# 리포트 경계 — 정규화된 라벨에 나올 수 없는 문자 (오토마톤이 경계를 넘지 않음)
+_REPORT_SEPARATOR = "\x00"
+
+KIND_EXACT = "exact"
+KIND_HANG = "hang"
+KIND_ARTICLE_ONLY = "article_only"
+KIND_COMPACT = "compact"
+
+
+def _normalize_text(text: str) -> str:
+    """본문 정규화 — normalize_citation_label과 같은 규칙(전각 숫자·공백), strip 제외."""
+    return _WS.sub(" ", text.translate(_FULLWIDTH_DIGITS))
+
+
+def label_variants(source: str, article_number: str) -> list[tuple[str, str]]:
+    """정식 인용명의 (정규화된 변형, 종류) 목록. 첫 항목이 정식 인용명(exact)."""
+    source, article = source.strip(), article_number.strip()
+    exact = normalize_citation_label(f"{source} {article}")
+    variants = [(exact, KIND_EXACT)]
+    hang = _CIRCLED_RE.sub(lambda m: _CIRCLED_TO_HANG[m.group(0)], article)
+    if hang != article:
+        variants.append((normalize_citation_label(f"{source} {hang}"), KIND_HANG))
+    article_only = _ARTICLE_ONLY_RE.sub("", article).strip()
+    if article_only and article_only != article:
+        variants.append((normalize_citation_label(f"{source} {article_only}"), KIND_ARTICLE_ONLY))
+    compact = exact.replace(" ", "")
+    if compact != exact:
+        variants.append((compact, KIND_COMPACT))
+
+    seen: set[str] = set()
+    unique = []
+    for text, kind in variants:
+        if text and text not in seen:
+            seen.add(text)
+            unique.append((text, kind))
+    return unique
+
+
+def edit_distance(a: str, b: str, cutoff: Optional[int] = None) -> int:
+    """Levenshtein 거리. cutoff를 넘는 것이 확정되면 cutoff + 1 반환 (조기 종료)."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if cutoff is not None and len(a) - len(b) > cutoff:
+        return cutoff + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if cutoff is not None and min(current) > cutoff:
+            return cutoff + 1
+        previous = current
+    return previous[-1]
+
+
+# ── Aho–Corasick ────────────────────────────────────────────────
+
+class AhoCorasick:
+    """다중 패턴 문자열 검색 오토마톤. 패턴 id는 추가 순서(0부터)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: list[str] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        pid = len(self.patterns)
+        self.patterns.append(pattern)
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pid)
+
+    def _build(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, int]]:
+        """(start, end, pattern_id) — end는 exclusive. 겹치는 매칭 모두 반환."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pid in out[node]:
+                yield i + 1 - len(patterns[pid]), i + 1, pid
+
+
+# ── 인용 매처 ───────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class NearMiss:
+    label: str        # 리포트에 쓰인 원래 라벨
+    suggestion: str   # 가장 가까운 정식 인용명
+    kind: str         # variant:<hang|article_only|compact> | edit | contains
+    distance: int     # 정규화 라벨 ↔ 정식 인용명 편집 거리
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "label": self.label, "suggestion": self.suggestion,
+            "kind": self.kind, "distance": self.distance,
+        }
+
+
+@dataclass
+class ReportScan:
+    used: list[str]           # 〔〕 라벨 원문 (등장 순서, 빈 라벨 제외 — extract_citation_labels와 동일)
+    bare_mentions: list[str]  # 〔〕 밖에 쓰인 정식 인용명 (중복 제거)
+
+
+class CitationMatcher:
+    """규범 집합 하나에 대한 컴파일된 매처. compile_matcher()로 얻는다."""
+
+    def __init__(self, citations: Iterable[tuple[str, str]]):
+        self.labels: list[str] = []  # 정식 인용명 (정규화)
+        self._exact: dict[str, int] = {}
+        self._variant_of: list[tuple[int, str]] = []  # pattern id → (label idx, kind)
+        patterns: list[str] = []
+        for source, article in citations:
+            variants = label_variants(source, article)
+            if not variants[0][0] or variants[0][0] in self._exact:
+                continue
+            idx = len(self.labels)
+            self.labels.append(variants[0][0])
+            self._exact[variants[0][0]] = idx
+            for text, kind in variants:
+                patterns.append(text)
+                self._variant_of.append((idx, kind))
+        self._variants: dict[str, tuple[int, str]] = {}
+        for text, owner in zip(patterns, self._variant_of):
+            self._variants.setdefault(text, owner)
+        self._automaton = AhoCorasick(patterns)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def is_allowed(self, normalized: str) -> bool:
+        return normalized in self._exact
+
+    def near_miss(self, raw_label: str, max_distance: int = NEAR_MISS_MAX_DISTANCE) -> Optional[NearMiss]:
+        """비매칭 라벨의 가장 가까운 정식 인용명. 정확히 일치하거나 후보가 없으면 None."""
+        norm = normalize_citation_label(raw_label)
+        if not norm or norm in self._exact:
+            return None
+        owner = self._variants.get(norm)
+        if owner is not None:
+            suggestion = self.labels[owner[0]]
+            return NearMiss(raw_label, suggestion, f"variant:{owner[1]}",
+                            edit_distance(norm, suggestion))
+        best: Optional[tuple[int, str]] = None
+        for label in self.labels:
+            d = edit_distance(norm, label, cutoff=max_distance)
+            if d <= max_distance and (best is None or d < best[0]):
+                best = (d, label)
+        if best is not None:
+            return NearMiss(raw_label, best[1], "edit", best[0])
+        contained = [
+            self.labels[self._variant_of[pid][0]]
+            for _, _, pid in self._automaton.iter_matches(norm)
+            if self._variant_of[pid][1] == KIND_EXACT
+        ]
+        if contained:
+            suggestion = max(contained, key=len)
+            return NearMiss(raw_label, suggestion, "contains", edit_distance(norm, suggestion))
+        return None
+
+    def scan(self, texts: dict[str, str]) -> dict[str, ReportScan]:
+        """리포트별 〔〕 라벨과 bare mention — 라벨 추출 1회 + 이어 붙인 본문 오토마톤 1회.
+
+        〔〕 구간은 라벨로 떼어 내고 그 자리를 리포트 경계 문자로 바꿔 스캔하므로
+        〔〕 안의 인용은 bare mention으로 잡히지 않는다.
+        """
+        keys = list(texts)
+        scans: dict[str, ReportScan] = {}
+        normalized: list[str] = []
+        for key in keys:
+            text = texts[key] or ""
+            used: list[str] = []
+            outside: list[str] = []
+            pos = 0
+            for m in _BRACKET_PATTERN.finditer(text):
+                if m.group(1).strip():
+                    used.append(m.group(1))
+                outside.append(text[pos:m.start()])
+                pos = m.end()
+            outside.append(text[pos:])
+            scans[key] = ReportScan(used, [])
+            normalized.append(_normalize_text(_REPORT_SEPARATOR.join(outside)))
+        joined = _REPORT_SEPARATOR.join(normalized)
+
+        bounds: list[int] = []
+        offset = 0
+        for text in normalized:
+            offset += len(text)
+            bounds.append(offset)
+            offset += len(_REPORT_SEPARATOR)
+
+        report = 0
+        for start, _, pid in self._automaton.iter_matches(joined):
+            idx, kind = self._variant_of[pid]
+            if kind != KIND_EXACT:
+                continue
+            while report < len(bounds) - 1 and start > bounds[report]:
+                report += 1
+            label = self.labels[idx]
+            bare = scans[keys[report]].bare_mentions
+            if label not in bare:
+                bare.append(label)
+        return scans
+
+    def scan_reports(self, texts: dict[str, str]) -> dict[str, list[str]]:
+        """리포트별 〔〕 밖에 쓰인 정식 인용명(정확형)."""
+        return {key: s.bare_mentions for key, s in self.scan(texts).items()}
+
+
+@lru_cache(maxsize=256)
+def _compile(citations: tuple[tuple[str, str], ...]) -> CitationMatcher:
+    return CitationMatcher(citations)
+
+
+def compile_matcher(allowed: Iterable[dict[str, Any]]) -> CitationMatcher:
+    """allowed_citations(dict 목록) → 컴파일된 매처. 같은 규범 집합이면 캐시 재사용."""
+    citations = sorted({
+        (str(a.get("source") or ""), str(a.get("article_number") or ""))
+        for a in allowed or []
+    })
+    return _compile(tuple(citations))
+
+
+def matcher_cache_info() -> Any:
+    """컴파일 매처 캐시 통계 (배치 감사 로그용)."""
+    return _compile.cache_info()
@@ -0,0 +1,35 @@
+# backend/core/clients.py
+"""
+CR-Check — 프로세스 공유 API 클라이언트
+
+Anthropic/OpenAI 클라이언트는 내부에 httpx 커넥션 풀을 들고 있고 스레드 안전하다.
+호출마다 새로 만들면 생성 비용과 TLS 핸드셰이크를 매 요청 다시 치르므로
+(클래스, API 키) 조합별로 1개만 만들어 재사용한다. core.warmup이 기동 시 미리 만든다.
+
+키를 (클래스, API 키)로 잡아 두어 테스트가 모듈의 Anthropic/OpenAI를 patch하면
+patch된 클래스로 새 인스턴스가 만들어진다 (캐시된 실제 클라이언트를 건드리지 않음).
+"""
+
+import os
+import threading
+from typing import Any
+
+_clients: dict[tuple, Any] = {}
+_lock = threading.Lock()
+
+
+def get_client(cls: Any, env_var: str) -> Any:
+    """cls(api_key=os.environ[env_var])를 프로세스 수명 동안 1회만 생성해 반환."""
+    api_key = os.environ[env_var]
+    key = (cls, api_key)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = cls(api_key=api_key)
+    return client
+
+
+def reset_clients() -> None:
+    """캐시 비우기 (테스트·키 교체용)."""
+    with _lock:
+        _clients.clear()
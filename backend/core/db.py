@@ -1,10 +1,26 @@
 # backend/core/db.py
 """
 CR-Check — Supabase 연결 공통 모듈
+
+연결 대상(로컬/클라우드)은 프로세스당 1회 결정해 불변 ConnectionProfile로 캐시한다.
+예전에는 _get_supabase_config()가 호출될 때마다(스토리지·패턴·리포트 함수 거의 전부)
+SUPABASE_URL이 비었거나 로컬이면 127.0.0.1:54321에 timeout 5초 probe를 보냈다.
+
+- get_connection_profile(): 캐시된 프로필 (없거나 관련 환경변수가 바뀌었으면 해결)
+- _get_supabase_config(): 기존 (url, key) 튜플 API — 프로필의 얇은 래퍼
+- start_health_monitor(): 백그라운드에서 현재 대상을 주기적으로 점검하고,
+  자동 감지(auto) 프로필이 실패하면 다시 해결한다 (로컬 다운 → 클라우드 폴백 등).
+  명시 설정(SUPABASE_LOCAL=1 / 클라우드 SUPABASE_URL)은 재해결하지 않고 상태만 기록.
+- connection_status(): /health용 스냅샷 (키는 노출하지 않음)
 """
 
+import logging
 import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
 
 import httpx
 from dotenv import load_dotenv
@@ -12,21 +28,74 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+logger = logging.getLogger(__name__)
+
 _LOCAL_SERVICE_KEY = (
     "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9."
     "eyJpc3MiOiJzdXBhYmFzZS1kZW1vIiwicm9sZSI6InNlcnZpY2Vfcm9sZSIsImV4cCI6MTk4MzgxMjk5Nn0."
     "EGIM96RAZx35lJzdJsyH-qQwv8Hdp7fsn3W0YpN81IU"
 )
+_LOCAL_URL = "http://127.0.0.1:54321"
+_PROBE_TIMEOUT = 5
 
+HEALTH_INTERVAL_SECONDS = float(os.environ.get("SUPABASE_HEALTH_INTERVAL", "30"))
+# 연속 실패가 이 횟수에 도달하면 auto 프로필을 다시 해결한다
+HEALTH_FAILURE_THRESHOLD = 2
 
-def _get_supabase_config() -> tuple[str, str]:
-    """Supabase URL + service key를 반환. 로컬/클라우드 자동 분기."""
-    local_url = "http://127.0.0.1:54321"
+# 프로필 결정에 쓰이는 환경변수 — 값이 바뀌면 캐시를 버리고 다시 해결한다
+_ENV_KEYS = ("SUPABASE_LOCAL", "SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """해결된 Supabase 연결 설정 (불변).
+
+    mode: "local_forced" (SUPABASE_LOCAL) | "cloud" (명시 클라우드 URL)
+          | "local" / "cloud_fallback" (자동 감지 결과 — 헬스 모니터가 재해결 대상)
+    """
+    url: str
+    key: str = field(repr=False)
+    mode: str
+    resolved_at: float
+
+    @property
+    def auto(self) -> bool:
+        return self.mode in ("local", "cloud_fallback")
+
+    def headers(self, **extra: str) -> dict:
+        """PostgREST 공통 헤더 (apikey + Bearer + JSON)."""
+        return {
+            "apikey": self.key,
+            "Authorization": f"Bearer {self.key}",
+            "Content-Type": "application/json",
+            **extra,
+        }
+
+
+def _env_snapshot() -> tuple:
+    return tuple(os.environ.get(k, "") for k in _ENV_KEYS)
+
+
+def _probe_local() -> bool:
+    try:
+        r = httpx.get(
+            f"{_LOCAL_URL}/rest/v1/patterns?select=id&limit=1",
+            headers={"apikey": _LOCAL_SERVICE_KEY},
+            timeout=_PROBE_TIMEOUT,
+        )
+        return r.status_code == 200
+    except (httpx.ConnectError, httpx.ReadTimeout):
+        return False
+
+
+def resolve_connection_profile() -> ConnectionProfile:
+    """환경변수(+필요 시 로컬 probe)로 연결 대상을 결정한다. 캐시하지 않는다."""
     sb_url = os.environ.get("SUPABASE_URL", "")
+    now = time.time()
 
     # 1. SUPABASE_LOCAL=1 → 로컬 강제
     if os.environ.get("SUPABASE_LOCAL"):
-        return local_url, _LOCAL_SERVICE_KEY
+        return ConnectionProfile(_LOCAL_URL, _LOCAL_SERVICE_KEY, "local_forced", now)
 
     # 2. SUPABASE_URL이 명시적 클라우드 URL이면 → 즉시 반환 (로컬 체크 생략)
     if sb_url and "127.0.0.1" not in sb_url and "localhost" not in sb_url:
@@ -36,20 +105,130 @@ def _get_supabase_config() -> tuple[str, str]:
                 "SUPABASE_URL이 클라우드 URL로 설정되었으나 "
                 "SUPABASE_SERVICE_ROLE_KEY가 비어 있습니다."
             )
-        return sb_url, cloud_key
+        return ConnectionProfile(sb_url, cloud_key, "cloud", now)
 
     # 3. URL 미설정 또는 로컬 URL → 로컬 시도 후 클라우드 폴백
+    if _probe_local():
+        return ConnectionProfile(_LOCAL_URL, _LOCAL_SERVICE_KEY, "local", now)
+    cloud_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+    return ConnectionProfile(sb_url, cloud_key, "cloud_fallback", now)
+
+
+_profile: Optional[ConnectionProfile] = None
+_profile_env: tuple = ()
+_profile_lock = threading.Lock()
+_health = {"healthy": None, "checked_at": None, "latency_ms": None, "failures": 0,
+           "resolutions": 0, "error": None}
+_health_lock = threading.Lock()
+_monitor: Optional[threading.Thread] = None
+_monitor_stop = threading.Event()
+
+
+def get_connection_profile(refresh: bool = False) -> ConnectionProfile:
+    """캐시된 연결 프로필. 최초 호출·환경변수 변경·refresh=True일 때만 해결한다."""
+    global _profile, _profile_env
+    env = _env_snapshot()
+    profile = _profile
+    if profile is not None and not refresh and _profile_env == env:
+        return profile
+    with _profile_lock:
+        # 락 대기 중 다른 스레드가 먼저 해결했으면 그 결과를 쓴다 (refresh도 1회만)
+        if _profile is not None and _profile_env == env and (not refresh or _profile is not profile):
+            return _profile
+        previous = _profile
+        _profile = resolve_connection_profile()
+        _profile_env = env
+        with _health_lock:
+            _health["resolutions"] += 1
+        if previous is None or (previous.url, previous.mode) != (_profile.url, _profile.mode):
+            logger.info(f"Supabase 연결 프로필: mode={_profile.mode}, url={_profile.url}")
+        return _profile
+
+
+def reset_connection_profile() -> None:
+    """캐시 비우기 (테스트·수동 전환용) — 다음 호출에서 다시 해결."""
+    global _profile, _profile_env
+    with _profile_lock:
+        _profile = None
+        _profile_env = ()
+
+
+def _get_supabase_config() -> tuple[str, str]:
+    """Supabase URL + service key를 반환. 로컬/클라우드 자동 분기 (프로세스당 1회 해결)."""
+    profile = get_connection_profile()
+    return profile.url, profile.key
+
+
+def check_connection(profile: Optional[ConnectionProfile] = None) -> bool:
+    """현재 대상에 가벼운 요청 1회 — 결과를 헬스 상태에 기록하고 성공 여부 반환."""
+    profile = profile or get_connection_profile()
+    started = time.monotonic()
+    error = None
     try:
         r = httpx.get(
-            f"{local_url}/rest/v1/patterns?select=id&limit=1",
-            headers={"apikey": _LOCAL_SERVICE_KEY},
-            timeout=5,
+            f"{profile.url}/rest/v1/patterns?select=id&limit=1",
+            headers={"apikey": profile.key, "Authorization": f"Bearer {profile.key}"},
+            timeout=_PROBE_TIMEOUT,
         )
-        if r.status_code == 200:
-            return local_url, _LOCAL_SERVICE_KEY
-    except (httpx.ConnectError, httpx.ReadTimeout):
-        pass
+        ok = r.status_code == 200
+        if not ok:
+            error = f"HTTP {r.status_code}"
+    except Exception as e:
+        ok = False
+        error = f"{type(e).__name__}: {e}"
+    with _health_lock:
+        _health["healthy"] = ok
+        _health["checked_at"] = time.time()
+        _health["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        _health["failures"] = 0 if ok else _health["failures"] + 1
+        _health["error"] = error
+    return ok
 
-    # 클라우드 폴백
-    cloud_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
-    return sb_url, cloud_key
+
+def _monitor_tick() -> None:
+    profile = get_connection_profile()
+    if check_connection(profile):
+        return
+    with _health_lock:
+        failures = _health["failures"]
+    if profile.auto and failures >= HEALTH_FAILURE_THRESHOLD:
+        logger.warning(f"Supabase 연결 실패 {failures}회 (mode={profile.mode}) → 프로필 재해결")
+        get_connection_profile(refresh=True)
+
+
+def start_health_monitor(interval: float = HEALTH_INTERVAL_SECONDS) -> Optional[threading.Thread]:
+    """헬스 모니터 데몬 스레드 시작 (중복 시작 무시). interval<=0이면 비활성."""
+    global _monitor
+    if interval <= 0:
+        return None
+    if _monitor is not None and _monitor.is_alive():
+        return _monitor
+    _monitor_stop.clear()
+
+    def _loop() -> None:
+        while not _monitor_stop.wait(interval):
+            try:
+                _monitor_tick()
+            except Exception as e:  # 모니터가 죽지 않게
+                logger.warning(f"Supabase 헬스 모니터 오류 [{type(e).__name__}]: {e}")
+
+    _monitor = threading.Thread(target=_loop, name="supabase-health", daemon=True)
+    _monitor.start()
+    return _monitor
+
+
+def stop_health_monitor() -> None:
+    _monitor_stop.set()
+
+
+def connection_status() -> dict:
+    """/health용 스냅샷 — 프로필(키 제외)과 마지막 점검 결과."""
+    profile = _profile
+    with _health_lock:
+        health = dict(_health)
+    return {
+        "mode": profile.mode if profile else None,
+        "url": profile.url if profile else None,
+        "resolved_at": profile.resolved_at if profile else None,
+        **health,
+    }
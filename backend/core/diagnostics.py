@@ -0,0 +1,254 @@
+# backend/core/diagnostics.py
+"""
+CR-Check — 진단 기록 비동기 싱크
+
+파이프라인 진단 레코드(체크포인트 1~5)를 요청 스레드에서 디스크에 쓰지 않고
+백그라운드 writer 큐로 넘긴다. writer는 gzip 압축 JSON Lines로 기록하고
+크기·날짜 기준으로 파일을 회전하며, 보존 기간·개수를 넘은 파일은 지운다.
+
+- 샘플링: DIAGNOSTICS_SAMPLE_RATE (0.0~1.0, 기본 1.0). 0이면 비활성.
+  샘플링에서 빠진 요청은 레코드 dict도 만들지 않는다 (builder·capture 미호출).
+- 스냅샷: submit(builder, capture=...)이면 capture()를 요청 스레드에서 먼저 호출하고
+  writer 스레드에서 builder(capture 결과)로 레코드를 만든다 — 큐 대기 중 호출 측이
+  원본 객체를 고쳐도 레코드가 바뀌지 않는다.
+- 고유 id: 레코드마다 diagnostic_id(uuid4 hex) + 마이크로초 timestamp.
+- 비차단: 큐가 가득 차면 레코드를 버리고 dropped 카운터만 올린다.
+- 파일: {DIAGNOSTICS_DIR}/diagnostics-YYYYMMDD-HHMMSS-ffffff-<pid>.jsonl.gz
+  (기본 backend/diagnostics/ — *.jsonl.gz는 .gitignore 대상)
+  배치마다 gzip 멤버를 하나씩 덧붙인다. 쓰는 도중 프로세스가 죽어 마지막 멤버가 잘려도
+  read_diagnostics는 그 앞의 완전한 레코드까지 읽고 멈춘다.
+
+읽기: read_diagnostics(path) / iter_diagnostic_files(dir)
+"""
+
+import atexit
+import functools
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DIAGNOSTICS_DIR = Path(
+    os.environ.get("DIAGNOSTICS_DIR", str(Path(__file__).parent.parent / "diagnostics"))
+)
+SAMPLE_RATE = float(os.environ.get("DIAGNOSTICS_SAMPLE_RATE", "1.0"))
+MAX_FILE_BYTES = int(os.environ.get("DIAGNOSTICS_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+RETENTION_DAYS = int(os.environ.get("DIAGNOSTICS_RETENTION_DAYS", "14"))
+MAX_FILES = int(os.environ.get("DIAGNOSTICS_MAX_FILES", "100"))
+QUEUE_SIZE = int(os.environ.get("DIAGNOSTICS_QUEUE_SIZE", "256"))
+
+_FILE_PREFIX = "diagnostics-"
+_FILE_SUFFIX = ".jsonl.gz"
+
+RecordBuilder = Callable[..., dict[str, Any]]
+
+
+class DiagnosticsSink:
+    """진단 레코드를 백그라운드 스레드에서 gzip JSONL로 기록하는 싱크."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DIAGNOSTICS_DIR,
+        sample_rate: float = SAMPLE_RATE,
+        max_file_bytes: int = MAX_FILE_BYTES,
+        retention_days: int = RETENTION_DAYS,
+        max_files: int = MAX_FILES,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.max_file_bytes = max_file_bytes
+        self.retention_days = retention_days
+        self.max_files = max_files
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._current: Optional[Path] = None
+        self._current_day: Optional[str] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    # ── 요청 스레드 쪽 ───────────────────────────────────────────
+
+    def submit(
+        self,
+        builder: Union[RecordBuilder, dict[str, Any]],
+        capture: Optional[Callable[[], Any]] = None,
+    ) -> Optional[str]:
+        """레코드를 큐에 넣고 diagnostic_id를 반환. 샘플 제외·큐 포화 시 None.
+
+        builder가 callable이면 writer 스레드에서 호출해 레코드를 만든다.
+        capture가 있으면 요청 스레드에서 바로 호출하고, builder는 그 결과를 인자로 받는다.
+        요청 스레드는 샘플링 판정·capture·큐 삽입만 한다 (디스크 I/O·직렬화 없음).
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        if capture is not None:
+            builder = functools.partial(builder, capture())
+        diagnostic_id = uuid.uuid4().hex
+        envelope = {
+            "diagnostic_id": diagnostic_id,
+            "timestamp": datetime.now().isoformat(timespec="microseconds"),
+        }
+        try:
+            self._queue.put_nowait((envelope, builder))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        self._ensure_started()
+        return diagnostic_id
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐가 비고 기록이 끝날 때까지 최대 timeout초 대기. 완료 여부 반환."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="diagnostics-writer", daemon=True
+                )
+                self._thread.start()
+
+    # ── writer 스레드 쪽 ─────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.warning(f"진단 기록 실패 (파이프라인에 영향 없음): {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: list[tuple[dict, Any]]) -> None:
+        lines = []
+        for envelope, builder in batch:
+            try:
+                body = builder() if callable(builder) else builder
+                lines.append(json.dumps({**envelope, **body}, ensure_ascii=False, default=str))
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"진단 레코드 생성 실패 ({envelope['diagnostic_id']}): {e}")
+        if not lines:
+            return
+        path = self._target_file()
+        with gzip.open(path, "ab") as f:
+            f.write(("\n".join(lines) + "\n").encode("utf-8"))
+        self.written += len(lines)
+
+    def _target_file(self) -> Path:
+        """현재 기록 파일. 날짜가 바뀌었거나 크기 한도를 넘으면 새 파일로 회전."""
+        now = datetime.now()
+        day = now.strftime("%Y%m%d")
+        current = self._current
+        if (
+            current is None
+            or day != self._current_day
+            or (current.exists() and current.stat().st_size >= self.max_file_bytes)
+        ):
+            self.directory.mkdir(parents=True, exist_ok=True)
+            stamp = now.strftime("%Y%m%d-%H%M%S-%f")
+            current = self.directory / f"{_FILE_PREFIX}{stamp}-{os.getpid()}{_FILE_SUFFIX}"
+            seq = 1
+            while current.exists():
+                current = self.directory / f"{_FILE_PREFIX}{stamp}-{os.getpid()}-{seq}{_FILE_SUFFIX}"
+                seq += 1
+            self._current, self._current_day = current, day
+            self._apply_retention()
+        return current
+
+    def _apply_retention(self) -> None:
+        """보존 기간이 지났거나 개수 한도를 넘은 오래된 파일 삭제 (현재 파일 제외)."""
+        files = [p for p in iter_diagnostic_files(self.directory) if p != self._current]
+        cutoff = time.time() - self.retention_days * 86400
+        keep = max(self.max_files - 1, 0)  # 현재 파일 1개 몫
+        for i, path in enumerate(files):
+            try:
+                if i < len(files) - keep or path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError as e:
+                logger.warning(f"진단 파일 정리 실패: {path} ({e})")
+
+
+# ── 읽기 ────────────────────────────────────────────────────────
+
+def iter_diagnostic_files(directory: Union[str, Path] = DIAGNOSTICS_DIR) -> list[Path]:
+    """진단 파일 목록을 오래된 순으로 반환."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    files = directory.glob(f"{_FILE_PREFIX}*{_FILE_SUFFIX}")
+    return sorted(files, key=lambda p: (p.stat().st_mtime, p.name))
+
+
+def read_diagnostics(path: Union[str, Path]) -> Iterator[dict[str, Any]]:
+    """gzip JSONL 진단 파일의 레코드를 순서대로 산출.
+
+    마지막 gzip 멤버가 잘린 파일(쓰기 중 종료)은 완전한 레코드까지만 산출하고 멈춘다.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # 잘린 꼬리의 미완성 줄
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            logger.warning(f"진단 파일 끝이 잘림 — 완전한 레코드까지만 읽음: {path} ({e})")
+
+
+# ── 프로세스 전역 싱크 ───────────────────────────────────────────
+
+_sink: Optional[DiagnosticsSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_sink() -> DiagnosticsSink:
+    """프로세스 전역 싱크 (최초 호출 시 생성, 종료 시 flush)."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = DiagnosticsSink()
+                atexit.register(_sink.flush)
+    return _sink
+
+
+def record_diagnostic(
+    builder: Union[RecordBuilder, dict[str, Any]],
+    capture: Optional[Callable[[], Any]] = None,
+) -> Optional[str]:
+    """진단 레코드를 전역 싱크에 제출. diagnostic_id 또는 None 반환 (절대 예외 없음)."""
+    try:
+        return get_sink().submit(builder, capture)
+    except Exception as e:
+        logger.warning(f"진단 기록 제출 실패 (파이프라인에 영향 없음): {e}")
+        return None
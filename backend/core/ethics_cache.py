@@ -0,0 +1,288 @@
+# backend/core/ethics_cache.py
+"""
+CR-Check — 규범 조회 캐시 ((pattern_id × article_context) → 규범 row)
+
+get_ethics_for_patterns RPC 응답은 pattern_id별로 독립이다 — 모든 row가 pattern_id를
+달고 나오고, 롤업 제외(NOT EXISTS)도 pattern_id 단위로 판정한다. 따라서 임의의 패턴
+집합에 대한 답은 패턴별 캐시 항목을 이어 붙여 tier로 정렬한 것과 같다.
+자주 반복되는 조합(6-2-a, 1-4-a, …)은 네트워크 없이 조합된다.
+
+- 워밍: start_background_refresh()가 활성 패턴 전체 × 맥락 8종을 맥락당 RPC 1회로 채운다.
+- 무효화: get_ethics_mapping_version() (20261019000200) 폴링 — 값이 바뀌면 비우고 재워밍.
+  함수가 없거나 조회에 실패하면 ETHICS_CACHE_TTL_SECONDS 경과 시 만료.
+- 캐시 대상: RPC 정상 응답만. REST fallback(롤업 없음) 결과와 전체 0건 응답
+  (과거 간헐적 0건 관측 — report_generator 재시도 참고)은 캐시하지 않는다.
+- ETHICS_CACHE=0 이면 비활성 (report_generator가 매 요청 RPC 호출).
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import httpx
+
+from .db import get_connection_profile
+
+logger = logging.getLogger(__name__)
+
+ETHICS_CACHE_ENABLED = os.environ.get("ETHICS_CACHE", "1") != "0"
+VERSION_CHECK_SECONDS = float(os.environ.get("ETHICS_CACHE_VERSION_CHECK_SECONDS", "60"))
+TTL_SECONDS = float(os.environ.get("ETHICS_CACHE_TTL_SECONDS", "600"))
+
+# pipeline._infer_article_context 반환값 전체
+ARTICLE_CONTEXTS = (
+    "general", "health", "disaster", "crisis",
+    "crime", "election", "military", "unification",
+)
+
+# (pattern_ids, article_context) → (rows, cacheable)
+RowFetcher = Callable[[list[int], str], tuple[list[dict], bool]]
+VersionFetcher = Callable[[], Optional[int]]
+
+
+class EthicsCache:
+    """(pattern_id, article_context) → 규범 row 리스트 캐시."""
+
+    def __init__(
+        self,
+        version_check_seconds: float = VERSION_CHECK_SECONDS,
+        ttl_seconds: float = TTL_SECONDS,
+    ):
+        self.version_check_seconds = version_check_seconds
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[tuple[int, str], list[dict]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._loaded_at = time.monotonic()
+        self._checked_at: Optional[float] = None
+        self.version: Optional[int] = None
+        self.background = False  # 버전 폴링 스레드 가동 여부
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── 조회 ────────────────────────────────────────────────────
+
+    def get_rows(
+        self,
+        pattern_ids: Iterable[int],
+        article_context: str,
+        fetch: RowFetcher,
+    ) -> list[dict]:
+        """패턴 집합의 규범 row. 캐시에 없는 패턴만 fetch로 조회해 채운다.
+
+        반환 순서: 패턴 순서대로 이어 붙인 뒤 ethics_tier 안정 정렬 (RPC ORDER BY tier).
+        """
+        ids = list(dict.fromkeys(pattern_ids))
+        entries, generation = self._entries, self._generation
+        missing = [pid for pid in ids if (pid, article_context) not in entries]
+        self.hits += len(ids) - len(missing)
+        self.misses += len(missing)
+
+        fresh: dict[int, list[dict]] = {}
+        if missing:
+            rows, cacheable = fetch(missing, article_context)
+            fresh = _group_by_pattern(rows, missing)
+            if cacheable:
+                self._store(fresh, rows, article_context, generation)
+            elif rows and not fresh:
+                # pattern_id 없는 row (비정상 응답) — 조합 불가, 그대로 반환
+                return rows
+
+        composed = [
+            row
+            for pid in ids
+            for row in entries.get((pid, article_context), fresh.get(pid, []))
+        ]
+        composed.sort(key=lambda row: row.get("ethics_tier") or 0)
+        return composed
+
+    def warm(
+        self,
+        pattern_ids: list[int],
+        fetch: RowFetcher,
+        contexts: Iterable[str] = ARTICLE_CONTEXTS,
+    ) -> int:
+        """맥락마다 전체 패턴을 한 번에 조회해 채운다. 채운 항목 수 반환."""
+        before = len(self._entries)
+        for context in contexts:
+            generation = self._generation
+            try:
+                rows, cacheable = fetch(pattern_ids, context)
+            except Exception as e:
+                logger.warning(f"규범 캐시 워밍 실패 (context={context}) [{type(e).__name__}]: {e}")
+                continue
+            if cacheable:
+                self._store(_group_by_pattern(rows, pattern_ids), rows, context, generation)
+        return len(self._entries) - before
+
+    def _store(
+        self,
+        grouped: dict[int, list[dict]],
+        rows: list[dict],
+        article_context: str,
+        generation: int,
+    ) -> None:
+        """RPC 응답을 패턴별 항목으로 저장. 전체 0건·pattern_id 누락 응답은 저장하지 않는다."""
+        if not rows or not grouped:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return  # 조회 중 무효화됨 — 낡은 응답 폐기
+            for pid, pattern_rows in grouped.items():
+                self._entries[(pid, article_context)] = pattern_rows
+
+    # ── 무효화 ──────────────────────────────────────────────────
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._generation += 1
+            self._loaded_at = time.monotonic()
+            self.invalidations += 1
+
+    def check_version(self, fetch_version: VersionFetcher) -> bool:
+        """버전 스탬프 확인. 바뀌었으면(또는 스탬프 없이 TTL 경과 시) 비우고 True."""
+        self._checked_at = time.monotonic()
+        version = fetch_version()
+        if version is None:
+            if time.monotonic() - self._loaded_at >= self.ttl_seconds:
+                self.invalidate()
+                return True
+            return False
+        if self.version is not None and version != self.version:
+            logger.info(f"규범 매핑 버전 변경 {self.version} → {version}, 캐시 무효화")
+            self.version = version
+            self.invalidate()
+            return True
+        self.version = version
+        return False
+
+    def maybe_check_version(self, fetch_version: VersionFetcher) -> bool:
+        """폴링 스레드가 없을 때 요청 경로에서 주기적으로 버전 확인."""
+        if self.background:
+            return False
+        if (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.version_check_seconds
+        ):
+            return False
+        return self.check_version(fetch_version)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def _group_by_pattern(rows: list[dict], pattern_ids: Iterable[int]) -> dict[int, list[dict]]:
+    """row를 pattern_id별로 나눈다. 요청했지만 row가 없는 패턴은 빈 리스트.
+
+    pattern_id가 빠진 row가 하나라도 있으면 {} (조합 불가).
+    """
+    grouped: dict[int, list[dict]] = {pid: [] for pid in pattern_ids}
+    for row in rows:
+        pid = row.get("pattern_id")
+        if pid is None:
+            return {}
+        grouped.setdefault(pid, []).append(row)
+    return grouped
+
+
+# ── Supabase 조회 ───────────────────────────────────────────────
+
+_version_rpc_missing_logged = False
+
+
+def fetch_mapping_version() -> Optional[int]:
+    """get_ethics_mapping_version() RPC. 함수 부재·실패 시 None."""
+    global _version_rpc_missing_logged
+    try:
+        profile = get_connection_profile()
+        r = httpx.post(
+            f"{profile.url}/rest/v1/rpc/get_ethics_mapping_version",
+            headers=profile.headers(),
+            json={},
+            timeout=5,
+        )
+        if r.status_code == 404 or "PGRST202" in r.text:
+            if not _version_rpc_missing_logged:
+                _version_rpc_missing_logged = True
+                logger.warning(
+                    "get_ethics_mapping_version RPC 없음 → 규범 캐시 TTL 만료로 동작 "
+                    f"({TTL_SECONDS:.0f}s)"
+                )
+            return None
+        r.raise_for_status()
+        return int(r.json())
+    except Exception as e:
+        logger.warning(f"규범 매핑 버전 조회 실패 [{type(e).__name__}]: {e}")
+        return None
+
+
+def fetch_active_pattern_ids() -> list[int]:
+    """워밍 대상 — 활성 패턴 id 전체 (메타 패턴 포함)."""
+    profile = get_connection_profile()
+    r = httpx.get(
+        f"{profile.url}/rest/v1/patterns",
+        headers=profile.headers(),
+        params={"select": "id", "is_active": "eq.true"},
+        timeout=10,
+    )
+    r.raise_for_status()
+    return [row["id"] for row in r.json()]
+
+
+# ── 프로세스 전역 캐시 ───────────────────────────────────────────
+
+_cache = EthicsCache()
+_refresher: Optional[threading.Thread] = None
+_refresher_lock = threading.Lock()
+
+
+def get_ethics_cache() -> EthicsCache:
+    return _cache
+
+
+def _refresh_loop(cache: EthicsCache, fetch: RowFetcher) -> None:
+    warm_needed = True
+    while True:
+        if warm_needed:
+            try:
+                cache.check_version(fetch_mapping_version)
+                started = time.monotonic()
+                n = cache.warm(fetch_active_pattern_ids(), fetch)
+                logger.info(
+                    f"규범 캐시 워밍 완료: {n}항목, {time.monotonic() - started:.1f}초 "
+                    f"(version={cache.version})"
+                )
+                warm_needed = False
+            except Exception as e:
+                logger.warning(f"규범 캐시 워밍 실패 — 요청 경로에서 채움 [{type(e).__name__}]: {e}")
+        time.sleep(cache.version_check_seconds)
+        if cache.check_version(fetch_mapping_version):
+            warm_needed = True
+
+
+def start_background_refresh(fetch: RowFetcher) -> None:
+    """워밍 + 버전 폴링 데몬 스레드 시작 (프로세스당 1회, 비활성 시 무시)."""
+    global _refresher
+    if not ETHICS_CACHE_ENABLED:
+        return
+    with _refresher_lock:
+        if _refresher is not None and _refresher.is_alive():
+            return
+        _cache.background = True
+        _refresher = threading.Thread(
+            target=_refresh_loop, args=(_cache, fetch), name="ethics-cache-refresh", daemon=True,
+        )
+        _refresher.start()
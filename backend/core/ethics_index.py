@@ -0,0 +1,219 @@
+# backend/core/ethics_index.py
+"""
+CR-Check — 규범 컨텍스트 인덱스 (EthicsContextIndex)
+
+fetch_ethics_for_patterns 결과(EthicsReference 목록)를 요청당 한 번 분류·정렬해
+세 소비자가 공유한다:
+  - report_generator._build_ethics_context  → context_text()
+  - verify_citations.verify_report_citations → allowed_citations() / excluded_count
+  - storage.build_analysis_payload          → snapshot_targets()
+
+규범 코드별 헤더+원문 블록과 정규화 인용명은 _ethics_block()이 필드 값 기준으로
+메모이즈한다 — 규범 캐시(ethics_cache)가 같은 row 문자열을 재사용하므로 요청 간에도
+포맷팅·정규화가 반복되지 않는다. 출력은 기존 함수들과 바이트 단위로 동일하다.
+
+순수 모듈: DB/Anthropic import 금지, EthicsReference는 덕타이핑으로 접근.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+from .verify_citations import normalize_citation_label
+
+# 롤업 행 식별자.
+# RPC `get_ethics_for_patterns`의 parent_chain SELECT가 reasoning 컬럼에 강제 주입하는 마커이며,
+# 직접 매핑된 related_to와 parent-chain rollup으로 생성된 related_to를 가르는 유일한 양성 신호다.
+# (둘 다 relation_type="related_to" / strength="moderate"로 내려오므로 relation_type만으로는 구분 불가.)
+ROLLUP_MARKER = "parent chain rollup"
+
+# 섹션 순서 = 중복 제거 우선순위
+PRIMARY, REFERENCE, ROLLUP = 0, 1, 2
+
+_SECTION_TITLES = (
+    "## 직접 적용 규범(인용 1순위)",
+    "## 직접 참고 규범(보조 인용 가능)",
+    "## 상위 원칙(종합 평가 보조용)",
+)
+
+_STRONG = ("strong", "moderate")
+
+
+def _safe_str(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+@lru_cache(maxsize=4096)
+def _ethics_block(
+    source: str, article_number: str, title: str, tier: Any, full_text: str,
+) -> tuple[str, str, str]:
+    """(헤더+원문 블록, 인용 라벨, 정규화 라벨). 규범 코드별 1회 계산.
+
+    헤더: 내부 ethics_code 미노출, source+article_number 기반 정식 인용명.
+    빈 값 가드: source/article_number가 둘 다 비면 〔〕 자체를 출력하지 않는다.
+    """
+    src = source.strip()
+    art = article_number.strip()
+    label = f"{src} {art}".strip()
+    if label:
+        header = f"### 〔{label}〕 {title} (Tier {tier})"
+    else:
+        header = f"### {title} (Tier {tier})"
+    return f"{header}\n{full_text}", label, normalize_citation_label(label)
+
+
+def _section(ref: Any) -> Optional[int]:
+    """섹션 분류 (양성 판정만 사용). 그 외(weak / exception_of 등)는 None.
+
+      1. reasoning == ROLLUP_MARKER → 상위 원칙 (롤업 우선 판정 — relation_type을 먼저 보면
+         롤업이 직접 참고로 잘못 빨려든다)
+      2. relation_type == "violates" + strength in (strong|moderate) → 직접 적용
+      3. relation_type == "related_to" + strength in (strong|moderate) → 직접 참고
+    """
+    if (getattr(ref, "reasoning", "") or "").strip() == ROLLUP_MARKER:
+        return ROLLUP
+    strength = getattr(ref, "strength", "")
+    relation_type = getattr(ref, "relation_type", "")
+    if relation_type == "violates" and strength in _STRONG:
+        return PRIMARY
+    if relation_type == "related_to" and strength in _STRONG:
+        return REFERENCE
+    return None
+
+
+@dataclass(frozen=True)
+class _Entry:
+    ref: Any
+    code: str
+    section: Optional[int]
+    block: str
+    label: str
+    normalized: str
+    source: str
+    article_number: str
+
+
+class EthicsContextIndex:
+    """EthicsReference 목록의 분류·정렬·포맷 결과를 한 번 계산해 공유한다."""
+
+    def __init__(self, refs: Optional[list[Any]] = None):
+        self.refs: list[Any] = list(refs or [])
+        self._entries: list[_Entry] = []
+        for r in self.refs:
+            source = _safe_str(getattr(r, "ethics_source", ""))
+            article = _safe_str(getattr(r, "ethics_article_number", ""))
+            block, label, normalized = _ethics_block(
+                source, article,
+                _safe_str(getattr(r, "ethics_title", "")),
+                getattr(r, "ethics_tier", None),
+                _safe_str(getattr(r, "ethics_full_text", "")),
+            )
+            self._entries.append(_Entry(
+                ref=r,
+                code=getattr(r, "ethics_code", ""),
+                section=_section(r),
+                block=block,
+                label=label,
+                normalized=normalized,
+                source=source.strip(),
+                article_number=article.strip(),
+            ))
+        self._sections: Optional[list[list[_Entry]]] = None
+        self._context: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    # ── Phase 2 프롬프트 ────────────────────────────────────────
+
+    def _sorted_sections(self) -> list[list[_Entry]]:
+        """[직접 적용, 직접 참고, 상위 원칙] — 첫 context_text() 때 1회 계산."""
+        if self._sections is not None:
+            return self._sections
+        buckets: tuple[list[_Entry], ...] = ([], [], [])
+        for e in self._entries:
+            if e.section is not None:
+                buckets[e.section].append(e)
+
+        # 직접 적용/직접 참고는 구체 규범(Tier 4) 우선, 상위 원칙은 상위(Tier 1) 우선.
+        buckets[PRIMARY].sort(key=lambda e: (-e.ref.ethics_tier, e.code))
+        buckets[REFERENCE].sort(key=lambda e: (-e.ref.ethics_tier, e.code))
+        buckets[ROLLUP].sort(key=lambda e: (e.ref.ethics_tier, e.code))
+
+        # 전역 중복 제거: 같은 코드는 먼저 배치된 섹션에만 남는다.
+        seen: set[str] = set()
+        sections: list[list[_Entry]] = []
+        for bucket in buckets:
+            kept = []
+            for e in bucket:
+                if e.code in seen:
+                    continue
+                seen.add(e.code)
+                kept.append(e)
+            sections.append(kept)
+        self._sections = sections
+        return sections
+
+    def context_text(self) -> str:
+        """3섹션 규범 컨텍스트 (빈 섹션은 헤더 생략)."""
+        if self._context is None:
+            parts = [
+                f"{title}\n\n" + "\n\n".join(e.block for e in bucket)
+                for title, bucket in zip(_SECTION_TITLES, self._sorted_sections())
+                if bucket
+            ]
+            self._context = "\n\n---\n\n".join(parts)
+        return self._context
+
+    # ── 인용 감사 ───────────────────────────────────────────────
+
+    def allowed_citations(self) -> list[dict[str, Any]]:
+        """verify_citations.build_allowed_citations와 동일한 dict 목록 (입력 순서, 중복 유지)."""
+        allowed: list[dict[str, Any]] = []
+        for e in self._entries:
+            if not e.label:
+                continue
+            r = e.ref
+            allowed.append({
+                "label": e.label,
+                "normalized": e.normalized,
+                "source": e.source,
+                "article_number": e.article_number,
+                "title": _safe_str(getattr(r, "ethics_title", "")),
+                "tier": getattr(r, "ethics_tier", None),
+                "relation_type": _safe_str(getattr(r, "relation_type", "")) or None,
+                "strength": _safe_str(getattr(r, "strength", "")) or None,
+                "reasoning": getattr(r, "reasoning", None),
+                "ethics_code": _safe_str(e.code) or None,
+            })
+        return allowed
+
+    @property
+    def excluded_count(self) -> int:
+        """source/article_number가 둘 다 비어 allowed에서 빠진 ref 수."""
+        return sum(1 for e in self._entries if not e.label)
+
+    # ── 스냅샷 ─────────────────────────────────────────────────
+
+    def snapshot_targets(self) -> list[Any]:
+        """스냅샷 대상 규범 — ethics_code 기준 중복 제거 (등장 순서 유지).
+
+        1차: violates + (strong|moderate). 0건이면 related_to + (strong|moderate).
+        롤업 행도 relation_type 기준으로만 본다 (storage._select_snapshot_targets 계약).
+        """
+        def _pick(relation_type: str) -> list[_Entry]:
+            return [
+                e for e in self._entries
+                if getattr(e.ref, "relation_type", "") == relation_type
+                and getattr(e.ref, "strength", "") in _STRONG
+            ]
+
+        targets = _pick("violates") or _pick("related_to")
+        seen: set[str] = set()
+        unique: list[Any] = []
+        for e in targets:
+            if not e.code or e.code in seen:
+                continue
+            seen.add(e.code)
+            unique.append(e.ref)
+        return unique
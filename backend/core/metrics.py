@@ -0,0 +1,291 @@
+# backend/core/metrics.py
+"""
+CR-Check — Prometheus 텍스트 포맷 메트릭 (GET /metrics)
+
+외부 라이브러리 없이 카운터·히스토그램을 프로세스 메모리에 누적하고
+text exposition format 0.0.4로 내보낸다 (멀티 워커면 워커별 값 — 스크레이프 측에서 합산).
+
+계측 지점:
+- main: scrape 단계
+- core.pipeline: 파이프라인 1회 소요·결과, 단계별 소요(AnalysisResult.stage_seconds),
+  Phase 1 파싱 폴백·거부(환각) 코드·토큰
+- report_generator.generate_report: ethics_fetch · phase2_llm · phase2_parse 단계,
+  실패 시도 사유(529/429/기타 status/parse/error), Phase 2 파싱 폴백·토큰
+- core.storage: 분석 캐시 hit/miss/error, save 단계·경로(rpc/legacy)별 결과
+
+스크레이프 시점에 읽는 값(collector): resilience RPC 카운터·서킷 상태, 규범 캐시 통계.
+"""
+
+import math
+import threading
+from typing import Callable, Iterable, Optional
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# LLM 호출이 수십 초까지 가므로 상단 버킷을 길게 둔다
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+Sample = tuple[str, dict, float]  # (메트릭 이름, 라벨, 값)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {sorted(labels)} ≠ {list(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name}: 카운터는 감소할 수 없음 ({amount})")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), v) for key, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 키 → [버킷별 개수(비누적)..., +Inf 개수, 합계]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            row = self._values.get(self._key(labels))
+        return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out: list[Sample] = []
+        for key, row in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (math.inf,), row[:-1]):
+                cumulative += n
+                out.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            out.append((f"{self.name}_sum", labels, row[-1]))
+            out.append((f"{self.name}_count", labels, cumulative))
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        # collector: () → [(이름, 종류, 도움말, [(라벨, 값)])] — 스크레이프 시점 값
+        self._collectors: list[Callable[[], list]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+    def add_collector(self, collector: Callable[[], list]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:  # 관측이 응답을 막지 않게
+                lines.append(f"# collector {getattr(collector, '__name__', '?')} 실패: {_escape(e)}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ── 메트릭 정의 ─────────────────────────────────────────────────
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "crcheck_stage_seconds",
+    "Per-stage latency (scrape, chunking, embedding, vector_search, phase1_llm, phase1_parse, "
+    "ethics_fetch, phase2_llm, phase2_parse, report, save, ...)",
+    ["stage"],
+)
+PIPELINE_SECONDS = REGISTRY.histogram(
+    "crcheck_pipeline_seconds",
+    "analyze_article end-to-end latency by outcome (reported, no_patterns, phase1_only, error)",
+    ["outcome"],
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "crcheck_cache_lookups_total", "Cache lookups by cache and result (hit, miss, error)",
+    ["cache", "result"],
+)
+LLM_FAILED_ATTEMPTS = REGISTRY.counter(
+    "crcheck_llm_failed_attempts_total",
+    "Failed Messages API attempts by phase and reason (529, 429, status_<code>, parse, error)",
+    ["phase", "reason"],
+)
+PARSE_FALLBACKS = REGISTRY.counter(
+    "crcheck_parse_fallbacks_total", "LLM responses that needed a JSON recovery path", ["phase"],
+)
+HALLUCINATED_CODES = REGISTRY.counter(
+    "crcheck_hallucinated_codes_total", "Phase 1 pattern codes rejected by runtime validation",
+)
+LLM_TOKENS = REGISTRY.counter(
+    "crcheck_llm_tokens_total", "Tokens by model, phase and direction", ["model", "phase", "direction"],
+)
+STORAGE_SAVES = REGISTRY.counter(
+    "crcheck_storage_saves_total", "save_analysis_payload results by path and outcome",
+    ["path", "outcome"],
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+def observe_stages(stage_seconds: dict) -> None:
+    for stage, seconds in stage_seconds.items():
+        observe_stage(stage, seconds)
+
+
+def add_tokens(model: str, phase: str, input_tokens: int = 0, output_tokens: int = 0) -> None:
+    for direction, n in (("input", input_tokens), ("output", output_tokens)):
+        if isinstance(n, int) and n > 0:
+            LLM_TOKENS.inc(n, model=model, phase=phase, direction=direction)
+
+
+# ── 스크레이프 시점 collector ───────────────────────────────────
+
+# resilience RPC 카운터 키 (모두 누적값 — latency 분위수·서킷 상태는 제외)
+_RPC_COUNTER_KEYS = (
+    "calls", "errors", "invalid", "retries", "hedges", "hedge_wins", "fallbacks", "short_circuits",
+)
+
+
+def _rpc_collector() -> list:
+    from .resilience import rpc_stats_snapshot
+
+    snapshot = rpc_stats_snapshot()
+    events, breaker = [], []
+    for rpc, stats in sorted(snapshot.items()):
+        for key in _RPC_COUNTER_KEYS:
+            if key in stats:
+                events.append(({"rpc": rpc, "event": key}, stats[key]))
+        breaker.append(({"rpc": rpc}, 0 if stats.get("breaker") == "closed" else 1))
+    return [
+        ("crcheck_rpc_events_total", "counter", "Supabase RPC resilience events", events),
+        ("crcheck_rpc_breaker_open", "gauge", "1 when the RPC circuit breaker is not closed", breaker),
+    ]
+
+
+def _ethics_cache_collector() -> list:
+    from .ethics_cache import get_ethics_cache
+
+    stats = get_ethics_cache().stats()
+    return [
+        ("crcheck_ethics_cache_lookups_total", "counter", "Ethics cache lookups per pattern id",
+         [({"result": "hit"}, stats["hits"]), ({"result": "miss"}, stats["misses"])]),
+        ("crcheck_ethics_cache_invalidations_total", "counter", "Ethics cache invalidations",
+         [({}, stats["invalidations"])]),
+        ("crcheck_ethics_cache_entries", "gauge", "Ethics cache entries", [({}, stats["entries"])]),
+    ]
+
+
+REGISTRY.add_collector(_rpc_collector)
+REGISTRY.add_collector(_ethics_cache_collector)
+
+
+def render(registry: Optional[Registry] = None) -> str:
+    return (registry or REGISTRY).render()
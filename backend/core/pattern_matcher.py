@@ -14,6 +14,7 @@ import os
 import json
 import re
 import logging
+import time
 from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
@@ -25,6 +26,10 @@ from openai import OpenAI
 from dotenv import load_dotenv
 
 from .db import _get_supabase_config
+from . import structured_output
+from . import tracing
+from .usage import UsageLedger
+from .clients import get_client
 
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
@@ -92,6 +97,17 @@ class PatternMatchResult:
     # T2 — A-3 지시가 이름으로 지목한 4개 코드 중 이번 분석에서 실제로
     # validated_pattern_codes에 포함된 것 (모델에 새 필드를 묻지 않고 파생 계산)
     mandatory_review_codes: list[str] = field(default_factory=list)
+    # 구조화 출력 비교 — Solo 호출 모드("text" | "tool")와 호출 소요 시간(초)
+    output_mode: str = "text"
+    solo_seconds: float = 0.0
+    # 벤치마크 — Phase 1 내부 단계별 소요 시간(초). 관측 전용
+    # (catalog, embedding, vector_search, star_marking, phase1_llm, phase1_parse, validation)
+    stage_seconds: dict = field(default_factory=dict)
+    # Solo 호출 usage (core.metrics 토큰 카운터용)
+    solo_input_tokens: int = 0
+    solo_output_tokens: int = 0
+    # 임베딩·Solo 호출 원장 (core.usage) — pipeline이 Phase 2와 합쳐 analysis_results에 저장
+    usage: UsageLedger = field(default_factory=UsageLedger)
 
 
 @dataclass
@@ -117,6 +133,8 @@ _LEAF_CODE_RE = re.compile(r'^[0-9]+-[0-9]+-[a-z]+$')
 
 _pattern_catalog_cache: list[dict] | None = None
 _confusion_pairs_cache: list[dict] | None = None
+# (혼동 쌍 캐시 객체, 빌드된 Solo system 프롬프트) — 같은 캐시 객체면 재빌드하지 않는다
+_solo_prompt_cache: tuple[list[dict], str] | None = None
 
 
 def _load_pattern_catalog(sb_url: str, sb_key: str) -> list[dict]:
@@ -352,8 +370,12 @@ def _load_confusion_pairs(sb_url: str, sb_key: str) -> list[dict]:
 
 def generate_embeddings(texts: list[str]) -> tuple[list[list[float]], int]:
     """OpenAI 배치 API로 임베딩 생성. (texts, token_count) 반환."""
-    client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-    response = client.embeddings.create(input=texts, model=EMBEDDING_MODEL)
+    client = get_client(OpenAI, "OPENAI_API_KEY")
+    with tracing.span("openai.embeddings", {
+        "gen_ai.system": "openai", "gen_ai.request.model": EMBEDDING_MODEL, "crcheck.inputs": len(texts),
+    }) as sp:
+        response = client.embeddings.create(input=texts, model=EMBEDDING_MODEL)
+        tracing.record_llm_usage(sp, response)
     embeddings = [item.embedding for item in response.data]
     tokens = response.usage.total_tokens
     dim = len(embeddings[0]) if embeddings else 0
@@ -384,18 +406,24 @@ def search_vectors(
 
     for idx, emb in enumerate(embeddings):
         try:
-            r = httpx.post(
-                f"{sb_url}/rest/v1/rpc/search_pattern_candidates",
-                headers=headers,
-                json={
-                    "query_embedding": emb,
-                    "match_threshold": threshold,
-                    "match_count": match_count,
-                },
-                timeout=30,
-            )
-            r.raise_for_status()
-            rows = r.json()
+            with tracing.span("rpc.search_pattern_candidates", {
+                "crcheck.chunk_index": idx, "crcheck.match_threshold": threshold,
+                "crcheck.match_count": match_count,
+            }) as sp:
+                r = httpx.post(
+                    f"{sb_url}/rest/v1/rpc/search_pattern_candidates",
+                    headers=headers,
+                    json={
+                        "query_embedding": emb,
+                        "match_threshold": threshold,
+                        "match_count": match_count,
+                    },
+                    timeout=30,
+                )
+                tracing.set_attributes(sp, {"http.response.status_code": r.status_code})
+                r.raise_for_status()
+                rows = r.json()
+                tracing.set_attributes(sp, {"crcheck.rows": len(rows)})
             if not rows:
                 logger.warning(
                     f"청크 {idx}: RPC 성공(HTTP {r.status_code}), 결과 0건 — "
@@ -678,7 +706,10 @@ def _build_sonnet_solo_prompt(sb_url: str, sb_key: str) -> str:
     - .replace()를 사용한다 (.format()은 _SONNET_SOLO_PROMPT 내부의 {{ }} JSON 예시와
       충돌하므로 절대 사용 금지).
     """
+    global _solo_prompt_cache
     pairs = _load_confusion_pairs(sb_url, sb_key)
+    if _solo_prompt_cache is not None and _solo_prompt_cache[0] is pairs:
+        return _solo_prompt_cache[1]
     if pairs:
         blocks = [
             f"{p['code_a']} vs {p['code_b']}: {p['distinction_guide'].strip()}"
@@ -692,6 +723,9 @@ def _build_sonnet_solo_prompt(sb_url: str, sb_key: str) -> str:
     if not section_text:
         # placeholder 자리에 빈 문자열이 들어가 발생한 \n{3,}을 \n\n로 정리.
         result = re.sub(r'\n{3,}', '\n\n', result)
+    # 조회 실패(캐시 안 된 빈 리스트)면 다음 호출에서 재조회·재빌드하도록 캐시하지 않는다
+    if pairs is _confusion_pairs_cache:
+        _solo_prompt_cache = (pairs, result)
     return result
 
 
@@ -803,6 +837,45 @@ def _parse_solo_response(text: str) -> tuple[str, list[HaikuDetection], bool]:
     return "", [], True
 
 
+_STAR_LINE_RE = re.compile(r'^\[([^\]]+)\] ')
+
+
+def _apply_star_marks(
+    catalog_text: str,
+    candidate_codes: set[str],
+    vector_leaf_codes: set[str],
+) -> tuple[str, list[str]]:
+    """★ 마킹: [code] name 형식 매칭 + vector 섹션만 적용.
+
+    Returns: (★ 표시된 카탈로그 텍스트, 실제 ★ 마크된 코드 — T0 포렌식 원본 기록)
+    """
+    marked_lines: list[str] = []
+    starred_codes: list[str] = []
+    current_section: str | None = None
+    for line in catalog_text.split("\n"):
+        if line.startswith("## 벡터 검색 기반 패턴"):
+            current_section = "vector"
+            marked_lines.append(line)
+            continue
+        if line.startswith("## 구조적 판단 필수 검토 패턴"):
+            current_section = "structural"
+            marked_lines.append(line)
+            continue
+        if line.startswith("## "):
+            current_section = None
+            marked_lines.append(line)
+            continue
+        m = _STAR_LINE_RE.match(line)
+        if m and current_section == "vector":
+            code = m.group(1)
+            if code in candidate_codes and code in vector_leaf_codes:
+                starred_codes.append(code)
+                marked_lines.append(f"★ {line}")
+                continue
+        marked_lines.append(line)
+    return "\n".join(marked_lines), starred_codes
+
+
 def match_patterns_solo(
     chunks: list[str],
     article_text: str,
@@ -813,6 +886,15 @@ def match_patterns_solo(
     sb_url, sb_key = _get_supabase_config()
     t = threshold if threshold is not None else VECTOR_THRESHOLD
 
+    stage_seconds: dict[str, float] = {}
+    lap = time.monotonic()
+
+    def _mark(stage: str) -> None:
+        nonlocal lap
+        now = time.monotonic()
+        stage_seconds[stage] = round(now - lap, 3)
+        lap = now
+
     # 1. 패턴 카탈로그 + 벡터 검색
     catalog = _load_pattern_catalog(sb_url, sb_key)
     catalog_text = _build_pattern_list_text(catalog)
@@ -825,12 +907,17 @@ def match_patterns_solo(
         }
         for row in catalog
     }
+    _mark("catalog")
 
     if chunks:
         embeddings, emb_tokens = generate_embeddings(chunks)
     else:
         embeddings, emb_tokens = generate_embeddings([article_text])
+    _mark("embedding")
+    ledger = UsageLedger()
+    ledger.record("embedding", EMBEDDING_MODEL, input_tokens=emb_tokens)
     candidates = search_vectors(embeddings, sb_url, sb_key, threshold=t)
+    _mark("vector_search")
 
     # 2. ★ 마크 적용 (vector 섹션만) + unmatched_vector_candidates 수집
     candidate_codes = {c.pattern_code for c in candidates}
@@ -851,36 +938,13 @@ def match_patterns_solo(
             f"(STEP 6 임베딩 재생성 전까지 구버전 코드가 candidate로 올라올 수 있음)"
         )
 
-    # ★ 마킹: [code] name 형식 매칭 + vector 섹션만 적용
-    star_re = re.compile(r'^\[([^\]]+)\] ')
-    marked_lines: list[str] = []
-    starred_codes: list[str] = []  # T0 포렌식 — 실제 ★ 마크된 코드 원본 기록
-    current_section: str | None = None
-    for line in catalog_text.split("\n"):
-        if line.startswith("## 벡터 검색 기반 패턴"):
-            current_section = "vector"
-            marked_lines.append(line)
-            continue
-        if line.startswith("## 구조적 판단 필수 검토 패턴"):
-            current_section = "structural"
-            marked_lines.append(line)
-            continue
-        if line.startswith("## "):
-            current_section = None
-            marked_lines.append(line)
-            continue
-        m = star_re.match(line)
-        if m and current_section == "vector":
-            code = m.group(1)
-            if code in candidate_codes and code in vector_leaf_codes:
-                starred_codes.append(code)
-                marked_lines.append(f"★ {line}")
-                continue
-        marked_lines.append(line)
-    marked_catalog = "\n".join(marked_lines)
+    marked_catalog, starred_codes = _apply_star_marks(
+        catalog_text, candidate_codes, vector_leaf_codes,
+    )
+    _mark("star_marking")
 
     # 3. Sonnet 호출
-    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    client = get_client(Anthropic, "ANTHROPIC_API_KEY")
     title_block = f"## 기사 제목\n{title}\n\n" if title else ""
     user_message = f"""## 패턴 목록
 {marked_catalog}
@@ -888,21 +952,53 @@ def match_patterns_solo(
 {title_block}## 기사 전문
 {article_text}"""
 
-    response = client.messages.create(
-        model=SONNET_MODEL,
-        max_tokens=2048,
-        system=_build_sonnet_solo_prompt(sb_url, sb_key),
-        messages=[{"role": "user", "content": user_message}],
-        temperature=0.0,
+    mode = structured_output.output_mode()
+    extra = (
+        structured_output.tool_request(structured_output.SOLO_TOOL)
+        if mode == structured_output.MODE_TOOL else {}
     )
-
-    raw = response.content[0].text
-    assessment, detections, parse_fallback_used = _parse_solo_response(raw)
+    solo_started = time.monotonic()
+    with tracing.span("anthropic.messages.phase1", {
+        "gen_ai.system": "anthropic", "gen_ai.request.model": SONNET_MODEL, "crcheck.output_mode": mode,
+    }) as sp:
+        response = client.messages.create(
+            model=SONNET_MODEL,
+            max_tokens=2048,
+            system=_build_sonnet_solo_prompt(sb_url, sb_key),
+            messages=[{"role": "user", "content": user_message}],
+            temperature=0.0,
+            **extra,
+        )
+        tracing.record_llm_usage(sp, response)
+    solo_seconds = time.monotonic() - solo_started
+    _mark("phase1_llm")
+    usage = getattr(response, "usage", None)
+    ledger.record("phase1", SONNET_MODEL, usage)
+    solo_in = getattr(usage, "input_tokens", 0)
+    solo_out = getattr(usage, "output_tokens", 0)
+
+    tool_input = (
+        structured_output.extract_tool_input(response, structured_output.SOLO_TOOL["name"])
+        if mode == structured_output.MODE_TOOL else None
+    )
+    if tool_input is not None:
+        # 구조화 출력: 스키마 검증된 dict — 복구 경로 없음
+        raw = json.dumps(tool_input, ensure_ascii=False)
+        assessment, detections = _extract_solo_detections(tool_input)
+        parse_fallback_used = False
+    else:
+        if mode == structured_output.MODE_TOOL:
+            logger.warning("Solo tool_use 블록 없음 → 텍스트 JSON 파싱 폴백")
+        raw = structured_output.response_text(response)
+        assessment, detections, parse_fallback_used = _parse_solo_response(raw)
+        parse_fallback_used = parse_fallback_used or mode == structured_output.MODE_TOOL
+    _mark("phase1_parse")
 
     # 4. 밸리데이션 — 이미 로드한 활성 v3 leaf 카탈로그만으로 strict 검증 (DB 조회 0회)
     valid_ids, valid_codes, hallucinated = validate_runtime_pattern_codes(
         detections, catalog
     )
+    _mark("validation")
 
     # T2: 필수 검토 지시 대상 코드 중 실제 확정된 것 (파생 계산)
     mandatory_review_codes = sorted(
@@ -930,6 +1026,12 @@ def match_patterns_solo(
         parse_fallback_used=parse_fallback_used,
         starred_codes=sorted(starred_codes),
         mandatory_review_codes=mandatory_review_codes,
+        output_mode=mode,
+        solo_seconds=round(solo_seconds, 3),
+        stage_seconds=stage_seconds,
+        solo_input_tokens=solo_in if isinstance(solo_in, int) else 0,
+        solo_output_tokens=solo_out if isinstance(solo_out, int) else 0,
+        usage=ledger,
     )
 
 
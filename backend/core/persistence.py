@@ -0,0 +1,316 @@
+# backend/core/persistence.py
+"""
+CR-Check — 분석 결과 fire-and-forget 저장 큐
+
+/analyze는 share_id를 먼저 발급해 Phase 2가 끝나는 즉시 응답하고, DB 저장은
+이 모듈의 백그라운드 writer가 맡는다. Supabase 장애가 요청 지연(15초 타임아웃)으로
+번지지 않는다.
+
+- 내구성: submit 시 payload를 스풀 파일(write-ahead JSONL)에 fsync한 뒤 큐에 넣는다.
+  저장에 성공하면 ack 줄을 덧붙이고, 대기 건이 0이 되면 스풀을 비운다.
+- 재생: replay()가 이전 프로세스가 남긴 스풀에서 ack 없는 payload를 다시 큐에 넣는다.
+  스풀은 프로세스별 파일 + flock이라 워커 여러 개가 떠 있어도 살아 있는 스풀은 건드리지 않는다.
+- 재시도: 실패 시 지수 백오프로 PERSIST_MAX_ATTEMPTS회까지. 모두 실패하면 스풀에 남겨(park)
+  PERSIST_PARK_RETRY_SECONDS 뒤 writer가 다시 큐에 넣는다 (0이면 재시작 때 재생만).
+  재투입은 PERSIST_MAX_PARKS회까지 — 그래도 실패하면(영구 오류로 간주) share_id를 error 로그로
+  남기고 대기 목록에서 빼고 ack를 기록한다 (스풀이 영원히 비워지지 않는 것 방지).
+  save_analysis는 같은 share_id를 멱등 처리한다.
+- 조회: 저장 대기 중인 payload는 get_pending(share_id) — 공유 URL 즉시 조회용.
+- PERSIST_ASYNC=0 이면 main.py가 동기 저장 경로(storage.save_analysis_payload)를 쓴다.
+
+파일: {PERSIST_SPOOL_DIR}/persist-<pid>-<rand>.jsonl
+  {"op": "save", "share_id": ..., "payload": {...}}
+  {"op": "ack",  "share_id": ...}
+"""
+
+import atexit
+import fcntl
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+
+from .storage import save_analysis_payload
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+PERSIST_ASYNC = os.environ.get("PERSIST_ASYNC", "1") != "0"
+SPOOL_DIR = Path(
+    os.environ.get("PERSIST_SPOOL_DIR", str(Path(__file__).parent.parent / "spool"))
+)
+MAX_ATTEMPTS = int(os.environ.get("PERSIST_MAX_ATTEMPTS", "6"))
+RETRY_BASE_SECONDS = float(os.environ.get("PERSIST_RETRY_BASE_SECONDS", "1.0"))
+RETRY_MAX_SECONDS = float(os.environ.get("PERSIST_RETRY_MAX_SECONDS", "60.0"))
+PARK_RETRY_SECONDS = float(os.environ.get("PERSIST_PARK_RETRY_SECONDS", "300.0"))
+MAX_PARKS = int(os.environ.get("PERSIST_MAX_PARKS", "12"))
+
+_FILE_PREFIX = "persist-"
+_FILE_SUFFIX = ".jsonl"
+
+SaveFn = Callable[[dict[str, Any]], Optional[str]]
+
+
+def _unacked(lines: Iterable[str]) -> list[dict[str, Any]]:
+    """스풀 줄에서 ack 없는 save payload를 기록 순서대로 반환. 깨진 줄(중단된 쓰기)은 무시."""
+    pending: dict[str, dict[str, Any]] = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        share_id = entry.get("share_id")
+        if entry.get("op") == "save" and share_id and isinstance(entry.get("payload"), dict):
+            pending[share_id] = entry["payload"]
+        elif entry.get("op") == "ack":
+            pending.pop(share_id, None)
+    return list(pending.values())
+
+
+class PersistenceQueue:
+    """분석 결과 payload를 스풀에 기록하고 백그라운드 스레드에서 DB에 저장하는 큐."""
+
+    def __init__(
+        self,
+        save_fn: SaveFn = save_analysis_payload,
+        directory: Union[str, Path] = SPOOL_DIR,
+        max_attempts: int = MAX_ATTEMPTS,
+        retry_base_seconds: float = RETRY_BASE_SECONDS,
+        retry_max_seconds: float = RETRY_MAX_SECONDS,
+        park_retry_seconds: float = PARK_RETRY_SECONDS,
+        max_parks: int = MAX_PARKS,
+    ):
+        self.directory = Path(directory)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.park_retry_seconds = park_retry_seconds
+        self.max_parks = max(0, max_parks)
+        self._save_fn = save_fn
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._parked: dict[str, float] = {}  # share_id → 재투입 시각 (monotonic)
+        self._requeues: dict[str, int] = {}  # share_id → park 후 재투입 횟수
+        self._lock = threading.Lock()
+        self._spool_path = self.directory / (
+            f"{_FILE_PREFIX}{os.getpid()}-{uuid.uuid4().hex[:8]}{_FILE_SUFFIX}"
+        )
+        self._spool = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.saved = 0
+        self.retries = 0
+        self.parked = 0
+        self.dropped = 0
+        self.replayed = 0
+
+    # ── 요청 스레드 쪽 ───────────────────────────────────────────
+
+    def submit(self, payload: dict[str, Any]) -> str:
+        """payload를 스풀에 기록하고 저장 큐에 넣는다. payload["share_id"] 반환.
+
+        스풀 기록이 실패해도 예외를 올리지 않고 메모리 큐로만 진행한다 (내구성만 잃음).
+        """
+        share_id = payload["share_id"]
+        payload = {"queued_at": datetime.now().isoformat(timespec="seconds"), **payload}
+        with self._lock:
+            self._pending[share_id] = payload
+            try:
+                self._append({"op": "save", "share_id": share_id, "payload": payload}, sync=True)
+            except Exception as e:
+                logger.warning(f"저장 스풀 기록 실패 (메모리 큐로만 진행): share_id={share_id} ({e})")
+        self._queue.put(share_id)
+        self._ensure_started()
+        return share_id
+
+    def get_pending(self, share_id: str) -> Optional[dict[str, Any]]:
+        """아직 DB에 저장되지 않은 payload (없으면 None)."""
+        return self._pending.get(share_id)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐가 빌 때까지 최대 timeout초 대기. 완료 여부 반환."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 저장을 timeout초까지 기다린 뒤 writer를 멈춘다. 못 끝낸 건은 스풀에 남는다."""
+        self.flush(timeout)
+        self._stop.set()
+        with self._lock:
+            if self._spool is not None:
+                self._spool.close()
+                self._spool = None
+
+    def replay(self) -> int:
+        """이전 프로세스가 남긴 스풀에서 ack 없는 payload를 다시 큐에 넣는다. 재생 건수 반환."""
+        with self._lock:
+            self._open_spool()
+        count = 0
+        for path in sorted(self.directory.glob(f"{_FILE_PREFIX}*{_FILE_SUFFIX}")):
+            if path == self._spool_path:
+                continue
+            try:
+                f = open(path, "r", encoding="utf-8")
+            except OSError:
+                continue
+            with f:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue  # 살아 있는 다른 워커의 스풀
+                payloads = _unacked(f)
+                for payload in payloads:
+                    if payload["share_id"] not in self._pending:
+                        self.submit(payload)
+                        count += 1
+                # 재생분은 이미 이 프로세스 스풀에 다시 기록됨
+                path.unlink(missing_ok=True)
+        if count:
+            logger.info(f"저장 스풀 재생: {count}건")
+        self.replayed += count
+        return count
+
+    # ── 스풀 ────────────────────────────────────────────────────
+
+    def _open_spool(self) -> None:
+        """(lock 보유 상태) 이 프로세스 스풀 파일을 열고 flock을 잡는다."""
+        if self._spool is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        spool = open(self._spool_path, "a", encoding="utf-8")
+        fcntl.flock(spool, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._spool = spool
+
+    def _append(self, entry: dict[str, Any], sync: bool = False) -> None:
+        """(lock 보유 상태) 스풀에 한 줄 추가. sync=True면 fsync까지."""
+        self._open_spool()
+        self._spool.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self._spool.flush()
+        if sync:
+            os.fsync(self._spool.fileno())
+
+    def _ack(self, share_id: str) -> None:
+        with self._lock:
+            self._pending.pop(share_id, None)
+            try:
+                if self._pending:
+                    # ack 유실은 재생 시 중복 저장 시도로 끝나므로(멱등) fsync 생략
+                    self._append({"op": "ack", "share_id": share_id})
+                elif self._spool is not None:
+                    self._spool.truncate(0)
+            except Exception as e:
+                logger.warning(f"저장 스풀 ack 기록 실패: share_id={share_id} ({e})")
+
+    # ── writer 스레드 쪽 ─────────────────────────────────────────
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="persistence-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _requeue_parked(self) -> None:
+        """재투입 시각이 지난 park 건을 다시 큐에 넣는다."""
+        if not self._parked:
+            return
+        now = time.monotonic()
+        with self._lock:
+            due = [sid for sid, at in self._parked.items() if at <= now]
+            for sid in due:
+                del self._parked[sid]
+                self._requeues[sid] = self._requeues.get(sid, 0) + 1
+        for sid in due:
+            if sid in self._pending:
+                logger.info(f"보관된 저장 재시도: share_id={sid}")
+                self._queue.put(sid)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._requeue_parked()
+            try:
+                share_id = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._process(share_id)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, share_id: str) -> None:
+        payload = self._pending.get(share_id)
+        if payload is None:
+            return
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                # 요청 trace와는 별도 trace — share_id 속성으로 /analyze root span과 대조
+                with tracing.span("persistence.save", {"crcheck.share_id": share_id, "crcheck.attempt": attempt}):
+                    saved = self._save_fn(payload)
+            except Exception as e:
+                logger.warning(f"분석 결과 저장 예외 [{type(e).__name__}]: {e}")
+                saved = None
+            if saved:
+                self._requeues.pop(share_id, None)
+                self._ack(share_id)
+                self.saved += 1
+                return
+            if attempt < self.max_attempts:
+                self.retries += 1
+                delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempt - 1))
+                if self._stop.wait(delay):
+                    return  # 종료 중 — 스풀에 남겨 재시작 때 재생
+        if self._requeues.get(share_id, 0) >= self.max_parks and self.park_retry_seconds > 0:
+            self._requeues.pop(share_id, None)
+            self._ack(share_id)
+            self.dropped += 1
+            logger.error(
+                f"분석 결과 저장 포기 — 재투입 {self.max_parks}회 후에도 실패, payload 폐기: "
+                f"share_id={share_id}"
+            )
+            return
+        self.parked += 1
+        if self.park_retry_seconds > 0:
+            with self._lock:
+                self._parked[share_id] = time.monotonic() + self.park_retry_seconds
+            when = f"{self.park_retry_seconds:g}초 후 재시도"
+        else:
+            when = "재시작 시 재생"
+        logger.error(
+            f"분석 결과 저장 {self.max_attempts}회 실패 — 스풀에 보관, {when}: "
+            f"share_id={share_id}"
+        )
+
+
+# ── 프로세스 전역 큐 ─────────────────────────────────────────────
+
+_queue_instance: Optional[PersistenceQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_persistence_queue() -> PersistenceQueue:
+    """프로세스 전역 저장 큐 (최초 호출 시 생성, 종료 시 남은 저장을 잠시 기다림)."""
+    global _queue_instance
+    if _queue_instance is None:
+        with _queue_lock:
+            if _queue_instance is None:
+                _queue_instance = PersistenceQueue()
+                atexit.register(_queue_instance.close)
+    return _queue_instance
@@ -14,7 +14,8 @@ Sonnet Solo 1-Call 아키텍처:
 import re
 import time
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from typing import Optional
 
 from .chunker import chunk_article, Chunk
 from . import pattern_matcher as _pattern_matcher_mod  # T0: SONNET_MODEL 런타임 참조용 (벤치마크 override 반영)
@@ -37,6 +38,9 @@ from .verify_citations import verify_report_citations
 # inferred_by 관계 0건. 데이터 없이 운용 불가. 재활성화 시 import와 호출 블록 주석 해제.
 # from .meta_pattern_inference import check_meta_patterns
 from .db import _get_supabase_config
+from .diagnostics import record_diagnostic
+from . import metrics
+from .usage import UsageLedger
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +74,12 @@ class AnalysisResult:
     # T0: Phase 1 포렌식 축약본. analysis_results.phase1_forensic 컬럼에 저장.
     # 관측 전용 — 사용자-facing 리포트/프론트 응답에 노출 금지.
     phase1_forensic: dict | None = None
+    # 단계별 소요 시간(초) — chunking, Phase 1 내부 단계(PatternMatchResult.stage_seconds),
+    # report, citation_audit. 벤치마크 분위수 집계용 관측 필드.
+    stage_seconds: dict = field(default_factory=dict)
+    # 요청별 API 사용량·비용 원장 (임베딩·Phase 1·Phase 2 재시도 포함).
+    # analysis_results.usage_ledger 컬럼에 저장 — 관측 전용, 응답에 노출 금지.
+    usage: UsageLedger = field(default_factory=UsageLedger)
 
 
 def _infer_article_context(article_text: str, pattern_codes: set) -> str:
@@ -136,15 +146,44 @@ def _build_haiku_dicts(pm: PatternMatchResult, include_report_meta: bool = False
     return dicts
 
 
+def _build_structured_output_forensic(
+    pm: PatternMatchResult,
+    rr: Optional[ReportResult],
+) -> dict:
+    """구조화 출력(tool use) 모드 비교용 — Phase 1/2 호출 모드·파싱 폴백·재시도·소요 시간.
+
+    phase2는 generate_report가 성공한 경우에만 채운다 (TN·최종 실패 시 None).
+    """
+    phase2 = None
+    if rr is not None and rr.attempts:
+        phase2 = {
+            "mode": rr.output_mode,
+            "attempts": rr.attempts,
+            "retries": rr.attempts - 1,
+            "parse_fallbacks": rr.parse_fallbacks,
+            "seconds": rr.seconds,
+        }
+    return {
+        "phase1": {
+            "mode": pm.output_mode,
+            "fallback_used": pm.parse_fallback_used,
+            "seconds": pm.solo_seconds,
+        },
+        "phase2": phase2,
+    }
+
+
 def _build_phase1_forensic(
     pm: PatternMatchResult,
     article_context: str,
     patterns_without_ethics: list[str],
+    report_result: Optional[ReportResult] = None,
 ) -> dict:
-    """T0: Phase 1 포렌식 축약본 조립 (10키 고정 스키마).
+    """T0: Phase 1 포렌식 축약본 조립 (11키 고정 스키마).
 
     analysis_results.phase1_forensic JSONB에 저장되는 관측 전용 payload.
-    로컬 진단 덤프(CP2~CP4)의 부분집합 + 파싱 fallback·★ 마킹 원본 기록.
+    진단 기록(CP2~CP4)의 부분집합 + 파싱 fallback·★ 마킹 원본 기록
+    + 구조화 출력 모드 비교(structured_output).
     """
     return {
         "vector_candidates": [
@@ -167,9 +206,148 @@ def _build_phase1_forensic(
         "fallback_used": pm.parse_fallback_used,
         # 모듈 attribute 참조 — 벤치마크의 SONNET_MODEL 런타임 override를 반영
         "phase1_model": _pattern_matcher_mod.SONNET_MODEL,
+        "structured_output": _build_structured_output_forensic(pm, report_result),
+    }
+
+
+def _snapshot_for_diagnostics(result: AnalysisResult) -> AnalysisResult:
+    """진단 레코드가 읽는 필드의 사본 — 요청 스레드에서 큐 등록 전에 만든다.
+
+    레코드 조립은 analyze_article 반환 뒤 writer 스레드에서 돌므로, 호출 측이 그 사이
+    result를 고쳐도 레코드가 바뀌지 않게 결과 객체와 컨테이너를 복사한다
+    (원소 객체·문자열은 공유 — 얕은 복사라 요청 스레드 비용은 원소 수에 비례하는 정도).
+    """
+    pm, rr = result.pattern_result, result.report_result
+    return replace(
+        result,
+        chunks=list(result.chunks),
+        stage_seconds=dict(result.stage_seconds),
+        pattern_result=replace(
+            pm,
+            vector_candidates=list(pm.vector_candidates),
+            haiku_detections=list(pm.haiku_detections),
+            validated_pattern_ids=list(pm.validated_pattern_ids),
+            validated_pattern_codes=list(pm.validated_pattern_codes),
+            hallucinated_codes=list(pm.hallucinated_codes),
+        ),
+        report_result=replace(
+            rr,
+            reports=dict(rr.reports),
+            ethics_refs=list(rr.ethics_refs or []),
+        ),
+    )
+
+
+def _build_diagnostic_record(result: AnalysisResult, run_sonnet: bool) -> dict:
+    """진단 레코드(체크포인트 1~5) 조립. diagnostics writer 스레드에서 호출된다.
+
+    result는 _snapshot_for_diagnostics()로 만든 사본이다 (반환된 결과와 분리).
+    diagnostic_id·timestamp는 싱크가 덧붙인다.
+    """
+    pm = result.pattern_result
+    rr = result.report_result
+
+    # Checkpoint 1: 청킹
+    _cp1 = {
+        "chunk_count": result.chunk_count,
+        "avg_chunk_length": round(result.avg_chunk_length, 1),
+        "chunks_preview": [
+            {"index": i, "length": c.length, "preview": c.text[:80]}
+            for i, c in enumerate(result.chunks)
+        ],
+    }
+
+    # Checkpoint 2: 벡터 검색
+    _cp2 = {
+        "candidate_count": len(pm.vector_candidates),
+        "vector_candidates": [
+            {"pattern_code": vc.pattern_code, "pattern_name": vc.pattern_name, "similarity": round(vc.similarity, 4)}
+            for vc in pm.vector_candidates
+        ],
+    }
+
+    # Checkpoint 3: 패턴 식별
+    _cp3 = {
+        "overall_assessment": result.overall_assessment,
+        "haiku_detections": [
+            {"pattern_code": d.pattern_code, "matched_text": d.matched_text, "severity": d.severity, "reasoning": d.reasoning}
+            for d in pm.haiku_detections
+        ],
+        "validated_pattern_codes": list(pm.validated_pattern_codes),
+        "hallucinated_codes": list(pm.hallucinated_codes),
+        "haiku_raw_response": pm.haiku_raw_response,
+    }
+
+    # Checkpoint 4, 5: 리포트 관련 (run_sonnet=True이고 패턴이 확정된 경우에만)
+    _cp4 = {}
+    _cp5 = {}
+    if run_sonnet and pm.validated_pattern_ids:
+        # CP4: 규범 조회
+        _ethics = rr.ethics_refs or []
+        _patterns_with_ethics = set(er.pattern_code for er in _ethics)
+        _patterns_without = [pc for pc in pm.validated_pattern_codes if pc not in _patterns_with_ethics]
+        _cp4 = {
+            "ethics_ref_count": len(_ethics),
+            "patterns_without_ethics": _patterns_without,
+            "ethics_refs": [
+                {
+                    "pattern_code": er.pattern_code,
+                    "ethics_code": er.ethics_code,
+                    "ethics_title": er.ethics_title,
+                    "ethics_tier": er.ethics_tier,
+                    "full_text_length": len(er.ethics_full_text),
+                    "full_text_preview": er.ethics_full_text[:300],
+                    "relation_type": er.relation_type,
+                    "strength": er.strength,
+                }
+                for er in _ethics
+            ],
+        }
+
+        # CP5: 리포트 (cite 태그 후치환 비활성화 상태에서는 pre/post가 동일)
+        _cp5 = {
+            "pre_citation_reports": {rt: rr.reports.get(rt, "") for rt in ["comprehensive", "journalist", "student"]},
+            "post_citation_reports": {rt: rr.reports.get(rt, "") for rt in ["comprehensive", "journalist", "student"]},
+            "hallucinated_refs_per_report": {},
+            "sonnet_raw_response": rr.sonnet_raw_response,
+        }
+
+    return {
+        "total_seconds": round(result.total_seconds, 2),
+        "stage_seconds": dict(result.stage_seconds),
+        "checkpoint_1_chunks": _cp1,
+        "checkpoint_2_vector": _cp2,
+        "checkpoint_3_pattern": _cp3,
+        "checkpoint_4_ethics": _cp4,
+        "checkpoint_5_report": _cp5,
     }
 
 
+def _record_metrics(result: AnalysisResult, run_sonnet: bool) -> None:
+    """/metrics 누적 — 단계별 소요, 파싱 폴백, 거부 코드, Phase 1·임베딩 토큰.
+
+    Phase 2 토큰·재시도와 ethics_fetch/phase2_* 단계는 generate_report가 직접 기록한다.
+    """
+    pm = result.pattern_result
+    if not run_sonnet:
+        outcome = "phase1_only"
+    elif pm.validated_pattern_ids:
+        outcome = "reported"
+    else:
+        outcome = "no_patterns"
+    metrics.PIPELINE_SECONDS.observe(result.total_seconds, outcome=outcome)
+    metrics.observe_stages(result.stage_seconds)
+    if pm.parse_fallback_used:
+        metrics.PARSE_FALLBACKS.inc(phase="phase1")
+    if pm.hallucinated_codes:
+        metrics.HALLUCINATED_CODES.inc(len(pm.hallucinated_codes))
+    metrics.add_tokens(_pattern_matcher_mod.EMBEDDING_MODEL, "embedding", input_tokens=pm.embedding_tokens)
+    metrics.add_tokens(
+        _pattern_matcher_mod.SONNET_MODEL, "phase1",
+        input_tokens=pm.solo_input_tokens, output_tokens=pm.solo_output_tokens,
+    )
+
+
 def analyze_article(
     article_text: str,
     run_sonnet: bool = True,
@@ -191,11 +369,13 @@ def analyze_article(
     result = AnalysisResult()
 
     # 1. 청킹 — 실패 시 전체 텍스트를 단일 청크로 취급
+    lap = time.monotonic()
     try:
         chunks = chunk_article(article_text)
     except Exception as e:
         logger.warning(f"청킹 실패, 전체 텍스트를 단일 청크로 사용: {e}")
         chunks = [Chunk(text=article_text, start_idx=0, end_idx=len(article_text))]
+    result.stage_seconds["chunking"] = round(time.monotonic() - lap, 3)
 
     result.chunks = chunks
     result.chunk_count = len(chunks)
@@ -209,10 +389,13 @@ def analyze_article(
         pm = match_patterns_solo(chunk_texts, article_text, threshold=vector_threshold, title=title)
     except Exception as e:
         logger.error(f"패턴 매칭 실패: {e}", exc_info=True)
+        metrics.PIPELINE_SECONDS.observe(time.time() - start, outcome="error")
         raise
 
     result.pattern_result = pm
     result.embedding_tokens = pm.embedding_tokens
+    result.stage_seconds.update(pm.stage_seconds)
+    result.usage.extend(pm.usage)
 
     # overall_assessment 보존 (Phase D 아카이빙용)
     result.overall_assessment = pm.suspect_result.overall_assessment if pm.suspect_result else ""
@@ -239,11 +422,18 @@ def analyze_article(
     article_context = _infer_article_context(
         article_text, pm.validated_pattern_codes
     )
+    result.usage.shape = {
+        "article_chars": len(article_text),
+        "chunk_count": result.chunk_count,
+        "article_context": article_context,
+        "pattern_count": len(pm.validated_pattern_ids),
+    }
 
     # 3. 리포트 생성 (Sonnet) — 선택적
     if run_sonnet and pm.validated_pattern_ids:
         # S5: pattern_name + report_framing을 Phase 2 입력에 포함 (신규 DB 조회 없음 — pm.pattern_catalog_meta 사용).
         haiku_dicts = _build_haiku_dicts(pm, include_report_meta=True)
+        lap = time.monotonic()
         try:
             rr = generate_report(
                 article_text,
@@ -252,6 +442,7 @@ def analyze_article(
                 overall_assessment=result.overall_assessment,
                 meta_patterns=triggered_meta,
                 article_context=article_context,
+                usage=result.usage,
             )
         except Exception as e:
             logger.error(f"리포트 생성 최종 실패, 에러 메시지 리포트 반환: {e}")
@@ -262,6 +453,7 @@ def analyze_article(
                     "student": "리포트 생성 중 오류가 발생했습니다.",
                 }
             )
+        result.stage_seconds["report"] = round(time.monotonic() - lap, 3)
 
         # ─────────────────────────────────────────────────────────
         # _DEPRECATED_ [Phase β] cite 태그 후치환 비활성화
@@ -294,9 +486,10 @@ def analyze_article(
         result.sonnet_output_tokens = rr.output_tokens
 
         # S6: citation audit — 관측 전용. 실패해도 리포트 본문은 보존된다.
+        lap = time.monotonic()
         try:
             result.citation_audit = verify_report_citations(
-                rr.reports or {}, rr.ethics_refs or [],
+                rr.reports or {}, rr.ethics_refs or [], index=rr.ethics_index,
             )
         except Exception as e_audit:
             logger.warning(
@@ -314,6 +507,7 @@ def analyze_article(
                 "reports": {},
                 "notes": ["citation audit failed at pipeline; report preserved"],
             }
+        result.stage_seconds["citation_audit"] = round(time.monotonic() - lap, 3)
     elif run_sonnet and not pm.validated_pattern_ids:
         result.report_result = ReportResult(
             reports={
@@ -326,7 +520,7 @@ def analyze_article(
     result.total_seconds = time.time() - start
 
     # ── T0: Phase 1 포렌식 payload ──────────────────────────────
-    # 로컬 진단 덤프와 별도의 try/except — 실패해도 파이프라인 불중단.
+    # 진단 기록과 별도의 try/except — 실패해도 파이프라인 불중단.
     try:
         if run_sonnet and pm.validated_pattern_ids:
             # CP4의 _patterns_without 로직 재사용
@@ -342,104 +536,25 @@ def analyze_article(
             # 조건 미충족 시(탐지 0건 포함) validated 전체로 일관 처리
             _patterns_without_f = list(pm.validated_pattern_codes)
         result.phase1_forensic = _build_phase1_forensic(
-            pm, article_context, _patterns_without_f
+            pm, article_context, _patterns_without_f, result.report_result,
         )
     except Exception as _forensic_err:
         logger.warning(
             f"phase1_forensic 조립 실패 (파이프라인에 영향 없음): {_forensic_err}"
         )
 
-    # ── 진단용 JSON 덤프 ────────────────────────────────────────
     try:
-        import json as _json
-        from datetime import datetime as _dt
-        from pathlib import Path as _Path
-
-        _diag_dir = _Path(__file__).parent.parent / "diagnostics"
-        _diag_dir.mkdir(exist_ok=True)
-        _ts = _dt.now().strftime("%Y%m%d_%H%M%S")
-
-        # Checkpoint 1: 청킹
-        _cp1 = {
-            "chunk_count": result.chunk_count,
-            "avg_chunk_length": round(result.avg_chunk_length, 1),
-            "chunks_preview": [
-                {"index": i, "length": c.length, "preview": c.text[:80]}
-                for i, c in enumerate(result.chunks)
-            ],
-        }
-
-        # Checkpoint 2: 벡터 검색
-        _cp2 = {
-            "candidate_count": len(pm.vector_candidates),
-            "vector_candidates": [
-                {"pattern_code": vc.pattern_code, "pattern_name": vc.pattern_name, "similarity": round(vc.similarity, 4)}
-                for vc in pm.vector_candidates
-            ],
-        }
-
-        # Checkpoint 3: 패턴 식별
-        _cp3 = {
-            "overall_assessment": result.overall_assessment,
-            "haiku_detections": [
-                {"pattern_code": d.pattern_code, "matched_text": d.matched_text, "severity": d.severity, "reasoning": d.reasoning}
-                for d in pm.haiku_detections
-            ],
-            "validated_pattern_codes": list(pm.validated_pattern_codes),
-            "hallucinated_codes": list(pm.hallucinated_codes),
-            "haiku_raw_response": pm.haiku_raw_response,
-        }
-
-        # Checkpoint 4, 5: 리포트 관련 (run_sonnet=True이고 패턴이 확정된 경우에만)
-        _cp4 = {}
-        _cp5 = {}
-        if run_sonnet and pm.validated_pattern_ids:
-            # CP4: 규범 조회
-            _ethics = rr.ethics_refs or []
-            _patterns_with_ethics = set(er.pattern_code for er in _ethics)
-            _patterns_without = [pc for pc in pm.validated_pattern_codes if pc not in _patterns_with_ethics]
-            _cp4 = {
-                "ethics_ref_count": len(_ethics),
-                "patterns_without_ethics": _patterns_without,
-                "ethics_refs": [
-                    {
-                        "pattern_code": er.pattern_code,
-                        "ethics_code": er.ethics_code,
-                        "ethics_title": er.ethics_title,
-                        "ethics_tier": er.ethics_tier,
-                        "full_text_length": len(er.ethics_full_text),
-                        "full_text_preview": er.ethics_full_text[:300],
-                        "relation_type": er.relation_type,
-                        "strength": er.strength,
-                    }
-                    for er in _ethics
-                ],
-            }
-
-            # CP5: 리포트 (cite 태그 후치환 비활성화 상태에서는 pre/post가 동일)
-            _cp5 = {
-                "pre_citation_reports": {rt: rr.reports.get(rt, "") for rt in ["comprehensive", "journalist", "student"]},
-                "post_citation_reports": {rt: rr.reports.get(rt, "") for rt in ["comprehensive", "journalist", "student"]},
-                "hallucinated_refs_per_report": {},
-                "sonnet_raw_response": rr.sonnet_raw_response,
-            }
-
-        _diag = {
-            "timestamp": _ts,
-            "total_seconds": round(result.total_seconds, 2),
-            "checkpoint_1_chunks": _cp1,
-            "checkpoint_2_vector": _cp2,
-            "checkpoint_3_pattern": _cp3,
-            "checkpoint_4_ethics": _cp4,
-            "checkpoint_5_report": _cp5,
-        }
-
-        _diag_path = _diag_dir / f"diagnostic_{_ts}.json"
-        _diag_path.write_text(_json.dumps(_diag, ensure_ascii=False, indent=2), encoding="utf-8")
-        logger.info(f"진단 덤프 저장: {_diag_path}")
-
-    except Exception as _diag_err:
-        logger.warning(f"진단 덤프 실패 (파이프라인에 영향 없음): {_diag_err}")
-    # ── 진단용 JSON 덤프 끝 ─────────────────────────────────────
+        _record_metrics(result, run_sonnet)
+    except Exception as _metrics_err:
+        logger.warning(f"메트릭 기록 실패 (파이프라인에 영향 없음): {_metrics_err}")
+
+    # ── 진단 기록 (백그라운드 writer 큐 — 요청 스레드는 디스크 I/O 없음) ──
+    # 샘플된 경우에만 요청 스레드에서 스냅샷 → writer 스레드에서 조립
+    diagnostic_id = record_diagnostic(
+        lambda snapshot: _build_diagnostic_record(snapshot, run_sonnet),
+        capture=lambda: _snapshot_for_diagnostics(result),
+    )
+    if diagnostic_id:
+        logger.info(f"진단 기록 대기열 등록: {diagnostic_id}")
 
     return result
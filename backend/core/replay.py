@@ -0,0 +1,312 @@
+# backend/core/replay.py
+"""
+CR-Check — 오프라인 벤치마크용 HTTP 녹화/재생(cassette) + 단계별 프로파일러
+
+파이프라인의 외부 호출(OpenAI 임베딩, Supabase REST/RPC, Anthropic Messages)은
+모두 httpx를 거친다 (두 SDK도 내부적으로 httpx.Client). httpx.Client.send 한 곳을
+가로채 골든 케이스마다 cassette 파일 하나에 요청·응답을 기록하고,
+재생 시 네트워크 없이 같은 응답을 돌려준다.
+
+- 요청 키: method + path + 정렬된 query + 본문 해시 (호스트·헤더 제외 — 인증 정보 미기록).
+  같은 키가 여러 번 나오면 기록 순서대로, 소진되면 마지막 응답 재사용.
+  본문이 달라진 요청(프롬프트 수정 등)은 method + path 순서로 느슨하게 매칭하고 loose로 집계.
+- 전송 오류(예: 로컬 Supabase 연결 거부)도 기록·재현한다.
+- 재생 중 기록에 없는 요청은 CassetteMiss — 조용히 네트워크로 나가지 않는다.
+- 스트리밍 응답(messages.stream SSE)은 녹화 시 본문 전체를 읽어 저장하고,
+  재생 시 같은 바이트를 그대로 흘려보낸다.
+
+StageProfiler는 모듈/클래스 속성을 감싸 단계별 wall·CPU(스레드)·할당(tracemalloc)을 잰다.
+scripts/benchmark_offline.py가 두 도구를 함께 쓴다. httpx 외 의존성 없음.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+CASSETTE_VERSION = 1
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# 재생 응답에 남길 헤더 (content-encoding/length는 httpx가 다시 계산)
+_KEEP_HEADERS = ("content-type", "content-range", "request-id", "x-request-id")
+
+
+class CassetteMiss(RuntimeError):
+    """재생 중 cassette에 없는 요청."""
+
+
+def _canonical_body(content: bytes) -> bytes:
+    """JSON 본문은 키 정렬로 정규화 — dict 순서 차이로 키가 달라지지 않게."""
+    if not content:
+        return b""
+    try:
+        return json.dumps(json.loads(content), sort_keys=True, ensure_ascii=False).encode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        return content
+
+
+def request_key(request: httpx.Request) -> tuple[str, str, str, str]:
+    url = request.url
+    query = urlencode(sorted(parse_qsl(url.query.decode("ascii", "replace"), keep_blank_values=True)))
+    body = _canonical_body(request.content)
+    digest = hashlib.sha256(body).hexdigest()[:16] if body else ""
+    return request.method, url.path, query, digest
+
+
+def _encode_body(content: bytes) -> dict[str, str]:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(entry: dict[str, Any]) -> bytes:
+    if "base64" in entry:
+        return base64.b64decode(entry["base64"])
+    return entry.get("text", "").encode("utf-8")
+
+
+class Cassette:
+    """케이스 1개의 HTTP 상호작용 기록. activate() 동안 httpx.Client.send를 가로챈다."""
+
+    def __init__(self, path: Path, mode: str = MODE_REPLAY, meta: Optional[dict] = None):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.meta: dict[str, Any] = dict(meta or {})
+        self.interactions: list[dict[str, Any]] = []
+        self.stats = {"recorded": 0, "hits": 0, "loose": 0, "repeats": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._exact: dict[tuple, deque] = defaultdict(deque)
+        self._loose: dict[tuple, deque] = defaultdict(deque)
+        self._last: dict[tuple, dict] = {}
+        if mode == MODE_REPLAY:
+            self._load()
+
+    # ── 파일 ────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{self.path}: cassette version {data.get('version')} 미지원")
+        self.meta = data.get("meta") or {}
+        self.interactions = data.get("interactions") or []
+        for entry in self.interactions:
+            key = tuple(entry["key"])
+            self._exact[key].append(entry)
+            self._loose[key[:2]].append(entry)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CASSETTE_VERSION,
+            "meta": self.meta,
+            "interactions": self.interactions,
+        }
+        self.path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    # ── 가로채기 ────────────────────────────────────────────────
+
+    @contextmanager
+    def activate(self) -> Iterator["Cassette"]:
+        original = httpx.Client.send
+        cassette = self
+
+        def send(client: httpx.Client, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+            if cassette.mode == MODE_RECORD:
+                return cassette._record(original, client, request, **kwargs)
+            return cassette._replay(request)
+
+        httpx.Client.send = send
+        try:
+            yield self
+        finally:
+            httpx.Client.send = original
+            if self.mode == MODE_RECORD:
+                self.save()
+
+    def _record(self, original: Any, client: httpx.Client, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        entry: dict[str, Any] = {
+            "key": list(request_key(request)),
+            "url": str(request.url.copy_with(query=None)),
+        }
+        try:
+            response = original(client, request, **kwargs)
+            response.read()
+        except httpx.TransportError as e:
+            entry["error"] = {"type": type(e).__name__, "message": str(e)}
+            self._append(entry)
+            raise
+        entry["status"] = response.status_code
+        entry["headers"] = {
+            k: v for k, v in response.headers.items() if k.lower() in _KEEP_HEADERS
+        }
+        entry["body"] = _encode_body(response.content)
+        self._append(entry)
+        return response
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self.interactions.append(entry)
+            self.stats["recorded"] += 1
+
+    def _replay(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        with self._lock:
+            entry = self._pop(self._exact, key, "hits")
+            if entry is None:
+                entry = self._pop(self._loose, key[:2], "loose")
+            if entry is None:
+                entry = self._last.get(key) or self._last.get(key[:2])
+                if entry is not None:
+                    self.stats["repeats"] += 1
+            if entry is None:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"{self.path.name}: 기록 없음 {key[0]} {key[1]}?{key[2]}")
+            self._last[key] = self._last[key[:2]] = entry
+
+        if "error" in entry:
+            err_type = getattr(httpx, entry["error"]["type"], httpx.TransportError)
+            raise err_type(entry["error"]["message"], request=request)
+        return httpx.Response(
+            entry["status"],
+            headers=entry.get("headers") or {},
+            content=_decode_body(entry["body"]),
+            request=request,
+        )
+
+    def _pop(self, index: dict[tuple, deque], key: tuple, counter: str) -> Optional[dict]:
+        queue = index.get(key)
+        while queue:
+            entry = queue.popleft()
+            if not entry.get("_used"):
+                entry["_used"] = True
+                self.stats[counter] += 1
+                return entry
+        return None
+
+
+# ── 단계별 프로파일러 ──────────────────────────────────────────
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    alloc_peak: int = 0   # 호출 중 최대 추가 점유 (바이트, 호출 간 최댓값)
+    alloc_net: int = 0    # 호출 후 남은 순증 (바이트, 합계)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "alloc_peak_kb": round(self.alloc_peak / 1024, 1),
+            "alloc_net_kb": round(self.alloc_net / 1024, 1),
+        }
+
+
+class _Frame:
+    __slots__ = ("start_mem", "peak")
+
+    def __init__(self, start_mem: int):
+        self.start_mem = start_mem
+        self.peak = start_mem
+
+
+class StageProfiler:
+    """instrument(owner, attr, stage)로 감싼 호출의 단계별 통계.
+
+    할당은 tracemalloc 기준 (전역 — 다른 스레드 할당이 섞일 수 있음).
+    중첩 단계는 바깥 단계의 peak에 안쪽 peak가 반영된다.
+    """
+
+    def __init__(self, trace_alloc: bool = True):
+        self.trace_alloc = trace_alloc
+        self.stages: dict[str, StageStats] = defaultdict(StageStats)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stack = ExitStack()
+        self._started_tracing = False
+
+    def __enter__(self) -> "StageProfiler":
+        if self.trace_alloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stack.close()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def instrument(self, owner: Any, attr: str, stage: str) -> None:
+        """owner.attr(모듈 함수 또는 클래스 메서드)를 측정 래퍼로 교체. __exit__에서 복원."""
+        original = getattr(owner, attr)
+        profiler = self
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with profiler.measure(stage):
+                return original(*args, **kwargs)
+
+        wrapper.__wrapped__ = original  # type: ignore[attr-defined]
+        setattr(owner, attr, wrapper)
+        self._stack.callback(setattr, owner, attr, original)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        tracing = self.trace_alloc and tracemalloc.is_tracing()
+        frame = None
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            frame = _Frame(current)
+            stack.append(frame)
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall0, time.thread_time() - cpu0
+            peak_bytes = net_bytes = 0
+            if frame is not None:
+                current, peak = tracemalloc.get_traced_memory()
+                frame.peak = max(frame.peak, peak)
+                stack.pop()
+                if stack:
+                    stack[-1].peak = max(stack[-1].peak, frame.peak)
+                peak_bytes = frame.peak - frame.start_mem
+                net_bytes = current - frame.start_mem
+            with self._lock:
+                s = self.stages[stage]
+                s.calls += 1
+                s.wall += wall
+                s.cpu += cpu
+                s.alloc_peak = max(s.alloc_peak, peak_bytes)
+                s.alloc_net += net_bytes
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: s.as_dict() for name, s in self.stages.items()}
@@ -3,7 +3,7 @@
 CR-Check — Sonnet 3종 리포트 생성 모듈
 
 파이프라인 후반부 (M6):
-1. 확정 패턴 ID → get_ethics_for_patterns() RPC → 규범 원문 조회
+1. 확정 패턴 ID → 규범 원문 조회 (ethics_cache 조합 — 캐시에 없는 패턴만 get_ethics_for_patterns() RPC)
 2. Sonnet 호출 — 3종 리포트(comprehensive, journalist, student) + article_analysis
 3. 결정론적 인용 (<cite ref="{code}"/> 태그 → CitationResolver에서 원문 치환)
 """
@@ -15,14 +15,23 @@ import time
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import anthropic
 import httpx
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
-from .db import _get_supabase_config
+from .db import _get_supabase_config, get_connection_profile
+from .resilience import get_rpc
+from .ethics_index import EthicsContextIndex
+from .stream_json import StreamingJsonParser
+from . import structured_output
+from . import metrics
+from . import tracing
+from .usage import UsageLedger
+from .clients import get_client
+from .ethics_cache import ETHICS_CACHE_ENABLED, fetch_mapping_version, get_ethics_cache, start_background_refresh
 from .pattern_matcher import _MANDATORY_REVIEW_TARGET_CODES
 
 env_path = Path(__file__).parent.parent / '.env'
@@ -32,6 +41,11 @@ logger = logging.getLogger(__name__)
 
 SONNET_MODEL = "claude-sonnet-5"
 
+# Phase 2 응답을 스트리밍으로 받아 StreamingJsonParser로 증분 파싱 (REPORT_STREAMING=0 이면 단건 호출)
+REPORT_STREAMING = os.environ.get("REPORT_STREAMING", "1") != "0"
+
+_REPORT_FIELDS = ("comprehensive", "journalist", "student")
+
 
 # ── 데이터 구조 ──────────────────────────────────────────────────
 
@@ -61,9 +75,18 @@ class ReportResult:
     article_analysis: dict = field(default_factory=dict)
     # { "articleType": "...", "articleElements": "...", ... }
     ethics_refs: list[EthicsReference] = field(default_factory=list)
+    # ethics_refs의 분류·포맷 결과 — 인용 감사(verify_citations)·스냅샷(storage)이 공유.
+    ethics_index: Optional[EthicsContextIndex] = None
     sonnet_raw_response: str = ""
     input_tokens: int = 0
     output_tokens: int = 0
+    # 구조화 출력 비교 (phase1_forensic["structured_output"]["phase2"])
+    output_mode: str = "text"      # "text" | "tool"
+    attempts: int = 0              # Sonnet 호출 횟수 (재시도 포함)
+    parse_fallbacks: int = 0       # _robust_json_parse 폴백이 필요했던 시도 수
+    seconds: float = 0.0           # 첫 시도부터 성공까지 소요 시간
+    # 모든 시도의 호출 원장 (core.usage) — 재시도·실패 호출 포함
+    usage: UsageLedger = field(default_factory=UsageLedger)
 
 
 # ── 규범 조회 ────────────────────────────────────────────────────
@@ -93,27 +116,141 @@ def _rpc_get_ethics(
     timeout: int = 30,
 ) -> tuple[list[dict], int]:
     """RPC 호출 1회 실행. (rows, http_status) 반환."""
-    r = httpx.post(
-        f"{sb_url}/rest/v1/rpc/get_ethics_for_patterns",
-        headers=headers,
-        json={
-            "confirmed_pattern_ids": pattern_ids,
-            "article_context": article_context,
-        },
-        timeout=timeout,
-    )
-    r.raise_for_status()
-    rows = r.json()
+    with tracing.span("rpc.get_ethics_for_patterns", {
+        "crcheck.pattern_count": len(pattern_ids), "crcheck.article_context": article_context,
+    }) as sp:
+        r = httpx.post(
+            f"{sb_url}/rest/v1/rpc/get_ethics_for_patterns",
+            headers=headers,
+            json={
+                "confirmed_pattern_ids": pattern_ids,
+                "article_context": article_context,
+            },
+            timeout=timeout,
+        )
+        tracing.set_attributes(sp, {"http.response.status_code": r.status_code})
+        r.raise_for_status()
+        rows = r.json()
+        tracing.set_attributes(sp, {"crcheck.rows": len(rows)})
     return rows, r.status_code
 
 
+@tracing.traced("rest.ethics_fallback")
+def _rest_fallback_ethics_rows(
+    pattern_ids: list[int],
+    sb_url: str,
+    headers: dict,
+    article_context: str = 'general',
+) -> list[dict]:
+    """RPC 대신 pattern_ethics_relations + ethics_codes REST JOIN으로 직접 조회.
+
+    parent chain 롤업은 없다 (직접 매핑 행만). 실패 시 빈 리스트.
+    """
+    logger.warning(f"RPC 실패/0건, REST API fallback 시도: pattern_ids={pattern_ids}")
+    rows: list[dict] = []
+    ids_csv = ",".join(str(pid) for pid in pattern_ids)
+    try:
+        # pattern_ethics_relations + ethics_codes를 직접 JOIN 조회
+        fb_r = httpx.get(
+            f"{sb_url}/rest/v1/pattern_ethics_relations"
+            f"?select="
+            f"pattern_id,"
+            f"patterns!inner(code),"
+            f"ethics_code_id,"
+            f"ethics_codes!inner(code,title,source,article_number,full_text,tier,is_active,is_citable,applicable_contexts),"
+            f"relation_type,strength,reasoning"
+            f"&pattern_id=in.({ids_csv})"
+            f"&ethics_codes.is_active=eq.true"
+            f"&ethics_codes.is_citable=eq.true",
+            headers=headers,
+            timeout=30,
+        )
+        fb_r.raise_for_status()
+        fb_data = fb_r.json()
+        if fb_data:
+            for item in fb_data:
+                ec = item.get("ethics_codes", {})
+                p = item.get("patterns", {})
+
+                # applicable_contexts 필터 (RPC와 동일 의미: NULL/all/일치 시만 포함)
+                contexts = ec.get("applicable_contexts")
+                if not (
+                    contexts is None
+                    or "all" in contexts
+                    or article_context in contexts
+                ):
+                    continue
+
+                # weak 및 exception_of 제외
+                if item.get("strength") == "weak":
+                    continue
+                if item.get("relation_type") == "exception_of":
+                    continue
+
+                rows.append({
+                    "pattern_id": item.get("pattern_id"),
+                    "pattern_code": p.get("code", ""),
+                    "ethics_code": ec.get("code", ""),
+                    "ethics_title": ec.get("title", ""),
+                    "ethics_full_text": ec.get("full_text", ""),
+                    "ethics_tier": ec.get("tier", 0),
+                    "relation_type": item.get("relation_type", ""),
+                    "strength": item.get("strength", ""),
+                    "reasoning": item.get("reasoning", ""),
+                    "ethics_source": ec.get("source", "") or "",
+                    "ethics_article_number": ec.get("article_number", "") or "",
+                })
+            logger.info(f"REST API fallback 성공: {len(rows)}건 (필터링 후)")
+        else:
+            logger.warning(f"REST API fallback도 0건: pattern_ids={pattern_ids}")
+    except Exception as fb_e:
+        logger.error(f"REST API fallback 실패 [{type(fb_e).__name__}]: {fb_e}")
+
+    return rows
+
+
+def _fetch_ethics_rows(
+    pattern_ids: list[int],
+    sb_url: str,
+    headers: dict,
+    article_context: str = 'general',
+) -> tuple[list[dict], bool]:
+    """get_ethics_for_patterns() RPC 호출 (헤지·지터 재시도·서킷 브레이커 + REST fallback).
+
+    고정 2초 sleep 재시도 대신 resilience 계층을 쓴다. 0건 응답은 무효로 보고
+    재시도한 뒤 REST fallback으로 넘어간다 (서킷이 열려 있으면 곧바로 fallback).
+    (rows, cacheable) 반환. cacheable은 RPC가 정상 응답했을 때만 True —
+    REST fallback은 parent chain 롤업이 없어 캐시하지 않는다.
+    """
+    logger.info(f"규범 조회 요청: pattern_ids={pattern_ids}")
+
+    def _primary() -> list[dict]:
+        rows, status = _rpc_get_ethics(
+            pattern_ids, sb_url, headers, article_context=article_context,
+        )
+        logger.info(f"규범 조회 응답: HTTP {status}, {len(rows)}건")
+        return rows
+
+    def _fallback() -> list[dict]:
+        return _rest_fallback_ethics_rows(
+            pattern_ids, sb_url, headers, article_context=article_context,
+        )
+
+    outcome = get_rpc("get_ethics_for_patterns").call(
+        _primary, fallback=_fallback, accept=bool,
+    )
+    if outcome.source == "hedge":
+        logger.info(f"규범 조회 헤지 응답 채택 ({outcome.seconds:.2f}초)")
+    return outcome.value, outcome.source != "fallback" and bool(outcome.value)
+
+
 def fetch_ethics_for_patterns(
     pattern_ids: list[int],
     sb_url: str,
     sb_key: str,
     article_context: str = 'general',
 ) -> list[EthicsReference]:
-    """get_ethics_for_patterns() RPC 호출 (1회 재시도 + 진단 쿼리)."""
+    """확정 패턴의 규범 조회. 캐시 활성 시 패턴별 캐시 항목을 조합한다."""
     if not pattern_ids:
         return []
 
@@ -123,182 +260,40 @@ def fetch_ethics_for_patterns(
         "Content-Type": "application/json",
     }
 
-    logger.info(f"규범 조회 요청: pattern_ids={pattern_ids}")
-
-    # 1차 시도
-    try:
-        rows, status = _rpc_get_ethics(
-            pattern_ids, sb_url, headers, article_context=article_context,
-        )
-        logger.info(f"규범 조회 응답: HTTP {status}, {len(rows)}건")
-    except Exception as e:
-        logger.error(f"규범 조회 1차 실패 [{type(e).__name__}]: {e}")
-        # 네트워크 에러 시 2초 대기 후 1회 재시도
-        time.sleep(2)
-        try:
-            rows, status = _rpc_get_ethics(
-                pattern_ids, sb_url, headers, article_context=article_context,
-            )
-            logger.info(f"규범 조회 재시도 성공: HTTP {status}, {len(rows)}건")
-        except Exception as e2:
-            logger.error(f"규범 조회 재시도도 실패 [{type(e2).__name__}]: {e2}")
-            return []
-
-    # 200이지만 0건인 경우: 재시도
-    if not rows and pattern_ids:
-        logger.warning(
-            f"규범 조회 0건 (pattern_ids={pattern_ids}), 2초 후 재시도"
-        )
-        time.sleep(2)
-        try:
-            rows, status = _rpc_get_ethics(
-                pattern_ids, sb_url, headers, article_context=article_context,
-            )
-            logger.info(f"규범 조회 재시도 응답: HTTP {status}, {len(rows)}건")
-        except Exception as e:
-            logger.error(f"규범 조회 재시도 실패 [{type(e).__name__}]: {e}")
-
-    # 재시도까지 0건이면 REST API 직접 조회 fallback
-    if not rows and pattern_ids:
-        logger.warning(f"RPC 0건, REST API fallback 시도: pattern_ids={pattern_ids}")
-        ids_csv = ",".join(str(pid) for pid in pattern_ids)
-        try:
-            # pattern_ethics_relations + ethics_codes를 직접 JOIN 조회
-            fb_r = httpx.get(
-                f"{sb_url}/rest/v1/pattern_ethics_relations"
-                f"?select="
-                f"pattern_id,"
-                f"patterns!inner(code),"
-                f"ethics_code_id,"
-                f"ethics_codes!inner(code,title,source,article_number,full_text,tier,is_active,is_citable,applicable_contexts),"
-                f"relation_type,strength,reasoning"
-                f"&pattern_id=in.({ids_csv})"
-                f"&ethics_codes.is_active=eq.true"
-                f"&ethics_codes.is_citable=eq.true",
-                headers=headers,
-                timeout=30,
-            )
-            fb_r.raise_for_status()
-            fb_data = fb_r.json()
-            if fb_data:
-                rows = []
-                for item in fb_data:
-                    ec = item.get("ethics_codes", {})
-                    p = item.get("patterns", {})
-
-                    # applicable_contexts 필터 (RPC와 동일 의미: NULL/all/일치 시만 포함)
-                    contexts = ec.get("applicable_contexts")
-                    if not (
-                        contexts is None
-                        or "all" in contexts
-                        or article_context in contexts
-                    ):
-                        continue
-
-                    # weak 및 exception_of 제외
-                    if item.get("strength") == "weak":
-                        continue
-                    if item.get("relation_type") == "exception_of":
-                        continue
-
-                    rows.append({
-                        "pattern_code": p.get("code", ""),
-                        "ethics_code": ec.get("code", ""),
-                        "ethics_title": ec.get("title", ""),
-                        "ethics_full_text": ec.get("full_text", ""),
-                        "ethics_tier": ec.get("tier", 0),
-                        "relation_type": item.get("relation_type", ""),
-                        "strength": item.get("strength", ""),
-                        "reasoning": item.get("reasoning", ""),
-                        "ethics_source": ec.get("source", "") or "",
-                        "ethics_article_number": ec.get("article_number", "") or "",
-                    })
-                logger.info(f"REST API fallback 성공: {len(rows)}건 (필터링 후)")
-            else:
-                logger.warning(f"REST API fallback도 0건: pattern_ids={pattern_ids}")
-        except Exception as fb_e:
-            logger.error(f"REST API fallback 실패 [{type(fb_e).__name__}]: {fb_e}")
+    def _fetch(ids: list[int], context: str) -> tuple[list[dict], bool]:
+        return _fetch_ethics_rows(ids, sb_url, headers, article_context=context)
 
+    with tracing.span("ethics.fetch", {
+        "crcheck.pattern_count": len(pattern_ids), "crcheck.article_context": article_context,
+        "crcheck.cache_enabled": ETHICS_CACHE_ENABLED,
+    }) as sp:
+        if not ETHICS_CACHE_ENABLED:
+            rows, _ = _fetch(pattern_ids, article_context)
+        else:
+            cache = get_ethics_cache()
+            cache.maybe_check_version(fetch_mapping_version)
+            rows = cache.get_rows(pattern_ids, article_context, _fetch)
+        tracing.set_attributes(sp, {"crcheck.rows": len(rows)})
     return _parse_ethics_rows(rows)
 
 
-def _format_ethics_header(r: EthicsReference) -> str:
-    """규범 헤더: 내부 ethics_code 미노출, source+article_number 기반 정식 인용명.
-
-    빈 값 가드: source/article_number가 둘 다 비면 〔〕 자체를 출력하지 않는다.
-    """
-    source = (r.ethics_source or "").strip()
-    article_number = (r.ethics_article_number or "").strip()
-    citation_label = f"{source} {article_number}".strip()
-    if citation_label:
-        return f"### 〔{citation_label}〕 {r.ethics_title} (Tier {r.ethics_tier})"
-    return f"### {r.ethics_title} (Tier {r.ethics_tier})"
+def warm_ethics_cache() -> None:
+    """규범 캐시 워밍 + 매핑 버전 폴링 백그라운드 시작 (FastAPI startup에서 호출)."""
+    def _fetch(ids: list[int], context: str) -> tuple[list[dict], bool]:
+        profile = get_connection_profile()
+        rows, _ = _rpc_get_ethics(ids, profile.url, profile.headers(), article_context=context)
+        return rows, True
 
-
-# 롤업 행 식별자.
-# RPC `get_ethics_for_patterns`의 parent_chain SELECT가 reasoning 컬럼에 강제 주입하는 마커이며,
-# 직접 매핑된 related_to와 parent-chain rollup으로 생성된 related_to를 가르는 유일한 양성 신호다.
-# (둘 다 relation_type="related_to" / strength="moderate"로 내려오므로 relation_type만으로는 구분 불가.)
-_ROLLUP_MARKER = "parent chain rollup"
+    start_background_refresh(_fetch)
 
 
 def _build_ethics_context(refs: list[EthicsReference]) -> str:
     """규범 컨텍스트를 3섹션으로 분할: 직접 적용 / 직접 참고 / 상위 원칙.
 
-    분류 우선순위 (양성 판정만 사용):
-      1. reasoning == _ROLLUP_MARKER → 상위 원칙 (롤업 우선 판정)
-      2. relation_type == "violates" + strength in (strong|moderate) → 직접 적용
-      3. relation_type == "related_to" + strength in (strong|moderate) → 직접 참고
-      그 외(weak / exception_of 등): 무시.
+    분류·정렬·중복 제거·헤더 규칙은 EthicsContextIndex (core/ethics_index.py) 참고.
+    generate_report는 인덱스를 직접 만들어 인용 감사·스냅샷과 공유한다.
     """
-    primary_bucket: list[EthicsReference] = []
-    reference_bucket: list[EthicsReference] = []
-    rollup_bucket: list[EthicsReference] = []
-
-    for r in refs:
-        reasoning = (r.reasoning or "").strip()
-        # 롤업 판정을 먼저 한다 — relation_type을 먼저 보면 롤업이 직접 참고로 잘못 빨려든다.
-        if reasoning == _ROLLUP_MARKER:
-            rollup_bucket.append(r)
-        elif r.relation_type == "violates" and r.strength in ("strong", "moderate"):
-            primary_bucket.append(r)
-        elif r.relation_type == "related_to" and r.strength in ("strong", "moderate"):
-            reference_bucket.append(r)
-
-    # 직접 적용/직접 참고는 구체 규범(Tier 4) 우선, 상위 원칙은 상위(Tier 1) 우선.
-    primary_bucket.sort(key=lambda r: (-r.ethics_tier, r.ethics_code))
-    reference_bucket.sort(key=lambda r: (-r.ethics_tier, r.ethics_code))
-    rollup_bucket.sort(key=lambda r: (r.ethics_tier, r.ethics_code))
-
-    # 전역 중복 제거: ethics_code 기준. 같은 코드가 여러 섹션 후보면 먼저 배치된 섹션에만 남는다.
-    seen: set[str] = set()
-
-    def _emit(bucket: list[EthicsReference]) -> list[str]:
-        lines: list[str] = []
-        for r in bucket:
-            if r.ethics_code in seen:
-                continue
-            seen.add(r.ethics_code)
-            lines.append(
-                f"{_format_ethics_header(r)}\n"
-                f"{r.ethics_full_text}"
-            )
-        return lines
-
-    primary_lines = _emit(primary_bucket)
-    reference_lines = _emit(reference_bucket)
-    rollup_lines = _emit(rollup_bucket)
-
-    # 빈 섹션의 헤더는 출력하지 않는다.
-    sections: list[str] = []
-    if primary_lines:
-        sections.append("## 직접 적용 규범(인용 1순위)\n\n" + "\n\n".join(primary_lines))
-    if reference_lines:
-        sections.append("## 직접 참고 규범(보조 인용 가능)\n\n" + "\n\n".join(reference_lines))
-    if rollup_lines:
-        sections.append("## 상위 원칙(종합 평가 보조용)\n\n" + "\n\n".join(rollup_lines))
-
-    return "\n\n---\n\n".join(sections)
+    return EthicsContextIndex(refs).context_text()
 
 
 # ── Sonnet 프롬프트 (M6 — 3종 리포트) ──────────────────────────
@@ -653,6 +648,43 @@ def _robust_json_parse(text: str) -> dict:
     raise ValueError(f"JSON 파싱 4단계 모두 실패: {cleaned[:200]}...")
 
 
+def _report_parser(
+    on_report_field: Optional[Callable[[str, str], None]] = None,
+) -> StreamingJsonParser:
+    """Phase 2 응답용 증분 파서. reports.<field>가 닫히는 즉시 on_report_field 호출."""
+    def _on_field(path: tuple, value: str) -> None:
+        if (
+            on_report_field is not None
+            and len(path) == 2 and path[0] == "reports" and path[1] in _REPORT_FIELDS
+        ):
+            on_report_field(path[1], value)
+
+    return StreamingJsonParser(on_field=_on_field)
+
+
+def _parse_report_output(parser: StreamingJsonParser, raw_text: str) -> tuple[dict, bool]:
+    """스트리밍 파서 결과를 우선 사용하고, 구조가 불완전하면 _robust_json_parse로 폴백.
+
+    파서가 스트림을 받지 못한 경우(REPORT_STREAMING=0, 모킹된 호출)엔 raw_text를 1회 스캔한다.
+    반환: (result_json, _robust_json_parse 폴백 여부)
+    """
+    if not parser.chars:
+        parser.feed(raw_text)
+    parsed = parser.finish()
+    reports = parsed.get("reports") if isinstance(parsed, dict) else None
+    if (
+        parser.complete
+        and isinstance(reports, dict)
+        and all(isinstance(reports.get(f), str) and reports[f] for f in _REPORT_FIELDS)
+    ):
+        return parsed, False
+    logger.warning(
+        f"스트리밍 파서 결과 불완전(complete={parser.complete}, truncated={parser.truncated}) "
+        "→ _robust_json_parse 폴백"
+    )
+    return _robust_json_parse(raw_text), True
+
+
 # ── Sonnet 호출 ──────────────────────────────────────────────────
 
 def call_sonnet(
@@ -662,9 +694,17 @@ def call_sonnet(
     ethics_context: str,
     meta_pattern_block: str = "",
     frame_pattern_block: str = "",
+    on_text: Optional[Callable[[str], None]] = None,
+    ledger: Optional[UsageLedger] = None,
 ) -> tuple[str, int, int]:
-    """Sonnet을 호출하여 3종 리포트 생성. (raw_text, input_tokens, output_tokens)."""
-    client = Anthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+    """Sonnet을 호출하여 3종 리포트 생성. (raw_text, input_tokens, output_tokens).
+
+    on_text를 주면 스트리밍으로 호출하고 텍스트 델타가 도착할 때마다 전달한다.
+    ledger를 주면 응답 usage(캐시 읽기·쓰기 토큰 포함)를 phase2 호출로 기록한다.
+    STRUCTURED_OUTPUT=1 이면 submit_reports tool을 강제 선택하고 tool input JSON을
+    raw_text로 반환한다 (스트리밍 시 input_json 델타를 on_text로 전달).
+    """
+    client = get_client(Anthropic, "ANTHROPIC_API_KEY")
 
     user_message = f"""## 1차 분석 결과 (Sonnet Solo 패턴 식별)
 
@@ -690,7 +730,7 @@ def call_sonnet(
 ## 기사 전문
 {article_text}"""
 
-    response = client.messages.create(
+    request = dict(
         model=SONNET_MODEL,
         # Sonnet 5 토크나이저는 동일 텍스트를 ~30% 더 많은 토큰으로 계산한다.
         # 배포 후 usage.output_tokens 로그를 관찰하고 필요시 후속 커밋에서 조정할 것.
@@ -710,7 +750,38 @@ def call_sonnet(
         messages=[{"role": "user", "content": user_message}],
     )
 
-    report = response.content[0].text
+    tool_mode = structured_output.output_mode() == structured_output.MODE_TOOL
+    if tool_mode:
+        request.update(structured_output.tool_request(structured_output.REPORT_TOOL))
+
+    with tracing.span("anthropic.messages.phase2", {
+        "gen_ai.system": "anthropic", "gen_ai.request.model": SONNET_MODEL,
+        "crcheck.streaming": on_text is not None, "crcheck.tool_mode": tool_mode,
+    }) as sp:
+        if on_text is not None:
+            with client.messages.stream(**request) as stream:
+                for event in stream:
+                    if event.type == "text":
+                        on_text(event.text)
+                    elif event.type == "input_json":
+                        on_text(event.partial_json)
+                response = stream.get_final_message()
+        else:
+            response = client.messages.create(**request)
+        tracing.record_llm_usage(sp, response)
+    if ledger is not None:
+        ledger.record("phase2", SONNET_MODEL, response.usage)
+
+    tool_input = (
+        structured_output.extract_tool_input(response, structured_output.REPORT_TOOL["name"])
+        if tool_mode else None
+    )
+    if tool_input is not None:
+        report = json.dumps(tool_input, ensure_ascii=False)
+    else:
+        if tool_mode:
+            logger.warning("리포트 tool_use 블록 없음 → 텍스트 JSON 파싱 폴백")
+        report = structured_output.response_text(response)
     in_tok = response.usage.input_tokens
     out_tok = response.usage.output_tokens
     return report, in_tok, out_tok
@@ -718,6 +789,12 @@ def call_sonnet(
 
 # ── 메인 함수 ────────────────────────────────────────────────────
 
+def _backoff(seconds: float, reason: str) -> None:
+    """generate_report 재시도 대기 — 트레이스에서 백오프 구간이 보이도록 span으로 감싼다."""
+    with tracing.span("phase2.backoff", {"crcheck.reason": reason, "crcheck.wait_seconds": seconds}):
+        time.sleep(seconds)
+
+
 def _build_meta_pattern_block(meta_patterns: list) -> str:
     # [DEPRECATED] 메타 패턴 비활성화로 현재 활성 파이프라인에서는 메타 블록이 주입되지 않음.
     """메타 패턴 발동 시 Sonnet 프롬프트에 주입할 블록을 생성."""
@@ -787,6 +864,8 @@ def generate_report(
     overall_assessment: str = "",
     meta_patterns: list = None,
     article_context: str = 'general',
+    on_report_field: Optional[Callable[[str, str], None]] = None,
+    usage: Optional[UsageLedger] = None,
 ) -> ReportResult:
     """확정 패턴으로 규범 조회 후 Sonnet 3종 리포트 생성.
 
@@ -796,6 +875,9 @@ def generate_report(
         detections: Sonnet Solo 확정 결과 (dict 리스트)
         overall_assessment: Devil's Advocate CoT 판단 (컨텍스트용)
         meta_patterns: 발동된 MetaPatternResult 리스트 (optional)
+        on_report_field: 스트리밍 중 리포트 필드가 완성될 때마다 (field, text) 호출 (optional).
+            재시도가 일어나면 같은 필드가 다시 전달될 수 있다.
+        usage: 호출 원장 (optional). 주면 최종 실패로 예외가 나도 시도별 기록이 남는다.
 
     Returns:
         ReportResult (3종 리포트 + article_analysis)
@@ -803,10 +885,13 @@ def generate_report(
     sb_url, sb_key = _get_supabase_config()
 
     # 1. 규범 조회
+    lap = time.monotonic()
     ethics_refs = fetch_ethics_for_patterns(
         pattern_ids, sb_url, sb_key, article_context=article_context,
     )
-    ethics_context = _build_ethics_context(ethics_refs)
+    metrics.observe_stage("ethics_fetch", time.monotonic() - lap)
+    ethics_index = EthicsContextIndex(ethics_refs)
+    ethics_context = ethics_index.context_text()
 
     # 2. detections JSON 문자열
     detections_json = json.dumps(detections, ensure_ascii=False, indent=2)
@@ -820,15 +905,32 @@ def generate_report(
 
     # 3. Sonnet 호출 (3종 JSON 반환) + 재시도 로직
     max_retries = 5
+    output_mode = structured_output.output_mode()
+    started = time.monotonic()
+    parse_fallbacks = 0
+    ledger = usage if usage is not None else UsageLedger()
 
     for attempt in range(max_retries):
+        recorded = len(ledger)
         try:
+            parser = _report_parser(on_report_field)
+            lap = time.monotonic()
             raw_text, in_tok, out_tok = call_sonnet(
                 article_text, detections_json, overall_assessment, ethics_context,
                 meta_pattern_block=meta_block,
                 frame_pattern_block=frame_block,
+                on_text=parser.feed if REPORT_STREAMING else None,
+                ledger=ledger,
             )
-            result_json = _robust_json_parse(raw_text)
+            metrics.observe_stage("phase2_llm", time.monotonic() - lap)
+            # 재시도로 버려진 응답도 과금되므로 시도마다 누적
+            metrics.add_tokens(SONNET_MODEL, "phase2", input_tokens=in_tok, output_tokens=out_tok)
+            lap = time.monotonic()
+            result_json, parse_fallback = _parse_report_output(parser, raw_text)
+            metrics.observe_stage("phase2_parse", time.monotonic() - lap)
+            parse_fallbacks += parse_fallback
+            if parse_fallback:
+                metrics.PARSE_FALLBACKS.inc(phase="phase2")
 
             # 구조 검증
             if "reports" not in result_json:
@@ -844,13 +946,23 @@ def generate_report(
                 reports=reports,
                 article_analysis=article_analysis,
                 ethics_refs=ethics_refs,
+                ethics_index=ethics_index,
                 sonnet_raw_response=raw_text,
                 input_tokens=in_tok,
                 output_tokens=out_tok,
+                output_mode=output_mode,
+                attempts=attempt + 1,
+                parse_fallbacks=parse_fallbacks,
+                seconds=round(time.monotonic() - started, 3),
+                usage=ledger,
             )
         except anthropic.APIStatusError as e:
             # (A) API status 오류 — 529/429/그 외로 분기
             status = getattr(e, "status_code", None)
+            ledger.record("phase2", SONNET_MODEL, outcome=f"status_{status}")
+            metrics.LLM_FAILED_ATTEMPTS.inc(
+                phase="phase2", reason=str(status) if status in (429, 529) else f"status_{status}",
+            )
             if status == 529:
                 # 과부하: 긴 백오프 (10/20/40/60/60초)
                 wait = min(10 * (2 ** attempt), 60)
@@ -859,7 +971,7 @@ def generate_report(
                 )
                 if attempt == max_retries - 1:
                     raise ValueError(f"API 과부하(529) 최종 실패: {e}")
-                time.sleep(wait)
+                _backoff(wait, "529")
             elif status == 429:
                 # 한도 초과: 재시도 없이 즉시 실패
                 logger.error(f"API 한도 초과(429): {e}")
@@ -872,22 +984,29 @@ def generate_report(
                 )
                 if attempt == max_retries - 1:
                     raise ValueError(f"리포트 생성 최종 실패: {e}")
-                time.sleep(2 ** attempt)
+                _backoff(2 ** attempt, f"status_{status}")
         except (json.JSONDecodeError, ValueError) as e:
             # (B) JSON 파싱 실패 또는 구조 검증 실패
+            metrics.LLM_FAILED_ATTEMPTS.inc(phase="phase2", reason="parse")
+            ledger.mark(recorded, "parse")
             logger.error(
                 f"리포트 생성 시도 {attempt + 1}/{max_retries} 실패: "
                 f"[{type(e).__name__}] {e}"
             )
             if attempt == max_retries - 1:
                 raise ValueError(f"리포트 생성 최종 실패: {e}")
-            time.sleep(2 ** attempt)
+            _backoff(2 ** attempt, "parse")
         except Exception as e:
             # (C) 그 외 예외
+            metrics.LLM_FAILED_ATTEMPTS.inc(phase="phase2", reason="error")
+            if len(ledger) == recorded:
+                ledger.record("phase2", SONNET_MODEL, outcome="error")
+            else:
+                ledger.mark(recorded, "error")
             logger.error(
                 f"리포트 생성 시도 {attempt + 1}/{max_retries} 실패: "
                 f"[{type(e).__name__}] {e}"
             )
             if attempt == max_retries - 1:
                 raise ValueError(f"리포트 생성 최종 실패: {e}")
-            time.sleep(2 ** attempt)
+            _backoff(2 ** attempt, "error")
@@ -0,0 +1,310 @@
+# backend/core/resilience.py
+"""
+CR-Check — Supabase RPC 복원력 계층 (서킷 브레이커 + 지터 백오프 + 헤지 요청)
+
+고정 time.sleep 재시도 대신:
+- 헤지: primary 응답이 그 RPC의 최근 지연 p95(표본 부족 시 RPC_HEDGE_DEFAULT_SECONDS)를
+  넘기면 두 번째 요청(hedge)을 동시에 띄우고 먼저 온 유효 응답을 쓴다.
+- 재시도: 예외·무효 응답 시 full-jitter 지수 백오프(RPC_BACKOFF_BASE_SECONDS 기준)로 재시도.
+- 서킷 브레이커: 연속 실패 RPC_BREAKER_THRESHOLD회면 RPC_BREAKER_RESET_SECONDS 동안
+  primary를 건너뛰고 바로 fallback (half-open 1회 시도로 복구 확인).
+- 계측: RPC별 호출·오류·헤지·헤지 승리·fallback·차단 카운터와 지연 p50/p95/p99.
+  rpc_stats_snapshot()으로 내보낸다.
+
+사용:
+    outcome = get_rpc("get_ethics_for_patterns").call(primary, fallback=..., accept=bool)
+    outcome.value, outcome.source  # "primary" | "hedge" | "fallback"
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+HEDGE_PERCENTILE = float(os.environ.get("RPC_HEDGE_PERCENTILE", "95"))
+HEDGE_DEFAULT_SECONDS = float(os.environ.get("RPC_HEDGE_DEFAULT_SECONDS", "2.0"))
+HEDGE_MIN_SECONDS = float(os.environ.get("RPC_HEDGE_MIN_SECONDS", "0.3"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("RPC_HEDGE_MIN_SAMPLES", "20"))
+MAX_ATTEMPTS = int(os.environ.get("RPC_MAX_ATTEMPTS", "2"))
+BACKOFF_BASE_SECONDS = float(os.environ.get("RPC_BACKOFF_BASE_SECONDS", "0.25"))
+BACKOFF_MAX_SECONDS = float(os.environ.get("RPC_BACKOFF_MAX_SECONDS", "2.0"))
+BREAKER_THRESHOLD = int(os.environ.get("RPC_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("RPC_BREAKER_RESET_SECONDS", "30"))
+CALL_TIMEOUT_SECONDS = float(os.environ.get("RPC_CALL_TIMEOUT_SECONDS", "30"))
+
+_LATENCY_WINDOW = 256
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있고 fallback이 없을 때."""
+
+
+@dataclass
+class RpcOutcome(Generic[T]):
+    value: T
+    source: str  # "primary" | "hedge" | "fallback"
+    seconds: float
+
+
+class CircuitBreaker:
+    """연속 실패 기반 서킷 브레이커 (closed → open → half-open)."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+class ResilientRpc:
+    """RPC 하나에 대한 헤지·재시도·서킷 브레이커·계측."""
+
+    def __init__(
+        self,
+        name: str,
+        executor: Optional[ThreadPoolExecutor] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_attempts: int = MAX_ATTEMPTS,
+        hedge_percentile: float = HEDGE_PERCENTILE,
+        hedge_default_seconds: float = HEDGE_DEFAULT_SECONDS,
+        hedge_min_seconds: float = HEDGE_MIN_SECONDS,
+        hedge_min_samples: int = HEDGE_MIN_SAMPLES,
+        backoff_base_seconds: float = BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = BACKOFF_MAX_SECONDS,
+        timeout_seconds: float = CALL_TIMEOUT_SECONDS,
+    ):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker()
+        self.max_attempts = max(1, max_attempts)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_default_seconds = hedge_default_seconds
+        self.hedge_min_seconds = hedge_min_seconds
+        self.hedge_min_samples = hedge_min_samples
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.timeout_seconds = timeout_seconds
+        self._executor = executor or _shared_executor()
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self.counters = {
+            "calls": 0, "errors": 0, "invalid": 0, "retries": 0,
+            "hedges": 0, "hedge_wins": 0, "fallbacks": 0, "short_circuits": 0,
+        }
+
+    # ── 계측 ────────────────────────────────────────────────────
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += n
+
+    def _observe(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        idx = min(len(samples) - 1, max(0, round(p / 100 * (len(samples) - 1))))
+        return samples[idx]
+
+    def hedge_delay(self) -> float:
+        """헤지 발사 시점 — 최근 지연 p{hedge_percentile}, 표본 부족 시 기본값."""
+        if len(self._latencies) < self.hedge_min_samples:
+            return self.hedge_default_seconds
+        return max(self.hedge_min_seconds, self.percentile(self.hedge_percentile) or 0.0)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+            n = len(self._latencies)
+        return {
+            **counters,
+            "breaker": self.breaker.state,
+            "latency_samples": n,
+            "latency_p50": self.percentile(50),
+            "latency_p95": self.percentile(95),
+            "latency_p99": self.percentile(99),
+        }
+
+    # ── 호출 ────────────────────────────────────────────────────
+
+    def call(
+        self,
+        primary: Callable[[], T],
+        fallback: Optional[Callable[[], T]] = None,
+        accept: Callable[[T], bool] = lambda value: True,
+        hedge: bool = True,
+    ) -> RpcOutcome[T]:
+        """primary를 헤지·재시도로 호출하고, 모두 실패하면 fallback.
+
+        accept(value)가 False인 응답(예: 0건)은 무효로 보고 재시도하되
+        서킷 실패로는 세지 않는다 (서버 오류가 아님).
+        """
+        started = time.monotonic()
+        self._count("calls")
+        last_value: Any = None
+        last_error: Optional[BaseException] = None
+        have_value = False
+
+        if not self.breaker.allow():
+            self._count("short_circuits")
+            logger.warning(f"[{self.name}] 서킷 open — primary 생략")
+        else:
+            for attempt in range(self.max_attempts):
+                if attempt:
+                    self._count("retries")
+                    time.sleep(self._backoff(attempt))
+                    if not self.breaker.allow():
+                        self._count("short_circuits")
+                        break
+                try:
+                    value, source = self._hedged(primary, accept, hedge)
+                except Exception as e:
+                    last_error = e
+                    self._count("errors")
+                    self.breaker.record_failure()
+                    logger.warning(f"[{self.name}] 시도 {attempt + 1} 실패 [{type(e).__name__}]: {e}")
+                    continue
+                self.breaker.record_success()
+                last_value, have_value = value, True
+                if accept(value):
+                    return RpcOutcome(value, source, time.monotonic() - started)
+                self._count("invalid")
+                logger.warning(f"[{self.name}] 시도 {attempt + 1} 무효 응답")
+
+        if fallback is not None:
+            self._count("fallbacks")
+            value = fallback()
+            return RpcOutcome(value, "fallback", time.monotonic() - started)
+        if have_value:
+            return RpcOutcome(last_value, "primary", time.monotonic() - started)
+        if last_error is not None:
+            raise last_error
+        raise CircuitOpenError(f"{self.name}: circuit open")
+
+    def _backoff(self, attempt: int) -> float:
+        """full jitter: U(0, min(max, base·2^attempt))."""
+        cap = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    def _timed(self, fn: Callable[[], T]) -> T:
+        started = time.monotonic()
+        value = fn()
+        self._observe(time.monotonic() - started)
+        return value
+
+    def _hedged(self, primary: Callable[[], T], accept: Callable[[T], bool], hedge: bool) -> tuple[T, str]:
+        """primary 1회 + (지연 시) 헤지 1회. 먼저 온 유효 응답, 없으면 마지막 응답/예외."""
+        deadline = time.monotonic() + self.timeout_seconds
+        # 워커 스레드에서도 호출자 span 아래에 붙도록 컨텍스트 전달 (트레이싱 비활성 시 그대로)
+        primary = tracing.bind(primary)
+        futures: dict[Future, str] = {self._executor.submit(self._timed, primary): "primary"}
+        done, _ = wait(futures, timeout=self.hedge_delay() if hedge else None)
+        if not done and hedge:
+            self._count("hedges")
+            futures[self._executor.submit(self._timed, primary)] = "hedge"
+
+        last: Optional[tuple[T, str]] = None
+        last_error: Optional[BaseException] = None
+        remaining = set(futures)
+        while remaining:
+            done, _ = wait(remaining, timeout=max(0.0, deadline - time.monotonic()),
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError(f"{self.name}: {self.timeout_seconds:.0f}s 초과")
+            for future in done:
+                remaining.discard(future)
+                source = futures[future]
+                try:
+                    value = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if accept(value):
+                    if source == "hedge":
+                        self._count("hedge_wins")
+                    return value, source
+                last = (value, source)
+        if last is not None:
+            return last
+        assert last_error is not None
+        raise last_error
+
+
+# ── 프로세스 전역 레지스트리 ──────────────────────────────────────
+
+_executor: Optional[ThreadPoolExecutor] = None
+_registry: dict[str, ResilientRpc] = {}
+_registry_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _registry_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("RPC_MAX_WORKERS", "16")),
+                thread_name_prefix="rpc",
+            )
+        return _executor
+
+
+def get_rpc(name: str) -> ResilientRpc:
+    """이름별 ResilientRpc (최초 호출 시 생성)."""
+    rpc = _registry.get(name)
+    if rpc is None:
+        executor = _shared_executor()
+        with _registry_lock:
+            rpc = _registry.setdefault(name, ResilientRpc(name, executor=executor))
+    return rpc
+
+
+def rpc_stats_snapshot() -> dict[str, dict[str, Any]]:
+    """RPC별 카운터·지연 분위수 (관측용)."""
+    return {name: rpc.snapshot() for name, rpc in list(_registry.items())}
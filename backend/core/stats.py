@@ -0,0 +1,148 @@
+# backend/core/stats.py
+"""
+CR-Check — 통계 RPC 조회 + 프로세스 내 응답 캐시 (대시보드 API용)
+
+get_trending_articles / get_publisher_stats / get_overall_stats는
+20261019000300부터 롤업 테이블을 읽는다. 대시보드 폴링이 몰려도 RPC는
+키(함수 × 인자)당 STATS_CACHE_TTL_SECONDS마다 한 번만 나간다.
+
+- 동시 만료: 키별 락으로 한 요청만 RPC를 호출하고 나머지는 그 결과를 쓴다.
+- RPC 실패: 직전 값이 있으면 만료됐어도 그대로 반환 (stale) — 대시보드가 비지 않게.
+  직전 값도 없으면 StatsUnavailable.
+- 응답마다 ETag(본문 해시) — main.py가 If-None-Match에 304로 응답한다.
+- RPC 호출은 resilience.get_rpc(이름) 경유 (지연 분위수·서킷이 /health "rpc"에 노출).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import httpx
+
+from .db import get_connection_profile
+from .resilience import get_rpc
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_TTL_SECONDS = float(os.environ.get("STATS_CACHE_TTL_SECONDS", "60"))
+TRENDING_MAX_HOURS = 24 * 7
+
+
+class StatsUnavailable(RuntimeError):
+    """통계 RPC 실패 + 캐시된 값 없음."""
+
+
+@dataclass(frozen=True)
+class StatsEntry:
+    data: Any
+    etag: str
+    fetched_at: float  # time.time()
+    stale: bool = False
+
+    @property
+    def age_seconds(self) -> int:
+        return max(int(time.time() - self.fetched_at), 0)
+
+
+def _etag(data: Any) -> str:
+    body = json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:16] + '"'
+
+
+class StatsCache:
+    """(RPC 이름, 인자) → StatsEntry. TTL 만료 후 첫 요청만 다시 조회."""
+
+    def __init__(self, ttl_seconds: float = STATS_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[tuple, tuple[float, StatsEntry]] = {}  # key → (monotonic 만료, entry)
+        self._locks: dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key: tuple, loader: Callable[[], Any]) -> StatsEntry:
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+        with self._key_lock(key):
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            try:
+                data = loader()
+            except Exception as e:
+                if cached is None:
+                    raise StatsUnavailable(f"{key[0]}: {type(e).__name__}: {e}") from e
+                self.stale_served += 1
+                logger.warning(f"통계 조회 실패 — 이전 값 반환 {key} [{type(e).__name__}]: {e}")
+                return StatsEntry(cached[1].data, cached[1].etag, cached[1].fetched_at, stale=True)
+            entry = StatsEntry(data, _etag(data), time.time())
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, entry)
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+_cache = StatsCache()
+
+
+def get_stats_cache() -> StatsCache:
+    return _cache
+
+
+def _call_rpc(name: str, params: dict) -> list[dict]:
+    profile = get_connection_profile()
+
+    def _primary() -> list[dict]:
+        r = httpx.post(
+            f"{profile.url}/rest/v1/rpc/{name}", headers=profile.headers(), json=params, timeout=10,
+        )
+        r.raise_for_status()
+        return r.json()
+
+    # 통계는 읽기 전용·저빈도(캐시 뒤) — 헤지 없이 재시도·서킷만 사용
+    return get_rpc(name).call(_primary, hedge=False).value
+
+
+def trending_articles(hours: int = 24) -> StatsEntry:
+    hours = min(max(int(hours), 1), TRENDING_MAX_HOURS)
+    return _cache.get(
+        ("get_trending_articles", hours),
+        lambda: _call_rpc("get_trending_articles", {"hours_ago": hours}),
+    )
+
+
+def publisher_stats() -> StatsEntry:
+    return _cache.get(("get_publisher_stats",), lambda: _call_rpc("get_publisher_stats", {}))
+
+
+def overall_stats() -> StatsEntry:
+    def _load() -> dict:
+        rows = _call_rpc("get_overall_stats", {})
+        return rows[0] if rows else {"total_articles": 0, "total_analyses": 0, "avg_duration": None}
+
+    return _cache.get(("get_overall_stats",), _load)
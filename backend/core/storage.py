@@ -3,8 +3,13 @@
 CR-Check — Phase D 분석 결과 아카이빙 모듈
 
 - get_cached_analysis(url): URL 정규화 → articles + analysis_results 조회 → 캐시 응답
-- save_analysis_result(...): articles UPSERT → share_id 생성 → analysis_results INSERT
+- save_analysis_result(...): save_analysis RPC 1회 호출 — articles UPSERT · share_id 생성 ·
+  analysis_results · 윤리 스냅샷을 DB 함수 한 트랜잭션으로 저장
+  (RPC 미배포 DB에서는 기존 다단계 REST 경로로 폴백)
+- build_analysis_payload(...) / save_analysis_payload(payload): 위 저장을 payload 단위로 분리
+  (core.persistence 백그라운드 큐·스풀이 payload를 JSONL로 보관했다가 저장)
 - normalize_url(url): 트래킹 파라미터 제거로 캐시 키 안정화
+- /metrics: 캐시 조회 hit/miss/error, 저장 소요(save 단계)·경로(rpc/legacy)별 결과
 
 설계 원칙:
 - 모든 DB 호출 실패는 logger.error로만 남기고 None 반환 (graceful degradation).
@@ -14,11 +19,16 @@ CR-Check — Phase D 분석 결과 아카이빙 모듈
 
 import logging
 import secrets
+import time
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
 
 import httpx
 
 from .db import _get_supabase_config
+from .ethics_index import EthicsContextIndex
+from . import metrics
+from . import tracing
+from .usage import UsageLedger
 # T0: phase1_model 하드코딩 제거 — pattern_matcher.SONNET_MODEL 단일 소스 참조
 from . import pattern_matcher as _pattern_matcher_mod
 # phase2_model도 동일하게 report_generator.SONNET_MODEL 단일 소스 참조
@@ -45,6 +55,7 @@ def normalize_url(url: str) -> str:
 
 # ── 캐시 조회 ───────────────────────────────────────────────────
 
+@tracing.traced("storage.cache_lookup")
 def get_cached_analysis(url: str) -> dict | None:
     """URL로 기존 분석 결과를 조회한다. 없거나 실패하면 None."""
     normalized = normalize_url(url)
@@ -72,12 +83,15 @@ def get_cached_analysis(url: str) -> dict | None:
         logger.error(
             f"캐시 조회(articles) 실패: HTTP {e.response.status_code} - {e.response.text[:300]}"
         )
+        metrics.CACHE_LOOKUPS.inc(cache="analysis", result="error")
         return None
     except Exception as e:
         logger.error(f"캐시 조회(articles) 중 예기치 못한 에러 [{type(e).__name__}]: {e}")
+        metrics.CACHE_LOOKUPS.inc(cache="analysis", result="error")
         return None
 
     if not articles:
+        metrics.CACHE_LOOKUPS.inc(cache="analysis", result="miss")
         return None
 
     article = articles[0]
@@ -102,14 +116,17 @@ def get_cached_analysis(url: str) -> dict | None:
         logger.error(
             f"캐시 조회(analysis_results) 실패: HTTP {e.response.status_code} - {e.response.text[:300]}"
         )
+        metrics.CACHE_LOOKUPS.inc(cache="analysis", result="error")
         return None
     except Exception as e:
         logger.error(
             f"캐시 조회(analysis_results) 중 예기치 못한 에러 [{type(e).__name__}]: {e}"
         )
+        metrics.CACHE_LOOKUPS.inc(cache="analysis", result="error")
         return None
 
     if not rows:
+        metrics.CACHE_LOOKUPS.inc(cache="analysis", result="miss")
         return None
 
     ar = rows[0]
@@ -128,6 +145,7 @@ def get_cached_analysis(url: str) -> dict | None:
         if article_analysis.get(key):
             article_info[key] = article_analysis[key]
 
+    metrics.CACHE_LOOKUPS.inc(cache="analysis", result="hit")
     return {
         "article_info": article_info,
         "reports": {
@@ -208,6 +226,34 @@ def get_analysis_by_share_id(share_id: str) -> dict | None:
     }
 
 
+def report_from_payload(payload: dict) -> dict:
+    """저장 대기 중인 payload를 get_analysis_by_share_id와 같은 응답 형태로 변환.
+
+    fire-and-forget 저장이 끝나기 전에 공유 URL이 열려도 같은 결과를 보여 주기 위함.
+    """
+    article = payload.get("article") or {}
+    record = payload.get("result") or {}
+    article_info = {
+        "title": article.get("title", ""),
+        "url": article.get("url", ""),
+        "publisher": article.get("publisher"),
+        "publishDate": article.get("publish_date"),
+        "journalist": article.get("journalist"),
+        **(record.get("article_analysis") or {}),
+    }
+    return {
+        "article_info": article_info,
+        "reports": {
+            "comprehensive": record.get("comprehensive_report") or "",
+            "journalist": record.get("journalist_report") or "",
+            "student": record.get("student_report") or "",
+        },
+        "share_id": payload.get("share_id"),
+        "analyzed_at": payload.get("queued_at"),
+        "is_cached": True,
+    }
+
+
 # ── 결과 저장 ───────────────────────────────────────────────────
 
 def _normalize_publish_date(s: str | None) -> str | None:
@@ -251,6 +297,7 @@ def _normalize_publish_date(s: str | None) -> str | None:
     return None
 
 
+@tracing.traced("storage.articles_upsert")
 def _upsert_article(
     sb_url: str,
     headers: dict,
@@ -298,52 +345,33 @@ def _upsert_article(
         return None
 
 
+def _select_snapshot_targets(ethics_refs: list) -> list:
+    """스냅샷 대상 규범 선별 — ethics_code 기준 중복 제거 (등장 순서 유지).
+
+    1차: violates + (strong|moderate). 1건 이상이면 이를 사용.
+    2차: 1차가 0건이면 related_to + (strong|moderate)로 fallback.
+    """
+    return EthicsContextIndex(ethics_refs).snapshot_targets()
+
+
+@tracing.traced("storage.ethics_snapshot_insert")
 def _insert_ethics_snapshot(
     sb_url: str,
     headers: dict,
     analysis_id: int,
-    ethics_refs: list,
+    snapshots: list[dict],
 ) -> None:
-    """analysis_ethics_snapshot에 핵심 규범 스냅샷을 배치 INSERT.
+    """analysis_ethics_snapshot에 핵심 규범 스냅샷을 배치 INSERT (레거시 REST 경로).
 
-    1차: violates + (strong|moderate). 1건 이상이면 이를 사용.
-    2차: 1차가 0건이면 related_to + (strong|moderate)로 fallback.
-    둘 다 0건이면 건너뜀. 실패해도 logger.warning만 남기고 반환.
+    snapshots는 payload["snapshots"] — _select_snapshot_targets로 선별·중복 제거된
+    {"ethics_code", "snapshot_full_text"} 목록. 0건이면 건너뜀.
+    실패해도 logger.warning만 남기고 반환.
     """
-    # 1. 스냅샷 대상 필터 (primary 우선, fallback reference)
-    primary = [
-        r for r in ethics_refs
-        if getattr(r, "relation_type", "") == "violates"
-        and getattr(r, "strength", "") in ("strong", "moderate")
-    ]
-    if primary:
-        targets = primary
-    else:
-        targets = [
-            r for r in ethics_refs
-            if getattr(r, "relation_type", "") == "related_to"
-            and getattr(r, "strength", "") in ("strong", "moderate")
-        ]
-
-    if not targets:
-        logger.info("스냅샷 대상 규범 0건, 건너뜀")
-        return
-
-    # 2. ethics_code 기준 중복 제거 (등장 순서 유지)
-    seen: set[str] = set()
-    unique_targets: list = []
-    for r in targets:
-        code = getattr(r, "ethics_code", "")
-        if not code or code in seen:
-            continue
-        seen.add(code)
-        unique_targets.append(r)
-
-    if not unique_targets:
+    if not snapshots:
         logger.info("스냅샷 대상 규범 0건, 건너뜀")
         return
 
-    codes = [getattr(r, "ethics_code") for r in unique_targets]
+    codes = [s["ethics_code"] for s in snapshots]
 
     # 3. ethics_codes 배치 SELECT — code → (id, version) 조회
     try:
@@ -386,8 +414,8 @@ def _insert_ethics_snapshot(
 
     # 5. 스냅샷 rows 구성
     snapshot_rows: list[dict] = []
-    for r in unique_targets:
-        code = getattr(r, "ethics_code", "")
+    for snap in snapshots:
+        code = snap["ethics_code"]
         if code not in code_map:
             logger.warning(f"스냅샷 매핑 누락, 건너뜀: code={code}")
             continue
@@ -395,7 +423,7 @@ def _insert_ethics_snapshot(
         snapshot_rows.append({
             "analysis_id": analysis_id,
             "ethics_code_id": ec_id,
-            "snapshot_full_text": getattr(r, "ethics_full_text", "") or "",
+            "snapshot_full_text": snap.get("snapshot_full_text") or "",
             "snapshot_version": ec_version,
         })
 
@@ -428,37 +456,13 @@ def _insert_ethics_snapshot(
         )
 
 
-def save_analysis_result(
-    url: str,
-    title: str,
-    publisher: str | None,
-    journalist: str | None,
-    publish_date: str | None,
-    result,  # pipeline.AnalysisResult — 순환 import 회피용 untyped
-    ethics_refs: list | None = None,  # report_generator.EthicsReference 리스트 (순환 import 회피)
-    citation_audit: dict | None = None,  # S6: 관측 전용 metadata. 사용자-facing 노출 금지.
-    phase1_forensic: dict | None = None,  # T0: 관측 전용 Phase 1 포렌식. 사용자-facing 노출 금지.
-) -> str | None:
-    """분석 결과를 DB에 저장하고 share_id를 반환한다.
-
-    실패 시 None 반환 (파이프라인은 막지 않음).
-    """
-    normalized = normalize_url(url)
-    sb_url, sb_key = _get_supabase_config()
-    headers = {
-        "apikey": sb_key,
-        "Authorization": f"Bearer {sb_key}",
-        "Content-Type": "application/json",
-    }
-
-    # 1. articles UPSERT
-    article_id = _upsert_article(
-        sb_url, headers, normalized, title, publisher, journalist, publish_date,
-    )
-    if article_id is None:
-        return None
-
-    # 2. detected_patterns 직렬화
+def _build_result_record(
+    result,
+    citation_audit: dict | None,
+    phase1_forensic: dict | None,
+) -> dict:
+    """analysis_results 한 행 (article_id·share_id 제외)을 구성한다."""
+    # detected_patterns 직렬화
     pm = result.pattern_result
     validated_codes = pm.validated_pattern_codes if pm else set()
     detected_patterns = [
@@ -472,7 +476,7 @@ def save_analysis_result(
         if d.pattern_code in validated_codes
     ]
 
-    # 3. meta_patterns 직렬화 (실제 MetaPatternResult 필드명 사용)
+    # meta_patterns 직렬화 (실제 MetaPatternResult 필드명 사용)
     meta_patterns_payload = [
         {
             "meta_code": m.meta_pattern_code,
@@ -485,13 +489,13 @@ def save_analysis_result(
         for m in (result.meta_patterns or [])
     ]
 
-    # 4. 리포트와 article_analysis 추출
+    # 리포트와 article_analysis 추출
     rr = result.report_result
     reports_dict = rr.reports if rr else {}
     article_analysis_payload = rr.article_analysis if rr else {}
+    usage = getattr(result, "usage", None)
 
-    base_record = {
-        "article_id": article_id,
+    return {
         "comprehensive_report": reports_dict.get("comprehensive", ""),
         "journalist_report": reports_dict.get("journalist", ""),
         "student_report": reports_dict.get("student", ""),
@@ -506,21 +510,216 @@ def save_analysis_result(
         "citation_audit": citation_audit,
         # T0: 관측 전용 Phase 1 포렌식 축약본 (JSONB)
         "phase1_forensic": phase1_forensic,
+        # 관측 전용 API 사용량·비용 원장 (JSONB, core.usage)
+        "usage_ledger": usage.to_json() if isinstance(usage, UsageLedger) and len(usage) else None,
+    }
+
+
+# save_analysis RPC 사용 가능 여부. None=미확인, False=함수 없음 (프로세스 수명 동안 레거시 경로)
+_rpc_available: bool | None = None
+
+
+# analysis_results.usage_ledger 컬럼 존재 여부 (20261019000500). False면 레거시 INSERT에서 제외
+_usage_ledger_column: bool | None = None
+
+
+def _is_column_missing(response: httpx.Response, column: str) -> bool:
+    """PostgREST가 컬럼을 찾지 못했다는 응답인지 판정 (PGRST204)."""
+    return "PGRST204" in response.text and column in response.text
+
+
+def _is_rpc_missing(response: httpx.Response) -> bool:
+    """PostgREST가 함수를 찾지 못했다는 응답인지 판정 (PGRST202 / 404)."""
+    return response.status_code == 404 or "PGRST202" in response.text
+
+
+@tracing.traced("storage.save_analysis_rpc")
+def _save_via_rpc(sb_url: str, headers: dict, payload: dict) -> tuple[bool, str | None]:
+    """rpc/save_analysis 1회 호출로 저장. (RPC 사용 가능 여부, share_id) 반환.
+
+    articles UPSERT · share_id 생성 · analysis_results · 스냅샷이
+    DB 함수 안에서 한 트랜잭션으로 처리된다 (중간 실패 시 전체 롤백).
+    """
+    global _rpc_available
+    try:
+        r = httpx.post(
+            f"{sb_url}/rest/v1/rpc/save_analysis",
+            headers=headers,
+            json={"payload": payload},
+            timeout=20,
+        )
+        if _is_rpc_missing(r):
+            _rpc_available = False
+            logger.warning("save_analysis RPC 없음 (마이그레이션 미적용) → 레거시 REST 저장 경로 사용")
+            return False, None
+        r.raise_for_status()
+        _rpc_available = True
+        share_id = r.json()
+        if not isinstance(share_id, str) or not share_id:
+            logger.error(f"save_analysis RPC: 응답에 share_id 없음 (응답={share_id!r})")
+            return True, None
+        return True, share_id
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            f"save_analysis RPC 실패: HTTP {e.response.status_code} - {e.response.text[:300]}"
+        )
+        return True, None
+    except Exception as e:
+        logger.error(f"save_analysis RPC 중 예기치 못한 에러 [{type(e).__name__}]: {e}")
+        return True, None
+
+
+def new_share_id() -> str:
+    """공유 URL용 share_id 발급 (12자 URL-safe). DB 저장 전에 먼저 발급할 수 있다."""
+    return secrets.token_urlsafe(9)
+
+
+def build_analysis_payload(
+    url: str,
+    title: str,
+    publisher: str | None,
+    journalist: str | None,
+    publish_date: str | None,
+    result,  # pipeline.AnalysisResult — 순환 import 회피용 untyped
+    ethics_refs: list | None = None,  # report_generator.EthicsReference 리스트 (순환 import 회피)
+    citation_audit: dict | None = None,  # S6: 관측 전용 metadata. 사용자-facing 노출 금지.
+    phase1_forensic: dict | None = None,  # T0: 관측 전용 Phase 1 포렌식. 사용자-facing 노출 금지.
+    share_id: str | None = None,
+    ethics_index: EthicsContextIndex | None = None,  # ethics_refs로 만든 인덱스 (있으면 재사용)
+) -> dict:
+    """save_analysis RPC payload를 구성한다 (JSON 직렬화 가능 — 스풀에 그대로 기록).
+
+    share_id를 주지 않으면 새로 발급한다.
+    """
+    if ethics_index is None:
+        ethics_index = EthicsContextIndex(ethics_refs)
+    return {
+        "share_id": share_id or new_share_id(),
+        "article": {
+            "url": normalize_url(url),
+            "title": title or "",
+            "publisher": publisher or None,
+            "journalist": journalist or None,
+            "publish_date": _normalize_publish_date(publish_date),
+        },
+        "result": _build_result_record(result, citation_audit, phase1_forensic),
+        "snapshots": [
+            {
+                "ethics_code": getattr(r, "ethics_code"),
+                "snapshot_full_text": getattr(r, "ethics_full_text", "") or "",
+            }
+            for r in ethics_index.snapshot_targets()
+        ],
+    }
+
+
+def save_analysis_payload(payload: dict) -> str | None:
+    """build_analysis_payload 결과를 DB에 저장하고 share_id를 반환한다.
+
+    save_analysis RPC로 1회 왕복·단일 트랜잭션 저장. 함수가 아직 배포되지
+    않은 DB(PGRST202/404)나 요청 share_id를 무시하는 구 버전 함수에서는
+    기존 다단계 REST 경로로 폴백한다.
+    같은 share_id로 다시 저장하면 이미 저장된 것으로 보고 share_id를 반환 (멱등).
+    실패 시 None 반환 (파이프라인은 막지 않음).
+    """
+    sb_url, sb_key = _get_supabase_config()
+    headers = {
+        "apikey": sb_key,
+        "Authorization": f"Bearer {sb_key}",
+        "Content-Type": "application/json",
     }
+    started = time.monotonic()
+
+    global _rpc_available
+    if _rpc_available is not False:
+        available, share_id = _save_via_rpc(sb_url, headers, payload)
+        if available and not (share_id and payload.get("share_id") and share_id != payload["share_id"]):
+            if share_id:
+                logger.info(
+                    f"분석 결과 저장 완료 (RPC): share_id={share_id}, "
+                    f"snapshots={len(payload.get('snapshots') or [])}"
+                )
+            return _record_save("rpc", share_id, started)
+        if available:
+            # 20261019000100 미적용 DB — 구 버전 함수가 share_id를 새로 발급함.
+            # 사용자에게 이미 준 share_id로 조회돼야 하므로 레거시 경로로 다시 저장하고,
+            # 이후로는 RPC를 쓰지 않는다. 서버 발급 id 행은 고아로 남는다 (조회 경로 없음).
+            _rpc_available = False
+            logger.error(
+                f"save_analysis RPC가 요청 share_id를 무시함 (구 버전 함수): "
+                f"{payload['share_id']} → {share_id} — 레거시 REST 경로로 재저장"
+            )
+
+    return _record_save("legacy", _save_analysis_legacy(sb_url, headers, payload), started)
+
+
+def _record_save(path: str, share_id: str | None, started: float) -> str | None:
+    """저장 1회를 /metrics에 기록하고 share_id를 그대로 돌려준다."""
+    metrics.observe_stage("save", time.monotonic() - started)
+    metrics.STORAGE_SAVES.inc(path=path, outcome="ok" if share_id else "error")
+    return share_id
+
+
+def save_analysis_result(
+    url: str,
+    title: str,
+    publisher: str | None,
+    journalist: str | None,
+    publish_date: str | None,
+    result,  # pipeline.AnalysisResult — 순환 import 회피용 untyped
+    ethics_refs: list | None = None,  # report_generator.EthicsReference 리스트 (순환 import 회피)
+    citation_audit: dict | None = None,  # S6: 관측 전용 metadata. 사용자-facing 노출 금지.
+    phase1_forensic: dict | None = None,  # T0: 관측 전용 Phase 1 포렌식. 사용자-facing 노출 금지.
+    share_id: str | None = None,
+) -> str | None:
+    """분석 결과를 DB에 동기 저장하고 share_id를 반환한다.
+
+    /analyze는 core.persistence 백그라운드 큐를 거친다 (PERSIST_ASYNC=0이면 이 경로).
+    실패 시 None 반환 (파이프라인은 막지 않음).
+    """
+    payload = build_analysis_payload(
+        url, title, publisher, journalist, publish_date, result,
+        ethics_refs=ethics_refs,
+        citation_audit=citation_audit,
+        phase1_forensic=phase1_forensic,
+        share_id=share_id,
+    )
+    return save_analysis_payload(payload)
+
+
+def _save_analysis_legacy(sb_url: str, headers: dict, payload: dict) -> str | None:
+    """레거시 다단계 REST 저장 — save_analysis RPC 미배포 DB용 폴백."""
+    article = payload["article"]
+    # 1. articles UPSERT
+    article_id = _upsert_article(
+        sb_url, headers, article["url"], article["title"],
+        article.get("publisher"), article.get("journalist"), article.get("publish_date"),
+    )
+    if article_id is None:
+        return None
 
-    # 5. share_id 생성 — 충돌 시 최대 3회 재시도
+    global _usage_ledger_column
+    base_record = {"article_id": article_id, **payload["result"]}
+    if _usage_ledger_column is False:
+        base_record.pop("usage_ledger", None)
+    requested_id = payload.get("share_id")
+
+    # 2. share_id — 요청 값 우선, 없으면 발급 (충돌 시 최대 3회 재시도)
     insert_headers = {**headers, "Prefer": "return=representation"}
-    for attempt in range(3):
-        share_id = secrets.token_urlsafe(9)  # 12자
+    attempt = 0
+    while attempt < 3:
+        share_id = requested_id or new_share_id()  # 12자
         record = {**base_record, "share_id": share_id}
         try:
-            r = httpx.post(
-                f"{sb_url}/rest/v1/analysis_results",
-                headers=insert_headers,
-                json=record,
-                timeout=15,
-            )
-            r.raise_for_status()
+            with tracing.span("storage.analysis_results_insert", {"crcheck.attempt": attempt + 1}) as sp:
+                r = httpx.post(
+                    f"{sb_url}/rest/v1/analysis_results",
+                    headers=insert_headers,
+                    json=record,
+                    timeout=15,
+                )
+                tracing.set_attributes(sp, {"http.response.status_code": r.status_code})
+                r.raise_for_status()
             # Prefer: return=representation 응답에서 analysis_id 추출 (스냅샷 INSERT용)
             analysis_id: int | None = None
             try:
@@ -533,10 +732,10 @@ def save_analysis_result(
                     f"[{type(e_parse).__name__}]: {e_parse}"
                 )
             # 스냅샷 INSERT — 실패해도 share_id 반환에 영향 없음
-            if analysis_id is not None and ethics_refs:
+            if analysis_id is not None and payload.get("snapshots"):
                 try:
                     _insert_ethics_snapshot(
-                        sb_url, headers, analysis_id, ethics_refs,
+                        sb_url, headers, analysis_id, payload["snapshots"],
                     )
                 except Exception as e_snap:
                     logger.warning(
@@ -550,12 +749,23 @@ def save_analysis_result(
         except httpx.HTTPStatusError as e:
             status = e.response.status_code
             text = e.response.text[:300]
+            if "usage_ledger" in base_record and _is_column_missing(e.response, "usage_ledger"):
+                # 20261019000500 미적용 DB — 원장 없이 같은 share_id로 다시 INSERT
+                _usage_ledger_column = False
+                base_record.pop("usage_ledger")
+                logger.warning("analysis_results.usage_ledger 컬럼 없음 (마이그레이션 미적용) → 원장 제외하고 저장")
+                continue
             # PostgREST: 409 Conflict 또는 23505(unique_violation) → share_id 충돌
             is_conflict = status == 409 or "23505" in text
+            if is_conflict and requested_id:
+                # 요청 share_id가 이미 있음 = 스풀 재생 등으로 먼저 저장됨 (멱등)
+                logger.info(f"share_id 이미 저장됨, 건너뜀: share_id={share_id}")
+                return share_id
             if is_conflict and attempt < 2:
                 logger.warning(
                     f"share_id 충돌 (attempt {attempt + 1}/3), 재시도: {text[:120]}"
                 )
+                attempt += 1
                 continue
             if is_conflict:
                 logger.error(f"share_id 3회 충돌, 저장 포기: {text[:120]}")
@@ -0,0 +1,287 @@
+# backend/core/stream_json.py
+"""
+CR-Check — 증분(스트리밍) 관용 JSON 파서
+
+Sonnet Phase 2 응답을 토큰 스트림이 도착하는 대로 1회 스캔으로 파싱한다.
+_robust_json_parse의 4단계(코드블록 정규식 → json.loads → 바운더리 추출 →
+후행 쉼표·줄바꿈 보정 → 키별 슬라이싱)를 응답 완료 후 반복하는 대신,
+문자열 필드가 닫히는 즉시 on_field 콜백으로 내보낸다.
+
+관용 규칙 (단일 패스):
+- 첫 '{' 이전(```json, 서두 문장)과 최상위 객체 종료 이후는 무시.
+- 문자열 내 이스케이프되지 않은 줄바꿈·탭은 그대로 값에 포함.
+- 문자열 내 이스케이프되지 않은 큰따옴표: 뒤따르는 문자로 판정(lookahead) —
+  키는 ':' / 값은 '}' ']' 또는 ',' + 다음 키('"')·값 시작이 올 때만 닫는 따옴표.
+  판정에 필요한 문자가 아직 안 왔으면 다음 청크까지 대기.
+- 후행 쉼표·누락 쉼표 허용, 이스케이프가 청크 경계에 걸쳐도 안전.
+- finish(): 열린 문자열·컨테이너를 닫아 잘린 응답(max_tokens)도 부분 결과 반환.
+
+사용:
+    parser = StreamingJsonParser(on_field=lambda path, value: ...)
+    for chunk in stream: parser.feed(chunk)
+    data = parser.finish()
+"""
+
+import json
+import re
+from typing import Any, Callable, Optional
+
+# path: 최상위부터의 키/인덱스 튜플. 예: ("reports", "comprehensive")
+FieldCallback = Callable[[tuple, str], None]
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_WHITESPACE = " \t\r\n"
+_LITERAL_END = _WHITESPACE + ",:}]\"{["
+_VALUE_START = '"{[-0123456789tfn'
+_ESCAPES = {
+    '"': '"', "\\": "\\", "/": "/",
+    "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+}
+
+_SURROGATE = re.compile("[\ud800-\udfff]")
+
+_WAIT = object()  # lookahead 판정 보류 (다음 청크 필요)
+
+
+class _Frame:
+    __slots__ = ("value", "path", "key")
+
+    def __init__(self, value: Any, path: tuple):
+        self.value = value
+        self.path = path
+        self.key: Optional[str] = None  # dict: 값 대기 중인 키
+
+
+class StreamingJsonParser:
+    """관용 증분 JSON 파서. feed()로 청크를 넣고 finish()로 결과를 받는다."""
+
+    def __init__(self, on_field: Optional[FieldCallback] = None):
+        self.on_field = on_field
+        self.root: Any = None
+        self.complete = False  # 최상위 객체가 정상적으로 닫혔는가
+        self.truncated = False  # finish() 시점에 열린 구조를 강제로 닫았는가
+        self.fields: dict[tuple, str] = {}  # 완성된 문자열 값 (path → value)
+        self.chars = 0
+        self._buf = ""
+        self._stack: list[_Frame] = []
+        self._started = False
+        self._in_string = False
+        self._parts: list[str] = []
+        self._literal: Optional[str] = None
+
+    # ── 공개 API ────────────────────────────────────────────────
+
+    def feed(self, chunk: str) -> None:
+        if not chunk or self.complete:
+            return
+        self.chars += len(chunk)
+        self._buf += chunk
+        self._run(final=False)
+
+    def finish(self) -> Any:
+        """입력 종료. 열린 문자열·리터럴·컨테이너를 닫고 최상위 값을 반환."""
+        if not self.complete:
+            self._run(final=True)
+        if not self.complete:
+            self.truncated = self._started
+            if self._in_string:
+                self._close_string()
+            if self._literal is not None:
+                self._close_literal()
+            self._stack.clear()
+        return self.root
+
+    def get(self, *path: Any, default: Any = None) -> Any:
+        """현재까지 완성된 값에서 path 조회 (스트림 도중 부분 결과용)."""
+        node = self.root
+        for key in path:
+            try:
+                node = node[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return node
+
+    # ── 스캐너 ──────────────────────────────────────────────────
+
+    def _run(self, final: bool) -> None:
+        buf = self._buf
+        i, n = 0, len(buf)
+        while i < n and not self.complete:
+            if self._in_string:
+                m = _STRING_SPECIAL.search(buf, i)
+                if m is None:
+                    self._parts.append(buf[i:])
+                    i = n
+                    break
+                j = m.start()
+                if j > i:
+                    self._parts.append(buf[i:j])
+                if buf[j] == "\\":
+                    step = self._escape(buf, j, final)
+                    if step is _WAIT:
+                        i = j
+                        break
+                    i = step
+                    continue
+                verdict = self._quote_closes(buf, j + 1, final)
+                if verdict is _WAIT:
+                    i = j
+                    break
+                if verdict:
+                    self._close_string()
+                else:
+                    self._parts.append('"')
+                i = j + 1
+                continue
+
+            ch = buf[i]
+            if self._literal is not None:
+                if ch in _LITERAL_END:
+                    self._close_literal()
+                    continue  # 구분 문자는 일반 상태에서 다시 처리
+                self._literal += ch
+                i += 1
+                continue
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._push({})
+                i += 1
+                continue
+
+            if ch in _WHITESPACE or ch in ",:":
+                i += 1
+            elif ch == '"':
+                self._in_string = True
+                self._parts = []
+                i += 1
+            elif ch == "{":
+                self._push({})
+                i += 1
+            elif ch == "[":
+                self._push([])
+                i += 1
+            elif ch in "}]":
+                self._pop()
+                i += 1
+            else:
+                self._literal = ch
+                i += 1
+        self._buf = "" if self.complete else buf[i:]
+
+    def _escape(self, buf: str, j: int, final: bool) -> Any:
+        """백슬래시 이스케이프 처리. 다음 위치 또는 _WAIT."""
+        if j + 1 >= len(buf):
+            if final:
+                return len(buf)
+            return _WAIT
+        nxt = buf[j + 1]
+        if nxt in _ESCAPES:
+            self._parts.append(_ESCAPES[nxt])
+            return j + 2
+        if nxt == "u":
+            hex_code = buf[j + 2 : j + 6]
+            if len(hex_code) < 4 and not final:
+                return _WAIT
+            try:
+                self._parts.append(chr(int(hex_code, 16)))
+                return j + 6
+            except ValueError:
+                pass
+        # 알 수 없는 이스케이프: 백슬래시 그대로 유지
+        self._parts.append("\\")
+        return j + 1
+
+    def _quote_closes(self, buf: str, k: int, final: bool) -> Any:
+        """buf[k-1]의 큰따옴표가 문자열을 닫는지 lookahead로 판정."""
+        n = len(buf)
+        while k < n and buf[k] in _WHITESPACE:
+            k += 1
+        if k >= n:
+            return True if final else _WAIT
+        ch = buf[k]
+        frame = self._stack[-1] if self._stack else None
+        is_key = frame is not None and isinstance(frame.value, dict) and frame.key is None
+        if is_key:
+            return ch == ":"
+        if ch in "}]":
+            return True
+        if ch != ",":
+            return False
+        k += 1
+        while k < n and buf[k] in _WHITESPACE:
+            k += 1
+        if k >= n:
+            return True if final else _WAIT
+        follow = buf[k]
+        if isinstance(frame.value, dict):
+            return follow in '"}'
+        return follow in _VALUE_START or follow == "]"
+
+    # ── 값 조립 ─────────────────────────────────────────────────
+
+    def _close_string(self) -> None:
+        value = "".join(self._parts)
+        if _SURROGATE.search(value):  # \uD83D\uDE00 등 서로게이트 쌍 결합
+            value = value.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+        self._in_string = False
+        self._parts = []
+        frame = self._stack[-1] if self._stack else None
+        if frame is not None and isinstance(frame.value, dict) and frame.key is None:
+            frame.key = value
+            return
+        path = self._attach(value)
+        if path is not None:
+            self.fields[path] = value
+            if self.on_field is not None:
+                try:
+                    self.on_field(path, value)
+                except Exception:
+                    pass  # 관측용 콜백 실패가 파싱을 막지 않는다
+
+    def _close_literal(self) -> None:
+        token = self._literal or ""
+        self._literal = None
+        try:
+            value: Any = json.loads(token)
+        except ValueError:
+            value = token
+        frame = self._stack[-1] if self._stack else None
+        if frame is not None and isinstance(frame.value, dict) and frame.key is None:
+            frame.key = token  # 따옴표 없는 키
+            return
+        self._attach(value)
+
+    def _attach(self, value: Any) -> Optional[tuple]:
+        if not self._stack:
+            return None
+        frame = self._stack[-1]
+        if isinstance(frame.value, dict):
+            key = frame.key if frame.key is not None else ""
+            frame.value[key] = value
+            frame.key = None
+            return frame.path + (key,)
+        frame.value.append(value)
+        return frame.path + (len(frame.value) - 1,)
+
+    def _push(self, container: Any) -> None:
+        if not self._stack:
+            self.root = container
+            self._stack.append(_Frame(container, ()))
+            return
+        path = self._attach(container)
+        self._stack.append(_Frame(container, path or ()))
+
+    def _pop(self) -> None:
+        if self._stack:
+            self._stack.pop()
+        if not self._stack:
+            self.complete = True
+
+
+def parse_tolerant(text: str) -> Any:
+    """전체 텍스트를 한 번에 관용 파싱 (스트림이 아닌 응답용)."""
+    parser = StreamingJsonParser()
+    parser.feed(text)
+    return parser.finish()
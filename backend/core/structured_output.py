@@ -0,0 +1,125 @@
+# backend/core/structured_output.py
+"""
+CR-Check — 구조화 출력(tool use) 모드 (Phase 1 Solo 탐지 · Phase 2 3종 리포트)
+
+STRUCTURED_OUTPUT=1 이면 두 Sonnet 호출이 JSON 스키마를 가진 tool을 강제 선택
+(tool_choice)하도록 요청하고, tool_use 블록의 input(이미 dict)을 그대로 쓴다.
+_parse_solo_response/_fix_llm_json, _robust_json_parse 같은 복구 경로와
+파싱 실패로 인한 Phase 2 전체 재시도를 없애는 것이 목적이다.
+
+- 기본값 off (텍스트 JSON 모드 유지). 응답에 tool_use 블록이 없으면 텍스트 파서로 폴백.
+- 모드별 파싱 폴백·재시도·소요 시간은 phase1_forensic["structured_output"]에 기록 —
+  두 모드를 같은 기준으로 비교한다 (pipeline._build_phase1_forensic).
+"""
+
+import os
+from typing import Any, Optional
+
+STRUCTURED_OUTPUT = os.environ.get("STRUCTURED_OUTPUT", "0") == "1"
+
+MODE_TEXT = "text"
+MODE_TOOL = "tool"
+
+
+def output_mode() -> str:
+    return MODE_TOOL if STRUCTURED_OUTPUT else MODE_TEXT
+
+
+# ── 스키마 ──────────────────────────────────────────────────────
+
+SOLO_TOOL = {
+    "name": "report_detections",
+    "description": "기사 전반 판단과 확정된 문제 패턴 탐지 목록을 제출한다. 문제가 없으면 detections는 빈 배열.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "overall_assessment": {
+                "type": "string",
+                "description": "기사의 전반적 품질 평가. 확인된 문제점 또는 문제 없음 판단 근거.",
+            },
+            "detections": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "matched_text": {
+                            "type": "string",
+                            "description": "문제가 되는 기사 원문 인용 (1~2문장). 여러 문구는 ' / '로 구분.",
+                        },
+                        "reasoning": {
+                            "type": "string",
+                            "description": "왜 문제이고 어떤 기준을 위반했는지 (1~2문장)",
+                        },
+                        "severity": {"type": "string", "enum": ["high", "medium", "low"]},
+                        "pattern_code": {
+                            "type": "string",
+                            "description": "패턴 목록의 leaf 코드 (예: 1-1-a)",
+                        },
+                    },
+                    "required": ["matched_text", "reasoning", "severity", "pattern_code"],
+                },
+            },
+        },
+        "required": ["overall_assessment", "detections"],
+    },
+}
+
+_REPORT_BODY = {"type": "string", "description": "리포트 전문 (마크다운 가능)"}
+
+REPORT_TOOL = {
+    "name": "submit_reports",
+    "description": "기사 메타분석(article_analysis)과 독자 유형별 3종 리포트를 제출한다.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "article_analysis": {
+                "type": "object",
+                "properties": {
+                    "articleType": {"type": "string", "description": "기사 유형"},
+                    "articleElements": {"type": "string", "description": "기사 구성 요소"},
+                    "editStructure": {"type": "string", "description": "편집 구조"},
+                    "reportingMethod": {"type": "string", "description": "취재 방식"},
+                    "contentFlow": {"type": "string", "description": "내용 흐름"},
+                },
+                "required": [
+                    "articleType", "articleElements", "editStructure",
+                    "reportingMethod", "contentFlow",
+                ],
+            },
+            "reports": {
+                "type": "object",
+                "properties": {
+                    "comprehensive": _REPORT_BODY,
+                    "journalist": _REPORT_BODY,
+                    "student": _REPORT_BODY,
+                },
+                "required": ["comprehensive", "journalist", "student"],
+            },
+        },
+        "required": ["article_analysis", "reports"],
+    },
+}
+
+
+def tool_request(tool: dict) -> dict:
+    """messages.create에 더할 인자 — 해당 tool 1개 강제 선택."""
+    return {"tools": [tool], "tool_choice": {"type": "tool", "name": tool["name"]}}
+
+
+def extract_tool_input(response: Any, tool_name: str) -> Optional[dict]:
+    """응답 content에서 tool_use 블록 input. 없으면 None (텍스트 폴백 신호)."""
+    for block in getattr(response, "content", None) or []:
+        if getattr(block, "type", None) == "tool_use" and getattr(block, "name", None) == tool_name:
+            data = getattr(block, "input", None)
+            if isinstance(data, dict):
+                return data
+    return None
+
+
+def response_text(response: Any) -> str:
+    """응답 content의 text 블록을 이어 붙인다 (tool 미사용 응답 폴백용)."""
+    return "".join(
+        getattr(block, "text", "") or ""
+        for block in getattr(response, "content", None) or []
+        if getattr(block, "type", "text") == "text"
+    )
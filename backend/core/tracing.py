@@ -0,0 +1,190 @@
+# backend/core/tracing.py
+"""
+CR-Check — 선택적 OpenTelemetry 트레이싱
+
+/analyze 1건의 임계 경로(스크래핑 → 임베딩 → 청크별 벡터 RPC → Phase 1 → 규범 조회·fallback
+→ Phase 2 재시도·백오프 → 저장)를 span 트리로 본다. 기본은 꺼져 있고 켜도 SDK가 없으면 no-op —
+계측 지점은 span()/traced()만 부르고 opentelemetry를 직접 import하지 않는다.
+
+활성화 (선택 의존성: pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http):
+    OTEL_TRACING=1
+    OTEL_TRACES_EXPORTER=otlp (기본) | console
+    OTEL_EXPORTER_OTLP_TRACES_ENDPOINT=http://localhost:4318/v1/traces (기본)
+    OTEL_SERVICE_NAME=cr-check-backend (기본)
+
+로컬 collector 대용: OTLP/HTTP 4318을 받는 Jaeger all-in-one
+    docker run --rm -p 4318:4318 -p 16686:16686 jaegertracing/all-in-one
+→ http://localhost:16686 에서 요청별 span 타임라인 확인. 컨테이너 없이 보려면
+OTEL_TRACES_EXPORTER=console (span을 stdout JSON으로 출력).
+
+스레드 경계: resilience 헤지 요청·백그라운드 저장은 다른 스레드에서 돌므로
+bind(fn)로 제출 시점의 컨텍스트를 넘겨야 같은 트리에 붙는다.
+"""
+
+import functools
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.environ.get("OTEL_TRACING", "0") == "1"
+TRACES_EXPORTER = os.environ.get("OTEL_TRACES_EXPORTER", "otlp")
+OTLP_ENDPOINT = os.environ.get(
+    "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", "http://localhost:4318/v1/traces",
+)
+SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "cr-check-backend")
+
+try:
+    from opentelemetry import context as _otel_context
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # 선택 의존성 — 미설치면 모든 span이 no-op
+    _otel_context = None
+    _otel_trace = None
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_tracer: Any = None
+_setup_done = False
+_setup_lock = threading.Lock()
+
+
+class _NoopSpan:
+    """트레이싱 비활성 시 span() 대신 돌려주는 객체 — 호출부가 분기하지 않게."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[dict] = None) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _clean(attributes: dict) -> dict:
+    """OTel 속성 값은 str/bool/int/float(또는 그 리스트)만 — None은 버리고 나머지는 문자열화."""
+    out = {}
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if not isinstance(value, (str, bool, int, float)):
+            value = str(value)
+        out[key] = value
+    return out
+
+
+def setup_tracing(exporter: Any = None) -> bool:
+    """TracerProvider + BatchSpanProcessor 1회 구성. 성공하면 True.
+
+    exporter를 주면 그대로 쓴다 (테스트의 InMemorySpanExporter 등 — SimpleSpanProcessor).
+    """
+    global _tracer, _setup_done
+    with _setup_lock:
+        if _setup_done:
+            return _tracer is not None
+        _setup_done = True
+        if _otel_trace is None:
+            logger.warning("OTEL_TRACING=1 이지만 opentelemetry 미설치 — 트레이싱 비활성")
+            return False
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+
+        provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+        if exporter is not None:
+            provider.add_span_processor(SimpleSpanProcessor(exporter))
+        elif TRACES_EXPORTER == "console":
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+            provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=OTLP_ENDPOINT)))
+        _otel_trace.set_tracer_provider(provider)
+        _tracer = provider.get_tracer("cr-check")
+        logger.info(f"트레이싱 활성: exporter={TRACES_EXPORTER}, service={SERVICE_NAME}")
+        return True
+
+
+def _get_tracer() -> Any:
+    if not TRACING_ENABLED:
+        return None
+    if not _setup_done:
+        setup_tracing()
+    return _tracer
+
+
+@contextmanager
+def span(name: str, attributes: Optional[dict] = None) -> Iterator[Any]:
+    """현재 컨텍스트의 자식 span. 예외는 span에 기록되고 그대로 전파된다."""
+    tracer = _get_tracer()
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    with tracer.start_as_current_span(name, attributes=_clean(attributes or {})) as current:
+        yield current
+
+
+def set_attributes(target: Any, attributes: dict) -> None:
+    """span 결과 속성(토큰·행 수·상태코드 등)을 None 제외하고 기록."""
+    cleaned = _clean(attributes)
+    if cleaned:
+        target.set_attributes(cleaned)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """함수 호출 전체를 span 하나로 감싸는 데코레이터."""
+    def decorator(fn: F) -> F:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """fn을 다른 스레드에서 실행해도 현재 span 아래에 붙도록 컨텍스트를 캡처."""
+    if _get_tracer() is None:
+        return fn
+    ctx = _otel_context.get_current()
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _otel_context.attach(ctx)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _otel_context.detach(token)
+    return wrapper
+
+
+def trace_methods(cls: type, prefix: str, span_prefix: str) -> None:
+    """cls의 prefix로 시작하는 메서드를 span으로 감싼다 (트레이싱 활성 시에만, import 시 1회)."""
+    if not TRACING_ENABLED:
+        return
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith(prefix) and callable(value):
+            setattr(cls, attr, traced(f"{span_prefix}.{attr}")(value))
+
+
+def record_llm_usage(target: Any, response: Any) -> None:
+    """Messages/Embeddings 응답 usage를 gen_ai.* 속성으로 기록 (모킹된 응답은 무시)."""
+    usage = getattr(response, "usage", None)
+    values = {
+        "gen_ai.usage.input_tokens": getattr(usage, "input_tokens", None),
+        "gen_ai.usage.output_tokens": getattr(usage, "output_tokens", None),
+        "gen_ai.usage.cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None),
+        "gen_ai.usage.total_tokens": getattr(usage, "total_tokens", None),
+    }
+    set_attributes(target, {k: v for k, v in values.items() if isinstance(v, int)})
@@ -0,0 +1,125 @@
+# backend/core/usage.py
+"""
+CR-Check — 요청별 API 사용량·비용 원장 (analysis_results.usage_ledger)
+
+분석 1건이 호출한 모든 유료 API(임베딩, Phase 1, Phase 2 재시도 포함)를 호출 단위로 적고
+단계별·전체 합계와 추정 비용(USD)을 JSONB로 남긴다. core.metrics 토큰 카운터는 프로세스
+누적치라 기사·매체별로 나눠 볼 수 없어서, 같은 값을 분석 행에 붙여 롤업 뷰
+(public.analysis_usage_rollup)로 매체·기사 형태별 비용을 집계한다.
+
+- Anthropic usage.input_tokens는 캐시 미적용분만 센다 — cache_read/cache_creation은 따로 기록.
+- 실패한 호출(529 등 status 오류)은 토큰 0으로 outcome만 남기고, 응답을 받았지만 파싱·구조
+  검증에 실패한 시도는 토큰을 그대로 두고 outcome="parse"로 표시한다 (버려져도 과금됨).
+- 가격표에 없는 모델은 cost_usd=None (합계에서 제외, totals.unpriced_calls로 표시).
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+LEDGER_VERSION = "usage_v1"
+
+# 모델별 USD / 1M tokens — 공시 가격이 바뀌면 여기만 갱신한다 (과거 행은 기록 시점 값 유지).
+PRICES_USD_PER_MTOK: dict[str, dict[str, float]] = {
+    "claude-sonnet-4-6": {"input": 3.0, "output": 15.0, "cache_read": 0.30, "cache_write": 3.75},
+    "claude-sonnet-5": {"input": 3.0, "output": 15.0, "cache_read": 0.30, "cache_write": 3.75},
+    "text-embedding-3-small": {"input": 0.02},
+}
+
+_TOKEN_FIELDS = (
+    ("input_tokens", "input"),
+    ("output_tokens", "output"),
+    ("cache_read_input_tokens", "cache_read"),
+    ("cache_creation_input_tokens", "cache_write"),
+)
+
+
+def _int(value: Any) -> int:
+    """usage 값 정규화 — 모킹된 응답(MagicMock 등)·None은 0."""
+    return value if isinstance(value, int) and not isinstance(value, bool) and value > 0 else 0
+
+
+def estimate_cost(model: str, tokens: dict) -> Optional[float]:
+    """토큰 dict(_TOKEN_FIELDS 키)로 추정 비용(USD). 가격표에 없는 모델이면 None."""
+    prices = PRICES_USD_PER_MTOK.get(model)
+    if prices is None:
+        return None
+    total = sum(tokens.get(key, 0) * prices.get(price_key, 0.0) for key, price_key in _TOKEN_FIELDS)
+    return round(total / 1_000_000, 6)
+
+
+@dataclass
+class UsageLedger:
+    """분석 1건의 API 호출 원장. calls는 기록 순서 그대로 보존한다."""
+    calls: list[dict] = field(default_factory=list)
+    # 롤업용 기사 형태 (article_chars, chunk_count, article_context, pattern_count)
+    shape: dict = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(
+        self,
+        phase: str,
+        model: str,
+        usage: Any = None,
+        outcome: str = "ok",
+        **tokens: int,
+    ) -> dict:
+        """호출 1건 기록. usage 객체(응답.usage) 또는 토큰 키워드(input_tokens=...) 중 하나."""
+        entry: dict = {"phase": phase, "model": model, "outcome": outcome}
+        for key, _ in _TOKEN_FIELDS:
+            entry[key] = _int(getattr(usage, key, None) if usage is not None else tokens.get(key))
+        entry["cost_usd"] = estimate_cost(model, entry)
+        with self._lock:
+            self.calls.append(entry)
+        return entry
+
+    def mark(self, start: int, outcome: str) -> None:
+        """calls[start:] 중 outcome="ok"인 항목을 outcome으로 바꾼다 (파싱 실패한 시도 표시)."""
+        with self._lock:
+            for entry in self.calls[start:]:
+                if entry["outcome"] == "ok":
+                    entry["outcome"] = outcome
+
+    def extend(self, other: Optional["UsageLedger"]) -> None:
+        if other is None or other is self:
+            return
+        with self._lock:
+            self.calls.extend(dict(c) for c in other.calls)
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    @staticmethod
+    def _summarize(calls: list[dict]) -> dict:
+        summary = {"calls": len(calls), "failed_calls": 0, "unpriced_calls": 0, "cost_usd": 0.0}
+        for key, _ in _TOKEN_FIELDS:
+            summary[key] = 0
+        for entry in calls:
+            if entry["outcome"] != "ok":
+                summary["failed_calls"] += 1
+            for key, _ in _TOKEN_FIELDS:
+                summary[key] += entry[key]
+            if entry["cost_usd"] is None:
+                summary["unpriced_calls"] += 1
+            else:
+                summary["cost_usd"] += entry["cost_usd"]
+        summary["cost_usd"] = round(summary["cost_usd"], 6)
+        return summary
+
+    def to_json(self) -> dict:
+        """analysis_results.usage_ledger JSONB 값. retries = 단계별 (호출 수 - 1) 합."""
+        with self._lock:
+            calls = [dict(c) for c in self.calls]
+        phases: dict[str, list[dict]] = {}
+        for entry in calls:
+            phases.setdefault(entry["phase"], []).append(entry)
+        by_phase = {phase: self._summarize(items) for phase, items in phases.items()}
+        totals = self._summarize(calls)
+        totals["retries"] = sum(max(s["calls"] - 1, 0) for s in by_phase.values())
+        return {
+            "version": LEDGER_VERSION,
+            "calls": calls,
+            "by_phase": by_phase,
+            "totals": totals,
+            "shape": dict(self.shape),
+        }
@@ -8,15 +8,22 @@ Phase 2에 제공된 규범 컨텍스트의 정식 인용명 목록과 normalize
 - DB/Anthropic/Supabase client import 금지 (순수 함수).
 - 순환 import 회피: EthicsReference를 import하지 않고 덕타이핑으로 접근.
 - 부분/접두/유사도 매칭 금지 — normalized exact match만.
+  (near_misses·bare_mentions는 citation_matcher의 진단 필드 — 매칭 판정에 쓰지 않음)
+- 라벨 추출·bare mention은 citation_matcher 스캔 1회로 얻는다.
+  near_misses(편집 거리)는 opt-in — near_misses=True 또는 CITATION_NEAR_MISSES=1.
 - 보수적 정규화: 공백·전각 숫자 정리만, 숫자·조항 구분자 보존.
 - title에서 source/article_number 파싱 금지.
 - 내부 코드(JEC-/PCP- 등)는 canonical citation으로 사용하지 않음.
 """
+import os
 import re
 from typing import Any
 
 _VERSION = "wave1_s6_v1"
 
+# near-miss 진단 기본값 (라이브 경로 off, 배치 재감사는 인자로 켠다)
+NEAR_MISSES_ENABLED = os.environ.get("CITATION_NEAR_MISSES", "0") == "1"
+
 # 〔...〕 라벨 추출 — 동일 줄 안에서만 매칭(〕가 줄을 넘지 않는다 가정).
 _BRACKET_PATTERN = re.compile(r"〔([^〕]+)〕")
 
@@ -93,8 +100,7 @@ def _coerce_report_text(value: Any) -> str:
     return ""
 
 
-def _audit_one_report(text: str, allowed_norm: set[str]) -> dict[str, Any]:
-    used = extract_citation_labels(text)
+def _audit_one_report(used: list[str], allowed_norm: set[str]) -> dict[str, Any]:
     matched: list[str] = []
     unmatched: list[str] = []
     seen: set[str] = set()
@@ -126,30 +132,66 @@ def _empty_summary() -> dict[str, Any]:
         "matched_total": 0,
         "unmatched_total": 0,
         "match_rate": None,
+        "near_miss_total": None,
+        "bare_mention_total": 0,
     }
 
 
+def _attach_near_misses(report_audits: dict[str, dict[str, Any]], matcher: Any) -> int:
+    """리포트별 비매칭 라벨(중복 제외)에만 near_misses 추가. near_miss_total 반환."""
+    near_total = 0
+    for audit in report_audits.values():
+        near: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        for raw in audit["unmatched"]:
+            norm = normalize_citation_label(raw)
+            if norm in seen:
+                continue
+            seen.add(norm)
+            nm = matcher.near_miss(raw)
+            if nm is not None:
+                near.append(nm.as_dict())
+        audit["near_misses"] = near
+        near_total += len(near)
+    return near_total
+
+
 def verify_report_citations(
     reports: dict[str, Any],
     refs: list[Any],
+    index: Any = None,
+    near_misses: bool | None = None,
 ) -> dict[str, Any]:
     """3종 리포트 인용 감사. JSON 직렬화 가능한 dict 반환.
 
+    index: refs로 만든 EthicsContextIndex (덕타이핑). 주면 정규화된 allowed 목록을
+    다시 만들지 않고 재사용한다.
+    near_misses: 비매칭 라벨 near-miss 진단 여부 (None이면 NEAR_MISSES_ENABLED).
+    끄면 리포트별 near_misses 키가 없고 summary.near_miss_total은 None.
+
     호출자가 별도 try/except로 감싸지 않더라도 안전하게 동작하도록
     내부 예외를 흡수해 status='error' 객체를 돌려준다.
     리포트 생성·저장 자체는 호출 측에서 그대로 진행되어야 한다.
     """
+    from .citation_matcher import compile_matcher  # 순환 import 회피
+
+    if near_misses is None:
+        near_misses = NEAR_MISSES_ENABLED
     notes: list[str] = []
     try:
-        allowed = build_allowed_citations(refs)
-
-        # source/article_number가 둘 다 비어 allowed에서 제외된 ref 카운트
-        excluded = 0
-        for r in (refs or []):
-            src = _safe_str(getattr(r, "ethics_source", "")).strip()
-            art = _safe_str(getattr(r, "ethics_article_number", "")).strip()
-            if not src and not art:
-                excluded += 1
+        if index is not None:
+            allowed = index.allowed_citations()
+            excluded = index.excluded_count
+        else:
+            allowed = build_allowed_citations(refs)
+
+            # source/article_number가 둘 다 비어 allowed에서 제외된 ref 카운트
+            excluded = 0
+            for r in (refs or []):
+                src = _safe_str(getattr(r, "ethics_source", "")).strip()
+                art = _safe_str(getattr(r, "ethics_article_number", "")).strip()
+                if not src and not art:
+                    excluded += 1
         if excluded:
             notes.append(
                 f"{excluded} ref(s) excluded from allowed: "
@@ -158,18 +200,28 @@ def verify_report_citations(
 
         allowed_norm = {a["normalized"] for a in allowed}
 
+        texts: dict[str, str] = {}
+        for report_key, value in (reports or {}).items():
+            text = _coerce_report_text(value)
+            if not isinstance(value, str) and not text:
+                notes.append(f"report '{report_key}': body field 없음 또는 비문자열")
+            texts[report_key] = text
+
+        matcher = compile_matcher(allowed)
+        scans = matcher.scan(texts)
+
         report_audits: dict[str, dict[str, Any]] = {}
         used_total = 0
         used_unique_norms: set[str] = set()
         matched_total = 0
         unmatched_total = 0
+        bare_mention_total = 0
 
-        for report_key, value in (reports or {}).items():
-            text = _coerce_report_text(value)
-            if not isinstance(value, str) and not text:
-                notes.append(f"report '{report_key}': body field 없음 또는 비문자열")
-            audit = _audit_one_report(text, allowed_norm)
+        for report_key, scan in scans.items():
+            audit = _audit_one_report(scan.used, allowed_norm)
+            audit["bare_mentions"] = scan.bare_mentions
             report_audits[report_key] = audit
+            bare_mention_total += len(scan.bare_mentions)
             used_total += len(audit["used"])
             matched_total += audit["matched_count"]
             unmatched_total += audit["unmatched_count"]
@@ -178,6 +230,14 @@ def verify_report_citations(
 
         match_rate = (matched_total / used_total) if used_total > 0 else None
 
+        # near-miss 진단(관측 전용) 실패는 감사 결과 자체를 error로 만들지 않는다.
+        near_miss_total = None
+        if near_misses:
+            try:
+                near_miss_total = _attach_near_misses(report_audits, matcher)
+            except Exception as e:
+                notes.append(f"near-miss diagnostics skipped: {type(e).__name__}: {e}")
+
         return {
             "version": _VERSION,
             "status": "ok",
@@ -188,6 +248,8 @@ def verify_report_citations(
                 "matched_total": matched_total,
                 "unmatched_total": unmatched_total,
                 "match_rate": match_rate,
+                "near_miss_total": near_miss_total,
+                "bare_mention_total": bare_mention_total,
             },
             "allowed_citations": allowed,
             "reports": report_audits,
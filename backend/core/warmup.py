@@ -0,0 +1,165 @@
+# backend/core/warmup.py
+"""
+CR-Check — 기동 워밍업 (FastAPI lifespan)
+
+배포·오토스케일 직후 첫 /analyze가 떠안던 준비 비용을 기동 시 병렬로 미리 치른다.
+  - supabase_config  : core.db 연결 프로필 1회 해결 (로컬 probe 포함 — 이후 요청은 캐시 사용)
+  - pattern_catalog  : _load_pattern_catalog (모듈 캐시)
+  - solo_prompt      : _load_confusion_pairs + _build_sonnet_solo_prompt (모듈 캐시)
+  - anthropic_client / openai_client : core.clients 공유 클라이언트 생성
+카탈로그·프롬프트는 config가 끝나야 시작하고, 클라이언트는 config와 동시에 시작한다.
+규범 캐시는 기존대로 report_generator.warm_ethics_cache가 별도 스레드에서 채운다.
+
+/health는 워밍업이 끝나기 전(pending·warming) 503을 돌려 로드밸런서가 콜드 인스턴스로
+라우팅하지 않게 한다. 일부 단계가 실패해도(예: Supabase 일시 장애) 끝나면 ready로 보고
+status="degraded" + 실패 단계를 노출한다 — 실패한 캐시는 첫 요청에서 원래대로 다시 시도되므로
+인스턴스를 영구히 트래픽에서 빼지 않는다.
+
+WARMUP_ENABLED=0 이면 워밍업을 건너뛰고 즉시 ready (로컬 개발·테스트).
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1") != "0"
+
+PENDING, WARMING, READY, DEGRADED = "pending", "warming", "ready", "degraded"
+
+
+class WarmupState:
+    """워밍업 진행 상태 — 단계별 결과·소요 시간. 스레드 안전."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self.status = PENDING
+        self.steps: dict[str, dict] = {}
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in (READY, DEGRADED)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _start(self) -> None:
+        with self._lock:
+            self.status = WARMING
+            self.steps = {}
+            self.started_at = time.monotonic()
+            self.seconds = None
+        self._done.clear()
+
+    def _record(self, name: str, seconds: float, error: Optional[BaseException] = None) -> None:
+        entry = {"ok": error is None, "seconds": round(seconds, 3)}
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"
+        with self._lock:
+            self.steps[name] = entry
+
+    def _finish(self) -> None:
+        with self._lock:
+            failed = [n for n, s in self.steps.items() if not s["ok"]]
+            self.status = DEGRADED if failed else READY
+            self.seconds = round(time.monotonic() - (self.started_at or time.monotonic()), 3)
+        self._done.set()
+
+    def mark_ready(self) -> None:
+        """워밍업 없이 ready로 표시 (WARMUP_ENABLED=0)."""
+        with self._lock:
+            self.status = READY
+            self.seconds = 0.0
+        self._done.set()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "status": self.status,
+                "ready": self.status in (READY, DEGRADED),
+                "seconds": self.seconds,
+                "steps": {n: dict(s) for n, s in self.steps.items()},
+            }
+
+
+_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    return _state
+
+
+def _timed(state: WarmupState, name: str, fn: Callable[[], object]) -> object:
+    lap = time.monotonic()
+    try:
+        value = fn()
+    except Exception as e:  # 워밍업 실패는 기동을 막지 않는다
+        logger.warning(f"워밍업 {name} 실패 [{type(e).__name__}]: {e}")
+        state._record(name, time.monotonic() - lap, e)
+        return None
+    state._record(name, time.monotonic() - lap)
+    return value
+
+
+def _warm_solo_prompt(sb_url: str, sb_key: str) -> None:
+    from . import pattern_matcher
+
+    pattern_matcher._build_sonnet_solo_prompt(sb_url, sb_key)
+    # 혼동 쌍 조회 실패는 _load_confusion_pairs가 삼키므로 캐시 여부로 판정
+    if pattern_matcher._confusion_pairs_cache is None:
+        raise RuntimeError("혼동 쌍 조회 실패 (빈 목록으로 진행, 첫 요청에서 재시도)")
+
+
+def run_warmup(state: Optional[WarmupState] = None) -> dict:
+    """모든 워밍 단계를 병렬 실행하고 끝나면 상태 스냅샷을 반환 (블로킹)."""
+    from anthropic import Anthropic
+    from openai import OpenAI
+
+    from . import pattern_matcher
+    from .clients import get_client
+    from .db import _get_supabase_config
+
+    state = state or _state
+    state._start()
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="warmup") as pool:
+        clients = [
+            pool.submit(_timed, state, "anthropic_client",
+                        lambda: get_client(Anthropic, "ANTHROPIC_API_KEY")),
+            pool.submit(_timed, state, "openai_client",
+                        lambda: get_client(OpenAI, "OPENAI_API_KEY")),
+        ]
+        config = _timed(state, "supabase_config", _get_supabase_config)
+        dependents = []
+        if config is not None:
+            sb_url, sb_key = config
+            dependents = [
+                pool.submit(_timed, state, "pattern_catalog",
+                            lambda: pattern_matcher._load_pattern_catalog(sb_url, sb_key)),
+                pool.submit(_timed, state, "solo_prompt",
+                            lambda: _warm_solo_prompt(sb_url, sb_key)),
+            ]
+        for future in clients + dependents:
+            future.result()
+    state._finish()
+    snapshot = state.snapshot()
+    logger.info(f"워밍업 {snapshot['status']} ({snapshot['seconds']}초): "
+                f"{ {n: s['ok'] for n, s in snapshot['steps'].items()} }")
+    return snapshot
+
+
+def start_warmup(state: Optional[WarmupState] = None) -> Optional[threading.Thread]:
+    """run_warmup을 데몬 스레드로 시작 (기동은 바로 진행, /health가 준비 상태를 보고)."""
+    state = state or _state
+    if not WARMUP_ENABLED:
+        state.mark_ready()
+        return None
+    thread = threading.Thread(target=run_warmup, args=(state,), name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -11,11 +11,14 @@ by the Free Software Foundation, either version 3 of the License, or
 See LICENSE file for details.
 """
 
-from fastapi import FastAPI, HTTPException, Response
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
 from typing import Dict, Any, Optional
 import os
+import time
 
 from scraper import ArticleScraper
 # [M6] analyzer → pipeline 교체. analyzer.py 파일 자체는 보존 (참조용)
@@ -23,17 +26,62 @@ from core.pipeline import analyze_article as run_pipeline, AnalysisResult
 # [Phase D] 분석 결과 아카이빙 + 캐시 조회 + 공유 링크
 from core.storage import (
     get_cached_analysis,
-    save_analysis_result,
+    build_analysis_payload,
+    save_analysis_payload,
     get_analysis_by_share_id,
+    report_from_payload,
+)
+# 저장은 백그라운드 큐 + 로컬 스풀 (share_id 선발급 → 즉시 응답)
+from core.persistence import PERSIST_ASYNC, get_persistence_queue
+# 규범 캐시 (pattern_id × 맥락) — 시작 시 백그라운드 워밍
+from core.report_generator import warm_ethics_cache
+from core.resilience import rpc_stats_snapshot
+# 기동 워밍업 (카탈로그·혼동 쌍·프롬프트·클라이언트) — /health 준비 상태
+from core.warmup import get_warmup_state, start_warmup
+# Supabase 연결 프로필 (프로세스당 1회 해결) + 백그라운드 헬스 모니터
+from core.db import connection_status, start_health_monitor, stop_health_monitor
+# Prometheus 텍스트 포맷 메트릭 (단계별 히스토그램·카운터)
+from core import metrics, tracing
+# 통계 RPC (롤업 테이블) + 프로세스 내 캐시 — 대시보드용
+from core.stats import (
+    STATS_CACHE_TTL_SECONDS,
+    StatsUnavailable,
+    get_stats_cache,
+    overall_stats,
+    publisher_stats,
+    trending_articles,
 )
 # [M6] Phase D에서 재설계 예정
 # from export import generate_pdf_response
 
+def replay_persistence_spool():
+    """이전 프로세스가 저장하지 못한 분석 결과(스풀)를 백그라운드 큐에 다시 넣는다."""
+    if PERSIST_ASYNC:
+        get_persistence_queue().replay()
+
+
+def start_ethics_cache_warmup():
+    """규범 캐시 워밍 + 매핑 버전 폴링을 백그라운드로 시작 (기동을 막지 않음)."""
+    warm_ethics_cache()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """기동: 스풀 재생 + 규범 캐시 워밍 + 준비 워밍업(백그라운드 병렬). /health가 완료 여부를 보고."""
+    replay_persistence_spool()
+    start_ethics_cache_warmup()
+    start_warmup()
+    start_health_monitor()
+    yield
+    stop_health_monitor()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="CR-Check API",
     description="한국 언론 기사의 저널리즘 윤리 준수 여부를 평가하는 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정 (프론트엔드 연동을 위해)
@@ -106,16 +154,35 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
-    """헬스체크 엔드포인트 (Railway, Render 등에서 사용)"""
+async def health_check(response: Response):
+    """헬스체크 엔드포인트 (Railway, Render 등에서 사용)
+
+    기동 워밍업이 끝나기 전에는 503 + status="warming" — 콜드 인스턴스로 라우팅되지 않게 한다.
+    """
     api_key_exists = bool(os.environ.get("ANTHROPIC_API_KEY"))
+    warmup = get_warmup_state().snapshot()
+    if not warmup["ready"]:
+        response.status_code = 503
 
     return {
-        "status": "healthy",
-        "api_key_configured": api_key_exists
+        "status": "healthy" if warmup["ready"] else "warming",
+        "api_key_configured": api_key_exists,
+        # 기동 워밍업 단계별 결과 (status: pending|warming|ready|degraded)
+        "warmup": warmup,
+        # Supabase 연결 프로필(mode·url)과 헬스 모니터 마지막 점검 결과
+        "supabase": connection_status(),
+        # Supabase RPC별 지연 분위수·헤지·fallback·서킷 상태
+        "rpc": rpc_stats_snapshot(),
+        "stats_cache": get_stats_cache().snapshot(),
     }
 
 
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus 스크레이프 엔드포인트 — 단계별 지연 히스토그램, 캐시·재시도·토큰 카운터."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.post("/analyze", response_model=AnalyzeResponse)
 def analyze_article(request: AnalyzeRequest):
     """
@@ -126,89 +193,102 @@ def analyze_article(request: AnalyzeRequest):
     1. URL에서 기사 스크래핑 (제목 + 본문)
     2. 청킹 → 벡터검색 → Sonnet Solo (패턴 식별)
     3. 규범 조회 → Sonnet (3종 리포트)
-    4. 결과 DB 저장 → share_id 생성
-    """
-    try:
-        # ① 캐시 먼저 확인
-        cached = get_cached_analysis(str(request.url))
-        if cached:
-            print(f"💾 캐시 히트: {request.url}")
-            return AnalyzeResponse(**cached)
-
-        # ② 캐시 미스 → 기사 스크래핑
-        print(f"📰 기사 스크래핑 시작: {request.url}")
-        article_data = scraper.scrape(str(request.url))
-        article_text = article_data.get("content", "")
-        print(f"✅ 스크래핑 완료: {article_data['title'][:50]}...")
-
-        if not article_text or len(article_text.strip()) < 50:
-            raise ValueError("기사 본문을 추출할 수 없거나 너무 짧습니다.")
-
-        # ③ 파이프라인 실행
-        print(f"🔍 파이프라인 분석 시작...")
-        result: AnalysisResult = run_pipeline(article_text, title=article_data.get("title") or None)
-        print(f"✅ 파이프라인 완료 ({result.total_seconds:.1f}초)")
-
-        # ④ 응답용 article_info 구성
-        article_info: Dict[str, Any] = {
-            "title": article_data.get("title", ""),
-            "url": str(request.url),
-        }
+    4. share_id 선발급 → 응답, DB 저장은 백그라운드 큐 (PERSIST_ASYNC=0이면 동기 저장)
 
-        # scraper 메타데이터 병합
-        _INVALID_META = {"미확인", "", "N/A", "unknown", "Unknown"}
-        if article_data.get("publisher") and article_data["publisher"] not in _INVALID_META:
-            article_info["publisher"] = article_data["publisher"]
-        if article_data.get("publish_date") and article_data["publish_date"] not in _INVALID_META:
-            article_info["publishDate"] = article_data["publish_date"]
-        if article_data.get("journalist") and article_data["journalist"] not in _INVALID_META:
-            article_info["journalist"] = article_data["journalist"]
-
-        # Sonnet이 생성한 article_analysis 병합
-        if result.report_result.article_analysis:
-            article_info.update(result.report_result.article_analysis)
-
-        # ⑤ DB 저장 → share_id 획득 (실패해도 응답 정상 반환)
-        share_id = save_analysis_result(
-            url=str(request.url),
-            title=article_data.get("title", ""),
-            publisher=article_data.get("publisher"),
-            journalist=article_data.get("journalist"),
-            publish_date=article_data.get("publish_date"),
-            result=result,
-            ethics_refs=result.report_result.ethics_refs if result.report_result else None,
-            citation_audit=result.citation_audit,
-            phase1_forensic=result.phase1_forensic,
-        )
-        if share_id is None:
-            print("⚠️  분석 결과 DB 저장 실패 (공유 기능 비활성화)")
-
-        return AnalyzeResponse(
-            article_info=article_info,
-            reports=result.report_result.reports,
-            share_id=share_id,
-            is_cached=False,
-        )
-
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        import traceback
-        from datetime import datetime
-        error_msg = (
-            f"[{datetime.now()}] Error processing {request.url}: "
-            f"{str(e)}\n{traceback.format_exc()}\n{'='*50}\n"
-        )
+    OTEL_TRACING=1이면 요청 전체가 루트 span "analyze" 아래 트리로 기록된다 (core.tracing).
+    """
+    with tracing.span("analyze", {"url.full": str(request.url)}) as root:
         try:
-            with open("backend_error.log", "a", encoding="utf-8") as f:
-                f.write(error_msg)
-        except Exception as log_err:
-            print(f"Failed to write log: {log_err}")
-        print(f"❌ 오류 발생: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"서버 오류가 발생했습니다: {str(e)}"
-        )
+            # ① 캐시 먼저 확인
+            cached = get_cached_analysis(str(request.url))
+            tracing.set_attributes(root, {"crcheck.cache_hit": bool(cached)})
+            if cached:
+                print(f"💾 캐시 히트: {request.url}")
+                return AnalyzeResponse(**cached)
+
+            # ② 캐시 미스 → 기사 스크래핑
+            print(f"📰 기사 스크래핑 시작: {request.url}")
+            lap = time.monotonic()
+            with tracing.span("scrape"):
+                article_data = scraper.scrape(str(request.url))
+            metrics.observe_stage("scrape", time.monotonic() - lap)
+            article_text = article_data.get("content", "")
+            print(f"✅ 스크래핑 완료: {article_data['title'][:50]}...")
+
+            if not article_text or len(article_text.strip()) < 50:
+                raise ValueError("기사 본문을 추출할 수 없거나 너무 짧습니다.")
+
+            # ③ 파이프라인 실행
+            print(f"🔍 파이프라인 분석 시작...")
+            result: AnalysisResult = run_pipeline(article_text, title=article_data.get("title") or None)
+            print(f"✅ 파이프라인 완료 ({result.total_seconds:.1f}초)")
+
+            # ④ 응답용 article_info 구성
+            article_info: Dict[str, Any] = {
+                "title": article_data.get("title", ""),
+                "url": str(request.url),
+            }
+
+            # scraper 메타데이터 병합
+            _INVALID_META = {"미확인", "", "N/A", "unknown", "Unknown"}
+            if article_data.get("publisher") and article_data["publisher"] not in _INVALID_META:
+                article_info["publisher"] = article_data["publisher"]
+            if article_data.get("publish_date") and article_data["publish_date"] not in _INVALID_META:
+                article_info["publishDate"] = article_data["publish_date"]
+            if article_data.get("journalist") and article_data["journalist"] not in _INVALID_META:
+                article_info["journalist"] = article_data["journalist"]
+
+            # Sonnet이 생성한 article_analysis 병합
+            if result.report_result.article_analysis:
+                article_info.update(result.report_result.article_analysis)
+
+            # ⑤ share_id 선발급 + DB 저장 (비동기: 스풀 기록 후 즉시 반환 / 동기: 실패 시 None)
+            payload = build_analysis_payload(
+                url=str(request.url),
+                title=article_data.get("title", ""),
+                publisher=article_data.get("publisher"),
+                journalist=article_data.get("journalist"),
+                publish_date=article_data.get("publish_date"),
+                result=result,
+                ethics_refs=result.report_result.ethics_refs if result.report_result else None,
+                ethics_index=result.report_result.ethics_index if result.report_result else None,
+                citation_audit=result.citation_audit,
+                phase1_forensic=result.phase1_forensic,
+            )
+            if PERSIST_ASYNC:
+                share_id = get_persistence_queue().submit(payload)
+            else:
+                share_id = save_analysis_payload(payload)
+            tracing.set_attributes(root, {"crcheck.share_id": share_id})
+            if share_id is None:
+                print("⚠️  분석 결과 DB 저장 실패 (공유 기능 비활성화)")
+
+            return AnalyzeResponse(
+                article_info=article_info,
+                reports=result.report_result.reports,
+                share_id=share_id,
+                is_cached=False,
+            )
+
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            import traceback
+            from datetime import datetime
+            error_msg = (
+                f"[{datetime.now()}] Error processing {request.url}: "
+                f"{str(e)}\n{traceback.format_exc()}\n{'='*50}\n"
+            )
+            try:
+                with open("backend_error.log", "a", encoding="utf-8") as f:
+                    f.write(error_msg)
+            except Exception as log_err:
+                print(f"Failed to write log: {log_err}")
+            print(f"❌ 오류 발생: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"서버 오류가 발생했습니다: {str(e)}"
+            )
 
 
 @app.get("/report/{share_id}", response_model=AnalyzeResponse)
@@ -217,19 +297,65 @@ def get_report(share_id: str, response: Response):
 
     - PostgREST 외래키 자동 JOIN으로 analysis_results + articles를 한 번에 가져온다.
     - 결과는 불변이므로 1일(86400초) public 캐시.
+    - 아직 백그라운드 저장 대기 중이면 대기 payload로 응답 (캐시 금지).
     - share_id가 없으면 404.
     """
     data = get_analysis_by_share_id(share_id)
     if not data:
-        raise HTTPException(
-            status_code=404,
-            detail="공유된 분석 결과를 찾을 수 없습니다."
-        )
+        pending = get_persistence_queue().get_pending(share_id) if PERSIST_ASYNC else None
+        if not pending:
+            raise HTTPException(
+                status_code=404,
+                detail="공유된 분석 결과를 찾을 수 없습니다."
+            )
+        response.headers["Cache-Control"] = "no-store"
+        return AnalyzeResponse(**report_from_payload(pending))
 
     response.headers["Cache-Control"] = "public, max-age=86400"
     return AnalyzeResponse(**data)
 
 
+def _stats_response(load, request: Request, response: Response):
+    """통계 엔드포인트 공통 — 캐시 헤더(Cache-Control·ETag·Age) + If-None-Match 304.
+
+    max-age는 서버 캐시 잔여 TTL. 조회 실패로 이전 값을 돌려줄 때는 max-age=0.
+    """
+    try:
+        entry = load()
+    except StatsUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"통계를 불러올 수 없습니다: {e}")
+
+    ttl = int(STATS_CACHE_TTL_SECONDS)
+    max_age = 0 if entry.stale else max(ttl - entry.age_seconds, 0)
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={ttl * 5}",
+        "ETag": entry.etag,
+        "Age": str(entry.age_seconds),
+    }
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return entry.data
+
+
+@app.get("/stats/overall")
+def get_overall_stats(request: Request, response: Response):
+    """전체 기사·분석 수와 평균 분석 소요 시간 (get_overall_stats)."""
+    return _stats_response(overall_stats, request, response)
+
+
+@app.get("/stats/publishers")
+def get_publisher_stats(request: Request, response: Response):
+    """언론사별 분석 건수·평균 소요 시간 상위 20 (get_publisher_stats)."""
+    return _stats_response(publisher_stats, request, response)
+
+
+@app.get("/stats/trending")
+def get_trending_articles(request: Request, response: Response, hours: int = 24):
+    """최근 hours시간(1~168) 분석이 많은 기사 상위 10 (get_trending_articles)."""
+    return _stats_response(lambda: trending_articles(hours), request, response)
+
+
 # [M6] Phase D에서 재설계 예정 — 주석 처리
 # @app.post("/export-pdf")
 # async def export_to_pdf(analysis_result: AnalyzeResponse):
@@ -4,9 +4,47 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import json
+import html
 from datetime import datetime
 from typing import Dict, Optional, List, Union
 
+from core import tracing
+
+
+# ============================================
+# 구조화 소스 (DOM 생성 없이 JSON/메타 슬라이스)
+# ============================================
+
+# 조선일보 Arc Fusion 페이로드 시작 지점. 이후는 json.JSONDecoder.raw_decode로 읽는다.
+_FUSION_MARKER = 'Fusion.globalContent='
+
+# <script type="application/ld+json"> 블록
+_JSONLD_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+# <meta ...> 태그 단위 슬라이스 (속성 순서 무관하게 property/content를 따로 읽는다)
+_META_TAG_RE = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+_META_KEY_RE = re.compile(r'(?:property|name)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_META_CONTENT_RE = re.compile(r'content\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+
+# JSON-LD에서 기사 본문으로 인정하는 @type
+_JSONLD_ARTICLE_TYPES = {'NewsArticle', 'Article', 'ReportageNewsArticle', 'AnalysisNewsArticle'}
+
+# JSON-LD 구조화 경로를 쓰는 도메인 → 언론사명 (사이트별 핸들러와 같은 표기).
+# 목록 밖(포털·미검증 사이트)은 사이트별 HTML 핸들러가 원 언론사명·본문·기자명 정리를 맡는다.
+# 추가 시 test_scraper_structured에 해당 도메인 fixture를 함께 넣는다.
+_STRUCTURED_JSONLD_DOMAINS = {
+    'joongang.co.kr': '중앙일보',
+    'hani.co.kr': '한겨레',
+    'yna.co.kr': '연합뉴스',
+}
+
+# 구조화 소스 본문 최소 길이 — HTML 핸들러의 본문 검증(100자)과 동일 기준
+_STRUCTURED_MIN_CONTENT = 100
+
+
 class ArticleScraper:
     """
     기사 URL에서 제목과 본문을 추출하는 스크래퍼
@@ -53,7 +91,9 @@ class ArticleScraper:
                     raise ValueError("유효하지 않은 URL입니다.")
 
             # 페이지 가져오기
-            response = requests.get(url, headers=self.headers, timeout=10)
+            with tracing.span("scraper.fetch", {"url.full": url}) as sp:
+                response = requests.get(url, headers=self.headers, timeout=10)
+                tracing.set_attributes(sp, {"http.response.status_code": response.status_code})
             response.raise_for_status()
             
             # 인코딩 처리
@@ -65,6 +105,13 @@ class ArticleScraper:
                 # 헤더에 charset이 없어서 기본값(ISO-8859-1)으로 설정된 경우, 내용 기반 추측 사용
                 response.encoding = response.apparent_encoding
 
+            # 구조화 소스 우선 (조선일보·_STRUCTURED_JSONLD_DOMAINS) — JSON/메타 슬라이스로
+            # 추출되면 DOM을 만들지 않는다.
+            # 실패하면 아래 사이트별 HTML 핸들러로 폴백.
+            structured = self._scrape_structured(response.text, url)
+            if structured:
+                return structured
+
             # HTML 파싱
             soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -193,6 +240,195 @@ class ArticleScraper:
         except Exception as e:
             raise ValueError(f"기사 파싱 중 오류 발생: {str(e)}")
 
+    # ============================================
+    # 구조화 소스 레이어
+    # ============================================
+
+    def _scrape_structured(self, raw_html: str, url: str) -> Optional[Dict[str, str]]:
+        """DOM 파싱 없이 구조화 표현(Fusion JSON / JSON-LD / og: 메타)에서 기사 추출.
+
+        1. 조선일보: Fusion.globalContent JSON을 원문에서 바로 슬라이스
+        2. _STRUCTURED_JSONLD_DOMAINS: JSON-LD(NewsArticle 등)의 articleBody + og: 메타로 보강,
+           언론사명은 JSON-LD 값 대신 핸들러와 같은 표기로 고정
+        3. 그 외 도메인: 구조화 경로를 쓰지 않음 (None)
+
+        제목이 없거나 본문이 _STRUCTURED_MIN_CONTENT 미만이면 None을 반환하고,
+        호출 측은 기존 사이트별 HTML 핸들러로 폴백한다.
+        """
+        if not raw_html:
+            return None
+
+        try:
+            if 'chosun.com' in url:
+                result = self._extract_fusion(raw_html, url)
+            else:
+                publisher = next(
+                    (name for domain, name in _STRUCTURED_JSONLD_DOMAINS.items() if domain in url), None
+                )
+                if publisher is None:
+                    return None
+                result = self._extract_jsonld(raw_html, url)
+                if result:
+                    result["publisher"] = publisher
+        except Exception:
+            # 구조화 추출은 최적화 경로일 뿐 — 어떤 예외든 HTML 핸들러로 넘긴다.
+            return None
+
+        if not result or not result.get("title"):
+            return None
+        if len(result.get("content", "")) < _STRUCTURED_MIN_CONTENT:
+            return None
+        return result
+
+    def _slice_fusion_content(self, text: str) -> Optional[dict]:
+        """Fusion.globalContent= 뒤의 JSON 객체 하나를 raw_decode로 읽는다."""
+        idx = text.find(_FUSION_MARKER)
+        if idx == -1:
+            return None
+        try:
+            data, _ = json.JSONDecoder().raw_decode(text, idx + len(_FUSION_MARKER))
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _parse_fusion_content(self, json_data: dict) -> Dict[str, str]:
+        """Fusion.globalContent → 제목/본문/기자명/게재일."""
+        # 제목
+        headlines = json_data.get('headlines', {})
+        title = headlines.get('basic', '')
+        
+        # 본문
+        content_elements = json_data.get('content_elements', [])
+        body_text = []
+        for elem in content_elements:
+            if elem.get('type') == 'text':
+                body_text.append(elem.get('content', ''))
+        content = '\n\n'.join(body_text)
+        
+        # 기자명
+        journalist = "미확인"
+        credits = json_data.get('credits', {}).get('by', [])
+        journalist_list = []
+        if credits:
+            for credit in credits:
+                # 1. additional_properties.original.byline 확인 (예: "김희래 기자")
+                byline = credit.get('additional_properties', {}).get('original', {}).get('byline')
+                if byline:
+                    journalist_list.append(byline)
+                else:
+                    # 2. name 확인 (예: "희래 김") - " 기자" 접미사 추가
+                    name = credit.get('name')
+                    if name:
+                        journalist_list.append(f"{name} 기자")
+        
+        if journalist_list:
+            journalist = " ".join(journalist_list)
+        
+        # 게재일
+        publish_date = json_data.get('created_date', '미확인')
+
+        return {
+            "title": title,
+            "content": content,
+            "journalist": journalist,
+            "publish_date": publish_date,
+        }
+
+    def _extract_fusion(self, raw_html: str, url: str) -> Optional[Dict[str, str]]:
+        """조선일보 Fusion JSON 구조화 추출."""
+        json_data = self._slice_fusion_content(raw_html)
+        if not json_data:
+            return None
+        fusion = self._parse_fusion_content(json_data)
+        return {
+            "title": fusion["title"],
+            "content": fusion["content"],
+            "url": url,
+            "publisher": "조선일보",
+            "publish_date": fusion["publish_date"],
+            "journalist": fusion["journalist"],
+        }
+
+    def _extract_og_meta(self, raw_html: str) -> Dict[str, str]:
+        """<meta property|name="..." content="..."> 태그를 정규식으로 수집 (첫 값 우선)."""
+        meta: Dict[str, str] = {}
+        for tag in _META_TAG_RE.findall(raw_html):
+            key_match = _META_KEY_RE.search(tag)
+            content_match = _META_CONTENT_RE.search(tag)
+            if not key_match or not content_match:
+                continue
+            key = key_match.group(1).strip().lower()
+            value = content_match.group(1) if content_match.group(1) is not None else content_match.group(2)
+            if key not in meta:
+                meta[key] = html.unescape(value).strip()
+        return meta
+
+    def _find_jsonld_article(self, raw_html: str) -> Optional[dict]:
+        """JSON-LD 블록 중 articleBody를 가진 기사 객체를 찾는다 (@graph·배열 포함)."""
+        for block in _JSONLD_RE.findall(raw_html):
+            try:
+                data = json.loads(block.strip())
+            except ValueError:
+                continue
+            stack = [data]
+            while stack:
+                node = stack.pop(0)
+                if isinstance(node, list):
+                    stack.extend(node)
+                    continue
+                if not isinstance(node, dict):
+                    continue
+                if '@graph' in node:
+                    stack.extend(node['@graph'] if isinstance(node['@graph'], list) else [node['@graph']])
+                node_type = node.get('@type')
+                types = set(node_type) if isinstance(node_type, list) else {node_type}
+                if types & _JSONLD_ARTICLE_TYPES and node.get('articleBody'):
+                    return node
+        return None
+
+    def _jsonld_name(self, value) -> str:
+        """JSON-LD author/publisher 값(문자열·dict·리스트)에서 이름만 추출."""
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, dict):
+            return str(value.get('name', '')).strip()
+        if isinstance(value, list):
+            names = [self._jsonld_name(v) for v in value]
+            return " ".join(n for n in names if n)
+        return ""
+
+    def _extract_jsonld(self, raw_html: str, url: str) -> Optional[Dict[str, str]]:
+        """JSON-LD articleBody + og: 메타 구조화 추출."""
+        article = self._find_jsonld_article(raw_html)
+        if not article:
+            return None
+        meta = self._extract_og_meta(raw_html)
+
+        title = html.unescape(str(article.get('headline', ''))).strip() or meta.get('og:title', '')
+        content = self._clean_text(html.unescape(str(article.get('articleBody', ''))))
+
+        publisher = self._jsonld_name(article.get('publisher')) or meta.get('og:site_name', '') or "미확인"
+
+        publish_date = (
+            str(article.get('datePublished', '')).strip()
+            or meta.get('article:published_time', '')
+            or "미확인"
+        )
+
+        journalist = "미확인"
+        author = self._jsonld_name(article.get('author'))
+        if author:
+            journalist = author if '기자' in author else f"{author} 기자"
+
+        return {
+            "title": title,
+            "content": content,
+            "url": url,
+            "publisher": publisher,
+            "publish_date": publish_date,
+            "journalist": journalist,
+        }
+
     def _scrape_naver(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
         """네이버 뉴스 스크래핑"""
         # 제목 추출
@@ -1008,49 +1244,18 @@ class ArticleScraper:
         
         for s in scripts:
             text = s.get_text()
-            if 'Fusion.globalContent=' in text:
-                match = re.search(r'Fusion\.globalContent=({.*?});', text)
-                if match:
-                    try:
-                        json_data = json.loads(match.group(1))
-                        break
-                    except:
-                        continue
+            if _FUSION_MARKER in text:
+                json_data = self._slice_fusion_content(text)
+                if json_data:
+                    break
         
         # 2. JSON에서 데이터 추출
         if json_data:
-            # 제목
-            headlines = json_data.get('headlines', {})
-            title = headlines.get('basic', '')
-            
-            # 본문
-            content_elements = json_data.get('content_elements', [])
-            body_text = []
-            for elem in content_elements:
-                if elem.get('type') == 'text':
-                    body_text.append(elem.get('content', ''))
-            content = '\n\n'.join(body_text)
-            
-            # 기자명
-            credits = json_data.get('credits', {}).get('by', [])
-            journalist_list = []
-            if credits:
-                for credit in credits:
-                    # 1. additional_properties.original.byline 확인 (예: "김희래 기자")
-                    byline = credit.get('additional_properties', {}).get('original', {}).get('byline')
-                    if byline:
-                        journalist_list.append(byline)
-                    else:
-                        # 2. name 확인 (예: "희래 김") - " 기자" 접미사 추가
-                        name = credit.get('name')
-                        if name:
-                            journalist_list.append(f"{name} 기자")
-            
-            if journalist_list:
-                journalist = " ".join(journalist_list)
-            
-            # 게재일
-            publish_date = json_data.get('created_date', '미확인')
+            fusion = self._parse_fusion_content(json_data)
+            title = fusion["title"]
+            content = fusion["content"]
+            journalist = fusion["journalist"]
+            publish_date = fusion["publish_date"]
             
         # 3. JSON 파싱 실패 시 Fallback (기존 로직)
         if not title:
@@ -1773,3 +1978,7 @@ class ArticleScraper:
         # 앞뒤 공백 제거
         text = text.strip()
         return text
+
+
+# OTEL_TRACING=1이면 사이트별 추출기(_scrape_*)를 각각 span으로 기록
+tracing.trace_methods(ArticleScraper, "_scrape_", "scraper")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""analysis_results 아카이브 전체 인용 재감사 (배치).
+
+저장된 3종 리포트를 당시 Phase 2에 제공된 규범 집합
+(citation_audit.allowed_citations)으로 다시 감사한다. 라이브 경로와 같은
+verify_report_citations + citation_matcher를 쓰므로 결과 형식이 같고,
+규범 집합이 같은 행끼리는 컴파일된 Aho–Corasick 매처를 공유한다
+(compile_matcher 캐시 — 마지막에 hit/miss 출력).
+
+- id 기준 keyset 페이지네이션 (id=gt.<마지막 id>) — OFFSET 없이 전체 순회.
+- citation_audit가 없거나 allowed_citations가 빈 행(S6 이전 분석)은 건너뛴다.
+- near-miss 진단(편집 거리)을 켠다 — 라이브 경로는 기본 off (CITATION_NEAR_MISSES).
+- 행별 결과는 --out JSONL, 집계(매칭률·near-miss 종류·빈출 near-miss)는 로그로 출력.
+
+실행:
+    .venv/bin/python backend/scripts/audit_citations_archive.py --out /tmp/citation_audit.jsonl
+    .venv/bin/python backend/scripts/audit_citations_archive.py --since-id 1200 --limit 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# backend/core/db.py의 _get_supabase_config 재사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.archive_analytics import iter_analysis_rows  # noqa: E402
+from core.citation_matcher import matcher_cache_info  # noqa: E402
+from core.db import _get_supabase_config  # noqa: E402
+from core.verify_citations import verify_report_citations  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger("audit_citations_archive")
+
+_SELECT = (
+    "id,comprehensive_report,journalist_report,student_report,"
+    "allowed:citation_audit->allowed_citations"
+)
+
+
+class _StoredAllowed:
+    """저장된 allowed_citations를 verify_report_citations의 index 인자로 넘기는 어댑터."""
+
+    excluded_count = 0
+
+    def __init__(self, allowed: list[dict[str, Any]]):
+        self._allowed = allowed
+
+    def allowed_citations(self) -> list[dict[str, Any]]:
+        return self._allowed
+
+
+def audit_row(row: dict) -> dict | None:
+    allowed = row.get("allowed") or []
+    if not allowed:
+        return None
+    reports = {
+        "comprehensive": row.get("comprehensive_report") or "",
+        "journalist": row.get("journalist_report") or "",
+        "student": row.get("student_report") or "",
+    }
+    return verify_report_citations(reports, [], index=_StoredAllowed(allowed), near_misses=True)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="analysis_results 인용 재감사")
+    parser.add_argument("--out", type=Path, default=None, help="행별 결과 JSONL 경로")
+    parser.add_argument("--since-id", type=int, default=0, help="이 id 초과부터 (재개용)")
+    parser.add_argument("--limit", type=int, default=0, help="최대 행 수 (0=전체)")
+    parser.add_argument("--page-size", type=int, default=200)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    sb_url, sb_key = _get_supabase_config()
+    logger.info(f"Supabase URL: {sb_url}")
+    if not sb_key:
+        raise RuntimeError(
+            "Supabase service role key가 설정되지 않았습니다. "
+            ".env 또는 환경변수 확인 필요."
+        )
+
+    totals: Counter = Counter()
+    kinds: Counter = Counter()
+    pairs: Counter = Counter()
+    out = args.out.open("w", encoding="utf-8") if args.out else None
+    headers = {"apikey": sb_key, "Authorization": f"Bearer {sb_key}"}
+    try:
+        with httpx.Client(headers=headers) as client:
+            for row in iter_analysis_rows(
+                client, sb_url, _SELECT, args.since_id, args.page_size,
+            ):
+                totals["rows"] += 1
+                audit = audit_row(row)
+                if audit is None:
+                    totals["skipped"] += 1
+                else:
+                    s = audit["summary"]
+                    for key in ("used_total", "matched_total", "unmatched_total",
+                                "near_miss_total", "bare_mention_total"):
+                        totals[key] += s.get(key) or 0
+                    for report in audit["reports"].values():
+                        for nm in report.get("near_misses", []):
+                            kinds[nm["kind"]] += 1
+                            pairs[(nm["label"], nm["suggestion"])] += 1
+                    if out is not None:
+                        out.write(json.dumps(
+                            {"id": row["id"], "summary": s, "reports": audit["reports"]},
+                            ensure_ascii=False,
+                        ) + "\n")
+                if args.limit and totals["rows"] >= args.limit:
+                    break
+                if totals["rows"] % 1000 == 0:
+                    logger.info(f"진행: {totals['rows']}행 (마지막 id {row['id']})")
+    finally:
+        if out is not None:
+            out.close()
+
+    used = totals["used_total"]
+    rate = f"{totals['matched_total'] / used:.3f}" if used else "-"
+    logger.info(
+        f"완료: {totals['rows']}행 (건너뜀 {totals['skipped']}) | "
+        f"인용 {used}건, 매칭 {totals['matched_total']}, 비매칭 {totals['unmatched_total']} "
+        f"(match_rate {rate}) | near-miss {totals['near_miss_total']}, "
+        f"본문 직접 언급 {totals['bare_mention_total']}"
+    )
+    if kinds:
+        logger.info("near-miss 종류: " + ", ".join(f"{k}={v}" for k, v in kinds.most_common()))
+    for (label, suggestion), count in pairs.most_common(20):
+        logger.info(f"  {count:>5}  〔{label}〕 → 〔{suggestion}〕")
+    logger.info(f"컴파일 매처 캐시: {matcher_cache_info()}")
+    if args.out:
+        logger.info(f"저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""analysis_results 아카이브 → 열 지향 파일(Parquet/Arrow) + 사전 집계 (배치).
+
+citation_audit / phase1_forensic / detected_patterns JSONB를
+core.archive_analytics.flatten_analysis로 펼쳐 테이블별 파일로 기록한다.
+분석가는 PostgREST를 반복 호출하는 대신 로컬에서 DuckDB·pandas 등으로 조회한다.
+
+출력 (--out-dir):
+    analyses.<ext>           분석 1건 1행
+    detections.<ext>         탐지 1건 1행 (validated / hallucinated)
+    citations.<ext>          〔〕 인용 1건 1행
+    vector_candidates.<ext>  벡터 후보 1건 1행
+    aggregations.json        모델별 환각률·fallback률·패턴별 후보→validated 전환율·인용 매칭률
+
+- id 기준 keyset 페이지네이션 — OFFSET 없이 전체 순회, --since-id로 재개.
+- --batch-rows 행마다 row group(Parquet)/record batch(Arrow)로 끊어 써서 메모리 일정.
+- parquet/arrow는 pyarrow 필요 (백엔드 런타임 의존성 아님: pip install pyarrow).
+  --format jsonl은 추가 의존성 없이 같은 테이블을 JSON Lines로 기록.
+
+실행:
+    .venv/bin/python backend/scripts/export_analysis_archive.py --out-dir /tmp/cr_archive
+    .venv/bin/python backend/scripts/export_analysis_archive.py --format arrow --since-id 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# backend/core/db.py의 _get_supabase_config 재사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from core.archive_analytics import (  # noqa: E402
+    ARCHIVE_SELECT,
+    TABLES,
+    ArchiveAggregator,
+    flatten_analysis,
+    iter_analysis_rows,
+)
+from core.db import _get_supabase_config  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger("export_analysis_archive")
+
+_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow", "jsonl": "jsonl"}
+
+
+def _schemas(pa: Any) -> dict[str, Any]:
+    """테이블별 고정 스키마 — 배치마다 타입 추론이 달라지지 않도록 명시."""
+    return {
+        "analyses": pa.schema([
+            ("analysis_id", pa.int64()), ("article_id", pa.int64()),
+            ("created_at", pa.string()), ("phase1_model", pa.string()),
+            ("phase2_model", pa.string()), ("duration_seconds", pa.float64()),
+            ("article_context", pa.string()), ("has_forensic", pa.bool_()),
+            ("fallback_used", pa.bool_()), ("phase1_mode", pa.string()),
+            ("phase2_mode", pa.string()), ("phase2_attempts", pa.int32()),
+            ("phase2_parse_fallbacks", pa.int32()), ("candidate_count", pa.int32()),
+            ("validated_count", pa.int32()), ("hallucinated_count", pa.int32()),
+            ("citation_status", pa.string()), ("citation_used_total", pa.int32()),
+            ("citation_matched_total", pa.int32()), ("citation_unmatched_total", pa.int32()),
+            ("citation_near_miss_total", pa.int32()), ("citation_match_rate", pa.float64()),
+        ]),
+        "detections": pa.schema([
+            ("analysis_id", pa.int64()), ("pattern_code", pa.string()),
+            ("status", pa.string()), ("severity", pa.string()),
+            ("phase1_model", pa.string()),
+        ]),
+        "citations": pa.schema([
+            ("analysis_id", pa.int64()), ("report", pa.string()), ("label", pa.string()),
+            ("matched", pa.bool_()), ("near_miss_kind", pa.string()),
+            ("suggestion", pa.string()), ("phase2_model", pa.string()),
+        ]),
+        "vector_candidates": pa.schema([
+            ("analysis_id", pa.int64()), ("rank", pa.int32()),
+            ("pattern_code", pa.string()), ("similarity", pa.float64()),
+            ("starred", pa.bool_()), ("validated", pa.bool_()),
+        ]),
+    }
+
+
+class _TableSink:
+    """테이블 1개 출력. 버퍼가 batch_rows에 이르면 row group/record batch로 기록."""
+
+    def __init__(self, path: Path, fmt: str, schema: Any, batch_rows: int):
+        self.path = path
+        self.fmt = fmt
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._buffer: list[dict] = []
+        self._writer: Any = None
+        self._file: Any = None
+
+    def extend(self, rows: list[dict]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self.rows += len(self._buffer)
+        if self.fmt == "jsonl":
+            if self._file is None:
+                self._file = self.path.open("w", encoding="utf-8")
+            for row in self._buffer:
+                self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            import pyarrow as pa
+
+            batch = pa.RecordBatch.from_pylist(self._buffer, schema=self.schema)
+            if self._writer is None:
+                if self.fmt == "parquet":
+                    import pyarrow.parquet as pq
+
+                    self._writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+                else:
+                    self._writer = pa.ipc.new_file(str(self.path), self.schema)
+            if self.fmt == "parquet":
+                self._writer.write_batch(batch)
+            else:
+                self._writer.write(batch)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="analysis_results 열 지향 내보내기 + 집계")
+    parser.add_argument("--out-dir", type=Path, default=Path("analysis_archive"))
+    parser.add_argument("--format", choices=sorted(_EXTENSIONS), default="parquet")
+    parser.add_argument("--since-id", type=int, default=0, help="이 id 초과부터 (재개용)")
+    parser.add_argument("--limit", type=int, default=0, help="최대 분석 수 (0=전체)")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--batch-rows", type=int, default=50_000)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.format != "jsonl":
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise SystemExit(
+                "pyarrow가 설치되어 있지 않습니다. pip install pyarrow 후 다시 실행하거나 "
+                "--format jsonl을 사용하세요."
+            )
+        schemas = _schemas(pa)
+    else:
+        schemas = {name: None for name in TABLES}
+
+    sb_url, sb_key = _get_supabase_config()
+    logger.info(f"Supabase URL: {sb_url}")
+    if not sb_key:
+        raise RuntimeError(
+            "Supabase service role key가 설정되지 않았습니다. "
+            ".env 또는 환경변수 확인 필요."
+        )
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    ext = _EXTENSIONS[args.format]
+    sinks = {
+        name: _TableSink(args.out_dir / f"{name}.{ext}", args.format, schemas[name], args.batch_rows)
+        for name in TABLES
+    }
+    agg = ArchiveAggregator()
+    last_id = args.since_id
+    headers = {"apikey": sb_key, "Authorization": f"Bearer {sb_key}"}
+    try:
+        with httpx.Client(headers=headers) as client:
+            for row in iter_analysis_rows(
+                client, sb_url, ARCHIVE_SELECT, args.since_id, args.page_size,
+            ):
+                tables = flatten_analysis(row)
+                agg.add(tables)
+                for name, rows in tables.items():
+                    sinks[name].extend(rows)
+                last_id = row["id"]
+                if agg.analyses % 5000 == 0:
+                    logger.info(f"진행: {agg.analyses}건 (마지막 id {last_id})")
+                if args.limit and agg.analyses >= args.limit:
+                    break
+    finally:
+        for sink in sinks.values():
+            sink.close()
+
+    aggregations = agg.result()
+    aggregations["last_id"] = last_id
+    (args.out_dir / "aggregations.json").write_text(
+        json.dumps(aggregations, ensure_ascii=False, indent=2), encoding="utf-8",
+    )
+    logger.info(
+        f"완료: 분석 {agg.analyses}건 (마지막 id {last_id}) | "
+        + ", ".join(f"{name} {sink.rows}행" for name, sink in sinks.items())
+    )
+    for m in aggregations["hallucination_by_model"]:
+        logger.info(f"  환각률 {m['phase1_model']}: {m['rate']} ({m['hallucinated']}/{m['detections']})")
+    logger.info(f"저장: {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""아카이브 평탄화·사전 집계 단위 테스트 (네트워크·DB·pyarrow 불요).
+
+대상:
+  ① flatten_analysis — 탐지(validated/hallucinated)·인용(near-miss 포함)·벡터 후보 행 수와 값
+  ② 포렌식/감사 JSONB가 없는 레거시 행 — analyses 1행, 나머지 0행, 집계에서 제외
+  ③ ArchiveAggregator — 모델별 환각률, 모드별 fallback률·Phase 2 재시도, 패턴 전환율, 인용 매칭률
+  ④ iter_analysis_rows — id keyset 페이지네이션 (id=gt.<마지막 id>, 짧은 페이지에서 종료)
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_archive_analytics -v
+패턴 코드는 실제 데이터와 무관한 합성값(9-9-*)만 사용한다.
+"""
+
+import unittest
+
+from core.archive_analytics import build_aggregations, flatten_analysis, iter_analysis_rows
+
+
+def _row(aid, model="m1", hallucinated=(), fallback=False, mode="text", attempts=1):
+    return {
+        "id": aid,
+        "article_id": aid * 10,
+        "phase2_model": "s2",
+        "detected_patterns": [{"pattern_code": "9-9-a", "severity": "high"}],
+        "phase1_forensic": {
+            "vector_candidates": [
+                {"code": "9-9-a", "name": "A", "similarity": 0.81},
+                {"code": "9-9-b", "name": "B", "similarity": 0.72},
+            ],
+            "starred_codes": ["9-9-b"],
+            "validated_codes": ["9-9-a"],
+            "hallucinated_codes": list(hallucinated),
+            "article_context": "general",
+            "fallback_used": fallback,
+            "phase1_model": model,
+            "structured_output": {
+                "phase1": {"mode": mode, "fallback_used": fallback, "seconds": 1.0},
+                "phase2": {"mode": mode, "attempts": attempts, "retries": attempts - 1,
+                           "parse_fallbacks": 0, "seconds": 2.0},
+            },
+        },
+        "citation_audit": {
+            "status": "ok",
+            "summary": {"used_total": 2, "matched_total": 1, "unmatched_total": 1,
+                        "near_miss_total": 1, "match_rate": 0.5},
+            "reports": {
+                "comprehensive": {
+                    "matched": ["A 제1조"],
+                    "unmatched": ["A 제1조 1항"],
+                    "near_misses": [{"label": "A 제1조 1항", "suggestion": "A 제1조 ①",
+                                     "kind": "variant:hang", "distance": 2}],
+                },
+            },
+        },
+    }
+
+
+class TestFlatten(unittest.TestCase):
+    def test_tables(self):
+        t = flatten_analysis(_row(1, hallucinated=["9-9-z"]))
+        self.assertEqual(len(t["analyses"]), 1)
+        self.assertEqual(
+            [(d["pattern_code"], d["status"]) for d in t["detections"]],
+            [("9-9-a", "validated"), ("9-9-z", "hallucinated")],
+        )
+        self.assertEqual([c["matched"] for c in t["citations"]], [True, False])
+        self.assertEqual(t["citations"][1]["near_miss_kind"], "variant:hang")
+        vc = t["vector_candidates"]
+        self.assertEqual([(v["rank"], v["starred"], v["validated"]) for v in vc],
+                         [(1, False, True), (2, True, False)])
+        a = t["analyses"][0]
+        self.assertEqual((a["hallucinated_count"], a["citation_match_rate"]), (1, 0.5))
+
+    def test_legacy_row(self):
+        t = flatten_analysis({"id": 7, "phase1_forensic": None, "citation_audit": None})
+        self.assertFalse(t["analyses"][0]["has_forensic"])
+        self.assertEqual((t["detections"], t["citations"], t["vector_candidates"]), ([], [], []))
+        self.assertEqual(build_aggregations([{"id": 7}])["hallucination_by_model"], [])
+
+
+class TestAggregations(unittest.TestCase):
+    def test_prebuilt(self):
+        agg = build_aggregations([
+            _row(1, hallucinated=["9-9-z"]),
+            _row(2, fallback=True),
+            _row(3, model="m2", mode="tool", attempts=3),
+        ])
+        self.assertEqual(agg["analyses"], 3)
+        m1 = agg["hallucination_by_model"][0]
+        self.assertEqual((m1["phase1_model"], m1["detections"], m1["hallucinated"], m1["rate"]),
+                         ("m1", 3, 1, 0.3333))
+        fb = {(f["phase1_model"], f["phase1_mode"]): f for f in agg["fallback_by_mode"]}
+        self.assertEqual(fb[("m1", "text")]["rate"], 0.5)
+        self.assertEqual(fb[("m2", "tool")]["phase2_retries"], 2)
+        conv = {p["pattern_code"]: p for p in agg["pattern_conversion"]}
+        self.assertEqual(conv["9-9-a"]["conversion_rate"], 1.0)
+        self.assertEqual(conv["9-9-b"]["conversion_rate"], 0.0)
+        cit = agg["citation_by_model"][0]
+        self.assertEqual((cit["used"], cit["matched"], cit["match_rate"]), (6, 3, 0.5))
+
+
+class _FakeResponse:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._rows
+
+
+class _FakeClient:
+    def __init__(self, ids):
+        self.ids = ids
+        self.calls = []
+
+    def get(self, url, params, timeout):
+        self.calls.append(params["id"])
+        after = int(params["id"].removeprefix("gt."))
+        limit = int(params["limit"])
+        return _FakeResponse([{"id": i} for i in self.ids if i > after][:limit])
+
+
+class TestKeyset(unittest.TestCase):
+    def test_pages_by_last_id(self):
+        client = _FakeClient([3, 5, 8, 13, 21])
+        rows = list(iter_analysis_rows(client, "http://sb", "id", since_id=3, page_size=2))
+        self.assertEqual([r["id"] for r in rows], [5, 8, 13, 21])
+        self.assertEqual(client.calls, ["gt.3", "gt.8", "gt.21"])
+
+
+if __name__ == "__main__":
+    unittest.main()
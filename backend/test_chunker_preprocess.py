@@ -0,0 +1,234 @@
+"""chunker.preprocess 리터럴 사전 검사 엔진 동등성 + 오프셋 맵 테스트 (네트워크 불요).
+
+대상:
+  ① 골든셋·픽스처 기사 본문 — preprocess 출력 == 기존 순차 sub 출력
+  ② 대표 노이즈 라인(캡션/바이라인/저작권/관련기사/포털 메타) 제거 동등성
+  ③ 공백 정리(연속 줄바꿈 축약 + 줄 단위 strip) 동등성
+  ④ find_noise()가 매칭마다 패턴명(`분류_인덱스`)을 붙임
+  ⑤ preprocess_with_offsets() — cleaned[i] == 원문[offsets[i]], 단조 증가
+  ⑥ chunk_article() — 노이즈 제거 후에도 start_idx/end_idx가 원문과 정확히 대응
+  ⑦ 퍼즈 — 노이즈·본문 조각 무작위 조합 20000건에서 preprocess == 순차 sub (우선순위 겹침·2차 매칭 포함)
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_chunker_preprocess -v
+"""
+
+import glob
+import json
+import random
+import unittest
+from pathlib import Path
+
+from core import chunker
+from core.chunker import (
+    chunk_article,
+    find_noise,
+    preprocess,
+    preprocess_with_offsets,
+    _preprocess_sequential,
+)
+
+
+_DOCS = Path(__file__).parent.parent / "docs"
+
+_BODY = "정부는 이날 발표한 대책에서 공급 확대를 강조했다.\n시장에서는 효과에 의문을 제기했다."
+
+
+def _load_golden_texts() -> list[tuple[str, str]]:
+    """저장소에 포함된 골든셋 기사 본문을 (id, text)로 수집."""
+    texts: list[tuple[str, str]] = []
+    golden = _DOCS / "golden_dataset_final.json"
+    if golden.exists():
+        data = json.loads(golden.read_text(encoding="utf-8"))
+        for c in data.get("candidates", []):
+            if c.get("article_key_text"):
+                texts.append((c.get("candidate_id", "?"), c["article_key_text"]))
+    fixtures_dir = _DOCS / "report-quality-recovery" / "fixtures"
+    fixtures = fixtures_dir / "fixtures.json"
+    if fixtures.exists():
+        data = json.loads(fixtures.read_text(encoding="utf-8"))
+        for f in data.get("fixtures", []):
+            if f.get("article_text"):
+                texts.append((f.get("fixture_id", "?"), f["article_text"]))
+    for path in sorted(glob.glob(str(fixtures_dir / "_scraped_*.json"))):
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            for key in ("content", "article_text"):
+                if data.get(key):
+                    texts.append((Path(path).name, data[key]))
+    return texts
+
+
+class TestGoldenEquivalence(unittest.TestCase):
+    def test_golden_texts_identical(self):
+        texts = _load_golden_texts()
+        if not texts:
+            self.skipTest("골든셋 파일 없음")
+        for key, text in texts:
+            with self.subTest(key=key):
+                self.assertEqual(preprocess(text), _preprocess_sequential(text))
+
+
+class TestNoiseLineEquivalence(unittest.TestCase):
+    _NOISE_LINES = [
+        "[사진=연합뉴스]",
+        "(서울=뉴스1) 홍길동 기자 =",
+        "홍길동 기자 hong@example.com",
+        "Copyright © 테스트일보. All rights reserved.",
+        "무단전재 및 재배포 금지",
+        "▶ 관련기사 더보기",
+        "[관련기사]",
+        "입력 2026.01.01 09:00",
+        "수정 2026.01.01 10:00",
+    ]
+
+    def test_each_noise_line(self):
+        for line in self._NOISE_LINES:
+            text = f"{_BODY}\n\n{line}\n\n{_BODY}"
+            with self.subTest(line=line):
+                self.assertEqual(preprocess(text), _preprocess_sequential(text))
+
+    def test_all_noise_lines_in_one_article(self):
+        text = "\n".join([self._NOISE_LINES[0], _BODY, "", *self._NOISE_LINES[1:], _BODY])
+        self.assertEqual(preprocess(text), _preprocess_sequential(text))
+
+
+class TestWhitespaceEquivalence(unittest.TestCase):
+    def test_whitespace_cases(self):
+        cases = [
+            "",
+            "   ",
+            "\n\n\n",
+            "본문\n\n\n\n\n다음 문단",
+            "  앞 공백\t\n\t뒤 공백  \n",
+            "a\n \n \n b",
+            "a　\n　b",
+            "a\r\n\r\n\r\nb",
+            "a \n\n \n c",
+        ]
+        for text in cases:
+            with self.subTest(text=text):
+                self.assertEqual(preprocess(text), _preprocess_sequential(text))
+
+
+class TestFuzzEquivalence(unittest.TestCase):
+    # 패턴 경계가 겹치거나 삭제 후 새 매칭이 생기는 조각들 (바이라인 연속, 캡션+빈 줄 등)
+    _FRAGMENTS = [
+        "김철수 특파원", "홍길동 기자", "홍길동  선임기자", "이기자 인턴기자 = lee@example.com",
+        "hong@example.com", "/박기자 기자", "○○○ 기자", "[사진=연합뉴스]", "(사진=뉴스1)",
+        "사진 제공=OO", "【사진 캡션】", "ⓒ 테스트일보", "Ⓒ 테스트", "© 2026", "무단전재 및 재배포 금지",
+        "Copyright 테스트", "ALL RIGHTS RESERVED", "▶ 관련기사", "▶ 더보기 클릭", "[관련기사]",
+        "☞ 링크", "※ 이 기사는 뉴스와이어가 제공", "<b>", "</p>", "[입력 2026.01.01 09:00]",
+        "---", "===", "기사제보 및 보도자료", "네이버에서 구독하세요", "좋아요 3 댓글 4",
+        "언론사 구독", "기사원문", "SNS 공유", "야당은 반발했다.", "정부는 대책을 발표했다.",
+        "기자", "특파원", "@", "사진", "입력", "=", "-", "<", "[", "]",
+    ]
+    _SEPARATORS = ["\n", "\n\n", "\n\n\n", " ", "", "  \n", "\t"]
+
+    def test_random_fragments(self):
+        rng = random.Random(20261019)
+        for i in range(20000):
+            text = "".join(
+                rng.choice(self._FRAGMENTS) + rng.choice(self._SEPARATORS)
+                for _ in range(rng.randint(1, 8))
+            )
+            expected = _preprocess_sequential(text)
+            if preprocess(text) != expected or preprocess_with_offsets(text)[0] != expected:
+                self.fail(f"#{i} 순차 sub와 불일치: {text!r}")
+
+    def test_priority_overlap(self):
+        # 교대 결합이면 특파원 줄(byline_1)이 먼저 이겨 본문이 남던 경우
+        text = "김철수 특파원\n홍길동 기자\n야당은 반발했다."
+        self.assertEqual(preprocess(text), _preprocess_sequential(text))
+        self.assertEqual([n for n, _ in find_noise(text)], ["byline_0", "byline_1"])
+
+    def test_literal_registry(self):
+        self.assertLessEqual(set(chunker._NOISE_LITERALS), set(chunker._NOISE_NAMES))
+
+
+class TestFindNoise(unittest.TestCase):
+    def test_names_registry_matches_pattern_lists(self):
+        total = sum(len(p) for _, p in chunker._NOISE_PATTERN_GROUPS)
+        self.assertEqual(len(chunker._NOISE_NAMES), total)
+        self.assertEqual(len(chunker._COMPILED_NOISE), total)
+        self.assertEqual(len(set(chunker._NOISE_NAMES)), total)
+
+    def test_hits_are_classified(self):
+        text = f"[사진=연합뉴스]\n{_BODY}\n홍길동 기자 hong@example.com\nⓒ 테스트일보"
+        names = [name for name, _ in find_noise(text)]
+        self.assertEqual(names, ["caption_2", "byline_0", "copyright_0"])
+
+    def test_clean_text_has_no_hits(self):
+        self.assertEqual(find_noise(_BODY), [])
+
+
+def _assert_offset_map(tc: unittest.TestCase, original: str) -> None:
+    cleaned, offsets = preprocess_with_offsets(original)
+    tc.assertEqual(cleaned, preprocess(original))
+    tc.assertEqual(len(offsets), len(cleaned))
+    tc.assertTrue(all(a < b for a, b in zip(offsets, offsets[1:])))
+    tc.assertEqual("".join(original[i] for i in offsets), cleaned)
+
+
+class TestOffsetMap(unittest.TestCase):
+    def test_golden_texts(self):
+        for key, text in _load_golden_texts():
+            with self.subTest(key=key):
+                _assert_offset_map(self, text)
+
+    def test_noise_and_whitespace(self):
+        text = (
+            "  [사진=연합뉴스]\n홍길동 기자 hong@example.com\n"
+            f"{_BODY}  \n\n\n\n\t{_BODY}\nⓒ 테스트일보 무단전재 및 재배포 금지\n  "
+        )
+        _assert_offset_map(self, text)
+        cleaned, offsets = preprocess_with_offsets(text)
+        self.assertEqual(offsets[0], text.index(_BODY))
+
+    def test_empty(self):
+        self.assertEqual(preprocess_with_offsets(""), ("", []))
+        self.assertEqual(preprocess_with_offsets(" \n "), ("", []))
+
+
+class TestChunkPositions(unittest.TestCase):
+    def _check(self, original: str) -> list:
+        chunks = chunk_article(original)
+        prev_end = 0
+        for c in chunks:
+            self.assertGreaterEqual(c.start_idx, prev_end)
+            self.assertLess(c.start_idx, c.end_idx)
+            span = original[c.start_idx:c.end_idx]
+            # 청크 텍스트와 원문 구간은 공백·노이즈 차이만 있다
+            self.assertEqual(span[0], c.text[0])
+            self.assertEqual(span[-1], c.text[-1])
+            self.assertEqual(preprocess(span).split(), c.text.split())
+            prev_end = c.end_idx
+        return chunks
+
+    def test_noisy_long_article(self):
+        para = ("정부는 이날 발표한 대책에서 공급 확대를 강조했다. " * 6).strip()
+        noise = ["[사진=연합뉴스]", "▶ 관련기사 더보기", "홍길동 기자 hong@example.com"]
+        blocks = []
+        for i in range(8):
+            blocks.append(noise[i % len(noise)])
+            blocks.append(f"{i}번째 문단. {para}")
+        original = "\n\n".join(blocks) + "\nⓒ 테스트일보"
+        chunks = self._check(original)
+        self.assertGreater(len(chunks), 1)
+        # 첫 청크는 원문 맨 앞 캡션이 아니라 본문 시작을 가리킨다
+        self.assertEqual(chunks[0].start_idx, original.index("0번째 문단"))
+
+    def test_short_article_span(self):
+        original = "[사진=연합뉴스]\n" + _BODY + "\n홍길동 기자 hong@example.com"
+        chunks = self._check(original)
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].start_idx, original.index(_BODY))
+        self.assertEqual(chunks[0].end_idx, original.index(_BODY) + len(_BODY))
+
+    def test_golden_texts(self):
+        for key, text in _load_golden_texts():
+            with self.subTest(key=key):
+                self._check(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
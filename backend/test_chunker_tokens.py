@@ -0,0 +1,127 @@
+"""토큰 예산 기반 청킹(CHUNK_MODE=tokens) 단위 테스트 (네트워크 불요).
+
+대상:
+  ① 한국어 문장 경계 — 다./요./까? 종결 + 닫는 따옴표, 소수점·약어는 유지
+  ② max_tokens 예산 준수, 초과 문장은 어절 경계에서 분할
+  ③ overlap — 직전 청크 끝 문장을 overlap_tokens 이내로 이어 받음
+  ④ start_idx/end_idx가 원문 위치와 정확히 대응 (노이즈 제거 후에도)
+  ⑤ chunk_article(mode="tokens") 디스패치
+
+토크나이저는 추정치 경로로 고정한다 (tiktoken 설치·캐시 여부와 무관하게 결정적).
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_chunker_tokens -v
+"""
+
+import unittest
+from unittest.mock import patch
+
+from core import chunker
+from core.chunker import (
+    chunk_article,
+    chunk_article_by_tokens,
+    count_tokens,
+    preprocess,
+    _split_sentence_spans,
+)
+
+
+_SENTENCES = [
+    "정부는 이날 부동산 공급 대책을 발표했다.",
+    "금리는 3.5%로 동결됐다.",
+    "시장에서는 \"효과가 제한적일 것\"이라고 말했다.",
+    "전문가들은 후속 조치가 필요하다고 봤어요.",
+    "정말 그럴까?",
+    "야당은 \"졸속 대책\"이라고 비판했다.\"",
+]
+
+
+def _article(n_paragraphs: int = 6) -> str:
+    para = " ".join(_SENTENCES)
+    blocks = []
+    for i in range(n_paragraphs):
+        blocks.append(f"[사진=연합뉴스]\n{i}번째 문단. {para}")
+    return "\n\n".join(blocks) + "\n홍길동 기자 hong@example.com"
+
+
+class _EstimatedTokens(unittest.TestCase):
+    def setUp(self):
+        p1 = patch.object(chunker, "_tokenizer", None)
+        p2 = patch.object(chunker, "_tokenizer_loaded", True)
+        p1.start(), p2.start()
+        self.addCleanup(p1.stop)
+        self.addCleanup(p2.stop)
+
+
+class TestSentenceSpans(_EstimatedTokens):
+    def test_korean_endings(self):
+        text = " ".join(_SENTENCES)
+        sentences = [text[s:e] for s, e in _split_sentence_spans(text)]
+        self.assertEqual(sentences, _SENTENCES)
+
+    def test_blank_line_is_boundary(self):
+        text = "첫 문단 제목\n\n둘째 문단 시작 문장이고 끝나지 않음"
+        sentences = [text[s:e] for s, e in _split_sentence_spans(text)]
+        self.assertEqual(sentences, ["첫 문단 제목", "둘째 문단 시작 문장이고 끝나지 않음"])
+
+    def test_count_tokens_estimate(self):
+        self.assertEqual(count_tokens("가나다"), 3)
+        self.assertEqual(count_tokens("abcdefgh"), 2)
+
+
+class TestTokenChunks(_EstimatedTokens):
+    def test_budget_and_positions(self):
+        original = _article()
+        chunks = chunk_article_by_tokens(original, max_tokens=120, overlap_tokens=30)
+        self.assertGreater(len(chunks), 1)
+        for c in chunks:
+            self.assertLessEqual(count_tokens(c.text), 120)
+            span = original[c.start_idx:c.end_idx]
+            self.assertEqual(span[0], c.text[0])
+            self.assertEqual(span[-1], c.text[-1])
+            self.assertEqual(preprocess(span).split(), c.text.split())
+
+    def test_overlap_carries_tail_sentences(self):
+        chunks = chunk_article_by_tokens(_article(), max_tokens=120, overlap_tokens=30)
+        for prev, nxt in zip(chunks, chunks[1:]):
+            self.assertLess(nxt.start_idx, prev.end_idx)
+            self.assertGreater(nxt.end_idx, prev.end_idx)
+
+    def test_no_overlap(self):
+        chunks = chunk_article_by_tokens(_article(), max_tokens=120, overlap_tokens=0)
+        for prev, nxt in zip(chunks, chunks[1:]):
+            self.assertGreaterEqual(nxt.start_idx, prev.end_idx)
+        joined = " ".join(c.text for c in chunks).split()
+        self.assertEqual(joined, preprocess(_article()).split())
+
+    def test_oversized_sentence_split_on_words(self):
+        original = "아주 " * 200 + "긴 문장이다."
+        chunks = chunk_article_by_tokens(original, max_tokens=50, overlap_tokens=0)
+        self.assertGreater(len(chunks), 1)
+        for c in chunks:
+            self.assertLessEqual(count_tokens(c.text), 50)
+
+    def test_short_article_single_chunk(self):
+        chunks = chunk_article_by_tokens(_SENTENCES[0], max_tokens=500)
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].text, _SENTENCES[0])
+
+    def test_empty(self):
+        self.assertEqual(chunk_article_by_tokens(""), [])
+        self.assertEqual(chunk_article_by_tokens("[사진=연합뉴스]"), [])
+
+    def test_mode_dispatch(self):
+        original = _article()
+        self.assertEqual(
+            [c.text for c in chunk_article(original, mode="tokens")],
+            [c.text for c in chunk_article_by_tokens(original)],
+        )
+        with patch.object(chunker, "CHUNK_MODE", "tokens"):
+            self.assertEqual(len(chunk_article(original)), len(chunk_article_by_tokens(original)))
+        self.assertEqual(
+            [c.text for c in chunk_article(original, mode="chars")],
+            [c.text for c in chunk_article(original)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
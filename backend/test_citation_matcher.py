@@ -0,0 +1,147 @@
+"""인용 감사 매처(Aho–Corasick + near-miss) 단위 테스트 (네트워크·DB 불요).
+
+대상:
+  ① AhoCorasick — 겹치는 패턴·실패 링크 포함 전체 매칭
+  ② label_variants — 원문자→N항, 조만 축약, 공백 제거 변형
+  ③ near_miss — variant / edit / contains 분류, 후보 없으면 None, exact면 None
+  ④ scan — 3종 리포트 1회 스캔으로 〔〕 라벨(used)과 bare mention, 〔〕 안 인용은 제외, 리포트 경계 유지
+  ⑤ verify_report_citations 연동 — matched/unmatched 판정은 exact 그대로, 진단 필드 추가
+     near_misses는 opt-in, 켜도 비매칭 라벨에만 계산 (정규식 감사 패스·매칭 라벨 편집 거리 없음)
+  ⑥ compile_matcher — 같은 규범 집합(순서 무관)이면 같은 매처 재사용
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_citation_matcher -v
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core import citation_matcher, verify_citations
+from core.citation_matcher import (
+    AhoCorasick,
+    compile_matcher,
+    edit_distance,
+    label_variants,
+)
+from core.verify_citations import build_allowed_citations, verify_report_citations
+
+
+def mk(source, article):
+    return SimpleNamespace(
+        ethics_source=source, ethics_article_number=article, ethics_title="", ethics_tier=1,
+    )
+
+
+_REFS = [mk("언론윤리헌장", "제3조 ①"), mk("신문윤리실천요강", "제2조")]
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_overlapping_matches(self):
+        ac = AhoCorasick(["he", "she", "his", "hers"])
+        found = sorted((s, e, ac.patterns[p]) for s, e, p in ac.iter_matches("ushers"))
+        self.assertEqual(found, [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+    def test_no_match(self):
+        self.assertEqual(list(AhoCorasick(["abc"]).iter_matches("abab")), [])
+
+
+class TestVariants(unittest.TestCase):
+    def test_circled_article(self):
+        variants = dict(label_variants("언론윤리헌장", "제3조 ①"))
+        self.assertEqual(variants["언론윤리헌장 제3조 ①"], "exact")
+        self.assertEqual(variants["언론윤리헌장 제3조 1항"], "hang")
+        self.assertEqual(variants["언론윤리헌장 제3조"], "article_only")
+        self.assertEqual(variants["언론윤리헌장제3조①"], "compact")
+
+    def test_edit_distance_cutoff(self):
+        self.assertEqual(edit_distance("kitten", "sitting"), 3)
+        self.assertEqual(edit_distance("a" * 10, "b", cutoff=2), 3)
+
+
+class TestNearMiss(unittest.TestCase):
+    def setUp(self):
+        self.matcher = compile_matcher(build_allowed_citations(_REFS))
+
+    def test_kinds(self):
+        nm = self.matcher.near_miss("언론윤리헌장 제3조 1항")
+        self.assertEqual((nm.kind, nm.suggestion), ("variant:hang", "언론윤리헌장 제3조 ①"))
+        nm = self.matcher.near_miss("신문윤리실천요강 제 2조")
+        self.assertEqual((nm.kind, nm.distance), ("edit", 1))
+        nm = self.matcher.near_miss("언론윤리헌장 제3조 ① 및 ②")
+        self.assertEqual((nm.kind, nm.suggestion), ("contains", "언론윤리헌장 제3조 ①"))
+
+    def test_none(self):
+        self.assertIsNone(self.matcher.near_miss("전혀 다른 규정"))
+        self.assertIsNone(self.matcher.near_miss(" 신문윤리실천요강  제2조 "))
+
+
+class TestScanReports(unittest.TestCase):
+    def test_bare_mentions_single_pass(self):
+        matcher = compile_matcher(build_allowed_citations(_REFS))
+        found = matcher.scan_reports({
+            "comprehensive": "〔신문윤리실천요강 제2조〕 인용",
+            "journalist": "신문윤리실천요강\n제2조에 따르면",
+            "student": "",
+        })
+        self.assertEqual(found, {
+            "comprehensive": [], "journalist": ["신문윤리실천요강 제2조"], "student": [],
+        })
+
+    def test_used_labels_match_regex_extraction(self):
+        matcher = compile_matcher(build_allowed_citations(_REFS))
+        texts = {
+            "comprehensive": "〔 A  제1조 〕 〔〕 〔   〕 〔B\n제２조〕 신문윤리실천요강 제2조",
+            "journalist": "〔〔중첩〕 끝",
+            "student": "",
+        }
+        scans = matcher.scan(texts)
+        for key, text in texts.items():
+            self.assertEqual(scans[key].used, verify_citations.extract_citation_labels(text))
+        self.assertEqual(scans["comprehensive"].bare_mentions, ["신문윤리실천요강 제2조"])
+
+
+class TestVerifyIntegration(unittest.TestCase):
+    def test_exact_semantics_unchanged(self):
+        reports = {
+            "comprehensive": "〔언론윤리헌장 제3조 1항〕 〔신문윤리실천요강 제2조〕",
+            "journalist": "신문윤리실천요강 제2조 본문 언급",
+            "student": "〔없는 규정〕",
+        }
+        audit = verify_report_citations(reports, _REFS, near_misses=True)
+        s = audit["summary"]
+        self.assertEqual((s["matched_total"], s["unmatched_total"]), (1, 2))
+        self.assertEqual(s["near_miss_total"], 1)
+        self.assertEqual(s["bare_mention_total"], 1)
+        ra = audit["reports"]
+        self.assertEqual(ra["comprehensive"]["near_misses"][0]["kind"], "variant:hang")
+        self.assertEqual(ra["journalist"]["bare_mentions"], ["신문윤리실천요강 제2조"])
+        self.assertEqual(ra["student"]["near_misses"], [])
+        self.assertEqual(audit["version"], "wave1_s6_v1")
+
+    def test_near_misses_opt_in(self):
+        reports = {"comprehensive": "〔언론윤리헌장 제3조 1항〕 〔신문윤리실천요강 제2조〕"}
+        with patch.object(verify_citations, "extract_citation_labels") as regex_pass, \
+             patch.object(citation_matcher, "edit_distance") as edit:
+            audit = verify_report_citations(reports, _REFS)
+        regex_pass.assert_not_called()
+        edit.assert_not_called()
+        self.assertIsNone(audit["summary"]["near_miss_total"])
+        self.assertNotIn("near_misses", audit["reports"]["comprehensive"])
+        self.assertEqual(audit["summary"]["matched_total"], 1)
+
+    def test_near_misses_only_for_unmatched(self):
+        reports = {"comprehensive": "〔신문윤리실천요강 제2조〕 〔신문윤리실천요강 제2조〕 〔없는 규정〕"}
+        with patch.object(citation_matcher.CitationMatcher, "near_miss", return_value=None) as nm:
+            verify_report_citations(reports, _REFS, near_misses=True)
+        self.assertEqual([c.args[0] for c in nm.call_args_list], ["없는 규정"])
+
+
+class TestCompileCache(unittest.TestCase):
+    def test_same_set_reuses_matcher(self):
+        allowed = build_allowed_citations(_REFS)
+        self.assertIs(compile_matcher(allowed), compile_matcher(list(reversed(allowed))))
+        self.assertEqual(len(compile_matcher(allowed)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""진단 기록 비동기 싱크 단위 테스트 (네트워크·DB 불요).
+
+대상:
+  ① submit → 백그라운드 writer가 gzip JSONL로 기록, diagnostic_id 고유
+  ② 샘플링 0 → builder 미호출·파일 미생성
+  ③ 큐 포화 → 요청 스레드 비차단, dropped 카운트
+  ④ builder 예외 → 해당 레코드만 누락, 나머지는 기록
+  ⑤ 크기 한도 회전 + 보존 개수 정리
+  ⑥ capture — 요청 스레드에서 즉시 스냅샷, builder는 writer 스레드에서 스냅샷으로 조립 (샘플 제외 시 미호출)
+  ⑦ read_diagnostics — 마지막 gzip 멤버가 잘린 파일은 완전한 레코드까지 읽고 멈춤
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_diagnostics_sink -v
+"""
+
+import gzip
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from core.diagnostics import DiagnosticsSink, iter_diagnostic_files, read_diagnostics
+
+
+def _records(directory: Path) -> list[dict]:
+    return [r for p in iter_diagnostic_files(directory) for r in read_diagnostics(p)]
+
+
+class TestDiagnosticsSink(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_submit_writes_gzip_jsonl(self):
+        sink = DiagnosticsSink(self.dir, sample_rate=1.0)
+        ids = [sink.submit(lambda i=i: {"n": i, "텍스트": "한글"}) for i in range(5)]
+        self.assertTrue(sink.flush())
+        records = _records(self.dir)
+        self.assertEqual([r["n"] for r in records], list(range(5)))
+        self.assertEqual([r["diagnostic_id"] for r in records], ids)
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(records[0]["텍스트"], "한글")
+        self.assertIn("timestamp", records[0])
+        self.assertTrue(all(p.name.endswith(".jsonl.gz") for p in self.dir.iterdir()))
+
+    def test_sampling_zero_skips_builder(self):
+        sink = DiagnosticsSink(self.dir, sample_rate=0.0)
+        called = []
+        self.assertIsNone(sink.submit(lambda: called.append(1) or {}))
+        self.assertTrue(sink.flush())
+        self.assertEqual(called, [])
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+    def test_capture_on_submit_thread(self):
+        sink = DiagnosticsSink(self.dir, sample_rate=1.0)
+        state = {"n": 1}
+        threads = []
+
+        def capture():
+            threads.append(threading.current_thread())
+            return dict(state)
+
+        sink.submit(lambda snap: {"n": snap["n"]}, capture=capture)
+        state["n"] = 2  # 제출 후 원본 수정
+        self.assertEqual(threads, [threading.current_thread()])
+        self.assertTrue(sink.flush())
+        self.assertEqual([r["n"] for r in _records(self.dir)], [1])
+
+        skipped = DiagnosticsSink(self.dir, sample_rate=0.0)
+        skipped.submit(lambda snap: {}, capture=lambda: threads.append("called"))
+        self.assertEqual(len(threads), 1)
+
+    def test_truncated_tail_member(self):
+        path = self.dir / "diagnostics-truncated.jsonl.gz"
+        tail = gzip.compress(
+            (json.dumps({"n": 2}) + "\n" + json.dumps({"n": 3, "pad": "x" * 500}) + "\n").encode()
+        )
+        path.write_bytes(gzip.compress((json.dumps({"n": 1}) + "\n").encode()) + tail[: len(tail) // 2])
+        with self.assertLogs("core.diagnostics", "WARNING"):
+            records = list(read_diagnostics(path))
+        self.assertEqual(records[0], {"n": 1})
+        self.assertLessEqual(len(records), 2)
+        self.assertTrue(all("n" in r for r in records))
+
+    def test_queue_full_drops_without_blocking(self):
+        sink = DiagnosticsSink(self.dir, sample_rate=1.0, queue_size=1)
+        gate = threading.Event()
+        sink.submit(lambda: gate.wait(5) and {"n": 0})  # writer를 붙잡아 둠
+        results = [sink.submit({"n": i}) for i in range(1, 6)]
+        self.assertGreaterEqual(sink.dropped, 1)
+        self.assertIn(None, results)
+        gate.set()
+        self.assertTrue(sink.flush())
+
+    def test_builder_error_isolated(self):
+        sink = DiagnosticsSink(self.dir, sample_rate=1.0)
+        sink.submit(lambda: 1 / 0)
+        sink.submit({"n": 1})
+        self.assertTrue(sink.flush())
+        self.assertEqual([r["n"] for r in _records(self.dir)], [1])
+        self.assertEqual(sink.failed, 1)
+
+    def test_rotation_and_retention(self):
+        sink = DiagnosticsSink(self.dir, sample_rate=1.0, max_file_bytes=1, max_files=3)
+        for i in range(6):
+            sink.submit({"n": i})
+            self.assertTrue(sink.flush())
+        files = iter_diagnostic_files(self.dir)
+        self.assertEqual(len(files), 3)
+        # 가장 최근 레코드들만 남는다
+        self.assertEqual([r["n"] for r in _records(self.dir)], [3, 4, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
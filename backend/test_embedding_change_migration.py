@@ -0,0 +1,70 @@
+"""임베딩 변경 감지 컬럼 마이그레이션 SQL 정적 검증 (DB·API 불요).
+
+대상: supabase/migrations/20261019000400_embedding_change_detection.sql
+
+검증 항목:
+  ① patterns / ethics_codes 양쪽에 search_text_hash·embedding_model 추가 (IF NOT EXISTS)
+  ② 트리거·함수 없음 — 값은 scripts/generate_embeddings.py만 기록
+  ③ 같은 트랜잭션 사후 검증(DO 블록) + PostgREST 스키마 리로드
+  ④ 주석 ROLLBACK이 두 테이블 컬럼만 DROP
+  ⑤ generate_embeddings.py가 같은 컬럼명을 쓴다
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_embedding_change_migration -v
+"""
+
+import unittest
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+_MIGRATION = _ROOT / "supabase" / "migrations" / "20261019000400_embedding_change_detection.sql"
+_SCRIPT = _ROOT / "scripts" / "generate_embeddings.py"
+
+_COLUMNS = ("search_text_hash", "embedding_model")
+
+
+def _sql() -> str:
+    return _MIGRATION.read_text(encoding="utf-8")
+
+
+def _executable_sql() -> str:
+    """주석(-- 라인)을 제거한 실행 대상 SQL만 남긴다."""
+    return "\n".join(ln for ln in _sql().splitlines() if not ln.lstrip().startswith("--"))
+
+
+class TestMigrationContract(unittest.TestCase):
+    def setUp(self):
+        self.body = _executable_sql()
+
+    def test_columns_added_idempotently(self):
+        for table in ("patterns", "ethics_codes"):
+            start = self.body.index(f"ALTER TABLE public.{table}")
+            stmt = self.body[start:self.body.index(";", start)]
+            for column in _COLUMNS:
+                self.assertIn(f"ADD COLUMN IF NOT EXISTS {column}", stmt)
+
+    def test_no_triggers_or_functions(self):
+        self.assertNotIn("CREATE TRIGGER", self.body)
+        self.assertNotIn("CREATE OR REPLACE FUNCTION", self.body)
+
+    def test_verification_in_transaction(self):
+        begin, commit = self.body.index("BEGIN;"), self.body.index("COMMIT;")
+        self.assertTrue(begin < self.body.index("DO $$") < commit)
+        self.assertIn("RAISE EXCEPTION", self.body[begin:commit])
+        self.assertIn("NOTIFY pgrst, 'reload schema';", self.body[commit:])
+
+    def test_rollback_drops_only_new_columns(self):
+        rollback = _sql().split("[ROLLBACK]", 1)[1]
+        for table in ("patterns", "ethics_codes"):
+            self.assertIn(f"ALTER TABLE public.{table}", rollback)
+        for column in _COLUMNS:
+            self.assertEqual(rollback.count(f"DROP COLUMN IF EXISTS {column}"), 2)
+        self.assertNotIn("DROP TABLE", rollback)
+
+    def test_script_uses_same_columns(self):
+        script = _SCRIPT.read_text(encoding="utf-8")
+        self.assertIn(f'CHANGE_COLUMNS = ("{_COLUMNS[0]}", "{_COLUMNS[1]}")', script)
+        self.assertIn("20261019000400_embedding_change_detection", script)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+"""규범 조회 캐시 (pattern_id × article_context) 단위 테스트 (네트워크·DB 불요).
+
+대상:
+  ① 패턴별 항목 조합 — 임의 집합을 캐시에서 조합, tier 정렬, 없는 패턴만 조회
+  ② 맥락(article_context)별 분리
+  ③ 비캐시 응답 — REST fallback(cacheable=False)·전체 0건은 저장하지 않음
+  ④ 버전 스탬프 변경 → 무효화, 스탬프 없으면 TTL 만료
+  ⑤ 워밍 — 맥락당 1회 조회로 전체 패턴(매핑 없는 패턴은 빈 항목) 채움
+  ⑥ fetch_ethics_for_patterns 연동 — 두 번째 요청은 네트워크 없음
+  ⑦ 마이그레이션 20261019000200 정적 계약
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_ethics_cache -v
+"""
+
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core import ethics_cache, report_generator
+from core.ethics_cache import EthicsCache
+
+_MIG = (
+    Path(__file__).resolve().parent.parent
+    / "supabase" / "migrations" / "20261019000200_ethics_mapping_version.sql"
+)
+
+# pattern_id → [(ethics_code, tier)]
+_DB = {
+    1: [("JEC-1", 4), ("JCE-1", 1)],
+    2: [("JEC-2", 3)],
+    3: [],
+}
+
+
+def _row(pid, code, tier, context="general"):
+    return {
+        "pattern_id": pid, "pattern_code": f"p{pid}", "ethics_code": code,
+        "ethics_title": f"{code}-{context}", "ethics_full_text": "원문",
+        "ethics_tier": tier, "relation_type": "violates", "strength": "strong",
+        "reasoning": "",
+    }
+
+
+class _FakeRpc:
+    def __init__(self, cacheable=True):
+        self.calls: list[tuple[list[int], str]] = []
+        self.cacheable = cacheable
+
+    def __call__(self, ids, context):
+        self.calls.append((list(ids), context))
+        rows = [_row(pid, code, tier, context) for pid in ids for code, tier in _DB.get(pid, [])]
+        rows.sort(key=lambda r: r["ethics_tier"])
+        return rows, self.cacheable
+
+
+class TestEthicsCache(unittest.TestCase):
+    def test_compose_from_per_pattern_entries(self):
+        cache, rpc = EthicsCache(), _FakeRpc()
+        cache.get_rows([1], "general", rpc)
+        cache.get_rows([2], "general", rpc)
+        rows = cache.get_rows([2, 1], "general", rpc)
+        self.assertEqual(len(rpc.calls), 2)  # 조합은 네트워크 없음
+        self.assertEqual([r["ethics_code"] for r in rows], ["JCE-1", "JEC-2", "JEC-1"])
+        self.assertEqual(rows, _FakeRpc()([1, 2], "general")[0])
+
+    def test_fetches_only_missing(self):
+        cache, rpc = EthicsCache(), _FakeRpc()
+        cache.get_rows([1], "general", rpc)
+        cache.get_rows([1, 2, 3], "general", rpc)
+        self.assertEqual(rpc.calls[1], ([2, 3], "general"))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
+
+    def test_context_is_part_of_key(self):
+        cache, rpc = EthicsCache(), _FakeRpc()
+        cache.get_rows([1], "general", rpc)
+        rows = cache.get_rows([1], "health", rpc)
+        self.assertEqual(len(rpc.calls), 2)
+        self.assertTrue(all(r["ethics_title"].endswith("-health") for r in rows))
+
+    def test_fallback_and_empty_not_cached(self):
+        cache, fallback = EthicsCache(), _FakeRpc(cacheable=False)
+        self.assertEqual(len(cache.get_rows([1], "general", fallback)), 2)
+        self.assertEqual(len(cache), 0)
+
+        rpc = _FakeRpc()
+        cache.get_rows([3], "general", rpc)  # 전체 0건 응답
+        cache.get_rows([3], "general", rpc)
+        self.assertEqual(len(rpc.calls), 2)
+
+    def test_version_change_invalidates(self):
+        cache, rpc = EthicsCache(), _FakeRpc()
+        versions = iter([1, 1, 2])
+        cache.check_version(lambda: next(versions))
+        cache.get_rows([1], "general", rpc)
+        self.assertFalse(cache.check_version(lambda: next(versions)))
+        self.assertTrue(cache.check_version(lambda: next(versions)))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.version, 2)
+
+    def test_ttl_when_version_unavailable(self):
+        cache = EthicsCache(ttl_seconds=0)
+        cache.get_rows([1], "general", _FakeRpc())
+        self.assertTrue(cache.check_version(lambda: None))
+        self.assertEqual(len(cache), 0)
+        cache = EthicsCache(ttl_seconds=3600)
+        cache.get_rows([1], "general", _FakeRpc())
+        self.assertFalse(cache.check_version(lambda: None))
+        self.assertEqual(len(cache), 1)
+
+    def test_stale_fetch_discarded_after_invalidate(self):
+        cache = EthicsCache()
+
+        def racing(ids, context):
+            cache.invalidate()  # 조회 도중 버전 변경
+            return _FakeRpc()(ids, context)
+
+        rows = cache.get_rows([1], "general", racing)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_warm_fills_all_patterns(self):
+        cache, rpc = EthicsCache(), _FakeRpc()
+        n = cache.warm([1, 2, 3], rpc, contexts=("general", "health"))
+        self.assertEqual(n, 6)
+        self.assertEqual(len(rpc.calls), 2)
+        cache.get_rows([3, 1], "health", rpc)
+        self.assertEqual(len(rpc.calls), 2)
+
+
+class TestFetchEthicsIntegration(unittest.TestCase):
+    def test_second_request_served_from_cache(self):
+        rpc = _FakeRpc()
+
+        def fake_rpc_get(ids, sb_url, headers, article_context="general", timeout=30):
+            rows, _ = rpc(ids, article_context)
+            return rows, 200
+
+        with patch.object(ethics_cache, "_cache", EthicsCache()), \
+             patch.object(report_generator, "get_ethics_cache", lambda: ethics_cache._cache), \
+             patch.object(report_generator, "fetch_mapping_version", lambda: 1), \
+             patch.object(report_generator, "_rpc_get_ethics", side_effect=fake_rpc_get):
+            first = report_generator.fetch_ethics_for_patterns([1, 2], "http://sb", "key")
+            second = report_generator.fetch_ethics_for_patterns([2, 1], "http://sb", "key")
+
+        self.assertEqual(len(rpc.calls), 1)
+        self.assertEqual(
+            [r.ethics_code for r in first], [r.ethics_code for r in second]
+        )
+        self.assertEqual(first[0].ethics_code, "JCE-1")
+
+
+class TestMigrationContract(unittest.TestCase):
+    def setUp(self):
+        self.body = "\n".join(
+            ln for ln in _MIG.read_text(encoding="utf-8").splitlines()
+            if not ln.lstrip().startswith("--")
+        )
+
+    def test_statement_triggers_on_both_tables(self):
+        for table in ("pattern_ethics_relations", "ethics_codes"):
+            self.assertIn(
+                f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.{table}", self.body
+            )
+        self.assertEqual(self.body.count("FOR EACH STATEMENT"), 2)
+
+    def test_version_rpc_locked_down(self):
+        self.assertIn("CREATE OR REPLACE FUNCTION public.get_ethics_mapping_version()", self.body)
+        self.assertIn("SET search_path = public, pg_temp", self.body)
+        self.assertIn(
+            "GRANT EXECUTE ON FUNCTION public.get_ethics_mapping_version() TO service_role",
+            self.body,
+        )
+        self.assertIn(
+            "ALTER TABLE public.ethics_mapping_version ENABLE ROW LEVEL SECURITY", self.body
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""규범 컨텍스트 인덱스(EthicsContextIndex) 단위 테스트 (네트워크·DB 불요).
+
+대상:
+  ① context_text — 3섹션 분류(롤업 우선)·섹션별 tier 정렬·전역 중복 제거·빈 섹션 생략
+  ② 헤더 — 정식 인용명 〔source article〕, 둘 다 비면 〔〕 생략, ethics_code 미노출
+  ③ allowed_citations — build_allowed_citations와 동일, excluded_count
+  ④ snapshot_targets — violates 우선, 없으면 related_to, ethics_code 중복 제거
+  ⑤ 공유 — verify_report_citations(index=...)·build_analysis_payload(ethics_index=...) 결과 동일
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_ethics_index -v
+"""
+
+import unittest
+import unittest.mock
+from types import SimpleNamespace
+
+from core import storage
+from core.ethics_index import EthicsContextIndex, _ethics_block
+from core.report_generator import EthicsReference, _build_ethics_context
+from core.verify_citations import build_allowed_citations, verify_report_citations
+
+
+def _ref(code, tier, relation="violates", strength="strong", reasoning="",
+         source="신문윤리실천요강", article=None, pattern="1-1-a"):
+    return EthicsReference(
+        pattern_code=pattern,
+        ethics_code=code,
+        ethics_title=f"{code} 제목",
+        ethics_full_text=f"{code} 원문",
+        ethics_tier=tier,
+        relation_type=relation,
+        strength=strength,
+        reasoning=reasoning,
+        ethics_source=source,
+        ethics_article_number=article if article is not None else f"제{tier}조",
+    )
+
+
+_REFS = [
+    _ref("JCE-1", 1, relation="related_to", strength="moderate",
+         reasoning="parent chain rollup", source="기자윤리강령", article="제1조"),
+    _ref("JEC-3", 3),
+    _ref("JEC-4", 4),
+    _ref("JEC-4", 4, pattern="1-4-a"),                       # 동일 코드 중복
+    _ref("PCP-2", 2, relation="related_to", source=" ", article=""),  # 라벨 없음
+    _ref("JEC-3", 3, relation="related_to"),                 # 직접 적용에 이미 배치
+    _ref("JEC-9", 4, strength="weak"),                       # 무시
+]
+
+
+class TestContextText(unittest.TestCase):
+    def test_sections_order_and_dedup(self):
+        text = EthicsContextIndex(_REFS).context_text()
+        expected = (
+            "## 직접 적용 규범(인용 1순위)\n\n"
+            "### 〔신문윤리실천요강 제4조〕 JEC-4 제목 (Tier 4)\nJEC-4 원문\n\n"
+            "### 〔신문윤리실천요강 제3조〕 JEC-3 제목 (Tier 3)\nJEC-3 원문"
+            "\n\n---\n\n"
+            "## 직접 참고 규범(보조 인용 가능)\n\n"
+            "### PCP-2 제목 (Tier 2)\nPCP-2 원문"
+            "\n\n---\n\n"
+            "## 상위 원칙(종합 평가 보조용)\n\n"
+            "### 〔기자윤리강령 제1조〕 JCE-1 제목 (Tier 1)\nJCE-1 원문"
+        )
+        self.assertEqual(text, expected)
+        self.assertEqual(_build_ethics_context(_REFS), expected)
+
+    def test_empty_sections_omitted(self):
+        self.assertEqual(EthicsContextIndex([]).context_text(), "")
+        text = EthicsContextIndex([_ref("JEC-3", 3)]).context_text()
+        self.assertTrue(text.startswith("## 직접 적용 규범"))
+        self.assertNotIn("---", text)
+
+    def test_block_memoized_per_code(self):
+        _ethics_block.cache_clear()
+        EthicsContextIndex(_REFS)
+        EthicsContextIndex(_REFS)
+        info = _ethics_block.cache_info()
+        self.assertEqual(info.currsize, 5)  # 고유 규범 5종
+        self.assertEqual(info.misses, 5)
+
+
+class TestAllowedCitations(unittest.TestCase):
+    def test_matches_build_allowed_citations(self):
+        index = EthicsContextIndex(_REFS)
+        self.assertEqual(index.allowed_citations(), build_allowed_citations(_REFS))
+        self.assertEqual(index.excluded_count, 1)
+
+    def test_duck_typed_refs(self):
+        refs = [SimpleNamespace(ethics_source="기자윤리강령", ethics_article_number="제３조",
+                                ethics_title="t", ethics_tier=None, ethics_code="")]
+        allowed = EthicsContextIndex(refs).allowed_citations()
+        self.assertEqual(allowed, build_allowed_citations(refs))
+        self.assertEqual(allowed[0]["normalized"], "기자윤리강령 제3조")
+
+    def test_verify_with_index_identical(self):
+        reports = {
+            "comprehensive": "〔신문윤리실천요강 제4조〕와 〔없는 조항〕",
+            "journalist": "〔기자윤리강령 제1조〕",
+            "student": "",
+        }
+        plain = verify_report_citations(reports, _REFS)
+        shared = verify_report_citations(reports, _REFS, index=EthicsContextIndex(_REFS))
+        self.assertEqual(plain, shared)
+        self.assertEqual(shared["summary"]["matched_total"], 2)
+
+
+class TestSnapshotTargets(unittest.TestCase):
+    def test_violates_first_then_related(self):
+        codes = [r.ethics_code for r in EthicsContextIndex(_REFS).snapshot_targets()]
+        self.assertEqual(codes, ["JEC-3", "JEC-4"])
+        related = [r for r in _REFS if r.relation_type == "related_to"]
+        codes = [r.ethics_code for r in EthicsContextIndex(related).snapshot_targets()]
+        self.assertEqual(codes, ["JCE-1", "PCP-2", "JEC-3"])
+
+    def test_payload_uses_shared_index(self):
+        result = SimpleNamespace()
+        with unittest.mock.patch.object(storage, "_build_result_record", return_value={}):
+            a = storage.build_analysis_payload(
+                "https://e.com/a", "t", None, None, None, result,
+                ethics_refs=_REFS, share_id="x",
+            )
+            b = storage.build_analysis_payload(
+                "https://e.com/a", "t", None, None, None, result,
+                ethics_refs=_REFS, share_id="x", ethics_index=EthicsContextIndex(_REFS),
+            )
+        self.assertEqual(a["snapshots"], b["snapshots"])
+        self.assertEqual([s["ethics_code"] for s in a["snapshots"]], ["JEC-3", "JEC-4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
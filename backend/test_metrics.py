@@ -0,0 +1,189 @@
+"""/metrics (core.metrics) 단위 테스트 (네트워크·API·DB 불요).
+
+대상:
+  ① Counter/Histogram — 누적 버킷·_sum·_count, 라벨 이스케이프, 라벨 불일치·음수 증가 거부
+  ② collector — resilience RPC 카운터·서킷 상태, 실패한 collector는 주석으로만 남음
+  ③ generate_report — 529 재시도·구조 검증 실패 사유, 시도별 토큰, ethics_fetch/phase2 단계
+  ④ pipeline._record_metrics — 단계별 소요, Phase 1 파싱 폴백·거부 코드·토큰
+  ⑤ storage.save_analysis_payload — 경로(rpc)·결과별 카운터 + save 단계
+  ⑥ GET /metrics — Prometheus 텍스트 포맷 응답
+
+전역 REGISTRY를 공유하므로 카운터는 실행 전후 차이로 검증한다.
+패턴 코드는 실제 데이터와 무관한 합성값(9-9-*)만 사용한다.
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_metrics -v
+"""
+
+import json
+import unittest
+from unittest.mock import patch
+
+import anthropic
+import httpx
+
+from core import metrics, pattern_matcher, report_generator, storage
+from core.metrics import Registry
+from core.pattern_matcher import PatternMatchResult
+from core.pipeline import AnalysisResult, _record_metrics
+from core.resilience import get_rpc
+
+_REPORTS = {"reports": {"comprehensive": "c", "journalist": "j", "student": "s"}}
+
+
+def _status_error(code: int) -> anthropic.APIStatusError:
+    response = httpx.Response(code, request=httpx.Request("POST", "http://api/v1/messages"))
+    return anthropic.APIStatusError("overloaded", response=response, body=None)
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.reg = Registry()
+
+    def test_histogram_exposition(self):
+        h = self.reg.histogram("t_seconds", "help", ["stage"], buckets=(0.1, 1.0))
+        for v in (0.05, 0.5, 0.7, 3.0):
+            h.observe(v, stage="a")
+        text = self.reg.render()
+        self.assertIn("# TYPE t_seconds histogram", text)
+        self.assertIn('t_seconds_bucket{stage="a",le="0.1"} 1', text)
+        self.assertIn('t_seconds_bucket{stage="a",le="1"} 3', text)
+        self.assertIn('t_seconds_bucket{stage="a",le="+Inf"} 4', text)
+        self.assertIn('t_seconds_sum{stage="a"} 4.25', text)
+        self.assertIn('t_seconds_count{stage="a"} 4', text)
+        self.assertEqual(h.count(stage="a"), 4)
+
+    def test_counter_labels(self):
+        c = self.reg.counter("t_total", "help", ["reason"])
+        c.inc(reason='a"b\\c\nd')
+        self.assertIn('t_total{reason="a\\"b\\\\c\\nd"} 1', self.reg.render())
+        with self.assertRaises(ValueError):
+            c.inc(other="x")
+        with self.assertRaises(ValueError):
+            c.inc(-1, reason="x")
+
+    def test_same_name_returns_existing(self):
+        a = self.reg.counter("t_total", "help")
+        self.assertIs(self.reg.counter("t_total", "help"), a)
+
+    def test_collectors(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        self.reg.add_collector(broken)
+        self.reg.add_collector(metrics._rpc_collector)
+        rpc = get_rpc("test_metrics_rpc")
+        rpc.call(lambda: [1])
+        text = self.reg.render()
+        self.assertIn("# collector broken 실패: boom", text)
+        self.assertIn('crcheck_rpc_events_total{rpc="test_metrics_rpc",event="calls"} 1', text)
+        self.assertIn('crcheck_rpc_breaker_open{rpc="test_metrics_rpc"} 0', text)
+
+
+class TestGenerateReportMetrics(unittest.TestCase):
+    def test_retry_reasons_tokens_and_stages(self):
+        outputs = iter([
+            _status_error(529),
+            ('{"reports": {"comprehensive": "a"}}', 10, 1),  # 필수 리포트 누락 → parse
+            (json.dumps(_REPORTS), 100, 20),
+        ])
+
+        def _call(*a, **k):
+            item = next(outputs)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        model = report_generator.SONNET_MODEL
+        failed = metrics.LLM_FAILED_ATTEMPTS
+        before = (
+            failed.value(phase="phase2", reason="529"),
+            failed.value(phase="phase2", reason="parse"),
+            metrics.LLM_TOKENS.value(model=model, phase="phase2", direction="input"),
+            metrics.STAGE_SECONDS.count(stage="phase2_llm"),
+            metrics.STAGE_SECONDS.count(stage="ethics_fetch"),
+        )
+        with patch.object(report_generator, "_get_supabase_config", return_value=("http://sb", "k")), \
+             patch.object(report_generator, "fetch_ethics_for_patterns", return_value=[]), \
+             patch.object(report_generator, "call_sonnet", side_effect=_call), \
+             patch.object(report_generator.time, "sleep"):
+            rr = report_generator.generate_report("본문", [1], [])
+        after = (
+            failed.value(phase="phase2", reason="529"),
+            failed.value(phase="phase2", reason="parse"),
+            metrics.LLM_TOKENS.value(model=model, phase="phase2", direction="input"),
+            metrics.STAGE_SECONDS.count(stage="phase2_llm"),
+            metrics.STAGE_SECONDS.count(stage="ethics_fetch"),
+        )
+        self.assertEqual(rr.attempts, 3)
+        self.assertEqual([a - b for a, b in zip(after, before)], [1, 1, 110, 2, 1])
+
+
+class TestPipelineMetrics(unittest.TestCase):
+    def test_record_metrics(self):
+        pm = PatternMatchResult(
+            validated_pattern_ids=[1], hallucinated_codes=["9-9-x", "9-9-y"],
+            parse_fallback_used=True, embedding_tokens=30,
+            solo_input_tokens=500, solo_output_tokens=40,
+        )
+        result = AnalysisResult(pattern_result=pm, total_seconds=3.0,
+                                stage_seconds={"chunking": 0.01, "phase1_llm": 2.0})
+        model = pattern_matcher.SONNET_MODEL
+        before = (
+            metrics.PIPELINE_SECONDS.count(outcome="reported"),
+            metrics.STAGE_SECONDS.count(stage="phase1_llm"),
+            metrics.PARSE_FALLBACKS.value(phase="phase1"),
+            metrics.HALLUCINATED_CODES.value(),
+            metrics.LLM_TOKENS.value(model=model, phase="phase1", direction="output"),
+            metrics.LLM_TOKENS.value(model=pattern_matcher.EMBEDDING_MODEL, phase="embedding", direction="input"),
+        )
+        _record_metrics(result, run_sonnet=True)
+        after = (
+            metrics.PIPELINE_SECONDS.count(outcome="reported"),
+            metrics.STAGE_SECONDS.count(stage="phase1_llm"),
+            metrics.PARSE_FALLBACKS.value(phase="phase1"),
+            metrics.HALLUCINATED_CODES.value(),
+            metrics.LLM_TOKENS.value(model=model, phase="phase1", direction="output"),
+            metrics.LLM_TOKENS.value(model=pattern_matcher.EMBEDDING_MODEL, phase="embedding", direction="input"),
+        )
+        self.assertEqual([a - b for a, b in zip(after, before)], [1, 1, 1, 2, 40, 30])
+
+    def test_non_int_tokens_ignored(self):
+        metrics.add_tokens("m", "phase1", input_tokens=object(), output_tokens=None)  # 모킹된 usage
+        self.assertEqual(metrics.LLM_TOKENS.value(model="m", phase="phase1", direction="input"), 0)
+
+
+class TestStorageMetrics(unittest.TestCase):
+    def test_save_outcomes(self):
+        before = (
+            metrics.STORAGE_SAVES.value(path="rpc", outcome="ok"),
+            metrics.STORAGE_SAVES.value(path="rpc", outcome="error"),
+            metrics.STAGE_SECONDS.count(stage="save"),
+        )
+        with patch.object(storage, "_get_supabase_config", return_value=("http://sb", "k")), \
+             patch.object(storage, "_rpc_available", None), \
+             patch.object(storage, "_save_via_rpc", side_effect=[(True, "S1"), (True, None)]):
+            self.assertEqual(storage.save_analysis_payload({"share_id": "S1"}), "S1")
+            self.assertIsNone(storage.save_analysis_payload({"share_id": "S2"}))
+        after = (
+            metrics.STORAGE_SAVES.value(path="rpc", outcome="ok"),
+            metrics.STORAGE_SAVES.value(path="rpc", outcome="error"),
+            metrics.STAGE_SECONDS.count(stage="save"),
+        )
+        self.assertEqual([a - b for a, b in zip(after, before)], [1, 1, 2])
+
+
+class TestEndpoint(unittest.TestCase):
+    def test_metrics_endpoint(self):
+        from fastapi.testclient import TestClient
+        import main
+
+        metrics.observe_stage("scrape", 0.2)
+        r = TestClient(main.app).get("/metrics")
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn('crcheck_stage_seconds_bucket{stage="scrape",le="0.25"}', r.text)
+        self.assertIn("crcheck_ethics_cache_lookups_total", r.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
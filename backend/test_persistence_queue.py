@@ -0,0 +1,156 @@
+"""fire-and-forget 저장 큐 + 스풀 재생 단위 테스트 (네트워크·DB 불요).
+
+대상:
+  ① submit → share_id 즉시 반환, 저장은 백그라운드 (저장이 막혀도 요청 비차단)
+  ② 저장 실패 → 백오프 재시도 후 성공, 대기 0건이면 스풀 비움
+  ③ 재시도 소진 → 스풀·get_pending에 보관, park_retry_seconds 뒤 다시 큐에 넣어 저장
+  ③' 재투입 max_parks회 후에도 실패 → 폐기 (get_pending 제거 + ack, 스풀 비움)
+  ④ replay — 이전 스풀의 ack 없는 payload만 재생, 깨진 줄 무시, 재생한 파일 삭제
+  ⑤ replay — flock 잡힌(살아 있는 워커) 스풀은 건너뜀
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_persistence_queue -v
+"""
+
+import fcntl
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from core.persistence import PersistenceQueue, _unacked
+
+
+def _payload(share_id: str) -> dict:
+    return {
+        "share_id": share_id,
+        "article": {"url": f"https://news.example.com/{share_id}", "title": "제목"},
+        "result": {"comprehensive_report": "종합"},
+        "snapshots": [],
+    }
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(l) for l in path.read_text(encoding="utf-8").splitlines() if l.strip()]
+
+
+class TestPersistenceQueue(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.saved: list[str] = []
+        self.queues: list[PersistenceQueue] = []
+
+    def tearDown(self):
+        for q in self.queues:
+            q.close(timeout=1)
+        self._tmp.cleanup()
+
+    def _queue(self, save_fn=None, **kwargs) -> PersistenceQueue:
+        def ok(payload):
+            self.saved.append(payload["share_id"])
+            return payload["share_id"]
+
+        kwargs.setdefault("retry_base_seconds", 0.001)
+        q = PersistenceQueue(save_fn or ok, directory=self.dir, **kwargs)
+        self.queues.append(q)
+        return q
+
+    def test_submit_returns_before_save(self):
+        gate = threading.Event()
+
+        def slow(payload):
+            gate.wait(5)
+            self.saved.append(payload["share_id"])
+            return payload["share_id"]
+
+        q = self._queue(slow)
+        self.assertEqual(q.submit(_payload("aaa")), "aaa")
+        self.assertEqual(self.saved, [])
+        self.assertIsNotNone(q.get_pending("aaa"))
+        # 스풀에 먼저 기록됨 (write-ahead)
+        self.assertEqual(_lines(q._spool_path)[0]["op"], "save")
+        gate.set()
+        self.assertTrue(q.flush())
+        self.assertEqual(self.saved, ["aaa"])
+        self.assertIsNone(q.get_pending("aaa"))
+        self.assertEqual(q._spool_path.stat().st_size, 0)
+
+    def test_retry_then_success(self):
+        results = [None, None, "bbb"]
+        q = self._queue(lambda p: results.pop(0), max_attempts=5)
+        q.submit(_payload("bbb"))
+        self.assertTrue(q.flush())
+        self.assertEqual(q.saved, 1)
+        self.assertEqual(q.retries, 2)
+        self.assertEqual(q.pending_count, 0)
+
+    def test_exhausted_attempts_park_in_spool(self):
+        q = self._queue(lambda p: None, max_attempts=2)
+        q.submit(_payload("ccc"))
+        self.assertTrue(q.flush())
+        self.assertEqual(q.parked, 1)
+        self.assertEqual(q.get_pending("ccc")["share_id"], "ccc")
+        spooled = _unacked(q._spool_path.read_text(encoding="utf-8").splitlines())
+        self.assertEqual([p["share_id"] for p in spooled], ["ccc"])
+
+    def test_parked_entry_requeued_on_timer(self):
+        results = [None, None, "ppp"]
+        q = self._queue(lambda p: results.pop(0), max_attempts=2, park_retry_seconds=0.05)
+        q.submit(_payload("ppp"))
+        self.assertTrue(q.flush())
+        self.assertEqual(q.parked, 1)
+        deadline = time.monotonic() + 3
+        while q.pending_count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(q.saved, 1)
+        self.assertIsNone(q.get_pending("ppp"))
+        self.assertEqual(q._spool_path.stat().st_size, 0)
+
+    def test_drop_after_max_parks(self):
+        calls = []
+        q = self._queue(lambda p: calls.append(1), max_attempts=2,
+                        park_retry_seconds=0.02, max_parks=2)
+        q.submit(_payload("xxx"))
+        deadline = time.monotonic() + 3
+        while q.pending_count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(q.dropped, 1)
+        self.assertEqual(q.parked, 2)
+        self.assertEqual(len(calls), 2 * 3)  # 최초 + 재투입 2회, 매번 max_attempts
+        self.assertIsNone(q.get_pending("xxx"))
+        self.assertEqual(q._spool_path.stat().st_size, 0)
+
+    def test_replay_unacked_only(self):
+        old = self.dir / "persist-1-dead.jsonl"
+        old.write_text(
+            "\n".join([
+                json.dumps({"op": "save", "share_id": "d1", "payload": _payload("d1")}),
+                json.dumps({"op": "save", "share_id": "d2", "payload": _payload("d2")}),
+                json.dumps({"op": "ack", "share_id": "d1"}),
+                json.dumps({"op": "save", "share_id": "d3", "payload": _payload("d3")}),
+                '{"op": "save", "share_id": "d4", "payl',  # 중단된 쓰기
+            ]),
+            encoding="utf-8",
+        )
+        q = self._queue()
+        self.assertEqual(q.replay(), 2)
+        self.assertTrue(q.flush())
+        self.assertEqual(sorted(self.saved), ["d2", "d3"])
+        self.assertFalse(old.exists())
+
+    def test_replay_skips_live_spool(self):
+        live = self._queue(lambda p: None, max_attempts=1)
+        live.submit(_payload("e1"))
+        self.assertTrue(live.flush())
+        # 다른 fd로 flock — 살아 있는 워커의 스풀은 재생 대상이 아님
+        with open(live._spool_path) as f:
+            self.assertRaises(OSError, fcntl.flock, f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        other = self._queue()
+        self.assertEqual(other.replay(), 0)
+        self.assertTrue(live._spool_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
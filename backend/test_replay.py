@@ -0,0 +1,146 @@
+"""오프라인 녹화/재생(cassette) + 단계별 프로파일러 단위 테스트 (네트워크·DB 불요).
+
+대상:
+  ① Cassette record → replay 왕복 — 상태코드·본문·헤더 재현, 호스트·JSON 키 순서 무관
+  ② 같은 키 반복 요청 — 기록 순서대로 재생, 소진 후 마지막 응답 재사용 (repeats)
+  ③ 본문이 바뀐 요청 — method+path 느슨한 매칭 (loose), 기록 없는 경로 → CassetteMiss
+  ④ 전송 오류(ConnectError) 기록·재현
+  ⑤ StageProfiler — instrument 호출 집계·중첩, 종료 시 원래 함수 복원
+  ⑥ _apply_star_marks — vector 섹션의 후보 코드만 ★, 실제 마크된 코드 반환
+
+패턴 코드는 실제 데이터와 무관한 합성값(9-9-*)만 사용한다.
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_replay -v
+"""
+
+import json
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+import httpx
+
+from core.pattern_matcher import _apply_star_marks
+from core.replay import MODE_RECORD, MODE_REPLAY, Cassette, CassetteMiss, StageProfiler
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    """녹화 대상 가짜 서버 — 호출마다 번호가 올라가는 응답."""
+    _upstream.calls += 1
+    if request.url.path == "/down":
+        raise httpx.ConnectError("connection refused", request=request)
+    body = json.loads(request.content or b"{}")
+    return httpx.Response(
+        200,
+        json={"n": _upstream.calls, "echo": body},
+        headers={"request-id": f"req-{_upstream.calls}", "set-cookie": "secret"},
+    )
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        _upstream.calls = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "case.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record(self):
+        with Cassette(self.path, MODE_RECORD, meta={"supabase_url": "http://sb"}).activate():
+            with httpx.Client(transport=httpx.MockTransport(_upstream)) as client:
+                client.post("http://a/rpc/x", json={"a": 1, "b": 2})
+                client.get("http://a/rest/v1/patterns", params={"select": "id", "limit": 1})
+                client.get("http://a/rest/v1/patterns", params={"select": "id", "limit": 1})
+                with self.assertRaises(httpx.ConnectError):
+                    client.get("http://a/down")
+
+    def _replay_client(self):
+        def _no_network(request):
+            raise AssertionError(f"network call in replay: {request.url}")
+        return httpx.Client(transport=httpx.MockTransport(_no_network))
+
+    def test_round_trip(self):
+        self._record()
+        saved = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(saved["meta"], {"supabase_url": "http://sb"})
+        self.assertNotIn("set-cookie", saved["interactions"][0]["headers"])
+
+        cassette = Cassette(self.path, MODE_REPLAY)
+        with cassette.activate(), self._replay_client() as client:
+            # 다른 호스트·다른 키 순서 → 같은 요청
+            r = client.post("http://other/rpc/x", json={"b": 2, "a": 1})
+            self.assertEqual(r.json(), {"n": 1, "echo": {"a": 1, "b": 2}})
+            self.assertEqual(r.headers["request-id"], "req-1")
+            firsts = [
+                client.get("http://a/rest/v1/patterns", params={"limit": 1, "select": "id"}).json()["n"]
+                for _ in range(3)
+            ]
+            self.assertEqual(firsts, [2, 3, 3])
+        self.assertEqual(cassette.stats["hits"], 3)
+        self.assertEqual(cassette.stats["repeats"], 1)
+        self.assertEqual(_upstream.calls, 4)  # 재생은 업스트림을 부르지 않음
+
+    def test_loose_and_miss(self):
+        self._record()
+        cassette = Cassette(self.path, MODE_REPLAY)
+        with cassette.activate(), self._replay_client() as client:
+            r = client.post("http://a/rpc/x", json={"a": 999})
+            self.assertEqual(r.json()["n"], 1)
+            with self.assertRaises(CassetteMiss):
+                client.get("http://a/never")
+        self.assertEqual((cassette.stats["loose"], cassette.stats["misses"]), (1, 1))
+
+    def test_transport_error_replayed(self):
+        self._record()
+        with Cassette(self.path, MODE_REPLAY).activate(), self._replay_client() as client:
+            with self.assertRaises(httpx.ConnectError):
+                client.get("http://a/down")
+
+    def test_send_restored(self):
+        original = httpx.Client.send
+        self._record()
+        self.assertIs(httpx.Client.send, original)
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_instrument_and_restore(self):
+        mod = types.SimpleNamespace()
+        mod.inner = lambda n: [0] * n
+        mod.outer = lambda n: len(mod.inner(n))
+        originals = (mod.inner, mod.outer)
+
+        with StageProfiler() as prof:
+            prof.instrument(mod, "inner", "inner")
+            prof.instrument(mod, "outer", "outer")
+            self.assertEqual(mod.outer(10_000), 10_000)
+            mod.inner(10)
+            summary = prof.summary()
+
+        self.assertEqual((mod.inner, mod.outer), originals)
+        self.assertEqual(summary["inner"]["calls"], 2)
+        self.assertEqual(summary["outer"]["calls"], 1)
+        # 중첩: 바깥 단계 peak ≥ 안쪽 리스트 크기(약 78KB)
+        self.assertGreater(summary["outer"]["alloc_peak_kb"], 50)
+        self.assertGreaterEqual(summary["outer"]["wall_ms"], 0)
+
+
+class TestStarMarks(unittest.TestCase):
+    def test_only_vector_candidates(self):
+        catalog = "\n".join([
+            "## 벡터 검색 기반 패턴",
+            "[9-9-1] 합성 A",
+            "[9-9-2] 합성 B",
+            "## 구조적 판단 필수 검토 패턴",
+            "[9-9-3] 합성 C",
+        ])
+        marked, starred = _apply_star_marks(catalog, {"9-9-1", "9-9-3"}, {"9-9-1", "9-9-3"})
+        self.assertEqual(starred, ["9-9-1"])
+        self.assertIn("★ [9-9-1] 합성 A", marked)
+        self.assertNotIn("★ [9-9-2]", marked)
+        self.assertNotIn("★ [9-9-3]", marked)  # structural 섹션은 ★ 없음
+
+
+if __name__ == "__main__":
+    unittest.main()
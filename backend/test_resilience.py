@@ -0,0 +1,155 @@
+"""Supabase RPC 복원력 계층 단위 테스트 (네트워크 불요).
+
+대상:
+  ① 헤지 — primary가 hedge_delay를 넘기면 두 번째 요청을 띄우고 먼저 온 응답 채택
+  ② 재시도 — 예외·무효(0건) 응답은 지터 백오프 후 재시도, 끝내 실패하면 fallback
+  ③ 서킷 브레이커 — 연속 실패 시 open → primary 생략·즉시 fallback, reset 후 half-open 복구
+  ④ 계측 — 호출·헤지·fallback 카운터와 지연 분위수
+  ⑤ fetch_ethics_for_patterns — RPC 0건 시 sleep 없이 REST fallback, fallback 결과는 비캐시
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_resilience -v
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from core import report_generator
+from core.resilience import CircuitBreaker, CircuitOpenError, ResilientRpc
+
+
+def _rpc(**kwargs) -> ResilientRpc:
+    kwargs.setdefault("executor", ThreadPoolExecutor(max_workers=4))
+    kwargs.setdefault("backoff_base_seconds", 0.001)
+    kwargs.setdefault("hedge_default_seconds", 0.05)
+    return ResilientRpc("test_rpc", **kwargs)
+
+
+class TestHedging(unittest.TestCase):
+    def test_slow_primary_hedged(self):
+        calls = []
+        release = threading.Event()
+
+        def primary():
+            n = len(calls)
+            calls.append(n)
+            if n == 0:
+                release.wait(2)  # 첫 요청만 느림
+                return ["slow"]
+            return ["fast"]
+
+        rpc = _rpc()
+        outcome = rpc.call(primary)
+        release.set()
+        self.assertEqual(outcome.value, ["fast"])
+        self.assertEqual(outcome.source, "hedge")
+        self.assertEqual(rpc.counters["hedges"], 1)
+        self.assertEqual(rpc.counters["hedge_wins"], 1)
+        self.assertLess(outcome.seconds, 1.0)
+
+    def test_fast_primary_not_hedged(self):
+        rpc = _rpc(hedge_default_seconds=1.0)
+        outcome = rpc.call(lambda: [1])
+        self.assertEqual(outcome.source, "primary")
+        self.assertEqual(rpc.counters["hedges"], 0)
+
+    def test_hedge_delay_tracks_percentile(self):
+        rpc = _rpc(hedge_min_samples=5, hedge_min_seconds=0.0)
+        for seconds in (0.1, 0.1, 0.1, 0.1, 0.9):
+            rpc._observe(seconds)
+        self.assertAlmostEqual(rpc.hedge_delay(), 0.9)
+        self.assertAlmostEqual(rpc.percentile(50), 0.1)
+
+
+class TestRetryAndFallback(unittest.TestCase):
+    def test_error_then_success(self):
+        results = [RuntimeError("boom"), [1]]
+
+        def primary():
+            r = results.pop(0)
+            if isinstance(r, Exception):
+                raise r
+            return r
+
+        rpc = _rpc()
+        outcome = rpc.call(primary, fallback=lambda: ["fb"])
+        self.assertEqual(outcome.value, [1])
+        self.assertEqual(rpc.counters["errors"], 1)
+        self.assertEqual(rpc.counters["retries"], 1)
+        self.assertEqual(rpc.counters["fallbacks"], 0)
+
+    def test_invalid_responses_fall_back(self):
+        rpc = _rpc(max_attempts=2)
+        outcome = rpc.call(lambda: [], fallback=lambda: ["fb"], accept=bool)
+        self.assertEqual(outcome.value, ["fb"])
+        self.assertEqual(outcome.source, "fallback")
+        self.assertEqual(rpc.counters["invalid"], 2)
+        self.assertEqual(rpc.breaker.state, "closed")  # 0건은 서버 실패가 아님
+
+    def test_no_fallback_reraises(self):
+        def primary():
+            raise ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            _rpc().call(primary)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_short_circuits(self):
+        rpc = _rpc(breaker=CircuitBreaker(threshold=2, reset_seconds=60), max_attempts=1)
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise ConnectionError("down")
+
+        for _ in range(2):
+            rpc.call(failing, fallback=lambda: [])
+        self.assertEqual(rpc.breaker.state, "open")
+        outcome = rpc.call(failing, fallback=lambda: ["fb"])
+        self.assertEqual(outcome.value, ["fb"])
+        self.assertEqual(len(calls), 2)  # open 동안 primary 미호출
+        self.assertEqual(rpc.counters["short_circuits"], 1)
+        with self.assertRaises(CircuitOpenError):
+            rpc.call(failing)
+
+    def test_half_open_recovers(self):
+        breaker = CircuitBreaker(threshold=1, reset_seconds=0.01)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        time.sleep(0.02)
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # 탐침은 1개만
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+
+class TestEthicsFetch(unittest.TestCase):
+    def test_empty_rpc_falls_back_without_sleep(self):
+        rpc = _rpc()
+        fallback_rows = [{"pattern_id": 1, "ethics_code": "JEC-1", "ethics_tier": 4}]
+        with patch.object(report_generator, "get_rpc", return_value=rpc), \
+             patch.object(report_generator, "_rpc_get_ethics", return_value=([], 200)), \
+             patch.object(report_generator, "_rest_fallback_ethics_rows",
+                          return_value=fallback_rows) as fb:
+            started = time.monotonic()
+            rows, cacheable = report_generator._fetch_ethics_rows([1], "http://sb", {})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(rows, fallback_rows)
+        self.assertFalse(cacheable)
+        fb.assert_called_once()
+
+    def test_rpc_rows_cacheable(self):
+        rows = [{"pattern_id": 1, "ethics_code": "JEC-1", "ethics_tier": 4}]
+        with patch.object(report_generator, "get_rpc", return_value=_rpc()), \
+             patch.object(report_generator, "_rpc_get_ethics", return_value=(rows, 200)):
+            self.assertEqual(
+                report_generator._fetch_ethics_rows([1], "http://sb", {}), (rows, True)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,282 @@
+"""save_analysis RPC — 마이그레이션 정적 계약 + storage 저장 경로 검증 (DB·API 불요).
+
+대상:
+  supabase/migrations/20261019000000_save_analysis_rpc.sql
+    ① SECURITY INVOKER + search_path 고정, EXECUTE는 service_role만
+    ② articles ON CONFLICT (url) UPSERT, share_id ON CONFLICT DO NOTHING 재생성 루프
+    ③ 스냅샷은 code별 활성 행 우선·최신 version, 트랜잭션 + NOTIFY + rollback 문서화
+  core.storage.save_analysis_result
+    ④ RPC 1회 호출 — payload(article/result/snapshots) 형태·스냅샷 대상 선별
+    ⑤ RPC 미배포(PGRST202/404) → 레거시 REST 경로 폴백, 이후 호출은 RPC 생략
+    ⑥ RPC 오류 → None (레거시 재시도 없음)
+    ⑦ 호출 측 share_id — payload로 전달, 레거시 경로 충돌(409)은 이미 저장된 것으로 처리
+    ⑦' 구 버전 RPC가 share_id를 새로 발급 → 요청 share_id로 레거시 재저장, 이후 RPC 생략
+  supabase/migrations/20261019000100_save_analysis_client_share_id.sql
+    ⑧ payload.share_id 사용 + 기존 share_id면 그대로 반환 (멱등)
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_save_analysis_rpc -v
+"""
+
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+
+from core import storage
+
+_MIG_DIR = Path(__file__).resolve().parent.parent / "supabase" / "migrations"
+_MIG = _MIG_DIR / "20261019000000_save_analysis_rpc.sql"
+_MIG_CLIENT_ID = _MIG_DIR / "20261019000100_save_analysis_client_share_id.sql"
+
+
+def _executable(sql: str) -> str:
+    return "\n".join(
+        ln for ln in sql.splitlines() if not ln.lstrip().startswith("--")
+    )
+
+
+class TestMigrationContract(unittest.TestCase):
+    def setUp(self):
+        self.sql = _MIG.read_text(encoding="utf-8")
+        self.body = _executable(self.sql)
+
+    def test_function_signature_and_security(self):
+        self.assertIn(
+            "CREATE OR REPLACE FUNCTION public.save_analysis(payload jsonb)", self.body
+        )
+        self.assertIn("RETURNS text", self.body)
+        self.assertIn("SECURITY INVOKER", self.body)
+        self.assertNotIn("SECURITY DEFINER", self.body)
+        self.assertIn("SET search_path = public, pg_temp", self.body)
+
+    def test_grants(self):
+        self.assertIn("FROM PUBLIC", self.body)
+        self.assertIn("FROM anon, authenticated", self.body)
+        self.assertIn(
+            "GRANT EXECUTE ON FUNCTION public.save_analysis(jsonb) TO service_role", self.body
+        )
+
+    def test_upsert_and_share_id_loop(self):
+        self.assertIn("ON CONFLICT (url) DO UPDATE", self.body)
+        self.assertIn("ON CONFLICT (share_id) DO NOTHING", self.body)
+        self.assertIn("gen_random_uuid()", self.body)
+        self.assertIn("RETURN v_share_id", self.body)
+
+    def test_snapshot_version_selection(self):
+        self.assertIn("INSERT INTO public.analysis_ethics_snapshot", self.body)
+        self.assertIn("ORDER BY is_active DESC, version DESC", self.body)
+
+    def test_transaction_reload_rollback(self):
+        self.assertIn("BEGIN;", self.body)
+        self.assertIn("COMMIT;", self.body)
+        self.assertIn("NOTIFY pgrst, 'reload schema';", self.body)
+        self.assertIn("-- DROP FUNCTION IF EXISTS public.save_analysis(jsonb);", self.sql)
+
+
+class TestClientShareIdMigration(unittest.TestCase):
+    def setUp(self):
+        self.body = _executable(_MIG_CLIENT_ID.read_text(encoding="utf-8"))
+
+    def test_uses_payload_share_id(self):
+        self.assertIn("nullif(payload->>'share_id', '')", self.body)
+        self.assertIn("IF NOT v_client_id THEN", self.body)
+
+    def test_idempotent_on_existing_share_id(self):
+        self.assertIn(
+            "SELECT 1 FROM public.analysis_results WHERE share_id = v_share_id", self.body
+        )
+        self.assertIn("ON CONFLICT (share_id) DO NOTHING", self.body)
+
+    def test_security_unchanged(self):
+        self.assertIn("SECURITY INVOKER", self.body)
+        self.assertIn("SET search_path = public, pg_temp", self.body)
+        self.assertIn(
+            "GRANT EXECUTE ON FUNCTION public.save_analysis(jsonb) TO service_role", self.body
+        )
+
+
+# ── storage 저장 경로 ────────────────────────────────────────────
+
+def _ref(code, relation="violates", strength="strong"):
+    return SimpleNamespace(
+        ethics_code=code, relation_type=relation, strength=strength,
+        ethics_full_text=f"{code} 전문",
+    )
+
+
+def _result():
+    detection = SimpleNamespace(
+        pattern_code="1-1-1", matched_text="인용", severity="high", reasoning="근거",
+    )
+    return SimpleNamespace(
+        pattern_result=SimpleNamespace(
+            validated_pattern_codes={"1-1-1"},
+            haiku_detections=[
+                detection,
+                SimpleNamespace(pattern_code="9-9-9", matched_text="", severity="", reasoning=""),
+            ],
+        ),
+        meta_patterns=[],
+        report_result=SimpleNamespace(
+            reports={"comprehensive": "종합", "journalist": "기자", "student": "학생"},
+            article_analysis={"articleType": "스트레이트"},
+        ),
+        overall_assessment="총평",
+        total_seconds=12.5,
+    )
+
+
+def _response(status, json_body=None, text=None):
+    request = httpx.Request("POST", "http://sb/rest/v1/rpc/save_analysis")
+    if json_body is not None:
+        return httpx.Response(status, json=json_body, request=request)
+    return httpx.Response(status, text=text or "", request=request)
+
+
+def _save(refs=None, share_id=None):
+    return storage.save_analysis_result(
+        "https://news.example.com/a?utm_source=x", "제목", "언론사", None,
+        "2025. 3. 4. 10:05", _result(), ethics_refs=refs,
+        citation_audit={"total": 1}, phase1_forensic=None, share_id=share_id,
+    )
+
+
+class TestSaveAnalysisResult(unittest.TestCase):
+    def setUp(self):
+        p1 = patch.object(storage, "_get_supabase_config", return_value=("http://sb", "key"))
+        p2 = patch.object(storage, "_rpc_available", None)
+        p1.start(), p2.start()
+        self.addCleanup(p1.stop)
+        self.addCleanup(p2.stop)
+
+    def test_single_rpc_round_trip(self):
+        refs = [
+            _ref("JEC-1"), _ref("JEC-1"), _ref("JEC-2", strength="moderate"),
+            _ref("JEC-3", strength="weak"), _ref("JEC-4", relation="related_to"),
+        ]
+        with patch.object(storage.httpx, "post", return_value=_response(200, "abcDEF123_-x")) as post, \
+             patch.object(storage.httpx, "get") as get:
+            share_id = _save(refs, share_id="abcDEF123_-x")
+
+        self.assertEqual(share_id, "abcDEF123_-x")
+        self.assertEqual(post.call_count, 1)
+        get.assert_not_called()
+        url = post.call_args.args[0]
+        self.assertEqual(url, "http://sb/rest/v1/rpc/save_analysis")
+        payload = post.call_args.kwargs["json"]["payload"]
+        self.assertEqual(payload["article"], {
+            "url": "https://news.example.com/a",
+            "title": "제목",
+            "publisher": "언론사",
+            "journalist": None,
+            "publish_date": "2025-03-04T10:05:00+09:00",
+        })
+        self.assertEqual(
+            [s["ethics_code"] for s in payload["snapshots"]], ["JEC-1", "JEC-2"]
+        )
+        self.assertEqual(payload["snapshots"][0]["snapshot_full_text"], "JEC-1 전문")
+        record = payload["result"]
+        self.assertNotIn("article_id", record)
+        self.assertNotIn("share_id", record)
+        self.assertEqual([d["pattern_code"] for d in record["detected_patterns"]], ["1-1-1"])
+        self.assertIsNone(record["meta_patterns"])
+        self.assertEqual(record["citation_audit"], {"total": 1})
+
+    def test_related_to_fallback_targets(self):
+        refs = [_ref("JEC-4", relation="related_to"), _ref("JEC-5", strength="weak")]
+        with patch.object(storage.httpx, "post", return_value=_response(200, "sid")) as post:
+            _save(refs, share_id="sid")
+        payload = post.call_args.kwargs["json"]["payload"]
+        self.assertEqual([s["ethics_code"] for s in payload["snapshots"]], ["JEC-4"])
+
+    def test_missing_rpc_falls_back_to_legacy(self):
+        missing = _response(404, text='{"code":"PGRST202","message":"Could not find"}')
+        calls = []
+
+        def fake_post(url, **kwargs):
+            calls.append(url)
+            if url.endswith("/rpc/save_analysis"):
+                return missing
+            if url.endswith("/articles"):
+                return _response(201, [{"id": 7}])
+            if url.endswith("/analysis_results"):
+                return _response(201, [{"id": 70}])
+            return _response(201, text="")
+
+        with patch.object(storage.httpx, "post", side_effect=fake_post):
+            first = _save()
+            second = _save()
+
+        self.assertIsInstance(first, str)
+        self.assertEqual(len(first), 12)
+        self.assertIsInstance(second, str)
+        self.assertFalse(storage._rpc_available)
+        # RPC는 첫 호출에서만 시도
+        self.assertEqual(sum(u.endswith("/rpc/save_analysis") for u in calls), 1)
+        self.assertEqual(sum(u.endswith("/analysis_results") for u in calls), 2)
+
+    def test_rpc_error_returns_none_without_legacy(self):
+        err = _response(500, text='{"code":"23502","message":"null value"}')
+        with patch.object(storage.httpx, "post", return_value=err) as post:
+            self.assertIsNone(_save([_ref("JEC-1")]))
+        self.assertEqual(post.call_count, 1)
+        self.assertIsNot(storage._rpc_available, False)
+
+    def test_client_share_id_passed_to_rpc(self):
+        with patch.object(storage.httpx, "post", return_value=_response(200, "client12345x")) as post:
+            self.assertEqual(_save(share_id="client12345x"), "client12345x")
+        self.assertEqual(post.call_args.kwargs["json"]["payload"]["share_id"], "client12345x")
+
+    def test_rpc_ignoring_client_share_id_falls_back_to_legacy(self):
+        # 20261019000100 미적용 DB — 구 버전 함수가 share_id를 새로 발급
+        calls = []
+
+        def fake_post(url, **kwargs):
+            calls.append((url, kwargs.get("json")))
+            if url.endswith("/rpc/save_analysis"):
+                return _response(200, "server999999")
+            if url.endswith("/articles"):
+                return _response(201, [{"id": 7}])
+            return _response(201, [{"id": 70}])
+
+        with patch.object(storage.httpx, "post", side_effect=fake_post):
+            self.assertEqual(_save(share_id="client12345x"), "client12345x")
+            self.assertEqual(_save(share_id="client67890y"), "client67890y")
+
+        self.assertFalse(storage._rpc_available)
+        urls = [u for u, _ in calls]
+        self.assertEqual(sum(u.endswith("/rpc/save_analysis") for u in urls), 1)
+        inserted = [body["share_id"] for u, body in calls if u.endswith("/analysis_results")]
+        self.assertEqual(inserted, ["client12345x", "client67890y"])
+
+    def test_legacy_conflict_on_client_share_id_is_saved(self):
+        storage._rpc_available = False
+        conflict = _response(409, text='{"code":"23505","message":"duplicate key"}')
+
+        def fake_post(url, **kwargs):
+            if url.endswith("/articles"):
+                return _response(201, [{"id": 7}])
+            return conflict
+
+        with patch.object(storage.httpx, "post", side_effect=fake_post) as post:
+            self.assertEqual(_save(share_id="client12345x"), "client12345x")
+        # 재시도 없이 바로 종료 (articles 1회 + analysis_results 1회)
+        self.assertEqual(post.call_count, 2)
+
+    def test_build_payload_is_json_serializable(self):
+        import json
+        payload = storage.build_analysis_payload(
+            "https://news.example.com/a", "제목", None, None, None, _result(),
+            ethics_refs=[_ref("JEC-1")],
+        )
+        self.assertEqual(len(payload["share_id"]), 12)
+        self.assertEqual(json.loads(json.dumps(payload, ensure_ascii=False)), payload)
+        report = storage.report_from_payload(payload)
+        self.assertEqual(report["reports"]["comprehensive"], "종합")
+        self.assertEqual(report["article_info"]["articleType"], "스트레이트")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+"""구조화 소스 레이어 단위 테스트 (네트워크 불요).
+
+대상:
+  ① 조선일보 Fusion.globalContent — DOM 없이 raw_decode 슬라이스로 추출
+  ② JSON-LD(NewsArticle) articleBody + og: 메타 보강 — 허용 도메인별 fixture, 언론사명은 핸들러 표기 유지
+  ③ 구조화 소스 부재/본문 부족/허용 목록 밖 도메인(포털 포함) 시 None → 기존 HTML 핸들러 폴백
+  ④ scrape()가 구조화 성공 시 BeautifulSoup을 만들지 않음
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_scraper_structured -v
+"""
+
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import scraper as scraper_mod
+from scraper import ArticleScraper, _STRUCTURED_JSONLD_DOMAINS
+
+
+_BODY = "가나다라마바사 아자차카타파하. " * 20  # 100자 이상 합성 본문
+
+
+def _fusion_html(payload: dict) -> str:
+    return (
+        "<html><head><script>"
+        f"Fusion.globalContent={json.dumps(payload, ensure_ascii=False)};"
+        "Fusion.globalContentConfig={};"
+        "</script></head><body><h1>무관한 제목</h1></body></html>"
+    )
+
+
+def _jsonld_html(node, og: str = "") -> str:
+    return (
+        f"<html><head>{og}"
+        '<script type="application/ld+json">'
+        f"{json.dumps(node, ensure_ascii=False)}"
+        "</script></head><body></body></html>"
+    )
+
+
+def _mock_response(text: str) -> MagicMock:
+    resp = MagicMock()
+    resp.text = text
+    resp.encoding = "utf-8"
+    resp.raise_for_status.return_value = None
+    return resp
+
+
+class TestFusionStructured(unittest.TestCase):
+    def setUp(self):
+        self.s = ArticleScraper()
+
+    def test_fusion_extracts_without_dom(self):
+        payload = {
+            "headlines": {"basic": "조선 제목"},
+            "content_elements": [
+                {"type": "text", "content": _BODY},
+                {"type": "image", "content": "무시"},
+                {"type": "text", "content": "두 번째 문단 };"},
+            ],
+            "credits": {"by": [{"additional_properties": {"original": {"byline": "김기자 기자"}}}]},
+            "created_date": "2026-01-01T00:00:00Z",
+        }
+        result = self.s._scrape_structured(_fusion_html(payload), "https://www.chosun.com/a/1")
+        self.assertIsNotNone(result)
+        self.assertEqual(result["title"], "조선 제목")
+        self.assertEqual(result["publisher"], "조선일보")
+        self.assertEqual(result["journalist"], "김기자 기자")
+        self.assertEqual(result["publish_date"], "2026-01-01T00:00:00Z")
+        # JSON 문자열 안의 '};'에서 잘리지 않아야 한다
+        self.assertTrue(result["content"].endswith("두 번째 문단 };"))
+
+    def test_fusion_missing_falls_back(self):
+        html_text = "<html><body><h1>제목</h1></body></html>"
+        self.assertIsNone(self.s._scrape_structured(html_text, "https://www.chosun.com/a/1"))
+
+    def test_fusion_short_body_falls_back(self):
+        payload = {"headlines": {"basic": "제목"}, "content_elements": [{"type": "text", "content": "짧음"}]}
+        self.assertIsNone(self.s._scrape_structured(_fusion_html(payload), "https://www.chosun.com/a/1"))
+
+
+# 허용 도메인별 fixture — 각 사이트 JSON-LD 형태를 축약 (publisher 값은 사이트 표기 그대로)
+_DOMAIN_FIXTURES = {
+    "joongang.co.kr": (
+        "https://www.joongang.co.kr/article/25300001",
+        {
+            "@context": "https://schema.org",
+            "@type": "NewsArticle",
+            "headline": "중앙 제목 &amp; 부제",
+            "articleBody": _BODY,
+            "datePublished": "2026-02-02T09:00:00+09:00",
+            "author": [{"@type": "Person", "name": "홍길동"}],
+            "publisher": {"@type": "Organization", "name": "JoongAng Ilbo"},
+        },
+        "중앙 제목 & 부제",
+    ),
+    "hani.co.kr": (
+        "https://www.hani.co.kr/arti/politics/politics_general/1200001.html",
+        {
+            "@context": "https://schema.org",
+            "@graph": [
+                {"@type": "WebPage", "name": "한겨레"},
+                {"@type": "NewsArticle", "headline": "한겨레 제목", "articleBody": _BODY,
+                 "author": {"@type": "Person", "name": "김기자 기자"},
+                 "publisher": {"@type": "Organization", "name": "The Hankyoreh"}},
+            ],
+        },
+        "한겨레 제목",
+    ),
+    "yna.co.kr": (
+        "https://www.yna.co.kr/view/AKR20260202000100001",
+        [
+            {"@type": "BreadcrumbList", "itemListElement": []},
+            {"@type": "NewsArticle", "headline": "연합 제목",
+             "articleBody": "(서울=연합뉴스) 이기자 기자 =\n\n  " + _BODY,
+             "author": {"@type": "Person", "name": "이기자"},
+             "publisher": {"@type": "Organization", "name": "Yonhap News Agency"}},
+        ],
+        "연합 제목",
+    ),
+}
+
+
+class TestJsonLdStructured(unittest.TestCase):
+    def setUp(self):
+        self.s = ArticleScraper()
+
+    def test_fixture_per_allowlisted_domain(self):
+        self.assertEqual(set(_DOMAIN_FIXTURES), set(_STRUCTURED_JSONLD_DOMAINS))
+        for domain, (url, node, title) in _DOMAIN_FIXTURES.items():
+            with self.subTest(domain=domain):
+                result = self.s._scrape_structured(_jsonld_html(node), url)
+                self.assertEqual(result["title"], title)
+                # JSON-LD의 publisher가 아니라 핸들러와 같은 언론사명
+                self.assertEqual(result["publisher"], _STRUCTURED_JSONLD_DOMAINS[domain])
+                self.assertTrue(result["journalist"].endswith("기자"))
+                self.assertNotIn("\n", result["content"])
+                self.assertNotIn("  ", result["content"])
+
+    def test_jsonld_news_article(self):
+        url, node, _ = _DOMAIN_FIXTURES["joongang.co.kr"]
+        result = self.s._scrape_structured(_jsonld_html(node), url)
+        self.assertEqual(result["journalist"], "홍길동 기자")
+        self.assertEqual(result["publish_date"], "2026-02-02T09:00:00+09:00")
+
+    def test_unlisted_domain_and_portal_skip_jsonld(self):
+        url, node, _ = _DOMAIN_FIXTURES["joongang.co.kr"]
+        for other in ("https://news.example.com/1",
+                      "https://n.news.naver.com/mnews/article/025/0003400001",
+                      "https://v.daum.net/v/20260202090000001"):
+            with self.subTest(url=other):
+                self.assertIsNone(self.s._scrape_structured(_jsonld_html(node), other))
+
+    def test_jsonld_graph_and_og_fallback(self):
+        node = {
+            "@graph": [
+                {"@type": "WebPage", "name": "페이지"},
+                {"@type": ["NewsArticle"], "articleBody": _BODY},
+            ]
+        }
+        og = (
+            '<meta content="OG 제목" property="og:title">'
+            "<meta property='og:site_name' content='오지일보'>"
+        )
+        result = self.s._scrape_structured(_jsonld_html(node, og), "https://www.hani.co.kr/arti/1.html")
+        self.assertEqual(result["title"], "OG 제목")
+        self.assertEqual(result["publisher"], "한겨레")
+        self.assertEqual(result["journalist"], "미확인")
+
+    def test_jsonld_without_article_body_falls_back(self):
+        node = {"@type": "NewsArticle", "headline": "제목", "description": "요약만"}
+        self.assertIsNone(self.s._scrape_structured(_jsonld_html(node), "https://www.hani.co.kr/arti/1.html"))
+
+    def test_broken_jsonld_falls_back(self):
+        html_text = '<script type="application/ld+json">{broken</script>'
+        self.assertIsNone(self.s._scrape_structured(html_text, "https://www.hani.co.kr/arti/1.html"))
+
+
+class TestScrapeIntegration(unittest.TestCase):
+    def test_structured_hit_skips_beautifulsoup(self):
+        node = {"@type": "NewsArticle", "headline": "제목", "articleBody": _BODY}
+        with patch.object(scraper_mod.requests, "get", return_value=_mock_response(_jsonld_html(node))), \
+             patch.object(scraper_mod, "BeautifulSoup") as bs:
+            result = ArticleScraper().scrape("https://www.hani.co.kr/arti/1.html")
+        bs.assert_not_called()
+        self.assertEqual(result["title"], "제목")
+
+    def test_structured_miss_uses_html_handler(self):
+        html_text = (
+            "<html><head><meta property='og:site_name' content='폴백일보'></head>"
+            f"<body><h1>HTML 제목</h1><article>{_BODY}</article></body></html>"
+        )
+        with patch.object(scraper_mod.requests, "get", return_value=_mock_response(html_text)):
+            result = ArticleScraper().scrape("https://news.example.com/1")
+        self.assertEqual(result["title"], "HTML 제목")
+        self.assertEqual(result["publisher"], "폴백일보")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""통계 RPC 캐시 + /stats 엔드포인트 단위 테스트 (네트워크·DB 불요, RPC 모킹).
+
+대상:
+  ① StatsCache — TTL 안에서는 RPC 1회, 만료 후 재조회, 실패 시 이전 값(stale) 반환
+  ② 이전 값이 없을 때 실패 → StatsUnavailable → 엔드포인트 503
+  ③ /stats/* — Cache-Control(max-age·stale-while-revalidate)·ETag·Age 헤더, If-None-Match 304
+  ④ trending hours 범위 보정 (1~168), RPC 헤더는 연결 프로필(ConnectionProfile.headers)에서
+  ⑤ 마이그레이션 20261019000300 정적 계약 — 트리거 2개, 함수 3개 롤업 조회, 재구성 권한,
+     stats_overall 슬롯 분산(증분은 백엔드별 슬롯, 조회는 SUM)
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_stats -v
+"""
+
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+import main
+from core import db, stats
+from core.stats import StatsCache, StatsUnavailable
+
+_MIG = (
+    Path(__file__).resolve().parent.parent
+    / "supabase" / "migrations" / "20261019000300_materialized_stats.sql"
+)
+
+
+class TestStatsCache(unittest.TestCase):
+    def test_ttl_and_refresh(self):
+        cache = StatsCache(ttl_seconds=60)
+        calls = []
+        loader = lambda: calls.append(1) or [{"n": len(calls)}]
+        first = cache.get(("k",), loader)
+        second = cache.get(("k",), loader)
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.ttl_seconds = 0
+        cache.clear()
+        cache.get(("k",), loader)
+        self.assertEqual(len(calls), 2)
+
+    def test_stale_on_failure(self):
+        cache = StatsCache(ttl_seconds=0)
+        fresh = cache.get(("k",), lambda: {"total": 1})
+
+        def boom():
+            raise RuntimeError("db down")
+
+        stale = cache.get(("k",), boom)
+        self.assertTrue(stale.stale)
+        self.assertEqual((stale.data, stale.etag), (fresh.data, fresh.etag))
+        self.assertEqual(cache.stale_served, 1)
+
+    def test_unavailable_without_previous(self):
+        with self.assertRaises(StatsUnavailable):
+            StatsCache().get(("k",), lambda: 1 / 0)
+
+
+class TestEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(main.app)
+        self.rpc_calls = []
+        stats.get_stats_cache().clear()
+
+    def _fake_rpc(self, name, params):
+        self.rpc_calls.append((name, params))
+        if name == "get_overall_stats":
+            return [{"total_articles": 3, "total_analyses": 5, "avg_duration": 41.5}]
+        return [{"publisher": "합성일보", "total_analyses": 5, "avg_duration": 41.5}]
+
+    def test_headers_and_304(self):
+        with patch.object(stats, "_call_rpc", side_effect=self._fake_rpc):
+            r = self.client.get("/stats/overall")
+            self.assertEqual(r.status_code, 200)
+            self.assertEqual(r.json()["total_analyses"], 5)
+            self.assertIn("max-age=", r.headers["cache-control"])
+            self.assertIn("stale-while-revalidate=", r.headers["cache-control"])
+            etag = r.headers["etag"]
+
+            again = self.client.get("/stats/overall", headers={"If-None-Match": etag})
+            self.assertEqual(again.status_code, 304)
+            self.assertEqual(again.headers["etag"], etag)
+        self.assertEqual(len(self.rpc_calls), 1)  # 두 번째 요청은 캐시 적중
+
+    def test_trending_hours_clamped(self):
+        with patch.object(stats, "_call_rpc", side_effect=self._fake_rpc):
+            self.client.get("/stats/trending", params={"hours": 10_000})
+            self.client.get("/stats/trending", params={"hours": 0})
+        self.assertEqual(
+            self.rpc_calls,
+            [("get_trending_articles", {"hours_ago": 168}),
+             ("get_trending_articles", {"hours_ago": 1})],
+        )
+
+    def test_rpc_uses_profile_headers(self):
+        profile = db.ConnectionProfile("http://sb", "k", "cloud", 0.0)
+        response = MagicMock(json=lambda: [])
+        with patch.object(stats, "get_connection_profile", return_value=profile), \
+             patch.object(stats.httpx, "post", return_value=response) as post:
+            stats._call_rpc("get_publisher_stats", {})
+        self.assertEqual(post.call_args.args[0], "http://sb/rest/v1/rpc/get_publisher_stats")
+        self.assertEqual(post.call_args.kwargs["headers"], profile.headers())
+
+    def test_503_when_unavailable(self):
+        with patch.object(stats, "_call_rpc", side_effect=RuntimeError("down")):
+            r = self.client.get("/stats/publishers")
+        self.assertEqual(r.status_code, 503)
+
+
+class TestMigrationContract(unittest.TestCase):
+    def setUp(self):
+        self.body = "\n".join(
+            ln for ln in _MIG.read_text(encoding="utf-8").splitlines()
+            if not ln.lstrip().startswith("--")
+        )
+
+    def test_row_triggers(self):
+        self.assertIn("CREATE TRIGGER stats_on_analysis_change", self.body)
+        self.assertIn("CREATE TRIGGER stats_on_article_change", self.body)
+        self.assertEqual(self.body.count("FOR EACH ROW"), 2)
+
+    def test_functions_read_rollups(self):
+        for fn, table in (
+            ("get_trending_articles(hours_ago INT DEFAULT 24)", "stats_article_hourly"),
+            ("get_publisher_stats()", "stats_publisher"),
+            ("get_overall_stats()", "stats_overall"),
+        ):
+            start = self.body.index(f"CREATE OR REPLACE FUNCTION public.{fn}")
+            end = self.body.index("$function$;", start)
+            self.assertIn(f"FROM public.{table}", self.body[start:end])
+            self.assertIn("SET search_path = public, pg_temp", self.body[start:end])
+
+    def test_overall_counter_sharded(self):
+        self.assertNotIn("WHERE id = 1", self.body)
+        self.assertIn("WHERE slot = pg_backend_pid() % 16", self.body)
+        self.assertEqual(self.body.count("UPDATE public.stats_overall\n  SET total_articles = total_articles"), 1)
+        start = self.body.index("CREATE OR REPLACE FUNCTION public.get_overall_stats()")
+        self.assertIn("sum(o.total_analyses)", self.body[start:self.body.index("$function$;", start)])
+
+    def test_refresh_locked_down_and_backfilled(self):
+        self.assertIn(
+            "GRANT EXECUTE ON FUNCTION public.refresh_analysis_stats() TO service_role", self.body
+        )
+        self.assertIn("SELECT public.refresh_analysis_stats();", self.body)
+        for table in ("stats_article_hourly", "stats_publisher", "stats_overall"):
+            self.assertIn(f"ALTER TABLE public.{table}", self.body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""증분 관용 JSON 파서(StreamingJsonParser) 단위 테스트 (네트워크·API 불요).
+
+대상:
+  ① 청크 분할 무관 — 1자씩 넣어도 한 번에 넣은 것과 같은 결과
+  ② 관용 — 코드블록·서두 문장, 후행 쉼표, 문자열 내 실제 줄바꿈·이스케이프 안 된 큰따옴표
+  ③ 이스케이프(\\n, \\", \\uXXXX, 서로게이트 쌍)가 청크 경계에 걸쳐도 안전
+  ④ 부분 결과 — 필드가 닫히는 즉시 on_field, 잘린 응답은 finish()에서 truncated
+  ⑤ generate_report 연동 — on_text 스트림 파싱·on_report_field 전달, 불완전 시 _robust_json_parse 폴백
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_stream_json -v
+"""
+
+import json
+import unittest
+from unittest.mock import patch
+
+from core import report_generator
+from core.report_generator import generate_report
+from core.stream_json import StreamingJsonParser, parse_tolerant
+
+_MESSY = (
+    "다음은 결과입니다.\n```json\n"
+    '{"reports": {"comprehensive": "그는 "괜찮다"고 말했다.\n둘째 줄, 끝", '
+    '"journalist": "탭\there \\"인용\\" \\u00e9 \\ud83d\\ude00", '
+    '"student": "쉼표, "따옴표", 포함",}, '
+    '"article_analysis": {"type": "스트레이트", "sources": ["A", "B",], "count": 2, "ok": true,}}'
+    "\n```\n이상입니다."
+)
+
+_EXPECTED = {
+    "reports": {
+        "comprehensive": '그는 "괜찮다"고 말했다.\n둘째 줄, 끝',
+        "journalist": '탭\there "인용" é 😀',
+        "student": '쉼표, "따옴표", 포함',
+    },
+    "article_analysis": {"type": "스트레이트", "sources": ["A", "B"], "count": 2, "ok": True},
+}
+
+
+def _feed_in(text, size):
+    parser = StreamingJsonParser()
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+    return parser
+
+
+class TestTolerantParse(unittest.TestCase):
+    def test_messy_output(self):
+        self.assertEqual(parse_tolerant(_MESSY), _EXPECTED)
+
+    def test_chunking_invariant(self):
+        for size in (1, 2, 3, 7, 64):
+            parser = _feed_in(_MESSY, size)
+            self.assertEqual(parser.finish(), _EXPECTED, f"chunk size {size}")
+            self.assertTrue(parser.complete)
+            self.assertFalse(parser.truncated)
+
+    def test_valid_json_roundtrip(self):
+        data = {"a": [1, -2.5, None, False, {"b": "c\\d\n"}], "e": {}, "f": []}
+        self.assertEqual(parse_tolerant(json.dumps(data, ensure_ascii=False)), data)
+        self.assertEqual(parse_tolerant(json.dumps(data, indent=2)), data)
+
+
+class TestPartialResults(unittest.TestCase):
+    def test_field_available_before_stream_ends(self):
+        seen = []
+        parser = StreamingJsonParser(on_field=lambda path, value: seen.append((path, value)))
+        parser.feed('{"reports": {"comprehensive": "첫 리포트", "journ')
+        self.assertEqual(seen, [(("reports", "comprehensive"), "첫 리포트")])
+        self.assertEqual(parser.get("reports", "comprehensive"), "첫 리포트")
+        self.assertIsNone(parser.get("reports", "journalist"))
+        self.assertFalse(parser.complete)
+
+    def test_closing_quote_waits_for_lookahead(self):
+        seen = []
+        parser = StreamingJsonParser(on_field=lambda path, value: seen.append(value))
+        parser.feed('{"a": "말했다"')
+        self.assertEqual(seen, [])  # 닫는 따옴표인지 아직 모름
+        parser.feed(" 고 했다\"}")
+        self.assertEqual(seen, ['말했다" 고 했다'])
+
+    def test_truncated_output(self):
+        parser = StreamingJsonParser()
+        parser.feed('{"reports": {"comprehensive": "완성", "journalist": "잘린 본')
+        result = parser.finish()
+        self.assertTrue(parser.truncated)
+        self.assertFalse(parser.complete)
+        self.assertEqual(result["reports"], {"comprehensive": "완성", "journalist": "잘린 본"})
+
+    def test_callback_errors_ignored(self):
+        def boom(path, value):
+            raise RuntimeError("observer")
+
+        parser = StreamingJsonParser(on_field=boom)
+        parser.feed('{"a": "b"}')
+        self.assertEqual(parser.finish(), {"a": "b"})
+
+
+class TestGenerateReportStreaming(unittest.TestCase):
+    def _run(self, raw, stream=True):
+        def fake_call_sonnet(*args, on_text=None, **kwargs):
+            if on_text is not None and stream:
+                for i in range(0, len(raw), 5):
+                    on_text(raw[i:i + 5])
+            return raw, 10, 20
+
+        fields = []
+        with patch.object(report_generator, "_get_supabase_config",
+                          return_value=("http://localhost", "key")), \
+             patch.object(report_generator, "fetch_ethics_for_patterns", return_value=[]), \
+             patch.object(report_generator, "call_sonnet", side_effect=fake_call_sonnet), \
+             patch.object(report_generator, "REPORT_STREAMING", True):
+            result = generate_report(
+                article_text="본문", pattern_ids=[1], detections=[],
+                on_report_field=lambda field, text: fields.append(field),
+            )
+        return result, fields
+
+    def test_streamed_reports(self):
+        result, fields = self._run(_MESSY)
+        self.assertEqual(result.reports, _EXPECTED["reports"])
+        self.assertEqual(result.article_analysis["type"], "스트레이트")
+        self.assertEqual(fields, ["comprehensive", "journalist", "student"])
+
+    def test_unstreamed_call_scanned_once(self):
+        result, fields = self._run(_MESSY, stream=False)
+        self.assertEqual(result.reports, _EXPECTED["reports"])
+        self.assertEqual(len(fields), 3)
+
+    def test_incomplete_falls_back_to_robust_parse(self):
+        raw = '{"reports": {"comprehensive": "a", "journalist": "b", "student": "c"}'  # 미종료
+        with self.assertLogs(report_generator.logger, level="WARNING") as logs:
+            result, _ = self._run(raw)
+        self.assertEqual(result.reports, {"comprehensive": "a", "journalist": "b", "student": "c"})
+        self.assertTrue(any("폴백" in line for line in logs.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""구조화 출력(tool use) 모드 단위 테스트 (네트워크·API·DB 불요, Anthropic 클라이언트 모킹).
+
+대상:
+  ① Phase 1 — tool 모드에서 tools/tool_choice 요청, tool input으로 탐지 구성(파싱 폴백 없음),
+     tool_use 블록이 없으면 텍스트 파서로 폴백(fallback_used=True)
+  ② Phase 2 — call_sonnet tool 모드: tool input JSON 반환, 스트리밍 시 input_json 델타 전달
+  ③ generate_report — output_mode·attempts·parse_fallbacks·seconds 기록
+  ④ phase1_forensic["structured_output"] — phase1/phase2 비교 블록
+  ⑤ 텍스트 모드(기본값) 요청에는 tools 인자가 없음
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_structured_output -v
+패턴 코드는 실제 데이터와 무관한 합성값(9-9-*)만 사용한다.
+"""
+
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from core import pattern_matcher, pipeline, report_generator, structured_output
+from core.pattern_matcher import PatternMatchResult
+from core.report_generator import ReportResult, call_sonnet, generate_report
+
+_CATALOG = [{
+    "id": 999, "code": "9-9-a", "name": "합성 패턴", "is_active": True,
+    "is_meta_pattern": False, "detection_strategy": "vector",
+}]
+
+_SOLO_INPUT = {
+    "overall_assessment": "판단",
+    "detections": [{"matched_text": "발췌 \"인용\"", "reasoning": "근거",
+                    "severity": "high", "pattern_code": "9-9-a"}],
+}
+
+_REPORT_INPUT = {
+    "article_analysis": {"articleType": "스트레이트", "articleElements": "e",
+                         "editStructure": "s", "reportingMethod": "m", "contentFlow": "f"},
+    "reports": {"comprehensive": "그는 \"말했다\"\n둘째 줄", "journalist": "j", "student": "s"},
+}
+
+
+def _tool_block(name, data):
+    return SimpleNamespace(type="tool_use", name=name, input=data)
+
+
+def _text_block(text):
+    return SimpleNamespace(type="text", text=text)
+
+
+def _response(*blocks):
+    return SimpleNamespace(
+        content=list(blocks), usage=SimpleNamespace(input_tokens=10, output_tokens=20),
+    )
+
+
+def _client(response):
+    client = MagicMock()
+    client.messages.create.return_value = response
+    return client
+
+
+def _run_solo(response, mode):
+    client = _client(response)
+    with patch.object(structured_output, "STRUCTURED_OUTPUT", mode == "tool"), \
+         patch.object(pattern_matcher, "_get_supabase_config", return_value=("http://sb", "k")), \
+         patch.object(pattern_matcher, "_load_pattern_catalog", return_value=_CATALOG), \
+         patch.object(pattern_matcher, "_build_pattern_list_text", return_value=""), \
+         patch.object(pattern_matcher, "generate_embeddings", return_value=([[0.0]], 1)), \
+         patch.object(pattern_matcher, "search_vectors", return_value=[]), \
+         patch.object(pattern_matcher, "_build_sonnet_solo_prompt", return_value="sys"), \
+         patch.object(pattern_matcher, "Anthropic", return_value=client), \
+         patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test"}):
+        pm = pattern_matcher.match_patterns_solo(["청크"], "본문")
+    return pm, client.messages.create.call_args.kwargs
+
+
+class TestPhase1(unittest.TestCase):
+    def test_tool_mode_uses_tool_input(self):
+        pm, kwargs = _run_solo(
+            _response(_tool_block("report_detections", _SOLO_INPUT)), "tool",
+        )
+        self.assertEqual(kwargs["tool_choice"], {"type": "tool", "name": "report_detections"})
+        self.assertEqual(kwargs["tools"][0]["name"], "report_detections")
+        self.assertEqual(pm.validated_pattern_codes, ["9-9-a"])
+        self.assertEqual(pm.haiku_detections[0].matched_text, '발췌 "인용"')
+        self.assertFalse(pm.parse_fallback_used)
+        self.assertEqual(pm.output_mode, "tool")
+        self.assertEqual(json.loads(pm.haiku_raw_response), _SOLO_INPUT)
+
+    def test_tool_mode_without_tool_block_falls_back(self):
+        pm, _ = _run_solo(_response(_text_block(json.dumps(_SOLO_INPUT))), "tool")
+        self.assertEqual(pm.validated_pattern_codes, ["9-9-a"])
+        self.assertTrue(pm.parse_fallback_used)
+
+    def test_text_mode_request_unchanged(self):
+        pm, kwargs = _run_solo(_response(_text_block(json.dumps(_SOLO_INPUT))), "text")
+        self.assertNotIn("tools", kwargs)
+        self.assertNotIn("tool_choice", kwargs)
+        self.assertFalse(pm.parse_fallback_used)
+        self.assertEqual(pm.output_mode, "text")
+
+
+class TestPhase2(unittest.TestCase):
+    def _call(self, client, on_text=None):
+        with patch.object(structured_output, "STRUCTURED_OUTPUT", True), \
+             patch.object(report_generator, "Anthropic", return_value=client), \
+             patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test"}):
+            return call_sonnet("본문", "[]", "판단", "규범", on_text=on_text)
+
+    def test_tool_mode_returns_tool_json(self):
+        client = _client(_response(_tool_block("submit_reports", _REPORT_INPUT)))
+        raw, in_tok, out_tok = self._call(client)
+        self.assertEqual(json.loads(raw), _REPORT_INPUT)
+        self.assertEqual((in_tok, out_tok), (10, 20))
+        kwargs = client.messages.create.call_args.kwargs
+        self.assertEqual(kwargs["tool_choice"]["name"], "submit_reports")
+
+    def test_streaming_forwards_input_json_deltas(self):
+        payload = json.dumps(_REPORT_INPUT, ensure_ascii=False)
+        events = [SimpleNamespace(type="input_json", partial_json=payload[i:i + 9])
+                  for i in range(0, len(payload), 9)]
+        stream = MagicMock()
+        stream.__enter__.return_value = stream
+        stream.__iter__.return_value = iter(events)
+        stream.get_final_message.return_value = _response(
+            _tool_block("submit_reports", _REPORT_INPUT),
+        )
+        client = MagicMock()
+        client.messages.stream.return_value = stream
+
+        parser = report_generator._report_parser()
+        raw, _, _ = self._call(client, on_text=parser.feed)
+        self.assertEqual(parser.finish(), _REPORT_INPUT)
+        self.assertTrue(parser.complete)
+        self.assertEqual(json.loads(raw), _REPORT_INPUT)
+
+
+class TestGenerateReportMetrics(unittest.TestCase):
+    def test_attempts_and_fallbacks_recorded(self):
+        outputs = iter([
+            '{"reports": {"comprehensive": "a"}}',  # 필수 리포트 누락 → 재시도
+            json.dumps(_REPORT_INPUT, ensure_ascii=False),
+        ])
+
+        with patch.object(report_generator, "_get_supabase_config",
+                          return_value=("http://localhost", "key")), \
+             patch.object(report_generator, "fetch_ethics_for_patterns", return_value=[]), \
+             patch.object(report_generator, "call_sonnet",
+                          side_effect=lambda *a, **k: (next(outputs), 1, 2)), \
+             patch.object(report_generator.time, "sleep"), \
+             patch.object(structured_output, "STRUCTURED_OUTPUT", True):
+            rr = generate_report(article_text="본문", pattern_ids=[1], detections=[])
+        self.assertEqual(rr.output_mode, "tool")
+        self.assertEqual(rr.attempts, 2)
+        self.assertEqual(rr.parse_fallbacks, 1)
+        self.assertGreaterEqual(rr.seconds, 0.0)
+        self.assertEqual(rr.reports, _REPORT_INPUT["reports"])
+
+
+class TestForensicBlock(unittest.TestCase):
+    def test_phase1_and_phase2_blocks(self):
+        pm = PatternMatchResult(parse_fallback_used=True, output_mode="tool", solo_seconds=1.25)
+        rr = ReportResult(output_mode="tool", attempts=3, parse_fallbacks=1, seconds=9.5)
+        block = pipeline._build_phase1_forensic(pm, "general", [], rr)["structured_output"]
+        self.assertEqual(block["phase1"], {"mode": "tool", "fallback_used": True, "seconds": 1.25})
+        self.assertEqual(block["phase2"], {
+            "mode": "tool", "attempts": 3, "retries": 2, "parse_fallbacks": 1, "seconds": 9.5,
+        })
+
+    def test_phase2_none_without_report_call(self):
+        block = pipeline._build_phase1_forensic(PatternMatchResult(), "general", [])
+        self.assertIsNone(block["structured_output"]["phase2"])
+        self.assertEqual(block["structured_output"]["phase1"]["mode"], "text")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Supabase 연결 프로필 (core.db) 단위 테스트 (네트워크·DB 불요 — httpx.get 모킹).
+
+대상:
+  ① _get_supabase_config — 자동 감지 probe는 프로세스당 1회, 이후 호출은 캐시
+  ② 관련 환경변수 변경 시 재해결, 명시 설정(SUPABASE_LOCAL / 클라우드 URL)은 probe 없음
+  ③ 헬스 모니터 — auto 프로필 연속 실패 시 재해결(로컬 → cloud_fallback), 명시 프로필은 상태만 기록
+  ④ connection_status / ConnectionProfile — 키 비노출, 공통 헤더
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_supabase_config -v
+"""
+
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from core import db
+
+_AUTO_ENV = {"SUPABASE_LOCAL": "", "SUPABASE_URL": "", "SUPABASE_SERVICE_ROLE_KEY": "cloud-key"}
+_CLOUD_ENV = {"SUPABASE_LOCAL": "", "SUPABASE_URL": "https://x.supabase.co",
+              "SUPABASE_SERVICE_ROLE_KEY": "cloud-key"}
+
+
+def _ok():
+    return MagicMock(status_code=200)
+
+
+class _Base(unittest.TestCase):
+    def setUp(self):
+        db.reset_connection_profile()
+        self.addCleanup(db.reset_connection_profile)
+        health = patch.object(db, "_health", {"healthy": None, "checked_at": None, "latency_ms": None,
+                                              "failures": 0, "resolutions": 0, "error": None})
+        health.start()
+        self.addCleanup(health.stop)
+
+
+class TestProfileCache(_Base):
+    def test_probe_once(self):
+        with patch.dict(os.environ, _AUTO_ENV), \
+             patch.object(db.httpx, "get", return_value=_ok()) as get:
+            for _ in range(5):
+                self.assertEqual(db._get_supabase_config(), (db._LOCAL_URL, db._LOCAL_SERVICE_KEY))
+            self.assertEqual(db.get_connection_profile().mode, "local")
+        self.assertEqual(get.call_count, 1)
+
+    def test_env_change_resolves_again(self):
+        with patch.object(db.httpx, "get", side_effect=httpx.ConnectError("down")) as get:
+            with patch.dict(os.environ, _AUTO_ENV):
+                self.assertEqual(db.get_connection_profile().mode, "cloud_fallback")
+            with patch.dict(os.environ, _CLOUD_ENV):
+                profile = db.get_connection_profile()
+        self.assertEqual((profile.mode, profile.url), ("cloud", "https://x.supabase.co"))
+        self.assertEqual(get.call_count, 1)  # 명시 클라우드 URL은 probe 없음
+
+    def test_explicit_settings_skip_probe(self):
+        with patch.object(db.httpx, "get") as get:
+            with patch.dict(os.environ, {**_AUTO_ENV, "SUPABASE_LOCAL": "1"}):
+                self.assertEqual(db.get_connection_profile().mode, "local_forced")
+            with patch.dict(os.environ, {**_CLOUD_ENV, "SUPABASE_SERVICE_ROLE_KEY": ""}):
+                with self.assertRaises(ValueError):
+                    db.get_connection_profile()
+        get.assert_not_called()
+
+
+class TestHealthMonitor(_Base):
+    def test_auto_profile_re_resolved_after_failures(self):
+        responses = [_ok()]  # 최초 해결: 로컬 probe 성공, 이후 전부 연결 실패
+
+        def _get(*args, **kwargs):
+            if responses:
+                return responses.pop(0)
+            raise httpx.ConnectError("down")
+
+        with patch.dict(os.environ, _AUTO_ENV), patch.object(db.httpx, "get", side_effect=_get):
+            self.assertEqual(db.get_connection_profile().mode, "local")
+            db._monitor_tick()  # 실패 1회 — 유지
+            self.assertEqual(db.get_connection_profile().mode, "local")
+            db._monitor_tick()  # 실패 2회 — 재해결
+            self.assertEqual(db.get_connection_profile().mode, "cloud_fallback")
+        status = db.connection_status()
+        self.assertFalse(status["healthy"])
+        self.assertEqual(status["resolutions"], 2)
+
+    def test_explicit_profile_only_records(self):
+        with patch.dict(os.environ, _CLOUD_ENV), \
+             patch.object(db.httpx, "get", return_value=MagicMock(status_code=503)):
+            first = db.get_connection_profile()
+            for _ in range(3):
+                db._monitor_tick()
+            self.assertIs(db.get_connection_profile(), first)
+        status = db.connection_status()
+        self.assertEqual((status["failures"], status["error"]), (3, "HTTP 503"))
+
+    def test_disabled_interval(self):
+        self.assertIsNone(db.start_health_monitor(0))
+
+
+class TestProfileApi(_Base):
+    def test_status_hides_key_and_headers(self):
+        with patch.dict(os.environ, _CLOUD_ENV):
+            profile = db.get_connection_profile()
+        self.assertNotIn("cloud-key", repr(profile))
+        self.assertNotIn("cloud-key", repr(db.connection_status()))
+        self.assertEqual(profile.headers(Prefer="return=minimal")["Authorization"], "Bearer cloud-key")
+        self.assertFalse(profile.auto)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,25 @@
 """Wave 1.1 · T0 단위 테스트 (DB·API 불요).
 
 대상:
-  ① phase1_forensic payload 10키 존재 + 타입 일치
+  ① phase1_forensic payload 11키 존재 + 타입 일치 (structured_output 모드 비교 포함)
   ② 탐지 0건 시나리오에서도 article_context 계산 + payload 조립
   ③ _parse_solo_response의 fallback_used: 1차 성공 False / 2차 경로 True
   ④ 포렌식 조립 실패가 파이프라인 결과를 막지 않음 (예외 격리)
+  ⑤ 진단 레코드 — 큐 등록 시점 스냅샷으로 조립 (반환 후 result 수정이 레코드에 반영되지 않음)
+
+진단 싱크는 임시 디렉터리로 바꿔 끼운다 (저장소 backend/diagnostics/에 쓰지 않음).
 
 실행: backend/ 디렉터리에서  python3 -m unittest test_t0_forensic -v
 패턴 코드는 실제 데이터와 무관한 합성값(9-9-*)만 사용한다.
 """
 
+import tempfile
+import threading
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
-from core import pipeline
+from core import diagnostics, pipeline
 from core.pattern_matcher import (
     PatternMatchResult,
     VectorCandidate,
@@ -34,9 +40,26 @@ _FORENSIC_KEYS = {
     "article_context",
     "fallback_used",
     "phase1_model",
+    "structured_output",
 }
 
 
+_diag_tmp = tempfile.TemporaryDirectory()
+_diag_patch = patch.object(
+    diagnostics, "_sink", diagnostics.DiagnosticsSink(_diag_tmp.name, sample_rate=1.0),
+)
+
+
+def setUpModule():
+    _diag_patch.start()
+
+
+def tearDownModule():
+    diagnostics._sink.flush()
+    _diag_patch.stop()
+    _diag_tmp.cleanup()
+
+
 def _make_pm(
     detections=None,
     validated_ids=None,
@@ -59,7 +82,7 @@ def _make_pm(
 
 
 class TestForensicPayloadSchema(unittest.TestCase):
-    """① 10키 존재 + 타입 일치."""
+    """① 11키 존재 + 타입 일치."""
 
     def test_ten_keys_and_types(self):
         pm = _make_pm(
@@ -179,5 +202,40 @@ class TestForensicExceptionIsolation(unittest.TestCase):
         self.assertIn("발견되지 않았습니다", result.report_result.reports["comprehensive"])
 
 
+class TestDiagnosticSnapshot(unittest.TestCase):
+    """⑤ writer 스레드가 늦게 돌아도 레코드는 반환 시점 값."""
+
+    def test_mutation_after_return_not_recorded(self):
+        sink = diagnostics._sink
+        self.assertEqual(Path(sink.directory), Path(_diag_tmp.name))
+        gate = threading.Event()
+        sink.submit(lambda: gate.wait(5) and {"blocker": True})  # writer를 붙잡아 둠
+        pm = _make_pm(
+            detections=[HaikuDetection("9-9-a", "발췌", "high", "근거")],
+            validated_ids=[999],
+            validated_codes=["9-9-a"],
+        )
+        with patch.object(pipeline, "match_patterns_solo", return_value=pm):
+            result = pipeline.analyze_article("일반 기사 본문", run_sonnet=False)
+        result.pattern_result.haiku_detections.clear()
+        result.pattern_result.validated_pattern_codes.append("9-9-z")
+        result.chunks.clear()
+        gate.set()
+        self.assertTrue(sink.flush())
+
+        records = [
+            r for p in diagnostics.iter_diagnostic_files(sink.directory)
+            for r in diagnostics.read_diagnostics(p) if "checkpoint_3_pattern" in r
+        ]
+        cp3 = records[-1]["checkpoint_3_pattern"]
+        self.assertEqual([d["pattern_code"] for d in cp3["haiku_detections"]], ["9-9-a"])
+        self.assertEqual(cp3["validated_pattern_codes"], ["9-9-a"])
+        self.assertGreater(records[-1]["checkpoint_1_chunks"]["chunk_count"], 0)
+        self.assertEqual(
+            len(records[-1]["checkpoint_1_chunks"]["chunks_preview"]),
+            records[-1]["checkpoint_1_chunks"]["chunk_count"],
+        )
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,137 @@
+"""core.tracing 단위 테스트 (네트워크·API·DB 불요).
+
+대상:
+  ① 비활성(기본) — span은 no-op 객체, bind·trace_methods는 원본 그대로
+  ② 활성 + opentelemetry 미설치 — setup_tracing 경고 후 False, 계측 지점은 계속 no-op
+  ③ 속성 정리 — None 제거·비원시값 문자열화, 모킹된 usage(비 int)는 기록 안 함
+  ④ 예외 전파 — span 안의 예외는 삼키지 않음 (generate_report 재시도 분기 유지)
+  ⑤ (SDK 설치 시에만) InMemorySpanExporter — 루트 span 아래 자식, bind로 스레드 경계 통과
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_tracing -v
+"""
+
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core import tracing
+
+
+class _Recorder:
+    def __init__(self):
+        self.attributes = {}
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+
+class TestDisabled(unittest.TestCase):
+    def test_span_is_noop(self):
+        with patch.object(tracing, "TRACING_ENABLED", False):
+            with tracing.span("x", {"a": 1}) as sp:
+                self.assertIs(sp, tracing._NOOP_SPAN)
+                tracing.set_attributes(sp, {"b": 2})
+
+    def test_bind_and_trace_methods_untouched(self):
+        class Dummy:
+            def _scrape_x(self):
+                return 1
+
+        original = Dummy.__dict__["_scrape_x"]
+
+        def fn():
+            return 1
+
+        with patch.object(tracing, "TRACING_ENABLED", False):
+            self.assertIs(tracing.bind(fn), fn)
+            tracing.trace_methods(Dummy, "_scrape_", "scraper")
+        self.assertIs(Dummy.__dict__["_scrape_x"], original)
+
+    def test_exception_propagates(self):
+        with patch.object(tracing, "TRACING_ENABLED", False):
+            with self.assertRaises(KeyError):
+                with tracing.span("x"):
+                    raise KeyError("k")
+
+    def test_traced_keeps_return_and_name(self):
+        @tracing.traced("t")
+        def add(a, b):
+            return a + b
+
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(add.__name__, "add")
+
+
+@unittest.skipUnless(tracing._otel_trace is None, "opentelemetry 설치 환경")
+class TestEnabledWithoutSdk(unittest.TestCase):
+    def test_setup_returns_false(self):
+        with patch.object(tracing, "TRACING_ENABLED", True), \
+             patch.object(tracing, "_setup_done", False), \
+             patch.object(tracing, "_tracer", None):
+            with self.assertLogs(tracing.logger, level="WARNING"):
+                with tracing.span("x") as sp:
+                    self.assertIs(sp, tracing._NOOP_SPAN)
+            self.assertFalse(tracing.setup_tracing())
+
+
+class TestAttributes(unittest.TestCase):
+    def test_clean(self):
+        self.assertEqual(
+            tracing._clean({"a": None, "b": 1, "c": True, "d": [1], "e": "s", "f": 0.5}),
+            {"b": 1, "c": True, "d": "[1]", "e": "s", "f": 0.5},
+        )
+
+    def test_record_llm_usage_ints_only(self):
+        rec = _Recorder()
+        usage = SimpleNamespace(input_tokens=120, output_tokens=object(), cache_read_input_tokens=None)
+        tracing.record_llm_usage(rec, SimpleNamespace(usage=usage))
+        self.assertEqual(rec.attributes, {"gen_ai.usage.input_tokens": 120})
+
+        rec = _Recorder()
+        tracing.record_llm_usage(rec, SimpleNamespace())  # usage 없음
+        self.assertEqual(rec.attributes, {})
+
+
+@unittest.skipUnless(tracing._otel_trace is not None, "opentelemetry 미설치")
+class TestWithSdk(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        cls.exporter = InMemorySpanExporter()
+        cls._patches = [
+            patch.object(tracing, "TRACING_ENABLED", True),
+            patch.object(tracing, "_setup_done", False),
+            patch.object(tracing, "_tracer", None),
+        ]
+        for p in cls._patches:
+            p.start()
+        tracing.setup_tracing(exporter=cls.exporter)
+
+    @classmethod
+    def tearDownClass(cls):
+        for p in reversed(cls._patches):
+            p.stop()
+
+    def setUp(self):
+        self.exporter.clear()
+
+    def test_child_across_thread(self):
+        def rpc():
+            with tracing.span("rpc.search_pattern_candidates"):
+                pass
+
+        with tracing.span("analyze", {"url.full": "https://example.com/a"}):
+            t = threading.Thread(target=tracing.bind(rpc))
+            t.start()
+            t.join()
+        spans = {s.name: s for s in self.exporter.get_finished_spans()}
+        root, child = spans["analyze"], spans["rpc.search_pattern_candidates"]
+        self.assertIsNone(root.parent)
+        self.assertEqual(child.parent.span_id, root.context.span_id)
+        self.assertEqual(root.attributes["url.full"], "https://example.com/a")
+
+
+if __name__ == "__main__":
+    unittest.main()
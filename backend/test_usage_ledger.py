@@ -0,0 +1,186 @@
+"""요청별 사용량·비용 원장 (core.usage) 단위 테스트 (네트워크·API·DB 불요).
+
+대상:
+  ① UsageLedger — 캐시 읽기·쓰기 토큰 분리, 모델별 추정 비용, 가격표 밖 모델(cost None),
+     단계별 합계·retries, 모킹된 usage(비 int) 무시
+  ② generate_report — 529 실패·파싱 실패 시도까지 phase2 호출로 누적, 외부 원장 주입 시 최종 실패에도 보존
+  ③ storage._build_result_record — usage_ledger JSONB 값 (원장이 비면 None)
+     레거시 저장 — 컬럼 없는 DB(PGRST204)면 원장을 빼고 같은 share_id로 재시도, 이후 INSERT는 처음부터 제외
+  ④ 마이그레이션 20261019000500 — 컬럼·save_analysis INSERT·롤업 뷰 권한·사후 검증
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_usage_ledger -v
+"""
+
+import json
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import anthropic
+import httpx
+
+from core import report_generator, storage
+from core.pipeline import AnalysisResult
+from core.usage import UsageLedger, estimate_cost
+
+_MIGRATION = (
+    Path(__file__).resolve().parent.parent
+    / "supabase" / "migrations" / "20261019000500_analysis_usage_ledger.sql"
+)
+_REPORTS = {"reports": {"comprehensive": "c", "journalist": "j", "student": "s"}}
+_SONNET = report_generator.SONNET_MODEL
+
+
+def _usage(inp, out, cache_read=0, cache_write=0):
+    return SimpleNamespace(
+        input_tokens=inp, output_tokens=out,
+        cache_read_input_tokens=cache_read, cache_creation_input_tokens=cache_write,
+    )
+
+
+def _status_error(code: int) -> anthropic.APIStatusError:
+    response = httpx.Response(code, request=httpx.Request("POST", "http://api/v1/messages"))
+    return anthropic.APIStatusError("overloaded", response=response, body=None)
+
+
+class TestLedger(unittest.TestCase):
+    def test_cache_tokens_and_cost(self):
+        ledger = UsageLedger()
+        entry = ledger.record("phase2", "claude-sonnet-4-6", _usage(1000, 500, 2000, 4000))
+        # 1000*3 + 500*15 + 2000*0.3 + 4000*3.75 = 26100 / 1M
+        self.assertAlmostEqual(entry["cost_usd"], 0.0261)
+        self.assertEqual(entry["cache_read_input_tokens"], 2000)
+        self.assertEqual(entry["cache_creation_input_tokens"], 4000)
+
+    def test_totals_retries_and_unpriced(self):
+        ledger = UsageLedger()
+        ledger.record("embedding", "text-embedding-3-small", input_tokens=50_000)
+        ledger.record("phase2", _SONNET, outcome="status_529")
+        ledger.record("phase2", _SONNET, _usage(10, 5))
+        ledger.mark(2, "parse")
+        ledger.record("phase2", _SONNET, _usage(100, 20))
+        ledger.record("phase1", "9-9-unknown-model", _usage(7, 3))
+        ledger.shape = {"article_chars": 1200}
+        data = ledger.to_json()
+        self.assertEqual(data["version"], "usage_v1")
+        self.assertEqual([c["outcome"] for c in data["calls"]],
+                         ["ok", "status_529", "parse", "ok", "ok"])
+        self.assertEqual(data["by_phase"]["phase2"]["calls"], 3)
+        self.assertEqual(data["by_phase"]["phase2"]["failed_calls"], 2)
+        totals = data["totals"]
+        self.assertEqual((totals["calls"], totals["retries"], totals["unpriced_calls"]), (5, 2, 1))
+        self.assertEqual(totals["input_tokens"], 50_000 + 10 + 100 + 7)
+        self.assertAlmostEqual(
+            totals["cost_usd"],
+            0.001 + estimate_cost(_SONNET, {"input_tokens": 110, "output_tokens": 25}),
+        )
+        self.assertEqual(data["shape"], {"article_chars": 1200})
+        json.dumps(data)  # JSONB 직렬화 가능
+
+    def test_mocked_usage_ignored(self):
+        entry = UsageLedger().record("phase1", _SONNET, MagicMock())
+        self.assertEqual(entry["input_tokens"], 0)
+        self.assertEqual(entry["cost_usd"], 0.0)
+
+
+class TestGenerateReportLedger(unittest.TestCase):
+    def _run(self, outputs, usage=None):
+        def _call(*a, ledger=None, **k):
+            item = next(outputs)
+            if isinstance(item, Exception):
+                raise item
+            raw, inp, out = item
+            ledger.record("phase2", _SONNET, _usage(inp, out, cache_read=1000))
+            return raw, inp, out
+
+        with patch.object(report_generator, "_get_supabase_config", return_value=("http://sb", "k")), \
+             patch.object(report_generator, "fetch_ethics_for_patterns", return_value=[]), \
+             patch.object(report_generator, "call_sonnet", side_effect=_call), \
+             patch.object(report_generator.time, "sleep"):
+            return report_generator.generate_report("본문", [1], [], usage=usage)
+
+    def test_retries_recorded(self):
+        rr = self._run(iter([
+            _status_error(529),
+            ('{"reports": {"comprehensive": "a"}}', 10, 1),
+            (json.dumps(_REPORTS), 100, 20),
+        ]))
+        outcomes = [c["outcome"] for c in rr.usage.calls]
+        self.assertEqual(outcomes, ["status_529", "parse", "ok"])
+        totals = rr.usage.to_json()["totals"]
+        self.assertEqual((totals["input_tokens"], totals["cache_read_input_tokens"]), (110, 2000))
+
+    def test_external_ledger_survives_final_failure(self):
+        ledger = UsageLedger()
+        with self.assertRaises(ValueError):
+            self._run(iter([('{"x": 1}', 5, 1)] * 5), usage=ledger)
+        self.assertEqual(len(ledger), 5)
+        self.assertTrue(all(c["outcome"] == "parse" for c in ledger.calls))
+
+
+class TestStorageRecord(unittest.TestCase):
+    def test_usage_ledger_in_record(self):
+        result = AnalysisResult()
+        self.assertIsNone(storage._build_result_record(result, None, None)["usage_ledger"])
+        result.usage.record("phase1", _SONNET, _usage(10, 2))
+        record = storage._build_result_record(result, None, None)
+        self.assertEqual(record["usage_ledger"]["totals"]["calls"], 1)
+
+    def test_legacy_insert_without_column(self):
+        missing = httpx.Response(
+            400, text='{"code":"PGRST204","message":"Could not find the \'usage_ledger\' column"}',
+            request=httpx.Request("POST", "http://sb/rest/v1/analysis_results"),
+        )
+        inserts = []
+
+        def fake_post(url, **kwargs):
+            request = httpx.Request("POST", url)
+            if url.endswith("/articles"):
+                return httpx.Response(201, json=[{"id": 7}], request=request)
+            inserts.append(dict(kwargs["json"]))
+            if "usage_ledger" in kwargs["json"]:
+                return missing
+            return httpx.Response(201, json=[{"id": 70}], request=request)
+
+        payload = {
+            "share_id": "client12345x",
+            "article": {"url": "https://news.example.com/a", "title": "제목"},
+            "result": {"comprehensive_report": "c", "usage_ledger": {"totals": {"calls": 1}}},
+            "snapshots": [],
+        }
+        with patch.object(storage, "_usage_ledger_column", None), \
+             patch.object(storage.httpx, "post", side_effect=fake_post):
+            self.assertEqual(storage._save_analysis_legacy("http://sb", {}, payload), "client12345x")
+            self.assertFalse(storage._usage_ledger_column)
+            self.assertEqual(storage._save_analysis_legacy("http://sb", {}, payload), "client12345x")
+        self.assertEqual(["usage_ledger" in r for r in inserts], [True, False, False])
+        self.assertEqual({r["share_id"] for r in inserts}, {"client12345x"})
+        self.assertIn("usage_ledger", payload["result"])  # 스풀 payload는 그대로
+
+
+class TestMigrationContract(unittest.TestCase):
+    def setUp(self):
+        sql = _MIGRATION.read_text(encoding="utf-8")
+        self.body = "\n".join(ln for ln in sql.splitlines() if not ln.lstrip().startswith("--"))
+
+    def test_column_and_save_analysis(self):
+        self.assertIn("ADD COLUMN IF NOT EXISTS usage_ledger JSONB", self.body)
+        self.assertIn("nullif(v_result->'usage_ledger', 'null'::jsonb)", self.body)
+        self.assertIn("SET search_path = public, pg_temp", self.body)
+        self.assertIn("GRANT EXECUTE ON FUNCTION public.save_analysis(jsonb) TO service_role;", self.body)
+
+    def test_rollup_view_private(self):
+        self.assertIn("CREATE OR REPLACE VIEW public.analysis_usage_rollup", self.body)
+        self.assertIn("WITH (security_invoker = on)", self.body)
+        self.assertIn("REVOKE ALL ON public.analysis_usage_rollup FROM anon, authenticated;", self.body)
+        self.assertIn("GROUP BY publisher, article_context, length_bucket", self.body)
+
+    def test_verification_in_transaction(self):
+        begin, commit = self.body.index("BEGIN;"), self.body.index("COMMIT;")
+        self.assertTrue(begin < self.body.index("DO $$") < commit)
+        self.assertIn("NOTIFY pgrst, 'reload schema';", self.body[commit:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""기동 워밍업 (core.warmup · core.clients) 단위 테스트 (네트워크·API·DB 불요).
+
+대상:
+  ① run_warmup — 클라이언트·config 동시 시작, config 후 카탈로그·프롬프트 병렬, 전부 성공 시 ready
+  ② 실패 단계 — degraded + 오류 노출, config 실패 시 의존 단계 생략
+  ③ GET /health — 워밍업 전 503 "warming", 완료 후 200 + 단계별 결과
+  ④ get_client — (클래스, 키)별 1회 생성, patch된 클래스는 별도 인스턴스
+  ⑤ _build_sonnet_solo_prompt — 혼동 쌍 캐시가 같으면 재빌드 생략, 조회 실패(미캐시)면 매번 재빌드
+
+실행: backend/ 디렉터리에서  python3 -m unittest test_warmup -v
+"""
+
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from core import clients, pattern_matcher, warmup
+from core.warmup import WarmupState, run_warmup
+
+_ENV = {"ANTHROPIC_API_KEY": "test-a", "OPENAI_API_KEY": "test-o"}
+
+
+class TestRunWarmup(unittest.TestCase):
+    def setUp(self):
+        clients.reset_clients()
+        self.addCleanup(clients.reset_clients)
+
+    def _run(self, config=("http://sb", "k"), catalog=None, pairs_cached=True):
+        barrier = threading.Barrier(2, timeout=2)
+
+        def _catalog(url, key):
+            barrier.wait()  # 프롬프트 단계와 동시에 실행돼야 통과
+            if isinstance(catalog, Exception):
+                raise catalog
+            return []
+
+        def _prompt(url, key):
+            barrier.wait()
+            if pairs_cached:
+                pattern_matcher._confusion_pairs_cache = []
+            return "prompt"
+
+        config_mock = MagicMock(side_effect=config) if isinstance(config, Exception) \
+            else MagicMock(return_value=config)
+        state = WarmupState()
+        with patch.dict(os.environ, _ENV), \
+             patch("core.db._get_supabase_config", config_mock), \
+             patch("anthropic.Anthropic", MagicMock()), \
+             patch("openai.OpenAI", MagicMock()), \
+             patch.object(pattern_matcher, "_load_pattern_catalog", side_effect=_catalog), \
+             patch.object(pattern_matcher, "_build_sonnet_solo_prompt", side_effect=_prompt), \
+             patch.object(pattern_matcher, "_confusion_pairs_cache", None):
+            return run_warmup(state), state
+
+    def test_ready(self):
+        snapshot, state = self._run()
+        self.assertEqual(snapshot["status"], "ready")
+        self.assertTrue(state.ready and state.wait(0))
+        self.assertEqual(
+            set(snapshot["steps"]),
+            {"supabase_config", "pattern_catalog", "solo_prompt", "anthropic_client", "openai_client"},
+        )
+        self.assertTrue(all(s["ok"] for s in snapshot["steps"].values()))
+
+    def test_failed_step_degraded(self):
+        snapshot, state = self._run(catalog=RuntimeError("db down"), pairs_cached=False)
+        self.assertEqual(snapshot["status"], "degraded")
+        self.assertTrue(state.ready)
+        self.assertIn("db down", snapshot["steps"]["pattern_catalog"]["error"])
+        self.assertFalse(snapshot["steps"]["solo_prompt"]["ok"])
+
+    def test_config_failure_skips_dependents(self):
+        snapshot, _ = self._run(config=ValueError("no key"))
+        self.assertEqual(snapshot["status"], "degraded")
+        self.assertNotIn("pattern_catalog", snapshot["steps"])
+        self.assertTrue(snapshot["steps"]["anthropic_client"]["ok"])
+
+
+class TestHealth(unittest.TestCase):
+    def test_health_gated_on_warmup(self):
+        from fastapi.testclient import TestClient
+        import main
+
+        state = WarmupState()
+        with patch.object(main, "get_warmup_state", return_value=state):
+            client = TestClient(main.app)
+            r = client.get("/health")
+            self.assertEqual(r.status_code, 503)
+            self.assertEqual(r.json()["status"], "warming")
+            state.mark_ready()
+            r = client.get("/health")
+            self.assertEqual(r.status_code, 200)
+            self.assertEqual(r.json()["warmup"]["status"], "ready")
+
+    def test_disabled_marks_ready(self):
+        state = WarmupState()
+        with patch.object(warmup, "WARMUP_ENABLED", False):
+            self.assertIsNone(warmup.start_warmup(state))
+        self.assertTrue(state.ready)
+
+
+class TestClients(unittest.TestCase):
+    def setUp(self):
+        clients.reset_clients()
+        self.addCleanup(clients.reset_clients)
+
+    def test_cached_per_class_and_key(self):
+        cls_a, cls_b = MagicMock(), MagicMock()
+        with patch.dict(os.environ, _ENV):
+            first = clients.get_client(cls_a, "ANTHROPIC_API_KEY")
+            self.assertIs(clients.get_client(cls_a, "ANTHROPIC_API_KEY"), first)
+            self.assertIsNot(clients.get_client(cls_b, "ANTHROPIC_API_KEY"), first)
+        cls_a.assert_called_once_with(api_key="test-a")
+
+
+class TestSoloPromptMemo(unittest.TestCase):
+    def test_rebuild_only_on_new_pairs(self):
+        pairs = [{"code_a": "9-9-a", "code_b": "9-9-b", "distinction_guide": "g"}]
+        with patch.object(pattern_matcher, "_confusion_pairs_cache", pairs), \
+             patch.object(pattern_matcher, "_solo_prompt_cache", None):
+            first = pattern_matcher._build_sonnet_solo_prompt("http://sb", "k")
+            self.assertIn("9-9-a vs 9-9-b: g", first)
+            self.assertIs(pattern_matcher._build_sonnet_solo_prompt("http://sb", "k"), first)
+
+    def test_uncached_failure_rebuilds(self):
+        with patch.object(pattern_matcher, "_confusion_pairs_cache", None), \
+             patch.object(pattern_matcher, "_solo_prompt_cache", None), \
+             patch.object(pattern_matcher, "_load_confusion_pairs", return_value=[]):
+            pattern_matcher._build_sonnet_solo_prompt("http://sb", "k")
+            self.assertIsNone(pattern_matcher._solo_prompt_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+오프라인 녹화/재생 벤치마크 — 네트워크 없이 결정론적으로 재실행.
+
+--record: 실제 API(임베딩·Supabase·Anthropic)로 골든 케이스를 한 번 돌리며
+          케이스마다 cassette(JSON)에 HTTP 응답을 기록한다.
+--replay: cassette만으로 같은 케이스를 재실행 (기본값). 외부 호출 0건,
+          재시도 대기(time.sleep) 생략 — 측정되는 것은 순수 CPU 단계뿐이다.
+
+단계별 wall·CPU·할당(tracemalloc):
+  chunking · catalog · star_marking · parsing · validation ·
+  ethics_context · citation_audit · diagnostics
+
+케이스마다 패턴 카탈로그/혼동 쌍 캐시를 비우고 규범 캐시를 끄므로 cassette는
+자기완결적이다 (케이스 순서·부분 실행과 무관하게 재생 가능).
+진단 레코드는 빌드만 하고 파일로 쓰지 않는다.
+
+사용법:
+  SUPABASE_LOCAL=1 python scripts/benchmark_offline.py --record --ids B-11 A-06
+  python scripts/benchmark_offline.py --ids B-11 A-06 --repeat 5
+  python scripts/benchmark_offline.py --json /tmp/offline.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+# 재생 모드: 규범 캐시 백그라운드 갱신·진단 writer 스레드가 cassette 밖에서 돌지 않게
+# 모듈 import 전에 끈다 (ethics_cache는 import 시 ETHICS_CACHE를 읽음)
+os.environ["ETHICS_CACHE"] = "0"
+os.environ.setdefault("DIAGNOSTICS_SAMPLE_RATE", "0")
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_pipeline_v3 import (  # noqa: E402
+    ARTICLE_TEXTS_DIR,
+    get_expected,
+    load_golden_dataset,
+    load_labels,
+)
+from core import ethics_index, pattern_matcher, pipeline, report_generator  # noqa: E402
+from core.replay import MODE_RECORD, MODE_REPLAY, Cassette, StageProfiler  # noqa: E402
+
+CASSETTE_DIR = Path(__file__).parent.parent / "docs" / "benchmark_cassettes"
+
+# (소유 객체, 속성, 단계) — pipeline/pattern_matcher가 모듈 전역 이름으로 호출하는 지점
+STAGES = [
+    (pipeline, "chunk_article", "chunking"),
+    (pattern_matcher, "_build_pattern_list_text", "catalog"),
+    (pattern_matcher, "_apply_star_marks", "star_marking"),
+    (pattern_matcher, "_parse_solo_response", "parsing"),
+    (report_generator, "_parse_report_output", "parsing"),
+    (pattern_matcher, "validate_runtime_pattern_codes", "validation"),
+    (ethics_index.EthicsContextIndex, "__init__", "ethics_context"),
+    (ethics_index.EthicsContextIndex, "context_text", "ethics_context"),
+    (pipeline, "verify_report_citations", "citation_audit"),
+    (pipeline, "_build_diagnostic_record", "diagnostics"),
+]
+
+
+def _load_article(c: dict) -> str:
+    article_file = ARTICLE_TEXTS_DIR / f"{c['candidate_id']}_article.txt"
+    if article_file.exists():
+        return article_file.read_text(encoding="utf-8").strip()
+    return c.get("article_key_text", "")
+
+
+def _reset_caches() -> None:
+    pattern_matcher._pattern_catalog_cache = None
+    pattern_matcher._confusion_pairs_cache = None
+
+
+def _inline_diagnostic(builder):
+    """진단 레코드를 요청 스레드에서 빌드만 한다 (diagnostics 단계 측정, 파일 기록 없음)."""
+    builder()
+    return None
+
+
+def _replay_env(meta: dict) -> dict:
+    """재생용 환경 — 녹화 당시 Supabase URL을 그대로 쓰되 키는 더미."""
+    env = {
+        "OPENAI_API_KEY": "replay",
+        "ANTHROPIC_API_KEY": "replay",
+        "SUPABASE_SERVICE_ROLE_KEY": "replay",
+    }
+    sb_url = meta.get("supabase_url", "")
+    if "127.0.0.1" in sb_url or "localhost" in sb_url:
+        env["SUPABASE_LOCAL"] = "1"
+    else:
+        env["SUPABASE_URL"] = sb_url
+    return env
+
+
+def run_case(c: dict, mode: str, cassette_dir: Path) -> dict:
+    cid = c["candidate_id"]
+    path = cassette_dir / f"{cid}.json"
+    article_text = _load_article(c)
+    if not article_text:
+        return {"candidate_id": cid, "skipped": "기사 텍스트 없음"}
+    if mode == MODE_REPLAY and not path.exists():
+        return {"candidate_id": cid, "skipped": f"cassette 없음: {path.name}"}
+
+    meta = {}
+    if mode == MODE_RECORD:
+        meta = {"candidate_id": cid, "supabase_url": pipeline._get_supabase_config()[0],
+                "recorded_on": date.today().isoformat()}
+    cassette = Cassette(path, mode, meta=meta)
+
+    _reset_caches()
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(pipeline, "record_diagnostic", _inline_diagnostic))
+        if mode == MODE_REPLAY:
+            stack.enter_context(mock.patch.dict(os.environ, _replay_env(cassette.meta)))
+            stack.enter_context(mock.patch("time.sleep", lambda _s: None))
+        stack.enter_context(cassette.activate())
+        start = time.perf_counter()
+        result = pipeline.analyze_article(article_text, run_sonnet=True)
+        seconds = time.perf_counter() - start
+
+    pm = result.pattern_result
+    return {
+        "candidate_id": cid,
+        "seconds": round(seconds, 4),
+        "validated_codes": sorted(pm.validated_pattern_codes),
+        "expected": c.get("_expected", []),
+        "cassette": dict(cassette.stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 녹화/재생 벤치마크")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true", help="실제 API로 실행하며 cassette 기록")
+    mode.add_argument("--replay", action="store_true", help="cassette만으로 재실행 (기본)")
+    parser.add_argument("--ids", nargs="*", default=None)
+    parser.add_argument("--cassette-dir", type=Path, default=CASSETTE_DIR)
+    parser.add_argument("--repeat", type=int, default=1, help="재생 반복 횟수 (record는 1회 고정)")
+    parser.add_argument("--json", type=Path, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--no-alloc", action="store_true", help="tracemalloc 비활성 (wall/CPU 오버헤드 제거)")
+    args = parser.parse_args()
+
+    run_mode = MODE_RECORD if args.record else MODE_REPLAY
+    repeat = 1 if run_mode == MODE_RECORD else max(args.repeat, 1)
+
+    gd = load_golden_dataset()
+    labels = load_labels()
+    candidates = gd["candidates"]
+    if args.ids:
+        candidates = [c for c in candidates if c["candidate_id"] in args.ids]
+    for c in candidates:
+        c["_expected"] = get_expected(labels, c["candidate_id"])
+
+    print("=" * 60)
+    print(f"오프라인 벤치마크 — {run_mode} ({len(candidates)}건 × {repeat}회)")
+    print("=" * 60)
+
+    cases: list[dict] = []
+    failed = 0
+    with StageProfiler(trace_alloc=not args.no_alloc) as profiler:
+        for owner, attr, stage in STAGES:
+            profiler.instrument(owner, attr, stage)
+        for rnd in range(repeat):
+            for c in candidates:
+                try:
+                    case = run_case(c, run_mode, args.cassette_dir)
+                except Exception as e:
+                    case = {"candidate_id": c["candidate_id"], "error": f"{type(e).__name__}: {e}"}
+                case["round"] = rnd + 1
+                misses = case.get("cassette", {}).get("misses", 0)
+                if "error" in case or misses:
+                    failed += 1
+                cases.append(case)
+                status = case.get("skipped") or case.get("error") or (
+                    f"{case['seconds']:.3f}s  {case['cassette']}"
+                )
+                print(f"  [{c['candidate_id']}] #{rnd + 1} {status}")
+        stages = profiler.summary()
+
+    print("\n단계별 누적:")
+    print(f"  {'stage':<16}{'calls':>7}{'wall_ms':>12}{'cpu_ms':>12}{'peak_kb':>11}{'net_kb':>11}")
+    for name, s in stages.items():
+        print(f"  {name:<16}{s['calls']:>7}{s['wall_ms']:>12.2f}{s['cpu_ms']:>12.2f}"
+              f"{s['alloc_peak_kb']:>11.1f}{s['alloc_net_kb']:>11.1f}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(
+            {"mode": run_mode, "repeat": repeat, "stages": stages, "cases": cases},
+            ensure_ascii=False, indent=2,
+        ), encoding="utf-8")
+        print(f"\n결과 저장: {args.json}")
+
+    if failed:
+        print(f"\n실패 {failed}건 (오류 또는 cassette 미스)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
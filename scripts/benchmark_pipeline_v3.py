@@ -17,13 +17,24 @@ Legacy 지표 (--legacy 모드에서만 표시):
   SUPABASE_LOCAL=1 python scripts/benchmark_pipeline_v3.py
   SUPABASE_LOCAL=1 python scripts/benchmark_pipeline_v3.py --ids B-11 A-06 E-11
   SUPABASE_LOCAL=1 python scripts/benchmark_pipeline_v3.py --legacy  # 2-Call 출력 형식
+  SUPABASE_LOCAL=1 python scripts/benchmark_pipeline_v3.py --concurrency 4 --rate 2
+  SUPABASE_LOCAL=1 python scripts/benchmark_pipeline_v3.py --compare docs/M6_BENCHMARK_RESULTS.base.json
+
+동시 실행 (--concurrency N):
+  케이스를 N개 워커 풀에서 실행하되, 케이스 시작은 --rate(건/초, 기본 1 — 기존 1초 간격)로
+  제한한다. 파이프라인이 기록한 단계별 소요 시간(AnalysisResult.stage_seconds)의
+  p50/p90/p99와 처리량(건/분)을 출력하고, 커밋 간 diff 가능한 JSON
+  (--results-json, 키 정렬)을 남긴다. --compare로 이전 JSON 대비 분위수 변화를 본다.
 """
 
 import argparse
 import json
 import logging
+import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import date
@@ -39,6 +50,11 @@ from core.pipeline import analyze_article
 logger = logging.getLogger(__name__)
 
 ARTICLE_TEXTS_DIR = Path(__file__).parent.parent.parent / "Golden_Data_Set_Pool" / "article_texts"
+RESULTS_JSON_PATH = Path(__file__).parent.parent / "docs" / "M6_BENCHMARK_RESULTS.json"
+RESULTS_SCHEMA_VERSION = 1
+PERCENTILES = (50, 90, 99)
+# --compare: 이 비율 이상 느려진 단계 분위수를 회귀로 표시
+REGRESSION_THRESHOLD = 0.20
 
 
 # ── 데이터 로드 ──────────────────────────────────────────────────
@@ -90,11 +106,180 @@ class CaseResult:
     suspect_assessment: str = ""
     suspect_accuracy: float | None = None  # Legacy: Haiku 의심 대분류 정확도
     pipeline_path: str = ""  # "sonnet_solo_empty" / "sonnet_solo_detect" / legacy paths
+    stage_seconds: dict = field(default_factory=dict)  # AnalysisResult.stage_seconds
+
+
+# ── 동시 실행: 시작 속도 제한 + 분위수 ─────────────────────────
+
+class RateLimiter:
+    """케이스 시작 간격을 1/rate초 이상으로 유지 (스레드 안전). rate<=0이면 제한 없음."""
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """선형 보간 분위수 (q: 0~100). 빈 목록이면 None."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def stage_percentiles(results: list["CaseResult"]) -> dict[str, dict]:
+    """단계별(+total) count·mean·max·p50/p90/p99 (초)."""
+    samples: dict[str, list[float]] = {}
+    for r in results:
+        if r.skipped:
+            continue
+        for stage, sec in r.stage_seconds.items():
+            samples.setdefault(stage, []).append(sec)
+        samples.setdefault("total", []).append(r.seconds)
+    out = {}
+    for stage, vals in samples.items():
+        row = {"count": len(vals), "mean": round(sum(vals) / len(vals), 3), "max": round(max(vals), 3)}
+        for q in PERCENTILES:
+            row[f"p{q}"] = round(percentile(vals, q), 3)
+        out[stage] = row
+    return out
 
 
 # ── 벤치마크 실행 ──────────────────────────────────────────────
 
-def run_benchmark(filter_ids: list[str] | None = None, model_override: str | None = None):
+def run_case(c: dict, labels: dict) -> CaseResult:
+    """골든 케이스 1건 분석 + 지표 계산. 워커 스레드에서 호출된다 (출력 없음)."""
+    cid = c["candidate_id"]
+    title = c.get("title", "")[:50]
+    is_tn = c.get("is_true_negative", False)
+    expected = get_expected(labels, cid)
+
+    cr = CaseResult(
+        candidate_id=cid, title=title, is_tn=is_tn, expected_patterns=expected,
+    )
+
+    article_file = ARTICLE_TEXTS_DIR / f"{cid}_article.txt"
+    if article_file.exists():
+        article_text = article_file.read_text(encoding="utf-8").strip()
+        cr.article_source = "full"
+    else:
+        article_text = c.get("article_key_text", "")
+        cr.article_source = "key_text" if article_text else ""
+
+    if not article_text:
+        cr.skipped = True
+        cr.skip_reason = "기사 텍스트 없음"
+        return cr
+
+    cr.article_chars = len(article_text)
+
+    try:
+        result = analyze_article(article_text, run_sonnet=False)
+    except Exception as e:
+        cr.skipped = True
+        cr.skip_reason = f"오류: {e}"
+        return cr
+
+    pm = result.pattern_result
+    cr.vector_candidate_codes = [vc.pattern_code for vc in pm.vector_candidates]
+    cr.haiku_confirmed_codes = list(pm.validated_pattern_codes)
+    cr.hallucinated_codes = list(pm.hallucinated_codes)
+    cr.seconds = result.total_seconds
+    cr.embedding_tokens = result.embedding_tokens
+    cr.chunk_count = result.chunk_count
+    cr.stage_seconds = dict(result.stage_seconds)
+
+    # overall_assessment 추출
+    suspect = pm.suspect_result
+    if suspect:
+        cr.suspect_categories = suspect.suspect_categories
+        cr.suspect_assessment = suspect.overall_assessment  # 전체 기록
+
+    # 파이프라인 경로
+    cr.pipeline_path = "sonnet_solo_detect" if cr.haiku_confirmed_codes else "sonnet_solo_empty"
+
+    if is_tn:
+        cr.is_false_positive = len(cr.haiku_confirmed_codes) > 0
+        cr.candidate_recall = None
+        cr.final_recall = None
+        cr.final_precision = None
+        cr.category_recall = None
+        cr.suspect_accuracy = None
+    else:
+        expected_set = set(expected)
+        vec_set = set(cr.vector_candidate_codes)
+        haiku_set = set(cr.haiku_confirmed_codes)
+
+        if expected_set:
+            cr.candidate_recall = len(expected_set & vec_set) / len(expected_set)
+            cr.final_recall = len(expected_set & haiku_set) / len(expected_set)
+        else:
+            cr.candidate_recall = 1.0
+            cr.final_recall = 1.0
+
+        if haiku_set:
+            cr.final_precision = len(expected_set & haiku_set) / len(haiku_set)
+        else:
+            cr.final_precision = 1.0 if not expected_set else 0.0
+
+        # Category Recall
+        expected_majors = set()
+        for p in expected:
+            parts = p.split("-")
+            if len(parts) >= 2:
+                expected_majors.add(f"{parts[0]}-{parts[1]}")
+
+        haiku_majors = set()
+        for p in cr.haiku_confirmed_codes:
+            parts = p.split("-")
+            if len(parts) >= 2:
+                haiku_majors.add(f"{parts[0]}-{parts[1]}")
+
+        if expected_majors:
+            cr.category_recall = len(expected_majors & haiku_majors) / len(expected_majors)
+        else:
+            cr.category_recall = 1.0
+
+        # Suspect Accuracy (legacy 호환)
+        suspect_set = set(cr.suspect_categories)
+        if expected_majors:
+            cr.suspect_accuracy = len(expected_majors & suspect_set) / len(expected_majors)
+        else:
+            cr.suspect_accuracy = 1.0
+
+    return cr
+
+
+def _case_line(cr: CaseResult) -> str:
+    if cr.skipped:
+        return f"  [{cr.candidate_id}] SKIP: {cr.skip_reason}"
+    if cr.is_tn:
+        status = f"TN-Solo:{'FP!' if cr.is_false_positive else '[]'}"
+    else:
+        status = f"CR={cr.candidate_recall:.2f} FR={cr.final_recall:.2f} FP={cr.final_precision:.2f}"
+    return f"  [{cr.candidate_id}] {cr.seconds:.1f}s {cr.chunk_count}ch ({cr.article_chars}자) | {status}"
+
+
+def run_benchmark(
+    filter_ids: list[str] | None = None,
+    model_override: str | None = None,
+    concurrency: int = 1,
+    rate: float = 1.0,
+):
     gd = load_golden_dataset()
     labels = load_labels()
     candidates = gd["candidates"]
@@ -107,120 +292,20 @@ def run_benchmark(filter_ids: list[str] | None = None, model_override: str | Non
         pm_module.SONNET_MODEL = model_override
         print(f"  ⚠️ 모델 오버라이드: {model_override}")
 
-    results: list[CaseResult] = []
-    total_start = time.time()
-
-    for c in candidates:
-        cid = c["candidate_id"]
-        title = c.get("title", "")[:50]
-        is_tn = c.get("is_true_negative", False)
-        expected = get_expected(labels, cid)
+    limiter = RateLimiter(rate)
+    print_lock = threading.Lock()
 
-        cr = CaseResult(
-            candidate_id=cid, title=title, is_tn=is_tn, expected_patterns=expected,
-        )
-
-        article_file = ARTICLE_TEXTS_DIR / f"{cid}_article.txt"
-        if article_file.exists():
-            article_text = article_file.read_text(encoding="utf-8").strip()
-            cr.article_source = "full"
-        else:
-            article_text = c.get("article_key_text", "")
-            cr.article_source = "key_text" if article_text else ""
-
-        if not article_text:
-            cr.skipped = True
-            cr.skip_reason = "기사 텍스트 없음"
-            results.append(cr)
-            print(f"  [{cid}] SKIP: {cr.skip_reason}")
-            continue
-
-        cr.article_chars = len(article_text)
-        print(f"  [{cid}] 분석 중... ({cr.article_chars}자)", end="", flush=True)
+    def _worker(c: dict) -> CaseResult:
+        limiter.acquire()
+        cr = run_case(c, labels)
+        with print_lock:
+            print(_case_line(cr), flush=True)
+        return cr
 
-        try:
-            result = analyze_article(article_text, run_sonnet=False)
-        except Exception as e:
-            cr.skipped = True
-            cr.skip_reason = f"오류: {e}"
-            results.append(cr)
-            print(f" ERROR: {e}")
-            continue
-
-        pm = result.pattern_result
-        cr.vector_candidate_codes = [vc.pattern_code for vc in pm.vector_candidates]
-        cr.haiku_confirmed_codes = list(pm.validated_pattern_codes)
-        cr.hallucinated_codes = list(pm.hallucinated_codes)
-        cr.seconds = result.total_seconds
-        cr.embedding_tokens = result.embedding_tokens
-        cr.chunk_count = result.chunk_count
-
-        # overall_assessment 추출
-        suspect = pm.suspect_result
-        if suspect:
-            cr.suspect_categories = suspect.suspect_categories
-            cr.suspect_assessment = suspect.overall_assessment  # 전체 기록
-
-        # 파이프라인 경로
-        cr.pipeline_path = "sonnet_solo_detect" if cr.haiku_confirmed_codes else "sonnet_solo_empty"
-
-        if is_tn:
-            cr.is_false_positive = len(cr.haiku_confirmed_codes) > 0
-            cr.candidate_recall = None
-            cr.final_recall = None
-            cr.final_precision = None
-            cr.category_recall = None
-            cr.suspect_accuracy = None
-        else:
-            expected_set = set(expected)
-            vec_set = set(cr.vector_candidate_codes)
-            haiku_set = set(cr.haiku_confirmed_codes)
-
-            if expected_set:
-                cr.candidate_recall = len(expected_set & vec_set) / len(expected_set)
-                cr.final_recall = len(expected_set & haiku_set) / len(expected_set)
-            else:
-                cr.candidate_recall = 1.0
-                cr.final_recall = 1.0
-
-            if haiku_set:
-                cr.final_precision = len(expected_set & haiku_set) / len(haiku_set)
-            else:
-                cr.final_precision = 1.0 if not expected_set else 0.0
-
-            # Category Recall
-            expected_majors = set()
-            for p in expected:
-                parts = p.split("-")
-                if len(parts) >= 2:
-                    expected_majors.add(f"{parts[0]}-{parts[1]}")
-
-            haiku_majors = set()
-            for p in cr.haiku_confirmed_codes:
-                parts = p.split("-")
-                if len(parts) >= 2:
-                    haiku_majors.add(f"{parts[0]}-{parts[1]}")
-
-            if expected_majors:
-                cr.category_recall = len(expected_majors & haiku_majors) / len(expected_majors)
-            else:
-                cr.category_recall = 1.0
-
-            # Suspect Accuracy (legacy 호환)
-            suspect_set = set(cr.suspect_categories)
-            if expected_majors:
-                cr.suspect_accuracy = len(expected_majors & suspect_set) / len(expected_majors)
-            else:
-                cr.suspect_accuracy = 1.0
-
-        results.append(cr)
-        if cr.is_tn:
-            status = f"TN-Solo:{'FP!' if cr.is_false_positive else '[]'}"
-        else:
-            status = f"CR={cr.candidate_recall:.2f} FR={cr.final_recall:.2f} FP={cr.final_precision:.2f}"
-        print(f" {cr.seconds:.1f}s {cr.chunk_count}ch | {status}")
-
-        time.sleep(1)
+    total_start = time.time()
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        # map은 입력 순서대로 반환 — 리포트/JSON의 케이스 순서는 동시성과 무관
+        results: list[CaseResult] = list(pool.map(_worker, candidates))
 
     total_seconds = time.time() - total_start
     return results, total_seconds
@@ -496,6 +581,101 @@ def generate_report_legacy(results: list[CaseResult], total_seconds: float):
     return report, str(out_path)
 
 
+# ── 결과 JSON (커밋 간 diff용) ───────────────────────────────
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _mean(vals: list) -> float | None:
+    vals = [v for v in vals if v is not None]
+    return round(sum(vals) / len(vals), 4) if vals else None
+
+
+def build_results_json(
+    results: list[CaseResult], total_seconds: float, concurrency: int, rate: float,
+) -> dict:
+    """지표·단계별 분위수·건별 결과. 키 정렬 JSON으로 저장해 커밋 간 diff가 읽히게 한다."""
+    import core.pattern_matcher as pm_module
+
+    done = [r for r in results if not r.skipped]
+    tp = [r for r in done if not r.is_tn]
+    tn = [r for r in done if r.is_tn]
+    return {
+        "schema": RESULTS_SCHEMA_VERSION,
+        "date": date.today().isoformat(),
+        "git_commit": _git_commit(),
+        "model": pm_module.SONNET_MODEL,
+        "concurrency": concurrency,
+        "rate_per_sec": rate,
+        "summary": {
+            "cases": len(results),
+            "completed": len(done),
+            "skipped": len(results) - len(done),
+            "wall_seconds": round(total_seconds, 2),
+            "throughput_per_min": round(len(done) / total_seconds * 60, 2) if total_seconds else None,
+            "candidate_recall": _mean([r.candidate_recall for r in tp]),
+            "final_recall": _mean([r.final_recall for r in tp]),
+            "final_precision": _mean([r.final_precision for r in tp]),
+            "tn_fp_rate": round(sum(r.is_false_positive for r in tn) / len(tn), 4) if tn else None,
+            "embedding_tokens": sum(r.embedding_tokens for r in done),
+        },
+        "stages": stage_percentiles(results),
+        "cases": [
+            {
+                "candidate_id": r.candidate_id,
+                "skipped": r.skip_reason if r.skipped else None,
+                "seconds": round(r.seconds, 3),
+                "stage_seconds": r.stage_seconds,
+                "chunk_count": r.chunk_count,
+                "vector_candidates": r.vector_candidate_codes,
+                "confirmed": r.haiku_confirmed_codes,
+                "hallucinated": r.hallucinated_codes,
+            }
+            for r in results
+        ],
+    }
+
+
+def print_stage_table(data: dict) -> None:
+    summary = data["summary"]
+    print(f"\n  처리량: {summary['throughput_per_min']}건/분 "
+          f"(동시성 {data['concurrency']}, 시작 {data['rate_per_sec']}건/초)")
+    print(f"\n  {'stage':<16}{'n':>4}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for stage, row in sorted(data["stages"].items(), key=lambda kv: -kv[1]["p50"]):
+        print(f"  {stage:<16}{row['count']:>4}{row['p50']:>9.3f}{row['p90']:>9.3f}"
+              f"{row['p99']:>9.3f}{row['max']:>9.3f}")
+
+
+def compare_results(base: dict, cur: dict) -> list[str]:
+    """단계별 p50/p90 변화. REGRESSION_THRESHOLD 이상 느려진 항목 목록 반환."""
+    regressions = []
+    print(f"\n  비교 기준: {base.get('git_commit')} ({base.get('date')}) → {cur.get('git_commit')}")
+    print(f"  {'stage':<16}{'p50 Δ':>16}{'p90 Δ':>16}")
+    for stage in sorted(set(base.get("stages", {})) | set(cur["stages"])):
+        b, c = base.get("stages", {}).get(stage), cur["stages"].get(stage)
+        if not b or not c:
+            print(f"  {stage:<16}{'(한쪽에만 있음)':>16}")
+            continue
+        cells = []
+        for key in ("p50", "p90"):
+            delta = c[key] - b[key]
+            ratio = delta / b[key] if b[key] else 0.0
+            flag = " ⚠️" if ratio >= REGRESSION_THRESHOLD else ""
+            if flag:
+                regressions.append(f"{stage}.{key} {b[key]:.3f}→{c[key]:.3f}s")
+            cells.append(f"{delta:+.3f}s{flag}")
+        print(f"  {stage:<16}{cells[0]:>16}{cells[1]:>16}")
+    return regressions
+
+
 # ── 메인 ─────────────────────────────────────────────────────
 
 def main():
@@ -503,6 +683,10 @@ def main():
     parser.add_argument("--ids", nargs="*", default=None)
     parser.add_argument("--model", default=None)
     parser.add_argument("--legacy", action="store_true", help="Legacy 2-Call 출력 형식")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시 실행 워커 수 (기본 1 = 순차)")
+    parser.add_argument("--rate", type=float, default=1.0, help="케이스 시작 속도 상한, 건/초 (0 = 무제한)")
+    parser.add_argument("--results-json", type=Path, default=RESULTS_JSON_PATH, help="결과 JSON 경로")
+    parser.add_argument("--compare", type=Path, default=None, help="이전 결과 JSON과 단계별 분위수 비교")
     args = parser.parse_args()
 
     filter_label = f" (필터: {args.ids})" if args.ids else " (전체 26건)"
@@ -511,7 +695,10 @@ def main():
     print(f"M6 벤치마크 — {mode_label}{filter_label}")
     print("=" * 60)
 
-    results, total_seconds = run_benchmark(filter_ids=args.ids, model_override=args.model)
+    results, total_seconds = run_benchmark(
+        filter_ids=args.ids, model_override=args.model,
+        concurrency=args.concurrency, rate=args.rate,
+    )
 
     if args.legacy:
         report, out_path = generate_report_legacy(results, total_seconds)
@@ -540,6 +727,20 @@ def main():
     print(f"\n  총 소요: {total_seconds:.1f}초")
     print(f"  결과 저장: {out_path}")
 
+    data = build_results_json(results, total_seconds, args.concurrency, args.rate)
+    args.results_json.write_text(
+        json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8",
+    )
+    print_stage_table(data)
+    print(f"\n  결과 JSON: {args.results_json}")
+
+    if args.compare:
+        base = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(base, data)
+        if regressions:
+            print(f"\n  ⚠️ 지연 회귀 ({REGRESSION_THRESHOLD:.0%} 이상): {', '.join(regressions)}")
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+chunker.preprocess 마이크로 벤치마크 — 순차 sub(기존) vs 리터럴 사전 검사 순차 sub(preprocess).
+
+입력:
+- 골든셋 기사 본문 (docs/golden_dataset_final.json, report-quality-recovery 픽스처)
+- 합성 노이즈 기사 (본문 + 캡션/바이라인/저작권/관련기사 라인, --repeat 배 확대)
+
+출력: 입력별 평균 소요 시간(µs)과 배속, 출력 동등 여부, 제거된 노이즈 건수.
+
+사용법:
+  python scripts/benchmark_preprocess.py
+  python scripts/benchmark_preprocess.py --iterations 500 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from core.chunker import preprocess, find_noise, _preprocess_sequential
+from test_chunker_preprocess import _load_golden_texts
+
+
+_SYNTHETIC_BLOCK = (
+    "[사진=연합뉴스]\n"
+    "(서울=뉴스1) 홍길동 기자 =\n"
+    "정부는 이날 발표한 대책에서 공급 확대를 강조했다.   \n"
+    "시장에서는 효과에 의문을 제기했다.\n\n\n\n"
+    "▶ 관련기사 더보기\n"
+    "전문가들은 후속 조치가 필요하다고 지적했다.\n"
+    "무단전재 및 재배포 금지\n\n"
+)
+
+
+def _time_per_call(fn, text: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(text)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="preprocess 마이크로 벤치마크")
+    parser.add_argument("--iterations", type=int, default=200, help="입력당 반복 횟수")
+    parser.add_argument("--repeat", type=int, default=10, help="합성 기사 블록 반복 수")
+    args = parser.parse_args()
+
+    golden = _load_golden_texts()
+    corpus = [
+        ("golden (전체 합본)", "\n\n".join(t for _, t in golden)),
+        (f"synthetic x{args.repeat}", _SYNTHETIC_BLOCK * args.repeat),
+    ]
+
+    print(f"골든 텍스트 {len(golden)}건 · 반복 {args.iterations}회\n")
+    print(f"{'입력':<22}{'길이':>8}{'순차(µs)':>12}{'검사(µs)':>12}{'배속':>8}{'노이즈':>8}  동등")
+    for name, text in corpus:
+        seq_us = _time_per_call(_preprocess_sequential, text, args.iterations)
+        one_us = _time_per_call(preprocess, text, args.iterations)
+        same = preprocess(text) == _preprocess_sequential(text)
+        print(
+            f"{name:<22}{len(text):>8}{seq_us:>12.1f}{one_us:>12.1f}"
+            f"{seq_us / one_us:>7.2f}x{len(find_noise(text)):>8}  {'✅' if same else '❌'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
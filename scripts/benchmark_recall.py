@@ -4,8 +4,12 @@ M3 Recall@10 Benchmark for CR-Check Hybrid RAG.
 
 Measures how well search_pattern_candidates() retrieves expected patterns
 from the golden dataset using vector similarity search.
+
+--sweep: threshold × match_count 격자 전체를 유사도 텐서 1회로 평가
+         (recall_sweep.py — RPC 호출 없음, numpy 필요).
 """
 
+import argparse
 import json
 import os
 import sys
@@ -211,6 +215,13 @@ def format_results(results, threshold):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="M3 Recall@10 벤치마크 (기사 전문)")
+    parser.add_argument("--sweep", action="store_true", help="threshold × match_count 텐서 스윕")
+    parser.add_argument("--thresholds", default=None, help="스윕 격자 (start:stop:step 또는 쉼표 목록)")
+    parser.add_argument("--counts", type=int, nargs="+", default=None, help="스윕 match_count 목록")
+    parser.add_argument("--target", type=float, default=0.8, help="스윕 권장 설정 기준 Recall")
+    args = parser.parse_args()
+
     load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -231,6 +242,22 @@ def main():
     print("\nGenerating query embeddings...")
     cases = generate_query_embeddings(client, cases)
 
+    if args.sweep:
+        import numpy as np
+        import recall_sweep
+        embeddings = [
+            np.array([c["query_embedding"]]) if "query_embedding" in c else np.zeros((0, 0))
+            for c in cases
+        ]
+        recall_sweep.run_sweep(
+            conn, cases, embeddings,
+            recall_sweep.parse_thresholds(args.thresholds or recall_sweep.DEFAULT_THRESHOLDS),
+            np.array(args.counts or recall_sweep.DEFAULT_COUNTS),
+            target=args.target, label="full article",
+        )
+        conn.close()
+        return
+
     # Run benchmark at multiple thresholds
     thresholds = [0.3, 0.4, 0.5, 0.6]
     all_outputs = []
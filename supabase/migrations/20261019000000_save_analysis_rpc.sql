@@ -0,0 +1,175 @@
+-- ============================================================================
+-- save_analysis(payload jsonb) — 분석 결과 원자적 저장 RPC
+-- ============================================================================
+-- 이력 version: 20261019000000
+--
+-- [실행 방식 경고 — 반드시 준수]
+-- Supabase SQL Editor에서 기획자가 "수동" 실행하는 마이그레이션이다.
+-- `supabase db push` / `supabase migration up` 로 운영 DB에 실행하지 말 것.
+-- (schema_migrations drift — 20260622 관례 준수. 이력은 수동 INSERT.)
+--
+-- [배경]
+--   storage.save_analysis_result가 articles UPSERT → analysis_results INSERT
+--   (share_id 충돌 시 최대 3회 재시도) → ethics_codes SELECT →
+--   analysis_ethics_snapshot INSERT 를 4~6회 왕복으로 나눠 실행했다.
+--   트랜잭션이 아니어서 중간 실패 시 스냅샷 없는 결과 행이 남을 수 있었다.
+--
+-- [내용]
+--   save_analysis(payload jsonb) RETURNS text (share_id)
+--     1. articles UPSERT (url 기준; publisher/journalist/publish_date는
+--        값이 있을 때만 갱신 — 기존 PostgREST merge-duplicates와 동일 의미)
+--     2. share_id 서버 생성 (12자 URL-safe, token_urlsafe(9)와 같은 형식)
+--        ON CONFLICT (share_id) DO NOTHING 으로 충돌 시 재생성 (최대 5회)
+--     3. analysis_results INSERT
+--     4. analysis_ethics_snapshot INSERT — code별 활성 행 우선, 없으면 최신 version
+--   함수 1회 호출 = 1 트랜잭션. 어느 단계든 실패하면 전체 롤백.
+--
+-- [payload]
+--   {
+--     "article":   {"url", "title", "publisher", "journalist", "publish_date"},
+--     "result":    {analysis_results 컬럼명: 값, ...},
+--     "snapshots": [{"ethics_code", "snapshot_full_text"}, ...]
+--   }
+--
+-- [보안] SECURITY INVOKER + search_path 고정. EXECUTE는 service_role만.
+-- [멱등성] CREATE OR REPLACE — 재실행 안전.
+-- ============================================================================
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.save_analysis(payload jsonb)
+RETURNS text
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public, pg_temp
+AS $function$
+DECLARE
+  v_article   jsonb := payload->'article';
+  v_result    jsonb := coalesce(payload->'result', '{}'::jsonb);
+  v_article_id bigint;
+  v_analysis_id bigint;
+  v_share_id  text;
+  v_attempt   int := 0;
+BEGIN
+  IF coalesce(v_article->>'url', '') = '' THEN
+    RAISE EXCEPTION 'save_analysis: payload.article.url is required';
+  END IF;
+
+  -- 1. articles UPSERT
+  INSERT INTO public.articles (url, title, publisher, journalist, publish_date)
+  VALUES (
+    v_article->>'url',
+    coalesce(v_article->>'title', ''),
+    nullif(v_article->>'publisher', ''),
+    nullif(v_article->>'journalist', ''),
+    nullif(v_article->>'publish_date', '')::timestamptz
+  )
+  ON CONFLICT (url) DO UPDATE SET
+    title        = EXCLUDED.title,
+    publisher    = coalesce(EXCLUDED.publisher, articles.publisher),
+    journalist   = coalesce(EXCLUDED.journalist, articles.journalist),
+    publish_date = coalesce(EXCLUDED.publish_date, articles.publish_date)
+  RETURNING id INTO v_article_id;
+
+  -- 2~3. share_id 생성 + analysis_results INSERT (충돌 시 재생성)
+  LOOP
+    v_attempt := v_attempt + 1;
+    -- uuid 앞 9바이트 → base64 12자 → URL-safe 치환 (secrets.token_urlsafe(9) 형식)
+    v_share_id := translate(
+      encode(substr(decode(replace(gen_random_uuid()::text, '-', ''), 'hex'), 1, 9), 'base64'),
+      '+/', '-_'
+    );
+
+    INSERT INTO public.analysis_results (
+      article_id, share_id,
+      comprehensive_report, journalist_report, student_report,
+      article_analysis, overall_assessment,
+      phase1_model, phase2_model, duration_seconds,
+      detected_patterns, meta_patterns, citation_audit, phase1_forensic
+    )
+    VALUES (
+      v_article_id, v_share_id,
+      v_result->>'comprehensive_report',
+      v_result->>'journalist_report',
+      v_result->>'student_report',
+      nullif(v_result->'article_analysis', 'null'::jsonb),
+      v_result->>'overall_assessment',
+      v_result->>'phase1_model',
+      v_result->>'phase2_model',
+      (v_result->>'duration_seconds')::float,
+      nullif(v_result->'detected_patterns', 'null'::jsonb),
+      nullif(v_result->'meta_patterns', 'null'::jsonb),
+      nullif(v_result->'citation_audit', 'null'::jsonb),
+      nullif(v_result->'phase1_forensic', 'null'::jsonb)
+    )
+    ON CONFLICT (share_id) DO NOTHING
+    RETURNING id INTO v_analysis_id;
+
+    EXIT WHEN v_analysis_id IS NOT NULL;
+    IF v_attempt >= 5 THEN
+      RAISE EXCEPTION 'save_analysis: share_id collision % times', v_attempt;
+    END IF;
+  END LOOP;
+
+  -- 4. analysis_ethics_snapshot — 대상 선별·중복 제거는 호출 측(storage.py) 책임
+  INSERT INTO public.analysis_ethics_snapshot (
+    analysis_id, ethics_code_id, snapshot_full_text, snapshot_version
+  )
+  SELECT v_analysis_id, ec.id, coalesce(s.snapshot_full_text, ''), ec.version
+  FROM jsonb_to_recordset(coalesce(payload->'snapshots', '[]'::jsonb))
+       AS s(ethics_code text, snapshot_full_text text)
+  JOIN LATERAL (
+    SELECT id, version
+    FROM public.ethics_codes
+    WHERE code = s.ethics_code
+    ORDER BY is_active DESC, version DESC
+    LIMIT 1
+  ) ec ON true;
+
+  RETURN v_share_id;
+END;
+$function$;
+
+COMMENT ON FUNCTION public.save_analysis(jsonb) IS
+  '분석 결과 원자적 저장: articles UPSERT + share_id 서버 생성 + analysis_results + '
+  'analysis_ethics_snapshot 을 1 트랜잭션으로 처리하고 share_id 반환';
+
+REVOKE ALL ON FUNCTION public.save_analysis(jsonb) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.save_analysis(jsonb) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.save_analysis(jsonb) TO service_role;
+
+-- ─── 사후 검증(같은 트랜잭션): search_path 고정 + anon 실행 불가 ──────────
+DO $$
+DECLARE
+  ok_path BOOLEAN;
+BEGIN
+  SELECT EXISTS (
+    SELECT 1 FROM unnest(coalesce(p.proconfig, ARRAY[]::text[])) cfg
+    WHERE cfg LIKE 'search_path=%'
+  ) INTO ok_path
+  FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+  WHERE n.nspname = 'public' AND p.proname = 'save_analysis';
+  IF NOT ok_path THEN
+    RAISE EXCEPTION 'save_analysis: search_path not pinned';
+  END IF;
+  IF has_function_privilege('anon', 'public.save_analysis(jsonb)', 'EXECUTE') THEN
+    RAISE EXCEPTION 'save_analysis: anon must not have EXECUTE';
+  END IF;
+END $$;
+
+COMMIT;
+
+NOTIFY pgrst, 'reload schema';
+
+-- [기획자 수동 실행 — 이력 동기화]
+-- INSERT INTO supabase_migrations.schema_migrations (version, name, statements)
+-- VALUES ('20261019000000', 'save_analysis_rpc',
+--         ARRAY['CREATE OR REPLACE FUNCTION public.save_analysis(jsonb) ...']);
+
+-- ============================================================================
+-- [ROLLBACK] 함수 제거만 하면 된다. storage.py는 RPC 부재(PGRST202/404) 시
+-- 기존 REST 다단계 저장 경로로 자동 폴백한다.
+-- ----------------------------------------------------------------------------
+-- DROP FUNCTION IF EXISTS public.save_analysis(jsonb);
+-- NOTIFY pgrst, 'reload schema';
+-- ============================================================================
@@ -0,0 +1,166 @@
+-- ============================================================================
+-- save_analysis(payload jsonb) — 호출 측 share_id 지원 (fire-and-forget 저장)
+-- ============================================================================
+-- 이력 version: 20261019000100
+--
+-- [실행 방식 경고 — 반드시 준수]
+-- Supabase SQL Editor에서 기획자가 "수동" 실행하는 마이그레이션이다.
+-- `supabase db push` / `supabase migration up` 로 운영 DB에 실행하지 말 것.
+-- (schema_migrations drift — 20260622 관례 준수. 이력은 수동 INSERT.)
+-- 선행: 20261019000000_save_analysis_rpc.sql
+--
+-- [배경]
+--   /analyze가 DB 저장 완료를 기다리지 않고 응답하도록, share_id를 백엔드가
+--   먼저 발급하고 저장은 백그라운드 큐 + 로컬 스풀(JSONL)로 넘긴다.
+--   스풀은 재시작 시 재생되므로 같은 payload가 두 번 도착할 수 있다.
+--
+-- [변경]
+--   payload.share_id 가 있으면 그 값을 사용한다 (없으면 기존처럼 서버 생성).
+--   이미 같은 share_id 행이 있으면 아무것도 쓰지 않고 share_id를 반환 (멱등).
+--   그 밖의 동작·권한은 20261019000000과 동일.
+--
+-- [멱등성] CREATE OR REPLACE — 재실행 안전.
+-- ============================================================================
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.save_analysis(payload jsonb)
+RETURNS text
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public, pg_temp
+AS $function$
+DECLARE
+  v_article   jsonb := payload->'article';
+  v_result    jsonb := coalesce(payload->'result', '{}'::jsonb);
+  v_article_id bigint;
+  v_analysis_id bigint;
+  v_share_id  text := nullif(payload->>'share_id', '');
+  v_client_id boolean := nullif(payload->>'share_id', '') IS NOT NULL;
+  v_attempt   int := 0;
+BEGIN
+  IF coalesce(v_article->>'url', '') = '' THEN
+    RAISE EXCEPTION 'save_analysis: payload.article.url is required';
+  END IF;
+
+  -- 0. 호출 측 share_id가 이미 저장돼 있으면 재전송(스풀 재생)으로 보고 그대로 반환
+  IF v_client_id AND EXISTS (
+    SELECT 1 FROM public.analysis_results WHERE share_id = v_share_id
+  ) THEN
+    RETURN v_share_id;
+  END IF;
+
+  -- 1. articles UPSERT
+  INSERT INTO public.articles (url, title, publisher, journalist, publish_date)
+  VALUES (
+    v_article->>'url',
+    coalesce(v_article->>'title', ''),
+    nullif(v_article->>'publisher', ''),
+    nullif(v_article->>'journalist', ''),
+    nullif(v_article->>'publish_date', '')::timestamptz
+  )
+  ON CONFLICT (url) DO UPDATE SET
+    title        = EXCLUDED.title,
+    publisher    = coalesce(EXCLUDED.publisher, articles.publisher),
+    journalist   = coalesce(EXCLUDED.journalist, articles.journalist),
+    publish_date = coalesce(EXCLUDED.publish_date, articles.publish_date)
+  RETURNING id INTO v_article_id;
+
+  -- 2~3. share_id (호출 측 지정 또는 서버 생성) + analysis_results INSERT
+  LOOP
+    v_attempt := v_attempt + 1;
+    IF NOT v_client_id THEN
+      -- uuid 앞 9바이트 → base64 12자 → URL-safe 치환 (secrets.token_urlsafe(9) 형식)
+      v_share_id := translate(
+        encode(substr(decode(replace(gen_random_uuid()::text, '-', ''), 'hex'), 1, 9), 'base64'),
+        '+/', '-_'
+      );
+    END IF;
+
+    INSERT INTO public.analysis_results (
+      article_id, share_id,
+      comprehensive_report, journalist_report, student_report,
+      article_analysis, overall_assessment,
+      phase1_model, phase2_model, duration_seconds,
+      detected_patterns, meta_patterns, citation_audit, phase1_forensic
+    )
+    VALUES (
+      v_article_id, v_share_id,
+      v_result->>'comprehensive_report',
+      v_result->>'journalist_report',
+      v_result->>'student_report',
+      nullif(v_result->'article_analysis', 'null'::jsonb),
+      v_result->>'overall_assessment',
+      v_result->>'phase1_model',
+      v_result->>'phase2_model',
+      (v_result->>'duration_seconds')::float,
+      nullif(v_result->'detected_patterns', 'null'::jsonb),
+      nullif(v_result->'meta_patterns', 'null'::jsonb),
+      nullif(v_result->'citation_audit', 'null'::jsonb),
+      nullif(v_result->'phase1_forensic', 'null'::jsonb)
+    )
+    ON CONFLICT (share_id) DO NOTHING
+    RETURNING id INTO v_analysis_id;
+
+    EXIT WHEN v_analysis_id IS NOT NULL;
+    -- 호출 측 share_id 충돌 = 동시 재전송이 먼저 커밋됨 → 이미 저장된 것으로 본다
+    IF v_client_id THEN
+      RETURN v_share_id;
+    END IF;
+    IF v_attempt >= 5 THEN
+      RAISE EXCEPTION 'save_analysis: share_id collision % times', v_attempt;
+    END IF;
+  END LOOP;
+
+  -- 4. analysis_ethics_snapshot — 대상 선별·중복 제거는 호출 측(storage.py) 책임
+  INSERT INTO public.analysis_ethics_snapshot (
+    analysis_id, ethics_code_id, snapshot_full_text, snapshot_version
+  )
+  SELECT v_analysis_id, ec.id, coalesce(s.snapshot_full_text, ''), ec.version
+  FROM jsonb_to_recordset(coalesce(payload->'snapshots', '[]'::jsonb))
+       AS s(ethics_code text, snapshot_full_text text)
+  JOIN LATERAL (
+    SELECT id, version
+    FROM public.ethics_codes
+    WHERE code = s.ethics_code
+    ORDER BY is_active DESC, version DESC
+    LIMIT 1
+  ) ec ON true;
+
+  RETURN v_share_id;
+END;
+$function$;
+
+COMMENT ON FUNCTION public.save_analysis(jsonb) IS
+  '분석 결과 원자적 저장: articles UPSERT + share_id(호출 측 지정 또는 서버 생성) + '
+  'analysis_results + analysis_ethics_snapshot 을 1 트랜잭션으로 처리하고 share_id 반환. '
+  '이미 저장된 share_id면 그대로 반환 (멱등)';
+
+-- CREATE OR REPLACE는 기존 grant를 유지하지만 명시적으로 재확인한다.
+REVOKE ALL ON FUNCTION public.save_analysis(jsonb) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.save_analysis(jsonb) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.save_analysis(jsonb) TO service_role;
+
+-- ─── 사후 검증(같은 트랜잭션): anon 실행 불가 ────────────────────────
+DO $$
+BEGIN
+  IF has_function_privilege('anon', 'public.save_analysis(jsonb)', 'EXECUTE') THEN
+    RAISE EXCEPTION 'save_analysis: anon must not have EXECUTE';
+  END IF;
+END $$;
+
+COMMIT;
+
+NOTIFY pgrst, 'reload schema';
+
+-- [기획자 수동 실행 — 이력 동기화]
+-- INSERT INTO supabase_migrations.schema_migrations (version, name, statements)
+-- VALUES ('20261019000100', 'save_analysis_client_share_id',
+--         ARRAY['CREATE OR REPLACE FUNCTION public.save_analysis(jsonb) ...']);
+
+-- ============================================================================
+-- [ROLLBACK] 20261019000000_save_analysis_rpc.sql 의 함수 정의를 다시 실행한다.
+-- 구 함수는 payload.share_id를 무시하고 새로 발급하므로, 롤백 시에는
+-- PERSIST_ASYNC=0 으로 동기 저장 경로를 함께 켤 것
+-- (응답으로 나간 share_id와 DB share_id가 어긋나지 않도록).
+-- ============================================================================
@@ -0,0 +1,124 @@
+-- ============================================================================
+-- 규범 매핑 버전 스탬프 — 백엔드 규범 캐시 무효화용
+-- ============================================================================
+-- 이력 version: 20261019000200
+--
+-- [실행 방식 경고 — 반드시 준수]
+-- Supabase SQL Editor에서 기획자가 "수동" 실행하는 마이그레이션이다.
+-- `supabase db push` / `supabase migration up` 로 운영 DB에 실행하지 말 것.
+-- (schema_migrations drift — 20260622 관례 준수. 이력은 수동 INSERT.)
+--
+-- [배경]
+--   report_generator는 기사마다 get_ethics_for_patterns(재귀 CTE) RPC를 호출했다.
+--   패턴↔규범 매핑은 시드 적용 때만 바뀌므로 백엔드가 (pattern_id × context)
+--   단위로 프로세스 내 캐시한다(core/ethics_cache.py). 캐시가 언제 낡았는지
+--   알 수 있도록 두 테이블 변경 시 올라가는 단조 증가 버전을 둔다.
+--
+-- [내용]
+--   1. public.ethics_mapping_version (단일 행: version BIGINT, updated_at)
+--   2. bump_ethics_mapping_version() — 문장 단위 트리거 함수 (version + 1)
+--   3. pattern_ethics_relations / ethics_codes 에
+--      AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE FOR EACH STATEMENT 트리거
+--   4. get_ethics_mapping_version() RETURNS bigint — 백엔드 폴링용 RPC
+--
+-- [보안] 버전 테이블은 RLS 활성 + 정책 없음 (service_role만 접근).
+--        두 함수 모두 search_path 고정. RPC EXECUTE는 service_role만.
+-- [멱등성] IF NOT EXISTS / CREATE OR REPLACE / DROP TRIGGER IF EXISTS — 재실행 안전.
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.ethics_mapping_version (
+  id         SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  version    BIGINT NOT NULL DEFAULT 1,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO public.ethics_mapping_version (id) VALUES (1)
+ON CONFLICT (id) DO NOTHING;
+
+ALTER TABLE public.ethics_mapping_version ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.bump_ethics_mapping_version()
+RETURNS trigger
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $function$
+BEGIN
+  UPDATE public.ethics_mapping_version
+  SET version = version + 1, updated_at = now()
+  WHERE id = 1;
+  RETURN NULL;
+END;
+$function$;
+
+DROP TRIGGER IF EXISTS bump_ethics_mapping_version ON public.pattern_ethics_relations;
+CREATE TRIGGER bump_ethics_mapping_version
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.pattern_ethics_relations
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.bump_ethics_mapping_version();
+
+DROP TRIGGER IF EXISTS bump_ethics_mapping_version ON public.ethics_codes;
+CREATE TRIGGER bump_ethics_mapping_version
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.ethics_codes
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.bump_ethics_mapping_version();
+
+CREATE OR REPLACE FUNCTION public.get_ethics_mapping_version()
+RETURNS bigint
+LANGUAGE sql
+STABLE
+SET search_path = public, pg_temp
+AS $function$
+  SELECT version FROM public.ethics_mapping_version WHERE id = 1;
+$function$;
+
+REVOKE ALL ON FUNCTION public.get_ethics_mapping_version() FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.get_ethics_mapping_version() FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_ethics_mapping_version() TO service_role;
+
+-- ─── 사후 검증(같은 트랜잭션): 트리거 2개 + 버전 행 1개 ──────────────
+DO $$
+DECLARE
+  n_triggers INT;
+  n_rows     INT;
+BEGIN
+  SELECT count(*) INTO n_triggers
+  FROM pg_trigger t
+  JOIN pg_class c ON c.oid = t.tgrelid
+  JOIN pg_namespace n ON n.oid = c.relnamespace
+  WHERE n.nspname = 'public'
+    AND t.tgname = 'bump_ethics_mapping_version'
+    AND c.relname IN ('pattern_ethics_relations', 'ethics_codes');
+  IF n_triggers <> 2 THEN
+    RAISE EXCEPTION 'ethics_mapping_version: expected 2 triggers, found %', n_triggers;
+  END IF;
+
+  SELECT count(*) INTO n_rows FROM public.ethics_mapping_version;
+  IF n_rows <> 1 THEN
+    RAISE EXCEPTION 'ethics_mapping_version: expected 1 row, found %', n_rows;
+  END IF;
+END $$;
+
+COMMIT;
+
+NOTIFY pgrst, 'reload schema';
+
+-- [기획자 수동 실행 — 이력 동기화]
+-- INSERT INTO supabase_migrations.schema_migrations (version, name, statements)
+-- VALUES ('20261019000200', 'ethics_mapping_version',
+--         ARRAY['CREATE TABLE public.ethics_mapping_version ...']);
+
+-- ============================================================================
+-- [ROLLBACK] 백엔드는 get_ethics_mapping_version 부재(PGRST202/404) 시
+-- TTL(ETHICS_CACHE_TTL_SECONDS) 기반 만료로 자동 전환한다.
+-- ----------------------------------------------------------------------------
+-- BEGIN;
+-- DROP TRIGGER IF EXISTS bump_ethics_mapping_version ON public.pattern_ethics_relations;
+-- DROP TRIGGER IF EXISTS bump_ethics_mapping_version ON public.ethics_codes;
+-- DROP FUNCTION IF EXISTS public.get_ethics_mapping_version();
+-- DROP FUNCTION IF EXISTS public.bump_ethics_mapping_version();
+-- DROP TABLE IF EXISTS public.ethics_mapping_version;
+-- COMMIT;
+-- NOTIFY pgrst, 'reload schema';
+-- ============================================================================
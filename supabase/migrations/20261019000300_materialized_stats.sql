@@ -0,0 +1,429 @@
+-- ============================================================================
+-- 통계 RPC 3종 롤업 테이블화 — get_trending_articles / get_publisher_stats /
+-- get_overall_stats
+-- ============================================================================
+-- 이력 version: 20261019000300
+--
+-- [실행 방식 경고 — 반드시 준수]
+-- Supabase SQL Editor에서 기획자가 "수동" 실행하는 마이그레이션이다.
+-- `supabase db push` / `supabase migration up` 로 운영 DB에 실행하지 말 것.
+-- (schema_migrations drift — 20260622 관례 준수. 이력은 수동 INSERT.)
+--
+-- [배경]
+--   세 통계 함수(20260328 스키마 §14~16)는 호출마다 articles ⋈ analysis_results
+--   전체를 집계한다. 아카이브 크기에 선형으로 느려지므로 대시보드 노출 전에
+--   증분 유지되는 롤업 테이블을 읽도록 바꾼다. 반환 타입·시그니처·정렬·LIMIT 불변.
+--
+-- [내용]
+--   1. 롤업 테이블 3개
+--      - stats_article_hourly (article_id, bucket=시간 단위) — 트렌드용
+--      - stats_publisher (publisher) — 언론사별 건수·소요 시간 합/건수
+--      - stats_overall (슬롯 16행) — 전체 기사·분석 수·소요 시간 합/건수
+--        단일 행이면 모든 저장 트랜잭션(save_analysis RPC 포함)이 그 행 락에서 커밋까지
+--        줄을 선다. 증분은 pg_backend_pid() % 16 슬롯에만 쓰고 get_overall_stats가 SUM.
+--   2. 행 단위 트리거로 증분 유지
+--      - analysis_results: AFTER INSERT / DELETE / UPDATE OF article_id, created_at, duration_seconds
+--      - articles: AFTER INSERT / DELETE (기사 수), UPDATE OF publisher (언론사 이동)
+--   3. refresh_analysis_stats() — 원본에서 전체 재구성 (초기 적재 + 주기 정합성 점검)
+--   4. 세 통계 함수 재작성 — 롤업 테이블 조회
+--      - get_trending_articles: 창 시작 시각이 걸친 첫 시간 버킷만 analysis_results를
+--        직접 스캔(idx_analysis_created_at), 나머지는 시간 버킷 합 → 기존과 같은 결과
+--
+-- [정합성]
+--   - 삭제 시 latest_analysis는 낮추지 않는다(상한값 유지). 기사 삭제 cascade 도중
+--     언론사 조회가 실패하면 언론사 롤업이 어긋날 수 있다. 두 경우 모두 앱 경로에는
+--     없으며 refresh_analysis_stats()가 바로잡는다 (아래 pg_cron 예시).
+--
+-- [보안] 롤업 테이블은 RLS 활성 + 정책 없음 (service_role만 접근) — 20260714 B와 같은 노출 수준.
+--        트리거·통계 함수 search_path 고정. 세 통계 함수의 기존 EXECUTE 권한은 변경하지 않는다.
+--        refresh_analysis_stats() EXECUTE는 service_role만.
+-- [멱등성] IF NOT EXISTS / CREATE OR REPLACE / DROP TRIGGER IF EXISTS — 재실행 안전
+--          (재실행 시 refresh로 롤업을 다시 맞춘다).
+-- ============================================================================
+
+BEGIN;
+
+-- ─── 1. 롤업 테이블 ─────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS public.stats_article_hourly (
+  article_id      BIGINT      NOT NULL,
+  bucket          TIMESTAMPTZ NOT NULL,
+  analysis_count  BIGINT      NOT NULL DEFAULT 0,
+  latest_analysis TIMESTAMPTZ,
+  PRIMARY KEY (article_id, bucket)
+);
+CREATE INDEX IF NOT EXISTS idx_stats_article_hourly_bucket
+  ON public.stats_article_hourly (bucket);
+
+CREATE TABLE IF NOT EXISTS public.stats_publisher (
+  publisher      TEXT PRIMARY KEY,
+  total_analyses BIGINT           NOT NULL DEFAULT 0,
+  duration_sum   DOUBLE PRECISION NOT NULL DEFAULT 0,
+  duration_count BIGINT           NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_stats_publisher_total
+  ON public.stats_publisher (total_analyses DESC);
+
+-- 쓰기 경합 분산용 슬롯 카운터 — 행 하나는 전체의 일부일 뿐, 값은 항상 SUM으로 읽는다.
+CREATE TABLE IF NOT EXISTS public.stats_overall (
+  slot           SMALLINT PRIMARY KEY CHECK (slot >= 0 AND slot < 16),
+  total_articles BIGINT           NOT NULL DEFAULT 0,
+  total_analyses BIGINT           NOT NULL DEFAULT 0,
+  duration_sum   DOUBLE PRECISION NOT NULL DEFAULT 0,
+  duration_count BIGINT           NOT NULL DEFAULT 0,
+  updated_at     TIMESTAMPTZ      NOT NULL DEFAULT now()
+);
+INSERT INTO public.stats_overall (slot)
+SELECT generate_series(0, 15)
+ON CONFLICT (slot) DO NOTHING;
+
+ALTER TABLE public.stats_article_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.stats_publisher      ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.stats_overall        ENABLE ROW LEVEL SECURITY;
+
+-- ─── 2. 증분 유지 ───────────────────────────────────────────────────
+CREATE OR REPLACE FUNCTION public.stats_publisher_delta(
+  p_publisher TEXT, p_count BIGINT, p_duration_sum DOUBLE PRECISION, p_duration_count BIGINT
+)
+RETURNS void
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $function$
+BEGIN
+  IF p_publisher IS NULL OR p_count = 0 THEN
+    RETURN;
+  END IF;
+  INSERT INTO public.stats_publisher AS s (publisher, total_analyses, duration_sum, duration_count)
+  VALUES (p_publisher, p_count, p_duration_sum, p_duration_count)
+  ON CONFLICT (publisher) DO UPDATE
+    SET total_analyses = s.total_analyses + EXCLUDED.total_analyses,
+        duration_sum   = s.duration_sum   + EXCLUDED.duration_sum,
+        duration_count = s.duration_count + EXCLUDED.duration_count;
+  DELETE FROM public.stats_publisher
+  WHERE publisher = p_publisher AND total_analyses <= 0;
+END;
+$function$;
+
+-- 동시 트랜잭션은 서로 다른 백엔드이므로 대개 다른 슬롯 행을 잠근다.
+CREATE OR REPLACE FUNCTION public.stats_overall_delta(
+  p_articles BIGINT, p_analyses BIGINT, p_duration_sum DOUBLE PRECISION, p_duration_count BIGINT
+)
+RETURNS void
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $function$
+BEGIN
+  UPDATE public.stats_overall
+  SET total_articles = total_articles + p_articles,
+      total_analyses = total_analyses + p_analyses,
+      duration_sum   = duration_sum   + p_duration_sum,
+      duration_count = duration_count + p_duration_count,
+      updated_at     = now()
+  WHERE slot = pg_backend_pid() % 16;
+END;
+$function$;
+
+CREATE OR REPLACE FUNCTION public.stats_analysis_delta(
+  p_article_id BIGINT, p_created_at TIMESTAMPTZ, p_duration DOUBLE PRECISION, p_sign INT
+)
+RETURNS void
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $function$
+DECLARE
+  v_bucket    TIMESTAMPTZ := date_trunc('hour', p_created_at);
+  v_publisher TEXT;
+BEGIN
+  IF p_sign > 0 THEN
+    INSERT INTO public.stats_article_hourly AS h (article_id, bucket, analysis_count, latest_analysis)
+    VALUES (p_article_id, v_bucket, 1, p_created_at)
+    ON CONFLICT (article_id, bucket) DO UPDATE
+      SET analysis_count  = h.analysis_count + 1,
+          latest_analysis = GREATEST(h.latest_analysis, EXCLUDED.latest_analysis);
+  ELSE
+    UPDATE public.stats_article_hourly
+    SET analysis_count = analysis_count - 1
+    WHERE article_id = p_article_id AND bucket = v_bucket;
+    DELETE FROM public.stats_article_hourly
+    WHERE article_id = p_article_id AND bucket = v_bucket AND analysis_count <= 0;
+  END IF;
+
+  SELECT a.publisher INTO v_publisher FROM public.articles a WHERE a.id = p_article_id;
+  PERFORM public.stats_publisher_delta(
+    v_publisher, p_sign, p_sign * COALESCE(p_duration, 0), p_sign * (p_duration IS NOT NULL)::INT
+  );
+
+  PERFORM public.stats_overall_delta(
+    0, p_sign, p_sign * COALESCE(p_duration, 0), p_sign * (p_duration IS NOT NULL)::INT
+  );
+END;
+$function$;
+
+CREATE OR REPLACE FUNCTION public.stats_on_analysis_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $function$
+BEGIN
+  IF TG_OP IN ('DELETE', 'UPDATE') THEN
+    PERFORM public.stats_analysis_delta(OLD.article_id, OLD.created_at, OLD.duration_seconds, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.stats_analysis_delta(NEW.article_id, NEW.created_at, NEW.duration_seconds, 1);
+  END IF;
+  RETURN NULL;
+END;
+$function$;
+
+CREATE OR REPLACE FUNCTION public.stats_on_article_change()
+RETURNS trigger
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $function$
+DECLARE
+  v_count BIGINT;
+  v_sum   DOUBLE PRECISION;
+  v_dur_n BIGINT;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM public.stats_overall_delta(1, 0, 0, 0);
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM public.stats_overall_delta(-1, 0, 0, 0);
+  ELSIF NEW.publisher IS DISTINCT FROM OLD.publisher THEN
+    SELECT count(*), COALESCE(sum(ar.duration_seconds), 0), count(ar.duration_seconds)
+      INTO v_count, v_sum, v_dur_n
+    FROM public.analysis_results ar
+    WHERE ar.article_id = NEW.id;
+    PERFORM public.stats_publisher_delta(OLD.publisher, -v_count, -v_sum, -v_dur_n);
+    PERFORM public.stats_publisher_delta(NEW.publisher, v_count, v_sum, v_dur_n);
+  END IF;
+  RETURN NULL;
+END;
+$function$;
+
+DROP TRIGGER IF EXISTS stats_on_analysis_change ON public.analysis_results;
+CREATE TRIGGER stats_on_analysis_change
+  AFTER INSERT OR DELETE OR UPDATE OF article_id, created_at, duration_seconds
+  ON public.analysis_results
+  FOR EACH ROW
+  EXECUTE FUNCTION public.stats_on_analysis_change();
+
+DROP TRIGGER IF EXISTS stats_on_article_change ON public.articles;
+CREATE TRIGGER stats_on_article_change
+  AFTER INSERT OR DELETE OR UPDATE OF publisher
+  ON public.articles
+  FOR EACH ROW
+  EXECUTE FUNCTION public.stats_on_article_change();
+
+-- ─── 3. 전체 재구성 ─────────────────────────────────────────────────
+-- SHARE 락: 재구성 동안 두 원본 테이블 쓰기를 막아 트리거 증분과 섞이지 않게 한다.
+CREATE OR REPLACE FUNCTION public.refresh_analysis_stats()
+RETURNS void
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $function$
+BEGIN
+  LOCK TABLE public.articles, public.analysis_results IN SHARE MODE;
+
+  DELETE FROM public.stats_article_hourly;
+  INSERT INTO public.stats_article_hourly (article_id, bucket, analysis_count, latest_analysis)
+  SELECT ar.article_id, date_trunc('hour', ar.created_at), count(*), max(ar.created_at)
+  FROM public.analysis_results ar
+  GROUP BY 1, 2;
+
+  DELETE FROM public.stats_publisher;
+  INSERT INTO public.stats_publisher (publisher, total_analyses, duration_sum, duration_count)
+  SELECT a.publisher, count(ar.id), COALESCE(sum(ar.duration_seconds), 0), count(ar.duration_seconds)
+  FROM public.articles a
+  JOIN public.analysis_results ar ON a.id = ar.article_id
+  WHERE a.publisher IS NOT NULL
+  GROUP BY a.publisher;
+
+  -- 전체 값은 슬롯 0에, 나머지 슬롯은 0으로
+  UPDATE public.stats_overall
+  SET total_articles = 0, total_analyses = 0, duration_sum = 0, duration_count = 0,
+      updated_at = now();
+  UPDATE public.stats_overall o
+  SET total_articles = (SELECT count(*) FROM public.articles),
+      total_analyses = live.n,
+      duration_sum   = live.dsum,
+      duration_count = live.dn
+  FROM (
+    SELECT count(*) AS n, COALESCE(sum(ar.duration_seconds), 0) AS dsum,
+           count(ar.duration_seconds) AS dn
+    FROM public.analysis_results ar
+  ) live
+  WHERE o.slot = 0;
+END;
+$function$;
+
+REVOKE ALL ON FUNCTION public.refresh_analysis_stats() FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.refresh_analysis_stats() FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.refresh_analysis_stats() TO service_role;
+
+REVOKE ALL ON FUNCTION public.stats_analysis_delta(BIGINT, TIMESTAMPTZ, DOUBLE PRECISION, INT) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.stats_analysis_delta(BIGINT, TIMESTAMPTZ, DOUBLE PRECISION, INT) FROM anon, authenticated;
+REVOKE ALL ON FUNCTION public.stats_publisher_delta(TEXT, BIGINT, DOUBLE PRECISION, BIGINT) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.stats_publisher_delta(TEXT, BIGINT, DOUBLE PRECISION, BIGINT) FROM anon, authenticated;
+REVOKE ALL ON FUNCTION public.stats_overall_delta(BIGINT, BIGINT, DOUBLE PRECISION, BIGINT) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.stats_overall_delta(BIGINT, BIGINT, DOUBLE PRECISION, BIGINT) FROM anon, authenticated;
+
+SELECT public.refresh_analysis_stats();
+
+-- ─── 4. 통계 함수 — 롤업 조회 (시그니처·반환 타입 불변) ─────────────
+CREATE OR REPLACE FUNCTION public.get_trending_articles(hours_ago INT DEFAULT 24)
+RETURNS TABLE (
+  article_id BIGINT,
+  title TEXT,
+  url TEXT,
+  publisher TEXT,
+  analysis_count BIGINT,
+  latest_analysis TIMESTAMPTZ
+)
+LANGUAGE plpgsql
+STABLE
+SET search_path = public, pg_temp
+AS $function$
+DECLARE
+  v_since TIMESTAMPTZ := NOW() - INTERVAL '1 hour' * hours_ago;
+  -- v_since가 걸친 시간 버킷은 일부만 창에 들어가므로 원본을 직접 센다.
+  v_full  TIMESTAMPTZ := date_trunc('hour', NOW() - INTERVAL '1 hour' * hours_ago) + INTERVAL '1 hour';
+BEGIN
+  RETURN QUERY
+  WITH counts AS (
+    SELECT h.article_id AS aid, h.analysis_count AS n, h.latest_analysis AS latest
+    FROM public.stats_article_hourly h
+    WHERE h.bucket >= v_full
+    UNION ALL
+    SELECT ar.article_id, 1::BIGINT, ar.created_at
+    FROM public.analysis_results ar
+    WHERE ar.created_at >= v_since AND ar.created_at < v_full
+  ), agg AS (
+    SELECT c.aid, SUM(c.n)::BIGINT AS cnt, MAX(c.latest) AS latest
+    FROM counts c
+    GROUP BY c.aid
+    HAVING SUM(c.n) > 0
+  )
+  SELECT a.id, a.title, a.url, a.publisher, agg.cnt, agg.latest
+  FROM agg
+  JOIN public.articles a ON a.id = agg.aid
+  ORDER BY agg.cnt DESC, agg.latest DESC
+  LIMIT 10;
+END;
+$function$;
+
+CREATE OR REPLACE FUNCTION public.get_publisher_stats()
+RETURNS TABLE (
+  publisher TEXT,
+  total_analyses BIGINT,
+  avg_duration FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+SET search_path = public, pg_temp
+AS $function$
+BEGIN
+  RETURN QUERY
+  SELECT s.publisher, s.total_analyses,
+         CASE WHEN s.duration_count > 0 THEN s.duration_sum / s.duration_count END
+  FROM public.stats_publisher s
+  WHERE s.total_analyses > 0
+  ORDER BY s.total_analyses DESC
+  LIMIT 20;
+END;
+$function$;
+
+CREATE OR REPLACE FUNCTION public.get_overall_stats()
+RETURNS TABLE (
+  total_articles BIGINT,
+  total_analyses BIGINT,
+  avg_duration FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+SET search_path = public, pg_temp
+AS $function$
+BEGIN
+  RETURN QUERY
+  SELECT sum(o.total_articles)::BIGINT, sum(o.total_analyses)::BIGINT,
+         CASE WHEN sum(o.duration_count) > 0 THEN sum(o.duration_sum) / sum(o.duration_count) END
+  FROM public.stats_overall o;
+END;
+$function$;
+
+-- ─── 사후 검증(같은 트랜잭션): 트리거 2개 + 롤업이 원본과 일치 ────────
+DO $$
+DECLARE
+  n_triggers   INT;
+  n_articles   BIGINT;
+  n_analyses   BIGINT;
+  n_hourly     BIGINT;
+  n_publisher  BIGINT;
+  r_overall    RECORD;
+BEGIN
+  SELECT count(*) INTO n_triggers
+  FROM pg_trigger t
+  JOIN pg_class c ON c.oid = t.tgrelid
+  JOIN pg_namespace n ON n.oid = c.relnamespace
+  WHERE n.nspname = 'public'
+    AND (
+      (c.relname = 'analysis_results' AND t.tgname = 'stats_on_analysis_change') OR
+      (c.relname = 'articles'         AND t.tgname = 'stats_on_article_change')
+    );
+  IF n_triggers <> 2 THEN
+    RAISE EXCEPTION 'materialized stats: expected 2 triggers, found %', n_triggers;
+  END IF;
+
+  SELECT count(*) INTO n_articles FROM public.articles;
+  SELECT count(*) INTO n_analyses FROM public.analysis_results;
+  SELECT * INTO r_overall FROM public.get_overall_stats();
+  IF r_overall.total_articles <> n_articles OR r_overall.total_analyses <> n_analyses THEN
+    RAISE EXCEPTION 'materialized stats: overall mismatch (% / %) vs live (% / %)',
+      r_overall.total_articles, r_overall.total_analyses, n_articles, n_analyses;
+  END IF;
+
+  SELECT COALESCE(sum(analysis_count), 0) INTO n_hourly FROM public.stats_article_hourly;
+  IF n_hourly <> n_analyses THEN
+    RAISE EXCEPTION 'materialized stats: hourly sum % vs analyses %', n_hourly, n_analyses;
+  END IF;
+
+  SELECT count(*) INTO n_publisher
+  FROM public.analysis_results ar JOIN public.articles a ON a.id = ar.article_id
+  WHERE a.publisher IS NOT NULL;
+  IF (SELECT COALESCE(sum(total_analyses), 0) FROM public.stats_publisher) <> n_publisher THEN
+    RAISE EXCEPTION 'materialized stats: publisher rollup mismatch';
+  END IF;
+END $$;
+
+COMMIT;
+
+NOTIFY pgrst, 'reload schema';
+
+-- [기획자 수동 실행 — 이력 동기화]
+-- INSERT INTO supabase_migrations.schema_migrations (version, name, statements)
+-- VALUES ('20261019000300', 'materialized_stats',
+--         ARRAY['CREATE TABLE public.stats_article_hourly ...']);
+
+-- [선택 — 주기 정합성 점검] pg_cron 확장이 켜져 있으면 매일 04:10(UTC) 재구성.
+-- SELECT cron.schedule('refresh_analysis_stats', '10 4 * * *',
+--                      'SELECT public.refresh_analysis_stats()');
+
+-- ============================================================================
+-- [ROLLBACK] 세 통계 함수를 20260328 원본(라이브 집계)으로 되돌린 뒤 롤업 제거.
+-- ----------------------------------------------------------------------------
+-- BEGIN;
+-- (20260328000000_create_cr_check_schema.sql §14~16의 CREATE OR REPLACE FUNCTION 3개 재실행,
+--  이어서 20260714051150 A의 ALTER FUNCTION ... SET search_path 3줄 재실행)
+-- DROP TRIGGER IF EXISTS stats_on_analysis_change ON public.analysis_results;
+-- DROP TRIGGER IF EXISTS stats_on_article_change ON public.articles;
+-- DROP FUNCTION IF EXISTS public.stats_on_analysis_change();
+-- DROP FUNCTION IF EXISTS public.stats_on_article_change();
+-- DROP FUNCTION IF EXISTS public.refresh_analysis_stats();
+-- DROP FUNCTION IF EXISTS public.stats_analysis_delta(BIGINT, TIMESTAMPTZ, DOUBLE PRECISION, INT);
+-- DROP FUNCTION IF EXISTS public.stats_publisher_delta(TEXT, BIGINT, DOUBLE PRECISION, BIGINT);
+-- DROP FUNCTION IF EXISTS public.stats_overall_delta(BIGINT, BIGINT, DOUBLE PRECISION, BIGINT);
+-- DROP TABLE IF EXISTS public.stats_article_hourly;
+-- DROP TABLE IF EXISTS public.stats_publisher;
+-- DROP TABLE IF EXISTS public.stats_overall;
+-- COMMIT;
+-- NOTIFY pgrst, 'reload schema';
+-- ============================================================================
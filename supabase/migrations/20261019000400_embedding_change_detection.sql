@@ -0,0 +1,83 @@
+-- ============================================================================
+-- 임베딩 변경 감지 — search_text_hash / embedding_model 컬럼
+-- ============================================================================
+-- 이력 version: 20261019000400
+--
+-- [실행 방식 경고 — 반드시 준수]
+-- Supabase SQL Editor에서 기획자가 "수동" 실행하는 마이그레이션이다.
+-- `supabase db push` / `supabase migration up` 로 운영 DB에 실행하지 말 것.
+-- (schema_migrations drift — 20260622 관례 준수. 이력은 수동 INSERT.)
+--
+-- [배경]
+--   STEP 6 방식 임베딩 재생성은 시드가 search_text 몇 건만 바꿔도(예:
+--   20260706000000_wave11_t1_pattern_enrichment) 패턴·규범 전체를 다시 임베딩했다.
+--   어떤 입력·모델로 만든 벡터인지 행에 남겨 두면 바뀐 행만 골라 재임베딩할 수 있다.
+--
+-- [내용]
+--   1. public.patterns / public.ethics_codes 에 두 컬럼 추가 (nullable)
+--      - search_text_hash : 임베딩 입력 텍스트의 sha256 hex
+--                           patterns = search_text.strip() (scripts/generate_embeddings.py)
+--                           ethics_codes = full_text (30자 미만이면 "title — full_text")
+--      - embedding_model  : 벡터를 만든 모델명 (예: text-embedding-3-small)
+--   2. 값은 scripts/generate_embeddings.py 만 기록한다 (벡터와 같은 UPDATE).
+--      NULL = 이 마이그레이션 이전에 만든 벡터 → --incremental 첫 실행에서 1회 재임베딩.
+--   트리거·함수 없음. ethics_codes UPDATE는 기존 bump_ethics_mapping_version
+--   (20261019000200) 문장 트리거를 그대로 발화시킨다 — 재임베딩이 없으면 UPDATE도 없다.
+--
+-- [보안] 컬럼 추가만. 기존 RLS·GRANT 변경 없음.
+-- [멱등성] ADD COLUMN IF NOT EXISTS — 재실행 안전.
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE public.patterns
+  ADD COLUMN IF NOT EXISTS search_text_hash TEXT,
+  ADD COLUMN IF NOT EXISTS embedding_model  TEXT;
+
+ALTER TABLE public.ethics_codes
+  ADD COLUMN IF NOT EXISTS search_text_hash TEXT,
+  ADD COLUMN IF NOT EXISTS embedding_model  TEXT;
+
+COMMENT ON COLUMN public.patterns.search_text_hash IS
+  'sha256 hex of the exact embedding input (search_text). Written by scripts/generate_embeddings.py.';
+COMMENT ON COLUMN public.patterns.embedding_model IS
+  'Model that produced description_embedding. Written by scripts/generate_embeddings.py.';
+COMMENT ON COLUMN public.ethics_codes.search_text_hash IS
+  'sha256 hex of the exact embedding input (full_text, or "title — full_text" when short).';
+COMMENT ON COLUMN public.ethics_codes.embedding_model IS
+  'Model that produced text_embedding. Written by scripts/generate_embeddings.py.';
+
+-- ─── 사후 검증(같은 트랜잭션): 컬럼 4개 ────────────────────────────
+DO $$
+DECLARE
+  n_cols INT;
+BEGIN
+  SELECT count(*) INTO n_cols
+  FROM information_schema.columns
+  WHERE table_schema = 'public'
+    AND table_name IN ('patterns', 'ethics_codes')
+    AND column_name IN ('search_text_hash', 'embedding_model');
+  IF n_cols <> 4 THEN
+    RAISE EXCEPTION 'embedding_change_detection: expected 4 columns, found %', n_cols;
+  END IF;
+END $$;
+
+COMMIT;
+
+NOTIFY pgrst, 'reload schema';
+
+-- [기획자 수동 실행 — 이력 동기화]
+-- INSERT INTO supabase_migrations.schema_migrations (version, name, statements)
+-- VALUES ('20261019000400', 'embedding_change_detection',
+--         ARRAY['ALTER TABLE public.patterns ADD COLUMN search_text_hash ...']);
+
+-- ============================================================================
+-- [ROLLBACK] generate_embeddings.py는 컬럼이 없으면 벡터만 갱신하고
+-- --incremental 은 안내 후 중단한다.
+-- ----------------------------------------------------------------------------
+-- BEGIN;
+-- ALTER TABLE public.patterns     DROP COLUMN IF EXISTS search_text_hash, DROP COLUMN IF EXISTS embedding_model;
+-- ALTER TABLE public.ethics_codes DROP COLUMN IF EXISTS search_text_hash, DROP COLUMN IF EXISTS embedding_model;
+-- COMMIT;
+-- NOTIFY pgrst, 'reload schema';
+-- ============================================================================
@@ -0,0 +1,251 @@
+-- ============================================================================
+-- 요청별 API 사용량·비용 원장 — analysis_results.usage_ledger + 롤업 뷰
+-- ============================================================================
+-- 이력 version: 20261019000500
+--
+-- [실행 방식 경고 — 반드시 준수]
+-- Supabase SQL Editor에서 기획자가 "수동" 실행하는 마이그레이션이다.
+-- `supabase db push` / `supabase migration up` 로 운영 DB에 실행하지 말 것.
+-- (schema_migrations drift — 20260622 관례 준수. 이력은 수동 INSERT.)
+-- 선행: 20261019000100_save_analysis_client_share_id.sql
+--
+-- [배경]
+--   analysis_results에는 토큰·비용이 남지 않는다. /metrics 토큰 카운터는 프로세스
+--   누적치라 어떤 매체·기사 형태가 비용을 끌어올리는지, 요청당 예산을 얼마로 잡을지
+--   볼 수 없다. Phase 1 토큰·프롬프트 캐시 토큰·Phase 2 재시도도 집계되지 않았다.
+--
+-- [내용]
+--   1. public.analysis_results.usage_ledger JSONB (nullable) — backend core/usage.py
+--      UsageLedger.to_json(): calls[] (호출별 phase·model·outcome·토큰·cost_usd),
+--      by_phase, totals(calls·failed_calls·retries·토큰·cost_usd), shape(기사 형태).
+--      NULL = 이 마이그레이션 이전 행 또는 원장 없는 저장.
+--   2. save_analysis(payload) 재정의 — payload.result.usage_ledger 를 함께 INSERT.
+--      그 밖의 동작(호출 측 share_id·멱등·스냅샷)은 20261019000100과 동일.
+--      레거시 REST 경로는 result 레코드를 그대로 INSERT하므로 컬럼만 있으면 된다.
+--   3. public.analysis_usage_rollup 뷰 — 매체 × article_context × 본문 길이 구간별
+--      분석 수·호출·재시도·토큰·비용 합계/평균/p95.
+--
+-- [보안] analysis_results는 service_role 전용(20260714051151). 뷰는 security_invoker=on
+--        이고 anon/authenticated SELECT를 회수한다. save_analysis 권한은 기존과 동일.
+-- [멱등성] ADD COLUMN IF NOT EXISTS / CREATE OR REPLACE — 재실행 안전.
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE public.analysis_results
+  ADD COLUMN IF NOT EXISTS usage_ledger JSONB;
+
+COMMENT ON COLUMN public.analysis_results.usage_ledger IS
+  'Per-request API usage ledger (calls, by_phase, totals incl. retries and cache tokens, '
+  'estimated cost_usd, article shape). Written by backend core/usage.py. Observability only.';
+
+-- ─── save_analysis: usage_ledger 포함 ───────────────────────────────
+CREATE OR REPLACE FUNCTION public.save_analysis(payload jsonb)
+RETURNS text
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public, pg_temp
+AS $function$
+DECLARE
+  v_article   jsonb := payload->'article';
+  v_result    jsonb := coalesce(payload->'result', '{}'::jsonb);
+  v_article_id bigint;
+  v_analysis_id bigint;
+  v_share_id  text := nullif(payload->>'share_id', '');
+  v_client_id boolean := nullif(payload->>'share_id', '') IS NOT NULL;
+  v_attempt   int := 0;
+BEGIN
+  IF coalesce(v_article->>'url', '') = '' THEN
+    RAISE EXCEPTION 'save_analysis: payload.article.url is required';
+  END IF;
+
+  -- 0. 호출 측 share_id가 이미 저장돼 있으면 재전송(스풀 재생)으로 보고 그대로 반환
+  IF v_client_id AND EXISTS (
+    SELECT 1 FROM public.analysis_results WHERE share_id = v_share_id
+  ) THEN
+    RETURN v_share_id;
+  END IF;
+
+  -- 1. articles UPSERT
+  INSERT INTO public.articles (url, title, publisher, journalist, publish_date)
+  VALUES (
+    v_article->>'url',
+    coalesce(v_article->>'title', ''),
+    nullif(v_article->>'publisher', ''),
+    nullif(v_article->>'journalist', ''),
+    nullif(v_article->>'publish_date', '')::timestamptz
+  )
+  ON CONFLICT (url) DO UPDATE SET
+    title        = EXCLUDED.title,
+    publisher    = coalesce(EXCLUDED.publisher, articles.publisher),
+    journalist   = coalesce(EXCLUDED.journalist, articles.journalist),
+    publish_date = coalesce(EXCLUDED.publish_date, articles.publish_date)
+  RETURNING id INTO v_article_id;
+
+  -- 2~3. share_id (호출 측 지정 또는 서버 생성) + analysis_results INSERT
+  LOOP
+    v_attempt := v_attempt + 1;
+    IF NOT v_client_id THEN
+      -- uuid 앞 9바이트 → base64 12자 → URL-safe 치환 (secrets.token_urlsafe(9) 형식)
+      v_share_id := translate(
+        encode(substr(decode(replace(gen_random_uuid()::text, '-', ''), 'hex'), 1, 9), 'base64'),
+        '+/', '-_'
+      );
+    END IF;
+
+    INSERT INTO public.analysis_results (
+      article_id, share_id,
+      comprehensive_report, journalist_report, student_report,
+      article_analysis, overall_assessment,
+      phase1_model, phase2_model, duration_seconds,
+      detected_patterns, meta_patterns, citation_audit, phase1_forensic,
+      usage_ledger
+    )
+    VALUES (
+      v_article_id, v_share_id,
+      v_result->>'comprehensive_report',
+      v_result->>'journalist_report',
+      v_result->>'student_report',
+      nullif(v_result->'article_analysis', 'null'::jsonb),
+      v_result->>'overall_assessment',
+      v_result->>'phase1_model',
+      v_result->>'phase2_model',
+      (v_result->>'duration_seconds')::float,
+      nullif(v_result->'detected_patterns', 'null'::jsonb),
+      nullif(v_result->'meta_patterns', 'null'::jsonb),
+      nullif(v_result->'citation_audit', 'null'::jsonb),
+      nullif(v_result->'phase1_forensic', 'null'::jsonb),
+      nullif(v_result->'usage_ledger', 'null'::jsonb)
+    )
+    ON CONFLICT (share_id) DO NOTHING
+    RETURNING id INTO v_analysis_id;
+
+    EXIT WHEN v_analysis_id IS NOT NULL;
+    -- 호출 측 share_id 충돌 = 동시 재전송이 먼저 커밋됨 → 이미 저장된 것으로 본다
+    IF v_client_id THEN
+      RETURN v_share_id;
+    END IF;
+    IF v_attempt >= 5 THEN
+      RAISE EXCEPTION 'save_analysis: share_id collision % times', v_attempt;
+    END IF;
+  END LOOP;
+
+  -- 4. analysis_ethics_snapshot — 대상 선별·중복 제거는 호출 측(storage.py) 책임
+  INSERT INTO public.analysis_ethics_snapshot (
+    analysis_id, ethics_code_id, snapshot_full_text, snapshot_version
+  )
+  SELECT v_analysis_id, ec.id, coalesce(s.snapshot_full_text, ''), ec.version
+  FROM jsonb_to_recordset(coalesce(payload->'snapshots', '[]'::jsonb))
+       AS s(ethics_code text, snapshot_full_text text)
+  JOIN LATERAL (
+    SELECT id, version
+    FROM public.ethics_codes
+    WHERE code = s.ethics_code
+    ORDER BY is_active DESC, version DESC
+    LIMIT 1
+  ) ec ON true;
+
+  RETURN v_share_id;
+END;
+$function$;
+
+COMMENT ON FUNCTION public.save_analysis(jsonb) IS
+  '분석 결과 원자적 저장: articles UPSERT + share_id(호출 측 지정 또는 서버 생성) + '
+  'analysis_results + analysis_ethics_snapshot 을 1 트랜잭션으로 처리하고 share_id 반환. '
+  '이미 저장된 share_id면 그대로 반환 (멱등). result.usage_ledger 포함';
+
+-- CREATE OR REPLACE는 기존 grant를 유지하지만 명시적으로 재확인한다.
+REVOKE ALL ON FUNCTION public.save_analysis(jsonb) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.save_analysis(jsonb) FROM anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.save_analysis(jsonb) TO service_role;
+
+-- ─── 롤업 뷰 ────────────────────────────────────────────────────────
+CREATE OR REPLACE VIEW public.analysis_usage_rollup
+WITH (security_invoker = on) AS
+WITH ledger AS (
+  SELECT
+    coalesce(nullif(a.publisher, ''), '(unknown)')                   AS publisher,
+    coalesce(ar.usage_ledger->'shape'->>'article_context', 'unknown') AS article_context,
+    CASE
+      WHEN (ar.usage_ledger->'shape'->>'article_chars') IS NULL THEN 'unknown'
+      WHEN (ar.usage_ledger->'shape'->>'article_chars')::int < 1500 THEN '<1.5k'
+      WHEN (ar.usage_ledger->'shape'->>'article_chars')::int < 3000 THEN '1.5k-3k'
+      WHEN (ar.usage_ledger->'shape'->>'article_chars')::int < 6000 THEN '3k-6k'
+      ELSE '6k+'
+    END                                                              AS length_bucket,
+    ar.usage_ledger->'totals'                                        AS t,
+    ar.created_at
+  FROM public.analysis_results ar
+  JOIN public.articles a ON a.id = ar.article_id
+  WHERE ar.usage_ledger IS NOT NULL
+)
+SELECT
+  publisher,
+  article_context,
+  length_bucket,
+  count(*)                                                  AS analyses,
+  sum((t->>'calls')::int)                                   AS api_calls,
+  sum((t->>'failed_calls')::int)                            AS failed_calls,
+  sum((t->>'retries')::int)                                 AS retries,
+  sum((t->>'input_tokens')::bigint)                         AS input_tokens,
+  sum((t->>'output_tokens')::bigint)                        AS output_tokens,
+  sum((t->>'cache_read_input_tokens')::bigint)              AS cache_read_input_tokens,
+  sum((t->>'cache_creation_input_tokens')::bigint)          AS cache_creation_input_tokens,
+  round(sum((t->>'cost_usd')::numeric), 4)                  AS cost_usd,
+  round(avg((t->>'cost_usd')::numeric), 6)                  AS avg_cost_usd,
+  round(percentile_cont(0.95) WITHIN GROUP (ORDER BY (t->>'cost_usd')::float)::numeric, 6)
+                                                            AS p95_cost_usd,
+  min(created_at)                                           AS first_at,
+  max(created_at)                                           AS last_at
+FROM ledger
+GROUP BY publisher, article_context, length_bucket;
+
+COMMENT ON VIEW public.analysis_usage_rollup IS
+  'Usage/cost rollup of analysis_results.usage_ledger by publisher x article_context x length bucket. '
+  'ORDER BY cost_usd DESC to find the article shapes and publishers that dominate spend.';
+
+REVOKE ALL ON public.analysis_usage_rollup FROM PUBLIC;
+REVOKE ALL ON public.analysis_usage_rollup FROM anon, authenticated;
+GRANT SELECT ON public.analysis_usage_rollup TO service_role;
+
+-- ─── 사후 검증(같은 트랜잭션): 컬럼·뷰 권한·함수 권한 ────────────────
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = 'public' AND table_name = 'analysis_results'
+      AND column_name = 'usage_ledger' AND data_type = 'jsonb'
+  ) THEN
+    RAISE EXCEPTION 'analysis_usage_ledger: usage_ledger jsonb column missing';
+  END IF;
+  IF has_table_privilege('anon', 'public.analysis_usage_rollup', 'SELECT') THEN
+    RAISE EXCEPTION 'analysis_usage_ledger: anon must not read analysis_usage_rollup';
+  END IF;
+  IF has_function_privilege('anon', 'public.save_analysis(jsonb)', 'EXECUTE') THEN
+    RAISE EXCEPTION 'save_analysis: anon must not have EXECUTE';
+  END IF;
+END $$;
+
+COMMIT;
+
+NOTIFY pgrst, 'reload schema';
+
+-- [기획자 수동 실행 — 이력 동기화]
+-- INSERT INTO supabase_migrations.schema_migrations (version, name, statements)
+-- VALUES ('20261019000500', 'analysis_usage_ledger',
+--         ARRAY['ALTER TABLE public.analysis_results ADD COLUMN usage_ledger JSONB ...']);
+
+-- [활용 예] 비용 상위 매체·기사 형태
+-- SELECT * FROM public.analysis_usage_rollup ORDER BY cost_usd DESC LIMIT 20;
+
+-- ============================================================================
+-- [ROLLBACK] 함수를 먼저 20261019000100 정의로 되돌린 뒤 뷰·컬럼을 지운다
+-- (순서가 바뀌면 save_analysis가 없는 컬럼을 INSERT하다 실패한다).
+-- ----------------------------------------------------------------------------
+-- BEGIN;
+-- -- 20261019000100_save_analysis_client_share_id.sql 의 CREATE OR REPLACE FUNCTION 실행
+-- DROP VIEW IF EXISTS public.analysis_usage_rollup;
+-- ALTER TABLE public.analysis_results DROP COLUMN IF EXISTS usage_ledger;
+-- COMMIT;
+-- NOTIFY pgrst, 'reload schema';
+-- ============================================================================